@@ -100,6 +100,9 @@ IP4_DEFAULT_TTL = 64
 IP4_FRAG_FLOW_TIMEOUT = 5
 IP6_FRAG_FLOW_TIMEOUT = 5
 
+# Number of TCP / UDP flows that keep pre-built Ethernet and IP headers used to send their subsequent packets, the oldest flow is dropped when over the limit
+TX_TEMPLATE_CACHE_SIZE = 1024
+
 # Static IPv6 adrsses may to be configured here (they will still be subject to CICMPv6 ND DAD  mechanism)
 # Each entry is a tuple interface address/prefix length and second is default gateway for this subnet
 # Basic routing is implemented and each subnet can have its own gateway
@@ -141,7 +144,14 @@ TAP_MTU = 1500
 
 # TCP session related settings
 LOCAL_TCP_MSS = 1460  # Maximum segment peer can send to us
-LOCAL_TCP_WIN = 65535  # Maximum amount of data peer can send to us without confirmation
+LOCAL_TCP_WIN = 65535  # Initial size of receive buffer, maximum amount of data peer can send to us without confirmation
+TCP_RCV_BUFFER_MAX = 4194304  # Limit of receive buffer auto-tuning, it also determines the window scale we advertise
+TCP_OOO_QUEUE_SESSION_LIMIT = 131072  # Maximum amount of memory single session can use to store out of order data
+TCP_OOO_QUEUE_GLOBAL_LIMIT = 4194304  # Maximum amount of memory all sessions together can use to store out of order data
+TCP_LISTEN_BACKLOG = 128  # Default limit of half-open connections and connections waiting for accept on listening socket
+
+# UDP socket related settings
+UDP_RCV_BUFFER = 212992  # Default limit of data queued on UDP socket waiting to be received, datagrams over the limit get dropped
 
 # Native support for UDP Echo (used for packet flow unit testing only and should always be disabled)
 UDP_ECHO_NATIVE_DISABLE = True
@@ -45,9 +45,12 @@ from protocols.tcp.session import FsmState, TcpSession
 from protocols.udp.metadata import UdpMetadata
 
 if TYPE_CHECKING:
+    from collections import deque
     from threading import Semaphore
+    from typing import BinaryIO
 
     from lib.ip_address import IpAddress
+    from lib.socket_table import SocketId
 
 
 class gaierror(OSError):
@@ -88,6 +91,25 @@ class SocketType(IntEnum):
 SOCK_STREAM = SocketType.SOCK_STREAM
 SOCK_DGRAM = SocketType.SOCK_DGRAM
 
+# Socket option levels and names, values follow the Linux socket API
+SOL_SOCKET = 1
+IPPROTO_TCP = 6
+IPPROTO_UDP = 17
+
+SO_RCVBUF = 8
+SO_REUSEPORT = 15
+SO_ZEROCOPY = 60
+
+TCP_DEFER_ACCEPT = 9
+TCP_INFO = 11
+TCP_FASTOPEN = 23
+
+UDP_SEGMENT = 103
+
+# Message flags
+MSG_TRUNC = 0x20
+MSG_FASTOPEN = 0x20000000
+
 
 def socket(family: AddressFamily = AF_INET4, type: SocketType = SOCK_STREAM) -> Socket:
     """Return Socket class object"""
@@ -106,9 +128,13 @@ def socket(family: AddressFamily = AF_INET4, type: SocketType = SOCK_STREAM) ->
 class Socket(ABC):
     """Base class for other socket classes"""
 
+    _supported_options: frozenset[tuple[int, int]] = frozenset()
+
     def __init__(self) -> None:
         """Class constructor"""
 
+        self._options: dict[tuple[int, int], int] = {}
+
         if TYPE_CHECKING:
             self._family: AddressFamily
             self._type: SocketType
@@ -118,7 +144,8 @@ class Socket(ABC):
             self._remote_port: int
             self._parent_socket: Socket
             self._tcp_session: TcpSession | None
-            self._tcp_accept: list[Socket]
+            self._tcp_accept: deque[Socket]
+            self._backlog: int
             self._event_tcp_session_established: Semaphore
 
     def __str__(self) -> str:
@@ -126,6 +153,19 @@ class Socket(ABC):
 
         return f"{self._family}/{self._type}/{self._local_ip_address}/{self._local_port}/{self._remote_ip_address}/{self._remote_port}"
 
+    @property
+    def socket_id(self) -> SocketId:
+        """Key the socket is registered under in stack socket table"""
+
+        return (
+            self._local_ip_address.version,
+            IPPROTO_TCP if self._type is SOCK_STREAM else IPPROTO_UDP,
+            int(self._local_ip_address),
+            self._local_port,
+            int(self._remote_ip_address),
+            self._remote_port,
+        )
+
     @property
     def family(self) -> AddressFamily:
         """Getter for _family"""
@@ -162,29 +202,48 @@ class Socket(ABC):
 
         return self._remote_port
 
-    def _pick_local_port(self) -> int:
-        """Pick ephemeral local port, making sure it is not already being used by any socket"""
-
-        available_ephemeral_ports = set(config.EPHEMERAL_PORT_RANGE) - {int(_.split("/")[3]) for _ in stack.sockets}
+    def _pick_local_port(self, local_ip_address: IpAddress | None = None, remote_ip_address: IpAddress | None = None, remote_port: int = 0) -> int:
+        """Pick ephemeral local port, port is shared with other connected sockets only if remote address is known"""
 
-        if len(available_ephemeral_ports):
-            return available_ephemeral_ports.pop()
+        if local_port := stack.sockets.pick_local_port(
+            IPPROTO_TCP if self._type is SOCK_STREAM else IPPROTO_UDP, local_ip_address, remote_ip_address, remote_port
+        ):
+            return local_port
 
         raise OSError("[Errno 98] Address already in use - [Unable to find free local ephemeral port]")
 
     def _is_address_in_use(self, local_ip_address: IpAddress, local_port: int) -> bool:
-        """Check if ip address / port combination is already in use"""
+        """Check if ip address / port combination is already in use, it can be shared by sockets that all have SO_REUSEPORT option set"""
 
-        for socket in stack.sockets.values():
+        reuse_port = self._options.get((SOL_SOCKET, SO_REUSEPORT), 0)
+
+        # Only sockets using the same local port need to be checked, socket table keeps them indexed by protocol and port
+        for socket in stack.sockets.port_users(IPPROTO_TCP if self._type is SOCK_STREAM else IPPROTO_UDP, local_port):
             if (
                 socket.family == self._family
                 and socket._type == self._type
                 and ((socket._local_ip_address.is_unspecified or socket._local_ip_address == local_ip_address) or local_ip_address.is_unspecified)
-                and socket._local_port == local_port
+                and not (reuse_port and socket._options.get((SOL_SOCKET, SO_REUSEPORT), 0))
             ):
                 return True
         return False
 
+    def setsockopt(self, level: int, optname: int, value: int) -> None:
+        """Set the value of given socket option"""
+
+        if (level, optname) not in self._supported_options:
+            raise OSError("[Errno 92] Protocol not available - [Unsupported socket option]")
+
+        self._options[(level, optname)] = value
+
+    def getsockopt(self, level: int, optname: int) -> int:
+        """Return the value of given socket option"""
+
+        if (level, optname) not in self._supported_options:
+            raise OSError("[Errno 92] Protocol not available - [Unsupported socket option]")
+
+        return self._options.get((level, optname), 0)
+
     def _set_ip_addresses(
         self, remote_address: tuple[str, int], local_ip_address: IpAddress, local_port: int, remote_port: int
     ) -> tuple[Ip6Address | Ip4Address, Ip6Address | Ip4Address]:
@@ -232,7 +291,7 @@ class Socket(ABC):
 
     if TYPE_CHECKING:
 
-        def listen(self) -> None:
+        def listen(self, backlog: int = config.TCP_LISTEN_BACKLOG) -> None:
             pass
 
         def accept(self) -> tuple[Socket, tuple[str, int]]:
@@ -244,6 +303,29 @@ class Socket(ABC):
         def recvfrom(self, bufsize: int | None = None, timeout: float | None = None) -> tuple[bytes, tuple[str, int]]:
             pass
 
+        def recv_into(self, buffer: memoryview | bytearray, nbytes: int = 0, flags: int = 0, *, timeout: float | None = None) -> int:
+            pass
+
+        def recvfrom_into(
+            self, buffer: memoryview | bytearray, nbytes: int = 0, flags: int = 0, *, timeout: float | None = None
+        ) -> tuple[int, tuple[str, int]]:
+            pass
+
+        def recv_many(self, count: int, timeout: float | None = None) -> list[tuple[bytes, tuple[str, int]]]:
+            pass
+
+        def recvfrom_view(self, timeout: float | None = None) -> tuple[memoryview, tuple[str, int]]:
+            pass
+
+        def send_many(self, datagrams: list[tuple[bytes, tuple[str, int]]]) -> int:
+            pass
+
+        def sendfile(self, file: BinaryIO, offset: int = 0, count: int | None = None) -> int:
+            pass
+
+        def recvfile(self, file: BinaryIO, count: int, offset: int = 0) -> int:
+            pass
+
         def process_udp_packet(self, packet: UdpMetadata) -> None:
             pass
 
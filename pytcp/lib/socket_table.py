@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# lib/socket_table.py - module contains socket demultiplexing table and ephemeral port allocator
+#
+
+
+from __future__ import annotations
+
+import itertools
+import os
+import random
+from hashlib import blake2s
+from typing import TYPE_CHECKING, Iterator
+
+import config
+from protocols.ip4.ps import IP4_PROTO_UDP
+
+if TYPE_CHECKING:
+    from lib.ip_address import IpAddress
+    from lib.socket import Socket
+
+# IP version, IP protocol, local address, local port, remote address, remote port
+SocketId = tuple[int, int, int, int, int, int]
+
+DHCP4_CLIENT_REMOTE_ADDRESS = 0xFFFFFFFF  # DHCPv4 client socket is bound to unspecified address but connected to limited broadcast address
+
+
+class SocketTable:
+    """Socket demultiplexing table, connected sockets are matched by exact socket id and sockets without remote address by local address and port"""
+
+    # Several sockets with SO_REUSEPORT option set can share the same local address and port, in such case they form a group
+    # and packets get spread over its members by the flow hash
+
+    def __init__(self) -> None:
+        """Class constructor"""
+
+        self._connected: dict[SocketId, Socket] = {}
+        self._bound: dict[tuple[int, int, int, int], list[Socket]] = {}
+        self._port_users: dict[tuple[int, int], list[Socket]] = {}
+        self._port_binds: dict[tuple[int, int], int] = {}
+        self._next_ephemeral = random.randrange(len(config.EPHEMERAL_PORT_RANGE))
+        self._secret = os.urandom(16)
+
+    def __len__(self) -> int:
+        """Number of registered sockets"""
+
+        return len(self._connected) + sum(len(_) for _ in self._bound.values())
+
+    def __contains__(self, socket_id: SocketId) -> bool:
+        """Check if socket is registered"""
+
+        return self.get(socket_id) is not None
+
+    def __iter__(self) -> Iterator[SocketId]:
+        """Iterate over ids of registered sockets"""
+
+        return itertools.chain((socket_id + (0, 0) for socket_id, group in self._bound.items() for _ in group), self._connected)
+
+    def __getitem__(self, socket_id: SocketId) -> Socket:
+        """Find registered socket"""
+
+        if (socket := self.get(socket_id)) is None:
+            raise KeyError(socket_id)
+        return socket
+
+    def __setitem__(self, socket_id: SocketId, socket: Socket) -> None:
+        """Register socket, sockets without remote address hold their local port exclusively or join the SO_REUSEPORT group"""
+
+        if socket_id[4:] == (0, 0):
+            group = self._bound.setdefault(socket_id[:4], [])
+            if any(_ is socket for _ in group):
+                return
+            group.append(socket)
+            port = (socket_id[1], socket_id[3])
+            self._port_binds[port] = self._port_binds.get(port, 0) + 1
+        else:
+            self.pop(socket_id, None)
+            self._connected[socket_id] = socket
+            port = (socket_id[1], socket_id[3])
+        self._port_users.setdefault(port, []).append(socket)
+
+    def get(self, socket_id: SocketId, default: Socket | None = None) -> Socket | None:
+        """Find registered socket by its exact id"""
+
+        if socket_id[4:] == (0, 0):
+            return group[0] if (group := self._bound.get(socket_id[:4])) else default
+        return self._connected.get(socket_id, default)
+
+    def get_bound(self, socket_id: SocketId) -> Socket | None:
+        """Find socket without remote address the packet should be delivered to, socket bound to specific local address takes precedence"""
+
+        if not (group := self._bound.get(socket_id[:4]) or self._bound.get((socket_id[0], socket_id[1], 0, socket_id[3]))):
+            return None
+        if len(group) == 1:
+            return group[0]
+        return group[hash(socket_id) % len(group)]
+
+    def match(self, socket_id: SocketId) -> Socket | None:
+        """Find socket the packet should be delivered to, connected socket takes precedence over the bound one"""
+
+        if socket := self._connected.get(socket_id) or self.get_bound(socket_id):
+            return socket
+
+        if socket_id[0] == 4 and socket_id[1] == IP4_PROTO_UDP:
+            return self._connected.get((4, IP4_PROTO_UDP, 0, socket_id[3], DHCP4_CLIENT_REMOTE_ADDRESS, socket_id[5]))
+
+        return None
+
+    def pop(self, socket_id: SocketId, *default: Socket | None) -> Socket | None:
+        """Unregister socket and release its local port, first member gets unregistered in case of SO_REUSEPORT group"""
+
+        if (socket := self.get(socket_id)) is None:
+            if default:
+                return default[0]
+            raise KeyError(socket_id)
+
+        self.discard(socket_id, socket)
+        return socket
+
+    def discard(self, socket_id: SocketId, socket: Socket) -> None:
+        """Unregister given socket if it's registered under given id and release its local port"""
+
+        port = (socket_id[1], socket_id[3])
+        if socket_id[4:] == (0, 0):
+            group = self._bound.get(socket_id[:4], [])
+            if not any(_ is socket for _ in group):
+                return
+            if not (group := [_ for _ in group if _ is not socket]):
+                del self._bound[socket_id[:4]]
+            else:
+                self._bound[socket_id[:4]] = group
+            if (binds := self._port_binds[port] - 1) > 0:
+                self._port_binds[port] = binds
+            else:
+                del self._port_binds[port]
+        else:
+            if self._connected.get(socket_id) is not socket:
+                return
+            del self._connected[socket_id]
+        users = self._port_users[port]
+        del users[next(index for index, _ in enumerate(users) if _ is socket)]
+        if not users:
+            del self._port_users[port]
+
+    def port_users(self, proto: int, port: int) -> list[Socket]:
+        """Sockets using given local port, either bound to it or connected through it"""
+
+        return self._port_users.get((proto, port), [])
+
+    def values(self) -> Iterator[Socket]:
+        """Iterate over registered sockets, the tables are copied first so the iteration is safe against sockets being (un)registered meanwhile"""
+
+        return itertools.chain(itertools.chain.from_iterable(list(self._bound.values())), list(self._connected.values()))
+
+    def clear(self) -> None:
+        """Unregister all sockets"""
+
+        self._connected.clear()
+        self._bound.clear()
+        self._port_users.clear()
+        self._port_binds.clear()
+
+    def pick_local_port(
+        self,
+        proto: int,
+        local_ip_address: IpAddress | None = None,
+        remote_ip_address: IpAddress | None = None,
+        remote_port: int = 0,
+    ) -> int | None:
+        """Pick ephemeral local port (RFC 6056), port already used by connected sockets can be reused as long as the 4-tuple stays unique"""
+
+        ports = config.EPHEMERAL_PORT_RANGE
+
+        # Search for completely unused port starts at random offset
+        if local_ip_address is None or remote_ip_address is None:
+            offset = random.randrange(len(ports))
+            for index in range(offset, offset + len(ports)):
+                if (proto, port := ports[index % len(ports)]) not in self._port_users:
+                    return port
+            return None
+
+        # Search for port usable with given destination starts at offset derived from the destination, consecutive
+        # connections to the same destination then get different ports while other destinations don't influence them
+        destination = bytes(local_ip_address) + bytes(remote_ip_address) + remote_port.to_bytes(2, "big")
+        offset = int.from_bytes(blake2s(destination, digest_size=4, key=self._secret).digest(), "big")
+        for _ in range(len(ports)):
+            port = ports[(offset + self._next_ephemeral) % len(ports)]
+            self._next_ephemeral += 1
+            if (proto, port) in self._port_binds:
+                continue
+            if (local_ip_address.version, proto, int(local_ip_address), port, int(remote_ip_address), remote_port) not in self._connected:
+                return port
+        return None
@@ -37,6 +37,8 @@ import time
 class Tracker:
     """Object used for tracking packets"""
 
+    __slots__ = ("_echo_tracker", "_timestamp", "_prefix", "_number", "_cache__serial")
+
     serial_rx: int = 0
     serial_tx: int = 0
 
@@ -45,27 +47,34 @@ class Tracker:
 
         self._echo_tracker: Tracker | None = echo_tracker
         self._timestamp: float
-        self._serial: str
+        self._prefix: str
+        self._number: int
 
         if serial:
-            self._serial = serial
+            self._cache__serial: str = serial
             return
 
         assert prefix in {"RX", "TX"}
 
+        # Serial number string is only needed for logging so it gets formatted when first used
+        self._timestamp = time.time()
+        self._prefix = prefix
         if prefix == "RX":
-            self._timestamp = time.time()
-            self._serial = "<lg>" + f"RX{Tracker.serial_rx:0>4x}</>".upper()
-            Tracker.serial_rx += 1
-            if Tracker.serial_rx > 0xFFFF:
-                Tracker.serial_rx = 0
-
-        if prefix == "TX":
-            self._timestamp = time.time()
-            self._serial = "<lr>" + f"TX{Tracker.serial_tx:0>4x}</>".upper()
-            Tracker.serial_tx += 1
-            if Tracker.serial_tx > 0xFFFF:
-                Tracker.serial_tx = 0
+            self._number = Tracker.serial_rx
+            Tracker.serial_rx = (Tracker.serial_rx + 1) & 0xFFFF
+        else:
+            self._number = Tracker.serial_tx
+            Tracker.serial_tx = (Tracker.serial_tx + 1) & 0xFFFF
+
+    @property
+    def _serial(self) -> str:
+        """Serial number string"""
+
+        try:
+            return self._cache__serial
+        except AttributeError:
+            self._cache__serial = ("<lg>" if self._prefix == "RX" else "<lr>") + f"{self._prefix}{self._number:0>4x}</>".upper()
+            return self._cache__serial
 
     def __str__(self) -> str:
         """Return serial number string"""
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# misc/header_schema.py - module contains declarative protocol header layouts and the generator of their field codecs
+#
+
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Callable, NamedTuple
+
+# Struct format characters of the words header fields are packed into
+WORD_FORMAT = {64: "Q", 32: "L", 16: "H", 8: "B"}
+
+
+class HeaderField(NamedTuple):
+    """Header field description, field without name marks reserved bits that are zeroed on assembly and skipped on parsing"""
+
+    name: str
+    bits: int
+    scale: int = 0  # Field carries value in units of 2**scale, eg. IPv4 header length is carried in 32 bit words
+    type: Callable[[int], Any] = int  # Type the value is converted to when parsed, int, bool (single bit fields) or one of the address classes
+
+
+class HeaderPart(NamedTuple):
+    """Part of the header field carried in single struct word"""
+
+    word: int  # Index of the word in the struct values
+    word_bits: int  # Width of the word
+    shift: int  # Position of the part's lowest bit in the word
+    bits: int  # Width of the part
+    value_shift: int  # Position of the part's lowest bit in the field value
+
+
+class HeaderSchema:
+    """Fixed part of the protocol header described as sequence of fields, field parser and assembler functions are generated from it at import time"""
+
+    def __init__(self, *fields: HeaderField) -> None:
+        """Class constructor"""
+
+        self.fields = fields
+        self.names = tuple(_.name for _ in fields if _.name)
+        self.parts: dict[str, list[HeaderPart]] = {_: [] for _ in self.names}
+
+        formats: list[str] = []
+        words = 0
+        group: list[HeaderField] = []
+        group_bits = 0
+
+        for field in fields:
+            assert field.bits > 0, f"Header field {field.name!r} must be at least one bit long"
+            assert field.type is not bool or field.bits == 1, f"Header field {field.name!r} of bool type must be single bit long"
+
+            # Byte aligned field gets its own words, fields that don't fit into single word are split into the biggest chunks available
+            if not group and field.bits % 8 == 0:
+                if not field.name:
+                    formats.append(f"{field.bits // 8}x")
+                    continue
+                assert not field.scale or field.bits in WORD_FORMAT, f"Header field {field.name!r} spanning multiple words cannot be scaled"
+                remaining = field.bits
+                while remaining:
+                    chunk = next(_ for _ in WORD_FORMAT if _ <= remaining)
+                    remaining -= chunk
+                    self.parts[field.name].append(HeaderPart(words, chunk, 0, chunk, remaining))
+                    formats.append(WORD_FORMAT[chunk])
+                    words += 1
+                continue
+
+            # Bitfields are grouped until they fill up a whole word
+            group.append(field)
+            group_bits += field.bits
+            assert group_bits <= 64, f"Header bitfields {[_.name for _ in group]} do not add up to 8, 16, 32 or 64 bit word"
+            if group_bits in WORD_FORMAT:
+                shift = group_bits
+                for group_field in group:
+                    shift -= group_field.bits
+                    if group_field.name:
+                        self.parts[group_field.name].append(HeaderPart(words, group_bits, shift, group_field.bits, 0))
+                formats.append(WORD_FORMAT[group_bits])
+                words += 1
+                group = []
+                group_bits = 0
+
+        assert not group, f"Header bitfields {[_.name for _ in group]} do not add up to 8, 16, 32 or 64 bit word"
+
+        self.struct = struct.Struct("! " + " ".join(formats))
+        self.len = self.struct.size
+        self.words = words
+        self.unpack_into: Callable[..., None] = self._compile("unpack_into", "_obj, _frame, _offset=0", self._unpack_into_source(), self.struct.unpack_from)
+        self.pack_into: Callable[..., None] = self._compile(
+            "pack_into", ", ".join(("_frame", "_offset") + self.names), self._pack_into_source(), self.struct.pack_into
+        )
+
+    def __len__(self) -> int:
+        """Length of the header"""
+
+        return self.len
+
+    def _unpack_into_source(self) -> list[str]:
+        """Source of the function that decodes header fields from frame and sets them as object attributes"""
+
+        lines = [f"{''.join(f'_w{_}, ' for _ in range(self.words))}= _struct(_frame, _offset)"]
+
+        for field in self.fields:
+            if not field.name:
+                continue
+            parts = self.parts[field.name]
+
+            if field.type is bool:
+                lines.append(f"_obj.{field.name} = bool(_w{parts[0].word} & {1 << parts[0].shift:#x})")
+                continue
+
+            if len(parts) == 1:
+                value, shift = f"_w{parts[0].word}", parts[0].shift - field.scale
+                # Mask is needed when there are other fields above or when scaling keeps some of the bits below
+                if parts[0].shift + parts[0].bits < parts[0].word_bits or parts[0].shift and field.scale:
+                    value = f"{value} & {(1 << parts[0].bits) - 1 << parts[0].shift:#x}"
+                    if shift:
+                        value = f"({value})"
+                if shift > 0:
+                    value = f"{value} >> {shift}"
+                elif shift < 0:
+                    value = f"{value} << {-shift}"
+            else:
+                value = " | ".join(f"_w{_.word} << {_.value_shift}" if _.value_shift else f"_w{_.word}" for _ in parts)
+
+            if field.type is not int:
+                value = f"{field.type.__name__}({value})"
+            lines.append(f"_obj.{field.name} = {value}")
+
+        return lines
+
+    def _pack_into_source(self) -> list[str]:
+        """Source of the function that encodes header fields into frame, range checks are asserts so they are skipped in optimized mode"""
+
+        lines = []
+        words: list[list[str]] = [[] for _ in range(self.words)]
+
+        for field in self.fields:
+            if not field.name:
+                continue
+            parts = self.parts[field.name]
+
+            if field.type not in {int, bool}:
+                lines.append(f"{field.name} = int({field.name})")
+            elif field.type is int:
+                condition = f"0 <= {field.name} < {1 << field.bits + field.scale:#x}"
+                # Scaled value is truncated to its unit when shifted right, otherwise the remainder would spill over to the fields below
+                if field.scale and parts[0].shift >= field.scale:
+                    condition += f" and not {field.name} & {(1 << field.scale) - 1:#x}"
+                lines.append(f'assert {condition}, f"Header field {field.name!r} value {{{field.name}}} out of range"')
+
+            for part in parts:
+                value, shift = field.name, part.shift - part.value_shift - field.scale
+                if shift > 0:
+                    value = f"{value} << {shift}"
+                elif shift < 0:
+                    value = f"{value} >> {-shift}"
+                if part is not parts[0]:
+                    value = f"{value} & {(1 << part.bits) - 1:#x}"
+                words[part.word].append(value)
+
+        lines.append(f"_struct(_frame, _offset, {', '.join(' | '.join(_) or '0' for _ in words)})")
+
+        return lines
+
+    def _compile(self, name: str, args: str, lines: list[str], function: Callable[..., Any]) -> Callable[..., None]:
+        """Compile generated function source"""
+
+        namespace: dict[str, Any] = {"_struct": function}
+        namespace |= {_.type.__name__: _.type for _ in self.fields if _.type not in {int, bool}}
+        exec(f"def {name}({args}):\n" + "".join(f"    {_}\n" for _ in lines), namespace)
+        compiled: Callable[..., None] = namespace[name]
+        return compiled
+
+
+class OptionsSchema:
+    """Header options described as type-length-value records, End of Option List and No Operation options are single byte long"""
+
+    def __init__(self, *, eol: int, nop: int) -> None:
+        """Class constructor"""
+
+        self.eol = eol
+        self.nop = nop
+
+    def integrity_check(self, frame: memoryview, optr: int, hlen: int) -> str:
+        """Check if options between optr and header length can be safely parsed, returns number of the failed check"""
+
+        while optr < hlen:
+            if frame[optr] == self.eol:
+                break
+            if frame[optr] == self.nop:
+                optr += 1
+                if optr > hlen:
+                    return "I"
+                continue
+            if optr + 1 > hlen:
+                return "II"
+            if frame[optr + 1] == 0:
+                return "III"
+            optr += frame[optr + 1]
+            if optr > hlen:
+                return "IV"
+
+        return ""
@@ -41,21 +41,95 @@ from lib.ip6_address import Ip6Address, Ip6AddressFormatError
 if TYPE_CHECKING:
     from lib.ip_address import IpAddress
 
+# NumPy is optional, without it all the checksums are computed in pure Python
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None  # type: ignore
 
-def inet_cksum(data: memoryview, init: int = 0) -> int:
-    """Compute Internet Checksum used by IPv4/ICMPv4/ICMPv6/UDP/TCP protocols"""
+# Minimum data length NumPy is used to compute checksum for, below that the pure Python code is faster
+INET_SUM_NUMPY_MIN_LEN = 256
+
+
+def inet_sum(data: bytes | memoryview, offset: int = 0) -> int:
+    """Compute folded 16 bit one's complement sum of data placed at given offset of the checksummed range, sums of ranges can be combined with inet_sum_add"""
 
     if (dlen := len(data)) == 20:
-        cksum = init + sum(struct.unpack("!5L", data))
+        cksum = sum(struct.unpack("!5L", data))
+
+    elif numpy is not None and dlen >= INET_SUM_NUMPY_MIN_LEN:
+        cksum = int(numpy.frombuffer(data, dtype=">u4", count=dlen >> 2).sum(dtype=numpy.uint64))
+        if remainder := dlen & 3:
+            cksum += int().from_bytes(data[-remainder:], byteorder="big") << ((4 - remainder) << 3)
 
     else:
-        cksum = init + sum(struct.unpack_from(f"!{dlen >> 3}Q", data))
+        cksum = sum(struct.unpack_from(f"!{dlen >> 3}Q", data))
         if remainder := dlen & 7:
             cksum += int().from_bytes(data[-remainder:], byteorder="big") << ((8 - remainder) << 3)
-        cksum = (cksum >> 64) + (cksum & 0xFFFFFFFFFFFFFFFF)
 
+    return inet_sum_move(inet_sum_fold(cksum), offset)
+
+
+def inet_sum_fold(cksum: int) -> int:
+    """Fold one's complement sum up to 128 bits wide into 16 bits"""
+
+    cksum = (cksum >> 64) + (cksum & 0xFFFFFFFFFFFFFFFF)
     cksum = (cksum >> 32) + (cksum & 0xFFFFFFFF)
     cksum = (cksum >> 16) + (cksum & 0xFFFF)
+    cksum = (cksum >> 16) + (cksum & 0xFFFF)
+    return (cksum >> 16) + (cksum & 0xFFFF)
+
+
+def inet_sum_move(cksum: int, offset: int) -> int:
+    """Adjust sum of range for the range being moved by offset bytes, range moved by odd offset has its bytes summed in swapped positions (RFC 1071)"""
+
+    return (cksum >> 8 | cksum << 8) & 0xFFFF if offset & 1 else cksum
+
+
+def inet_sum_add(cksum: int, other: int) -> int:
+    """Add one's complement sum of another range to the sum"""
+
+    return inet_sum_fold(cksum + other)
+
+
+def inet_sum_sub(cksum: int, other: int) -> int:
+    """Subtract one's complement sum of range that is part of the sum"""
+
+    return inet_sum_fold(cksum + (~other & 0xFFFF))
+
+
+def inet_cksum(data: bytes | memoryview, init: int = 0) -> int:
+    """Compute Internet Checksum used by IPv4/ICMPv4/ICMPv6/UDP/TCP protocols, init may carry unfolded sum of pseudo header and ranges not in data"""
+
+    return ~inet_sum_fold(init + inet_sum(data)) & 0xFFFF
+
+
+def inet_cksum_batch(data: list[bytes | memoryview], init: list[int] | None = None) -> list[int]:
+    """Compute Internet Checksums of multiple packets, with NumPy all of them get summed in single vectorized call"""
+
+    if init is None:
+        init = [0] * len(data)
+
+    if numpy is None or sum(len(_) for _ in data) < INET_SUM_NUMPY_MIN_LEN:
+        return [inet_cksum(_, __) for _, __ in zip(data, init)]
+
+    # Each packet is padded to non-zero multiple of 4 bytes so packets can be summed as separate ranges of 32 bit words
+    buffer = bytearray()
+    offsets = []
+    for _ in data:
+        offsets.append(len(buffer) >> 2)
+        buffer += _
+        buffer += bytes(-len(_) % 4 if _ else 4)
+    sums = numpy.add.reduceat(numpy.frombuffer(buffer, dtype=">u4").astype(numpy.uint64), offsets)
+
+    return [~inet_sum_fold(_ + int(__)) & 0xFFFF for _, __ in zip(init, sums)]
+
+
+def inet_cksum_update(cksum: int, old: int, new: int) -> int:
+    """Update Internet Checksum after one of the 16 bit words it covers changed from old to new value (RFC 1624)"""
+
+    cksum = (~cksum & 0xFFFF) + (~old & 0xFFFF) + new
+    cksum = (cksum >> 16) + (cksum & 0xFFFF)
     return ~(cksum + (cksum >> 16)) & 0xFFFF
 
 
@@ -31,7 +31,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 from lib.tracker import Tracker
 
@@ -47,8 +47,25 @@ if TYPE_CHECKING:
     from protocols.udp.fpp import UdpParser
 
 
+PACKET_RX_POOL_SIZE = 256  # Number of released packet objects kept for reuse
+
+
 class PacketRx:
-    """Base packet class"""
+    """Base packet class, objects released by packet handler are kept on free list and reused for the following frames"""
+
+    __slots__ = ("frame", "tracker", "parse_failed", "ether", "arp", "ip", "ip4", "ip6", "ip6_ext_frag", "icmp4", "icmp6", "tcp", "udp")
+
+    _pool: ClassVar[list[PacketRx]] = []
+
+    def __new__(cls, frame: bytes) -> PacketRx:
+        """Take packet object from free list if there is any"""
+
+        if cls._pool:
+            try:
+                return cls._pool.pop()
+            except IndexError:
+                pass
+        return super().__new__(cls)
 
     def __init__(self, frame: bytes) -> None:
         """Class constructor"""
@@ -68,6 +85,15 @@ class PacketRx:
         self.tcp: TcpParser
         self.udp: UdpParser
 
+    def release(self) -> None:
+        """Return packet object to free list, frame and parsers get dropped so they don't outlive the packet processing"""
+
+        for name in self.__slots__:
+            setattr(self, name, None)
+
+        if len(PacketRx._pool) < PACKET_RX_POOL_SIZE:
+            PacketRx._pool.append(self)
+
     def __len__(self) -> int:
         """Returns length of raw frame"""
 
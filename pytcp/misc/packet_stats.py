@@ -107,7 +107,11 @@ class PacketStatsRx:
     tcp__pre_parse: int = 0
     tcp__failed_parse__drop: int = 0
     tcp__socket_match_active__forward_to_socket: int = 0
+    tcp__socket_match_active__fast_path: int = 0
     tcp__socket_match_listening__forward_to_socket: int = 0
+    tcp__socket_match_time_wait__respond_ack: int = 0
+    tcp__socket_match_time_wait__reuse: int = 0
+    tcp__socket_match_time_wait__drop: int = 0
     tcp__no_socket_match__respond_rst: int = 0
 
     def __eq__(self, other):
@@ -139,6 +143,8 @@ class PacketStatsTx:
     ether__dst_unspec__ip4_lookup__locnet__arp_cache_hit__send: int = 0
     ether__dst_unspec__ip4_lookup__locnet__arp_cache_miss__drop: int = 0
     ether__dst_unspec__drop: int = 0
+    ether__template__save: int = 0
+    ether__template__send: int = 0
 
     arp__pre_assemble: int = 0
     arp__no_proto_support__drop: int = 0
@@ -210,6 +216,7 @@ class PacketStatsTx:
     tcp__opt_nop: int = 0
     tcp__opt_mss: int = 0
     tcp__opt_wscale: int = 0
+    tcp__opt_fastopen: int = 0
 
     udp__pre_assemble: int = 0
     udp__send: int = 0
@@ -33,12 +33,25 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from lib.socket_table import SocketTable
+from protocols.tcp.fastopen import TcpFastOpenCache
+from protocols.tcp.ooo_queue import TcpOooBudget
+from protocols.tcp.time_wait import TcpTimeWaitTable
+
 if TYPE_CHECKING:
-    from lib.socket import Socket
+    from lib.socket_table import SocketId
+    from protocols.tcp.session import TcpSession
     from subsystems.packet_handler import PacketHandler
     from subsystems.timer import Timer
 
 timer: Timer
 packet_handler: PacketHandler
 
-sockets: dict[str, Socket] = {}
+sockets: SocketTable = SocketTable()
+
+tcp_time_wait: TcpTimeWaitTable = TcpTimeWaitTable()
+tcp_fastopen_cache: TcpFastOpenCache = TcpFastOpenCache()
+tcp_ooo_budget: TcpOooBudget = TcpOooBudget()  # Memory used by out of order queues of all the sessions
+
+# Sessions in ESTABLISHED state, their in-order packets are handled using TCP header prediction
+tcp_fast_path: dict[SocketId, TcpSession] = {}
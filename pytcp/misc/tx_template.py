@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# misc/tx_template.py - module contains classes supporting per flow TX header templates
+#
+
+
+from __future__ import annotations
+
+import struct
+from typing import TYPE_CHECKING
+
+from misc.ip_helper import inet_cksum_update
+from protocols.ether.ps import ETHER_HEADER_LEN
+from protocols.ip4.fpa import Ip4Assembler
+from protocols.ip6.fpa import Ip6Assembler
+from protocols.ip6.ps import IP6_HEADER_LEN
+
+if TYPE_CHECKING:
+    from lib.ip_address import IpAddress
+    from lib.mac_address import MacAddress
+    from lib.tracker import Tracker
+    from protocols.ether.fpa import EtherAssembler
+    from protocols.tcp.fpa import TcpAssembler
+    from protocols.udp.fpa import UdpAssembler
+
+    # Protocol name, local address, remote address, local port, remote port
+    TxTemplateKey = tuple[str, IpAddress, IpAddress, int, int]
+
+
+class TxTemplate:
+    """Pre-assembled Ethernet and IP headers of a single TCP / UDP flow along with the flow's pseudo header sum"""
+
+    def __init__(self, ether_packet_tx: EtherAssembler) -> None:
+        """Class constructor, template is taken from packet that already went through address validation and destination MAC resolution"""
+
+        ip_packet_tx = ether_packet_tx._carried_packet
+        assert isinstance(ip_packet_tx, (Ip4Assembler, Ip6Assembler))
+
+        frame = memoryview(bytearray(len(ether_packet_tx)))
+        ether_packet_tx.assemble(frame)
+
+        self._ip4: bool = isinstance(ip_packet_tx, Ip4Assembler)
+        self._hlen: int = ETHER_HEADER_LEN + (ip_packet_tx.hlen if isinstance(ip_packet_tx, Ip4Assembler) else IP6_HEADER_LEN)
+        self._header: bytes = bytes(frame[: self._hlen])
+        self._ether_dst: MacAddress = ether_packet_tx.dst
+        self._ip_src: IpAddress = ip_packet_tx.src
+        self._ip_dst: IpAddress = ip_packet_tx.dst
+
+        # Pseudo header sum without the length field, length of each packet is added to it when packet is being assembled
+        self._pshdr_dlen_shift: int = 0 if self._ip4 else 32
+        self._pshdr_sum: int = ip_packet_tx.pshdr_sum - (ip_packet_tx.dlen << self._pshdr_dlen_shift)
+
+        # IPv4 length and checksum the template was assembled with, checksum is updated incrementally for each packet
+        self._ip4_plen: int = self._hlen - ETHER_HEADER_LEN + ip_packet_tx.dlen
+        self._ip4_cksum: int = struct.unpack_from("! H", self._header, ETHER_HEADER_LEN + 10)[0] if self._ip4 else 0
+
+    def __str__(self) -> str:
+        """Template log string"""
+
+        return f"TX template {self._ip_src} > {self._ip_dst} via {self._ether_dst}"
+
+    @property
+    def hlen(self) -> int:
+        """Getter for _hlen"""
+
+        return self._hlen
+
+    @property
+    def ether_dst(self) -> MacAddress:
+        """Getter for _ether_dst"""
+
+        return self._ether_dst
+
+    def assemble(self, frame: memoryview, carried_packet: TcpAssembler | UdpAssembler) -> None:
+        """Assemble packet out of the template, only the IP length and checksum fields get patched"""
+
+        dlen = len(carried_packet)
+
+        frame[: self._hlen] = self._header
+
+        if self._ip4:
+            plen = self._hlen - ETHER_HEADER_LEN + dlen
+            struct.pack_into("! H", frame, ETHER_HEADER_LEN + 2, plen)
+            struct.pack_into("! H", frame, ETHER_HEADER_LEN + 10, inet_cksum_update(self._ip4_cksum, self._ip4_plen, plen))
+        else:
+            struct.pack_into("! H", frame, ETHER_HEADER_LEN + 4, dlen)
+
+        carried_packet.assemble(frame[self._hlen :], self._pshdr_sum + (dlen << self._pshdr_dlen_shift))
+
+
+class TxTemplatePacket:
+    """Outbound packet assembled out of flow TX template and the carried TCP / UDP packet"""
+
+    def __init__(self, tx_template: TxTemplate, carried_packet: TcpAssembler | UdpAssembler) -> None:
+        """Class constructor"""
+
+        self._tx_template: TxTemplate = tx_template
+        self._carried_packet: TcpAssembler | UdpAssembler = carried_packet
+        self._tracker: Tracker = carried_packet.tracker
+
+    def __len__(self) -> int:
+        """Length of the packet"""
+
+        return self._tx_template.hlen + len(self._carried_packet)
+
+    def __str__(self) -> str:
+        """Packet log string"""
+
+        return f"{self._tx_template}, plen {len(self)}"
+
+    @property
+    def tracker(self) -> Tracker:
+        """Getter for _tracker"""
+
+        return self._tracker
+
+    def assemble(self, frame: memoryview) -> None:
+        """Assemble packet into the raw form"""
+
+        self._tx_template.assemble(frame, self._carried_packet)
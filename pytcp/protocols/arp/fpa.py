@@ -31,12 +31,10 @@
 
 from __future__ import annotations
 
-import struct
-
 from lib.ip4_address import Ip4Address
 from lib.mac_address import MacAddress
 from lib.tracker import Tracker
-from protocols.arp.ps import ARP_HEADER_LEN, ARP_OP_REPLY, ARP_OP_REQUEST
+from protocols.arp.ps import ARP_HEADER, ARP_HEADER_LEN, ARP_OP_REPLY, ARP_OP_REQUEST
 from protocols.ether.ps import ETHER_TYPE_ARP
 
 
@@ -95,8 +93,7 @@ class ArpAssembler:
     def assemble(self, frame: memoryview) -> None:
         """Assemble packet into the raw form"""
 
-        struct.pack_into(
-            "!HH BBH 6s 4s 6s 4s",
+        ARP_HEADER.pack_into(
             frame,
             0,
             self._hrtype,
@@ -104,8 +101,8 @@ class ArpAssembler:
             self._hrlen,
             self._prlen,
             self._oper,
-            bytes(self._sha),
-            bytes(self._spa),
-            bytes(self._tha),
-            bytes(self._tpa),
+            self._sha,
+            self._spa,
+            self._tha,
+            self._tpa,
         )
@@ -31,20 +31,32 @@
 
 from __future__ import annotations
 
-import struct
 from typing import TYPE_CHECKING
 
 import config
-from lib.ip4_address import Ip4Address
-from lib.mac_address import MacAddress
-from protocols.arp.ps import ARP_HEADER_LEN, ARP_OP_REPLY, ARP_OP_REQUEST
+from protocols.arp.ps import ARP_HEADER, ARP_HEADER_LEN, ARP_OP_REPLY, ARP_OP_REQUEST
 
 if TYPE_CHECKING:
+    from lib.ip4_address import Ip4Address
+    from lib.mac_address import MacAddress
     from misc.packet import PacketRx
 
 
 class ArpParser:
-    """ARP packet parser class"""
+    """ARP packet parser class, packet fields are decoded once when packet passes integrity check"""
+
+    __slots__ = ("_frame", "hrtype", "prtype", "hrlen", "prlen", "oper", "sha", "spa", "tha", "tpa", "_cache__packet_copy")
+
+    hrtype: int  # 'Hardware address type' field
+    prtype: int  # 'Protocol address type' field
+    hrlen: int  # 'Hardware address length' field
+    prlen: int  # 'Protocol address length' field
+    oper: int  # 'Operation' field
+    sha: MacAddress  # 'Sender hardware address' field
+    spa: Ip4Address  # 'Sender protocol address' field
+    tha: MacAddress  # 'Target hardware address' field
+    tpa: Ip4Address  # 'Target protocol address' field
+    _cache__packet_copy: bytes
 
     def __init__(self, packet_rx: PacketRx) -> None:
         """Class constructor"""
@@ -53,7 +65,11 @@ class ArpParser:
 
         self._frame = packet_rx.frame
 
-        packet_rx.parse_failed = self._packet_integrity_check() or self._packet_sanity_check()
+        packet_rx.parse_failed = self._packet_integrity_check()
+
+        if not packet_rx.parse_failed:
+            ARP_HEADER.unpack_into(self, self._frame)
+            packet_rx.parse_failed = self._packet_sanity_check()
 
     def __len__(self) -> int:
         """Number of bytes remaining in the frame"""
@@ -70,81 +86,15 @@ class ArpParser:
 
         return f"ARP request unknown operation {self.oper}"
 
-    @property
-    def hrtype(self) -> int:
-        """Read 'Hardware address type' field"""
-
-        if "_cache__hrtype" not in self.__dict__:
-            self._cache__hrtype: int = struct.unpack("!H", self._frame[0:2])[0]
-        return self._cache__hrtype
-
-    @property
-    def prtype(self) -> int:
-        """Read 'Protocol address type' field"""
-
-        if "_cache__prtype" not in self.__dict__:
-            self._cache__prtype: int = struct.unpack("!H", self._frame[2:4])[0]
-        return self._cache__prtype
-
-    @property
-    def hrlen(self) -> int:
-        """Read 'Hardware address length' field"""
-
-        return self._frame[4]
-
-    @property
-    def prlen(self) -> int:
-        """Read 'Protocol address length' field"""
-
-        return self._frame[5]
-
-    @property
-    def oper(self) -> int:
-        """Read 'Operation' field"""
-
-        if "_cache__oper" not in self.__dict__:
-            self._cache__oper: int = struct.unpack("!H", self._frame[6:8])[0]
-        return self._cache__oper
-
-    @property
-    def sha(self) -> MacAddress:
-        """Read 'Sender hardware address' field"""
-
-        if "_cache__sha" not in self.__dict__:
-            self._cache__sha = MacAddress(self._frame[8:14])
-        return self._cache__sha
-
-    @property
-    def spa(self) -> Ip4Address:
-        """Read 'Sender protocol address' field"""
-
-        if "_cache__spa" not in self.__dict__:
-            self._cache__spa = Ip4Address(self._frame[14:18])
-        return self._cache__spa
-
-    @property
-    def tha(self) -> MacAddress:
-        """Read 'Target hardware address' field"""
-
-        if "_cache__tha" not in self.__dict__:
-            self._cache__tha = MacAddress(self._frame[18:24])
-        return self._cache__tha
-
-    @property
-    def tpa(self) -> Ip4Address:
-        """Read 'Target protocol address' field"""
-
-        if "_cache__tpa" not in self.__dict__:
-            self._cache__tpa = Ip4Address(self._frame[24:28])
-        return self._cache__tpa
-
     @property
     def packet_copy(self) -> bytes:
         """Read the whole packet"""
 
-        if "_cache__packet_copy" not in self.__dict__:
+        try:
+            return self._cache__packet_copy
+        except AttributeError:
             self._cache__packet_copy = bytes(self._frame[:ARP_HEADER_LEN])
-        return self._cache__packet_copy
+            return self._cache__packet_copy
 
     def _packet_integrity_check(self) -> str:
         """Packet integrity check to be run on raw packet prior to parsing to make sure parsing is safe"""
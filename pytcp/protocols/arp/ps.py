@@ -30,6 +30,10 @@
 
 from __future__ import annotations
 
+from lib.ip4_address import Ip4Address
+from lib.mac_address import MacAddress
+from misc.header_schema import HeaderField, HeaderSchema
+
 # ARP packet header - IPv4 stack version only
 
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
@@ -49,7 +53,19 @@ from __future__ import annotations
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
 
 
-ARP_HEADER_LEN = 28
+ARP_HEADER = HeaderSchema(
+    HeaderField("hrtype", 16),
+    HeaderField("prtype", 16),
+    HeaderField("hrlen", 8),
+    HeaderField("prlen", 8),
+    HeaderField("oper", 16),
+    HeaderField("sha", 48, type=MacAddress),
+    HeaderField("spa", 32, type=Ip4Address),
+    HeaderField("tha", 48, type=MacAddress),
+    HeaderField("tpa", 32, type=Ip4Address),
+)
+
+ARP_HEADER_LEN = ARP_HEADER.len
 
 ARP_OP_REQUEST = 1
 ARP_OP_REPLY = 2
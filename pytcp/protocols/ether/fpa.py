@@ -31,11 +31,11 @@
 
 from __future__ import annotations
 
-import struct
 from typing import TYPE_CHECKING
 
 from lib.mac_address import MacAddress
 from protocols.ether.ps import (
+    ETHER_HEADER,
     ETHER_HEADER_LEN,
     ETHER_TYPE_ARP,
     ETHER_TYPE_IP4,
@@ -115,6 +115,6 @@ class EtherAssembler:
     def assemble(self, frame: memoryview) -> None:
         """Assemble packet into the raw form"""
 
-        struct.pack_into("! 6s 6s H", frame, 0, bytes(self._dst), bytes(self._src), self._type)
+        ETHER_HEADER.pack_into(frame, 0, self._dst, self._src, self._type)
 
         self._carried_packet.assemble(frame[ETHER_HEADER_LEN:])
@@ -31,19 +31,32 @@
 
 from __future__ import annotations
 
-import struct
 from typing import TYPE_CHECKING
 
 import config
-from lib.mac_address import MacAddress
-from protocols.ether.ps import ETHER_HEADER_LEN, ETHER_TYPE_MIN, ETHER_TYPE_TABLE
+from protocols.ether.ps import (
+    ETHER_HEADER,
+    ETHER_HEADER_LEN,
+    ETHER_TYPE_MIN,
+    ETHER_TYPE_TABLE,
+)
 
 if TYPE_CHECKING:
+    from lib.mac_address import MacAddress
     from misc.packet import PacketRx
 
 
 class EtherParser:
-    """Ethernet packet parser class"""
+    """Ethernet packet parser class, header fields are decoded once when packet passes integrity check"""
+
+    __slots__ = ("_frame", "dst", "src", "type", "_cache__header_copy", "_cache__data_copy", "_cache__packet_copy")
+
+    dst: MacAddress  # 'Destination MAC address' field
+    src: MacAddress  # 'Source MAC address' field
+    type: int  # 'EtherType' field
+    _cache__header_copy: bytes
+    _cache__data_copy: bytes
+    _cache__packet_copy: bytes
 
     def __init__(self, packet_rx: PacketRx) -> None:
         """Class constructor"""
@@ -52,7 +65,11 @@ class EtherParser:
 
         self._frame = packet_rx.frame
 
-        packet_rx.parse_failed = self._packet_integrity_check() or self._packet_sanity_check()
+        packet_rx.parse_failed = self._packet_integrity_check()
+
+        if not packet_rx.parse_failed:
+            ETHER_HEADER.unpack_into(self, self._frame)
+            packet_rx.parse_failed = self._packet_sanity_check()
 
         if not packet_rx.parse_failed:
             packet_rx.frame = packet_rx.frame[ETHER_HEADER_LEN:]
@@ -67,61 +84,41 @@ class EtherParser:
 
         return f"ETHER {self.src} > {self.dst}, 0x{self.type:0>4x} ({ETHER_TYPE_TABLE.get(self.type, '???')})"
 
-    @property
-    def dst(self) -> MacAddress:
-        """Read 'Destination MAC address' field"""
-
-        if "_cache__dst" not in self.__dict__:
-            self._cache__dst = MacAddress(self._frame[0:6])
-        return self._cache__dst
-
-    @property
-    def src(self) -> MacAddress:
-        """Read 'Source MAC address' field"""
-
-        if "_cache__src" not in self.__dict__:
-            self._cache__src = MacAddress(self._frame[6:12])
-        return self._cache__src
-
-    @property
-    def type(self) -> int:
-        """Read 'EtherType' field"""
-
-        if "_cache__type" not in self.__dict__:
-            self._cache__type: int = struct.unpack("!H", self._frame[12:14])[0]
-        return self._cache__type
-
     @property
     def header_copy(self) -> bytes:
         """Return copy of packet header"""
 
-        if "_cache__header_copy" not in self.__dict__:
+        try:
+            return self._cache__header_copy
+        except AttributeError:
             self._cache__header_copy = bytes(self._frame[:ETHER_HEADER_LEN])
-        return self._cache__header_copy
+            return self._cache__header_copy
 
     @property
     def data_copy(self) -> bytes:
         """Return copy of packet data"""
 
-        if "_cache__data_copy" not in self.__dict__:
+        try:
+            return self._cache__data_copy
+        except AttributeError:
             self._cache__data_copy = bytes(self._frame[ETHER_HEADER_LEN:])
-        return self._cache__data_copy
+            return self._cache__data_copy
 
     @property
     def packet_copy(self) -> bytes:
         """Return copy of whole packet"""
 
-        if "_cache__packet_copy" not in self.__dict__:
+        try:
+            return self._cache__packet_copy
+        except AttributeError:
             self._cache__packet_copy = bytes(self._frame[:])
-        return self._cache__packet_copy
+            return self._cache__packet_copy
 
     @property
     def plen(self) -> int:
         """Calculate packet length"""
 
-        if "_cache__plen" not in self.__dict__:
-            self._cache__plen = len(self)
-        return self._cache__plen
+        return len(self)
 
     def _packet_integrity_check(self) -> str:
         """Packet integrity check to be run on raw packet prior to parsing to make sure parsing is safe"""
@@ -33,16 +33,25 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import config
 from lib.logger import log
 from lib.mac_address import MacAddress
 from misc.tx_status import TxStatus
+from misc.tx_template import TxTemplate, TxTemplatePacket
 from protocols.ether.fpa import EtherAssembler
+from protocols.ether.ps import ETHER_HEADER_LEN
 from protocols.ip4.fpa import Ip4Assembler, Ip4FragAssembler
 from protocols.ip6.fpa import Ip6Assembler
 from protocols.raw.fpa import RawAssembler
 
 if TYPE_CHECKING:
+    from lib.ip4_address import Ip4Address
+    from lib.ip6_address import Ip6Address
+    from lib.tracker import Tracker
+    from misc.tx_template import TxTemplateKey
     from protocols.arp.fpa import ArpAssembler
+    from protocols.tcp.fpa import TcpAssembler
+    from protocols.udp.fpa import UdpAssembler
 
 
 def _phtx_ether(
@@ -51,12 +60,15 @@ def _phtx_ether(
     ether_src: MacAddress = MacAddress(0),
     ether_dst: MacAddress = MacAddress(0),
     carried_packet: ArpAssembler | Ip4Assembler | Ip6Assembler | RawAssembler | None = None,
+    tx_template_key: TxTemplateKey | None = None,
 ) -> TxStatus:
-    """Handle outbound Ethernet packets"""
+    """Handle outbound Ethernet packets, packet sent with TX template key gets its headers saved as template for the following packets of its flow"""
 
     def _send_out_packet() -> None:
         if __debug__:
             log("ether", f"{ether_packet_tx.tracker} - {ether_packet_tx}")
+        if tx_template_key is not None:
+            self._save_tx_template(tx_template_key, ether_packet_tx)
         self.tx_ring.enqueue(ether_packet_tx)
 
     if carried_packet is None:
@@ -87,122 +99,156 @@ def _phtx_ether(
 
     # Check if we can obtain destination MAC based on IPv6 header data
     if isinstance(ether_packet_tx._carried_packet, Ip6Assembler):
-        self.packet_stats_tx.ether__dst_unspec__ip6_lookup += 1
-
-        ip6_src = ether_packet_tx._carried_packet.src
-        ip6_dst = ether_packet_tx._carried_packet.dst
-
-        # Send packet out if its destined to multicast IPv6 address
-        if ip6_dst.is_multicast:
-            self.packet_stats_tx.ether__dst_unspec__ip6_lookup__multicast__send += 1
-            ether_packet_tx.dst = ip6_dst.multicast_mac
-            if __debug__:
-                log("ether", f"{ether_packet_tx.tracker} - Resolved destination IPv6 {ip6_dst} to MAC {ether_packet_tx.dst}")
-            _send_out_packet()
-            return TxStatus.PASSED__ETHER__TO_TX_RING
-
-        # Send out packet if is destined to external network (in relation to its source address) and we are able to obtain MAC of default gateway from ND cache
-        for ip6_host in self.ip6_host:
-            if ip6_host.address == ip6_src and ip6_dst not in ip6_host.network:
-                if ip6_host.gateway is None:
-                    self.packet_stats_tx.ether__dst_unspec__ip6_lookup__extnet__no_gw__drop += 1
-                    if __debug__:
-                        log("ether", f"<{ether_packet_tx.tracker} - <WARN>No default gateway set for {ip6_host} source address, dropping</>")
-                    return TxStatus.DROPED__ETHER__DST_NO_GATEWAY_IP6
-                if mac_address := self.nd_cache.find_entry(ip6_host.gateway):
-                    ether_packet_tx.dst = mac_address
-                    self.packet_stats_tx.ether__dst_unspec__ip6_lookup__extnet__gw_nd_cache_hit__send += 1
-                    if __debug__:
-                        log("ether", f"{ether_packet_tx.tracker} - Resolved destination IPv6 {ip6_dst}" + f" to Default Gateway MAC {ether_packet_tx.dst}")
-                    _send_out_packet()
-                    return TxStatus.PASSED__ETHER__TO_TX_RING
-                self.packet_stats_tx.ether__dst_unspec__ip6_lookup__extnet__gw_nd_cache_miss__drop += 1
-                return TxStatus.DROPED__ETHER__DST_GATEWAY_ND_CACHE_FAIL
-
-        # Send out packet if we are able to obtain destinaton MAC from ICMPv6 ND cache
-        if mac_address := self.nd_cache.find_entry(ip6_dst):
-            self.packet_stats_tx.ether__dst_unspec__ip6_lookup__locnet__nd_cache_hit__send += 1
-            ether_packet_tx.dst = mac_address
-            if __debug__:
-                log("ether", f"{ether_packet_tx.tracker} - Resolved destination IPv6 {ip6_dst} to MAC {ether_packet_tx.dst}")
-            _send_out_packet()
-            return TxStatus.PASSED__ETHER__TO_TX_RING
-        else:
-            self.packet_stats_tx.ether__dst_unspec__ip6_lookup__locnet__nd_cache_miss__drop += 1
-            if __debug__:
-                log("ether", f"{ether_packet_tx.tracker} - <WARN>No valid destination MAC could be obtained from ND cache, dropping</>")
-            return TxStatus.DROPED__ETHER__DST_ND_CACHE_FAIL
+        result = self._resolve_ether_dst_ip6(ether_packet_tx._carried_packet.src, ether_packet_tx._carried_packet.dst, ether_packet_tx.tracker)
+        if isinstance(result, TxStatus):
+            return result
+        ether_packet_tx.dst = result
+        _send_out_packet()
+        return TxStatus.PASSED__ETHER__TO_TX_RING
 
     # Check if we can obtain destination MAC based on IPv4 header data
     if isinstance(ether_packet_tx._carried_packet, (Ip4Assembler, Ip4FragAssembler)):
-        self.packet_stats_tx.ether__dst_unspec__ip4_lookup += 1
-
-        ip4_src = ether_packet_tx._carried_packet.src
-        ip4_dst = ether_packet_tx._carried_packet.dst
-
-        # Send packet out if its destined to multicast IPv4 address
-        if ip4_dst.is_multicast:
-            self.packet_stats_tx.ether__dst_unspec__ip4_lookup__multicast__send += 1
-            ether_packet_tx.dst = ip4_dst.multicast_mac
-            if __debug__:
-                log("ether", f"{ether_packet_tx.tracker} - Resolved destination IPv4 {ip4_dst} to MAC {ether_packet_tx.dst}")
-            _send_out_packet()
-            return TxStatus.PASSED__ETHER__TO_TX_RING
-
-        # Send out packet if its destinied to limited broadcast addresses
-        if ip4_dst.is_limited_broadcast:
-            self.packet_stats_tx.ether__dst_unspec__ip4_lookup__limited_broadcast__send += 1
-            ether_packet_tx.dst = MacAddress(0xFFFFFFFFFFFF)
-            if __debug__:
-                log("ether", f"{ether_packet_tx.tracker} - Resolved destination IPv4 {ip4_dst} to MAC {ether_packet_tx.dst}")
-            _send_out_packet()
-            return TxStatus.PASSED__ETHER__TO_TX_RING
-
-        # Send out packet if its destinied to network broadcast or network addresses (in relation to its source address)
-        for ip4_host in self.ip4_host:
-            if ip4_host.address == ip4_src:
-                if ip4_dst in {ip4_host.network.address, ip4_host.network.broadcast}:
-                    self.packet_stats_tx.ether__dst_unspec__ip4_lookup__network_broadcast__send += 1
-                    ether_packet_tx.dst = MacAddress(0xFFFFFFFFFFFF)
-                    if __debug__:
-                        log("ether", f"{ether_packet_tx.tracker} - Resolved destination IPv4 {ip4_dst} to MAC {ether_packet_tx.dst}")
-                    _send_out_packet()
-                    return TxStatus.PASSED__ETHER__TO_TX_RING
-
-        # Send out packet if is destined to external network (in relation to its source address) and we are able to obtain MAC of default gateway from ARP cache
-        for ip4_host in self.ip4_host:
-            if ip4_host.address == ip4_src and ip4_dst not in ip4_host.network:
-                if ip4_host.gateway is None:
-                    self.packet_stats_tx.ether__dst_unspec__ip4_lookup__extnet__no_gw__drop += 1
-                    if __debug__:
-                        log("ether", f"{ether_packet_tx.tracker} - <WARN>No default gateway set for {ip4_host} source address, dropping</>")
-                    return TxStatus.DROPED__ETHER__DST_NO_GATEWAY_IP4
-                if mac_address := self.arp_cache.find_entry(ip4_host.gateway):
-                    self.packet_stats_tx.ether__dst_unspec__ip4_lookup__extnet__gw_arp_cache_hit__send += 1
-                    ether_packet_tx.dst = mac_address
-                    if __debug__:
-                        log("ether", f"{ether_packet_tx.tracker} - Resolved destination IPv4 {ip4_dst}" + f" to Default Gateway MAC {ether_packet_tx.dst}")
-                    _send_out_packet()
-                    return TxStatus.PASSED__ETHER__TO_TX_RING
-                self.packet_stats_tx.ether__dst_unspec__ip4_lookup__extnet__gw_arp_cache_miss__drop += 1
-                return TxStatus.DROPED__ETHER__DST_GATEWAY_ARP_CACHE_FAIL
-
-        # Send out packet if we are able to obtain destinaton MAC from ARP cache, drop otherwise
-        if mac_address := self.arp_cache.find_entry(ip4_dst):
-            self.packet_stats_tx.ether__dst_unspec__ip4_lookup__locnet__arp_cache_hit__send += 1
-            ether_packet_tx.dst = mac_address
-            if __debug__:
-                log("ether", f"{ether_packet_tx.tracker} - Resolved destination IPv4 {ip4_dst} to MAC {ether_packet_tx.dst}")
-            _send_out_packet()
-            return TxStatus.PASSED__ETHER__TO_TX_RING
-        else:
-            self.packet_stats_tx.ether__dst_unspec__ip4_lookup__locnet__arp_cache_miss__drop += 1
-            if __debug__:
-                log("ether", f"{ether_packet_tx.tracker} - <WARN>No valid destination MAC could be obtained from ARP cache, dropping</>")
-            return TxStatus.DROPED__ETHER__DST_ARP_CACHE_FAIL
+        result = self._resolve_ether_dst_ip4(ether_packet_tx._carried_packet.src, ether_packet_tx._carried_packet.dst, ether_packet_tx.tracker)
+        if isinstance(result, TxStatus):
+            return result
+        ether_packet_tx.dst = result
+        _send_out_packet()
+        return TxStatus.PASSED__ETHER__TO_TX_RING
 
     # Drop packet in case we are not able to obtain valid destination MAC address
     self.packet_stats_tx.ether__dst_unspec__drop += 1
     if __debug__:
         log("ether", f"{ether_packet_tx.tracker} - <WARN>No valid destination MAC could be obtained, dropping</>")
     return TxStatus.DROPED__ETHER__DST_RESOLUTION_FAIL
+
+
+def _phtx_ether_template(self, *, tx_template_key: TxTemplateKey, carried_packet: TcpAssembler | UdpAssembler) -> TxStatus | None:
+    """Handle outbound TCP / UDP packet using its flow TX template, returns None if there is no template the packet could be sent with"""
+
+    if (tx_template := self.tx_templates.get(tx_template_key)) is None:
+        return None
+
+    packet_tx = TxTemplatePacket(tx_template, carried_packet)
+
+    # Packets that need fragmentation take the regular path
+    if len(packet_tx) > config.TAP_MTU + ETHER_HEADER_LEN:
+        return None
+
+    self.packet_stats_tx.ether__template__send += 1
+    if __debug__:
+        log("ether", f"{packet_tx.tracker} - {packet_tx}")
+    self.tx_ring.enqueue(packet_tx)
+    return TxStatus.PASSED__ETHER__TO_TX_RING
+
+
+def _save_tx_template(self, tx_template_key: TxTemplateKey, ether_packet_tx: EtherAssembler) -> None:
+    """Save headers of the packet as TX template of its flow, the oldest template is dropped when cache is full"""
+
+    self.packet_stats_tx.ether__template__save += 1
+    self.tx_templates[tx_template_key] = tx_template = TxTemplate(ether_packet_tx)
+    if len(self.tx_templates) > config.TX_TEMPLATE_CACHE_SIZE:
+        self.tx_templates.pop(next(iter(self.tx_templates)), None)
+    if __debug__:
+        log("ether", f"{ether_packet_tx.tracker} - Saved {tx_template}")
+
+
+def _resolve_ether_dst_ip6(self, ip6_src: Ip6Address, ip6_dst: Ip6Address, tracker: Tracker) -> MacAddress | TxStatus:
+    """Find destination MAC address for IPv6 packet"""
+
+    self.packet_stats_tx.ether__dst_unspec__ip6_lookup += 1
+
+    # Resolve MAC if packet is destined to multicast IPv6 address
+    if ip6_dst.is_multicast:
+        self.packet_stats_tx.ether__dst_unspec__ip6_lookup__multicast__send += 1
+        mac_address = ip6_dst.multicast_mac
+        if __debug__:
+            log("ether", f"{tracker} - Resolved destination IPv6 {ip6_dst} to MAC {mac_address}")
+        return mac_address
+
+    # Resolve MAC if packet is destined to external network (in relation to its source address) and we are able to obtain MAC of default gateway from ND cache
+    for ip6_host in self.ip6_host:
+        if ip6_host.address == ip6_src and ip6_dst not in ip6_host.network:
+            if ip6_host.gateway is None:
+                self.packet_stats_tx.ether__dst_unspec__ip6_lookup__extnet__no_gw__drop += 1
+                if __debug__:
+                    log("ether", f"<{tracker} - <WARN>No default gateway set for {ip6_host} source address, dropping</>")
+                return TxStatus.DROPED__ETHER__DST_NO_GATEWAY_IP6
+            if mac_address := self.nd_cache.find_entry(ip6_host.gateway):
+                self.packet_stats_tx.ether__dst_unspec__ip6_lookup__extnet__gw_nd_cache_hit__send += 1
+                if __debug__:
+                    log("ether", f"{tracker} - Resolved destination IPv6 {ip6_dst}" + f" to Default Gateway MAC {mac_address}")
+                return mac_address
+            self.packet_stats_tx.ether__dst_unspec__ip6_lookup__extnet__gw_nd_cache_miss__drop += 1
+            return TxStatus.DROPED__ETHER__DST_GATEWAY_ND_CACHE_FAIL
+
+    # Resolve MAC if we are able to obtain destinaton MAC from ICMPv6 ND cache
+    if mac_address := self.nd_cache.find_entry(ip6_dst):
+        self.packet_stats_tx.ether__dst_unspec__ip6_lookup__locnet__nd_cache_hit__send += 1
+        if __debug__:
+            log("ether", f"{tracker} - Resolved destination IPv6 {ip6_dst} to MAC {mac_address}")
+        return mac_address
+    else:
+        self.packet_stats_tx.ether__dst_unspec__ip6_lookup__locnet__nd_cache_miss__drop += 1
+        if __debug__:
+            log("ether", f"{tracker} - <WARN>No valid destination MAC could be obtained from ND cache, dropping</>")
+        return TxStatus.DROPED__ETHER__DST_ND_CACHE_FAIL
+
+
+def _resolve_ether_dst_ip4(self, ip4_src: Ip4Address, ip4_dst: Ip4Address, tracker: Tracker) -> MacAddress | TxStatus:
+    """Find destination MAC address for IPv4 packet"""
+
+    self.packet_stats_tx.ether__dst_unspec__ip4_lookup += 1
+
+    # Resolve MAC if packet is destined to multicast IPv4 address
+    if ip4_dst.is_multicast:
+        self.packet_stats_tx.ether__dst_unspec__ip4_lookup__multicast__send += 1
+        mac_address = ip4_dst.multicast_mac
+        if __debug__:
+            log("ether", f"{tracker} - Resolved destination IPv4 {ip4_dst} to MAC {mac_address}")
+        return mac_address
+
+    # Resolve MAC if packet is destined to limited broadcast addresses
+    if ip4_dst.is_limited_broadcast:
+        self.packet_stats_tx.ether__dst_unspec__ip4_lookup__limited_broadcast__send += 1
+        mac_address = MacAddress(0xFFFFFFFFFFFF)
+        if __debug__:
+            log("ether", f"{tracker} - Resolved destination IPv4 {ip4_dst} to MAC {mac_address}")
+        return mac_address
+
+    # Resolve MAC if packet is destined to network broadcast or network addresses (in relation to its source address)
+    for ip4_host in self.ip4_host:
+        if ip4_host.address == ip4_src:
+            if ip4_dst in {ip4_host.network.address, ip4_host.network.broadcast}:
+                self.packet_stats_tx.ether__dst_unspec__ip4_lookup__network_broadcast__send += 1
+                mac_address = MacAddress(0xFFFFFFFFFFFF)
+                if __debug__:
+                    log("ether", f"{tracker} - Resolved destination IPv4 {ip4_dst} to MAC {mac_address}")
+                return mac_address
+
+    # Resolve MAC if packet is destined to external network (in relation to its source address) and we are able to obtain MAC of default gateway from ARP cache
+    for ip4_host in self.ip4_host:
+        if ip4_host.address == ip4_src and ip4_dst not in ip4_host.network:
+            if ip4_host.gateway is None:
+                self.packet_stats_tx.ether__dst_unspec__ip4_lookup__extnet__no_gw__drop += 1
+                if __debug__:
+                    log("ether", f"{tracker} - <WARN>No default gateway set for {ip4_host} source address, dropping</>")
+                return TxStatus.DROPED__ETHER__DST_NO_GATEWAY_IP4
+            if mac_address := self.arp_cache.find_entry(ip4_host.gateway):
+                self.packet_stats_tx.ether__dst_unspec__ip4_lookup__extnet__gw_arp_cache_hit__send += 1
+                if __debug__:
+                    log("ether", f"{tracker} - Resolved destination IPv4 {ip4_dst}" + f" to Default Gateway MAC {mac_address}")
+                return mac_address
+            self.packet_stats_tx.ether__dst_unspec__ip4_lookup__extnet__gw_arp_cache_miss__drop += 1
+            return TxStatus.DROPED__ETHER__DST_GATEWAY_ARP_CACHE_FAIL
+
+    # Resolve MAC if we are able to obtain destinaton MAC from ARP cache, drop otherwise
+    if mac_address := self.arp_cache.find_entry(ip4_dst):
+        self.packet_stats_tx.ether__dst_unspec__ip4_lookup__locnet__arp_cache_hit__send += 1
+        if __debug__:
+            log("ether", f"{tracker} - Resolved destination IPv4 {ip4_dst} to MAC {mac_address}")
+        return mac_address
+    else:
+        self.packet_stats_tx.ether__dst_unspec__ip4_lookup__locnet__arp_cache_miss__drop += 1
+        if __debug__:
+            log("ether", f"{tracker} - <WARN>No valid destination MAC could be obtained from ARP cache, dropping</>")
+        return TxStatus.DROPED__ETHER__DST_ARP_CACHE_FAIL
@@ -31,6 +31,9 @@
 
 from __future__ import annotations
 
+from lib.mac_address import MacAddress
+from misc.header_schema import HeaderField, HeaderSchema
+
 # Ethernet packet header
 
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
@@ -44,7 +47,13 @@ from __future__ import annotations
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
 
 
-ETHER_HEADER_LEN = 14
+ETHER_HEADER = HeaderSchema(
+    HeaderField("dst", 48, type=MacAddress),
+    HeaderField("src", 48, type=MacAddress),
+    HeaderField("type", 16),
+)
+
+ETHER_HEADER_LEN = ETHER_HEADER.len
 
 ETHER_TYPE_MIN = 0x0600
 ETHER_TYPE_ARP = 0x0806
@@ -40,9 +40,12 @@ from protocols.icmp4.ps import (
     ICMP4_ECHO_REPLY_LEN,
     ICMP4_ECHO_REQUEST,
     ICMP4_ECHO_REQUEST_LEN,
+    ICMP4_ECHO_STRUCT,
+    ICMP4_HEADER_STRUCT,
     ICMP4_UNREACHABLE,
     ICMP4_UNREACHABLE__PORT,
     ICMP4_UNREACHABLE_LEN,
+    ICMP4_UNREACHABLE_STRUCT,
 )
 from protocols.ip4.ps import IP4_PROTO_ICMP4
 
@@ -130,18 +133,23 @@ class Icmp4Assembler:
     def assemble(self, frame: memoryview, _: int = 0) -> None:
         """Assemble packet into the raw form"""
 
+        ICMP4_HEADER_STRUCT.pack_into(frame, 0, self._type, self._code, 0)
+
         if self._type == ICMP4_ECHO_REPLY and self._code == 0:
-            struct.pack_into(f"! BBH HH {len(self._ec_data)}s", frame, 0, self._type, self._code, 0, self._ec_id, self._ec_seq, bytes(self._ec_data))
+            ICMP4_ECHO_STRUCT.pack_into(frame, 4, self._ec_id, self._ec_seq)
+            frame[ICMP4_ECHO_REPLY_LEN : ICMP4_ECHO_REPLY_LEN + len(self._ec_data)] = self._ec_data
             struct.pack_into("! H", frame, 2, inet_cksum(frame))
             return
 
         if self._type == ICMP4_UNREACHABLE and self._code == ICMP4_UNREACHABLE__PORT:
-            struct.pack_into(f"! BBH L {len(self._un_data)}s", frame, 0, self._type, self._code, 0, 0, bytes(self._un_data))
+            ICMP4_UNREACHABLE_STRUCT.pack_into(frame, 4, 0)
+            frame[ICMP4_UNREACHABLE_LEN : ICMP4_UNREACHABLE_LEN + len(self._un_data)] = self._un_data
             struct.pack_into("! H", frame, 2, inet_cksum(frame))
             return
 
         if self._type == ICMP4_ECHO_REQUEST and self._code == 0:
-            struct.pack_into(f"! BBH HH {len(self._ec_data)}s", frame, 0, self._type, self._code, 0, self._ec_id, self._ec_seq, bytes(self._ec_data))
+            ICMP4_ECHO_STRUCT.pack_into(frame, 4, self._ec_id, self._ec_seq)
+            frame[ICMP4_ECHO_REQUEST_LEN : ICMP4_ECHO_REQUEST_LEN + len(self._ec_data)] = self._ec_data
             struct.pack_into("! H", frame, 2, inet_cksum(frame))
             return
 
@@ -31,7 +31,6 @@
 
 from __future__ import annotations
 
-import struct
 from typing import TYPE_CHECKING
 
 import config
@@ -39,7 +38,9 @@ from misc.ip_helper import inet_cksum
 from protocols.icmp4.ps import (
     ICMP4_ECHO_REPLY,
     ICMP4_ECHO_REQUEST,
+    ICMP4_ECHO_STRUCT,
     ICMP4_HEADER_LEN,
+    ICMP4_HEADER_STRUCT,
     ICMP4_UNREACHABLE,
     ICMP4_UNREACHABLE__PORT,
 )
@@ -49,7 +50,18 @@ if TYPE_CHECKING:
 
 
 class Icmp4Parser:
-    """ICMPv4 packet parser class"""
+    """ICMPv4 packet parser class, header fields are decoded once when packet passes integrity check"""
+
+    __slots__ = ("_frame", "_plen", "type", "code", "cksum", "ec_id", "ec_seq", "ec_data", "un_data", "_cache__packet_copy")
+
+    type: int  # 'Type' field
+    code: int  # 'Code' field
+    cksum: int  # 'Checksum' field
+    ec_id: int  # Echo 'Id' field
+    ec_seq: int  # Echo 'Seq' field
+    ec_data: memoryview  # Data carried by Echo message
+    un_data: memoryview  # Data carried by Unreachable message
+    _cache__packet_copy: bytes
 
     def __init__(self, packet_rx: PacketRx) -> None:
         """Class constructor"""
@@ -61,7 +73,16 @@ class Icmp4Parser:
         self._frame = packet_rx.frame
         self._plen = packet_rx.ip4.dlen
 
-        packet_rx.parse_failed = self._packet_integrity_check() or self._packet_sanity_check()
+        packet_rx.parse_failed = self._packet_integrity_check()
+
+        if not packet_rx.parse_failed:
+            self.type, self.code, self.cksum = ICMP4_HEADER_STRUCT.unpack_from(self._frame)
+            if self.type in {ICMP4_ECHO_REQUEST, ICMP4_ECHO_REPLY}:
+                self.ec_id, self.ec_seq = ICMP4_ECHO_STRUCT.unpack_from(self._frame, 4)
+                self.ec_data = self._frame[8 : self._plen]
+            elif self.type == ICMP4_UNREACHABLE:
+                self.un_data = self._frame[8 : self._plen]
+            packet_rx.parse_failed = self._packet_sanity_check()
 
     def __len__(self) -> int:
         """Number of bytes remaining in the frame"""
@@ -84,62 +105,6 @@ class Icmp4Parser:
 
         return f"{header} (unknown)"
 
-    @property
-    def type(self) -> int:
-        """Read 'Type' field"""
-
-        return self._frame[0]
-
-    @property
-    def code(self) -> int:
-        """Read 'Code' field"""
-
-        return self._frame[1]
-
-    @property
-    def cksum(self) -> int:
-        """Read 'Checksum' field"""
-
-        if "_cache__cksum" not in self.__dict__:
-            self._cache__cksum: int = struct.unpack("!H", self._frame[2:4])[0]
-        return self._cache__cksum
-
-    @property
-    def ec_id(self) -> int:
-        """Read Echo 'Id' field"""
-
-        if "_cache__ec_id" not in self.__dict__:
-            assert self.type in {ICMP4_ECHO_REQUEST, ICMP4_ECHO_REPLY}
-            self._cache__ec_id: int = struct.unpack("!H", self._frame[4:6])[0]
-        return self._cache__ec_id
-
-    @property
-    def ec_seq(self) -> int:
-        """Read Echo 'Seq' field"""
-
-        if "_cache__ec_seq" not in self.__dict__:
-            assert self.type in {ICMP4_ECHO_REQUEST, ICMP4_ECHO_REPLY}
-            self._cache__ec_seq: int = struct.unpack("!H", self._frame[6:8])[0]
-        return self._cache__ec_seq
-
-    @property
-    def ec_data(self) -> bytes:
-        """Read data carried by Echo message"""
-
-        if "_cache__ec_data" not in self.__dict__:
-            assert self.type in {ICMP4_ECHO_REQUEST, ICMP4_ECHO_REPLY}
-            self._cache__ec_data = self._frame[8 : self.plen]
-        return self._cache__ec_data
-
-    @property
-    def un_data(self) -> bytes:
-        """Read data carried by Uneachable message"""
-
-        if "_cache__un_data" not in self.__dict__:
-            assert self.type == ICMP4_UNREACHABLE
-            self._cache__un_data = self._frame[8 : self.plen]
-        return self._cache__un_data
-
     @property
     def plen(self) -> int:
         """Calculate packet length"""
@@ -150,9 +115,11 @@ class Icmp4Parser:
     def packet_copy(self) -> bytes:
         """Read the whole packet"""
 
-        if "_cache__packet_copy" not in self.__dict__:
+        try:
+            return self._cache__packet_copy
+        except AttributeError:
             self._cache__packet_copy = bytes(self._frame[: self.plen])
-        return self._cache__packet_copy
+            return self._cache__packet_copy
 
     def _packet_integrity_check(self) -> str:
         """Packet integrity check to be run on raw frame prior to parsing to make sure parsing is safe"""
@@ -104,16 +104,14 @@ def _phrx_icmp4(self, packet_rx: PacketRx) -> None:
                 remote_port=struct.unpack("!H", frame[udp_offset + 2 : udp_offset + 4])[0],
             )
 
-            for socket_pattern in packet.socket_patterns:
-                socket = stack.sockets.get(socket_pattern, None)
-                if socket:
-                    if __debug__:
-                        log(
-                            "icmp4",
-                            f"{packet_rx.tracker} - <INFO>Found matching listening socket {socket}, for Unreachable packet from {packet_rx.ip4.src}</>",
-                        )
-                    socket.notify_unreachable()
-                    return
+            if socket := stack.sockets.match(packet.socket_id):
+                if __debug__:
+                    log(
+                        "icmp4",
+                        f"{packet_rx.tracker} - <INFO>Found matching listening socket {socket}, for Unreachable packet from {packet_rx.ip4.src}</>",
+                    )
+                socket.notify_unreachable()
+                return
 
             if __debug__:
                 log("icmp4", f"{packet_rx.tracker} - Unreachable data doesn't match any UDP socket")
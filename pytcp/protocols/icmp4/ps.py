@@ -31,6 +31,8 @@
 
 from __future__ import annotations
 
+import struct
+
 # Echo reply message (0/0)
 
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
@@ -76,6 +78,12 @@ from __future__ import annotations
 
 ICMP4_HEADER_LEN = 4
 
+ICMP4_HEADER_STRUCT = struct.Struct("! BBH")
+
+# Message specific fixed fields, those follow the common header
+ICMP4_ECHO_STRUCT = struct.Struct("! HH")
+ICMP4_UNREACHABLE_STRUCT = struct.Struct("! L")
+
 ICMP4_ECHO_REPLY = 0
 ICMP4_ECHO_REPLY_LEN = 8
 ICMP4_UNREACHABLE = 3
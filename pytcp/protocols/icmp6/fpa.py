@@ -42,12 +42,16 @@ from protocols.icmp6.ps import (
     ICMP6_ECHO_REPLY_LEN,
     ICMP6_ECHO_REQUEST,
     ICMP6_ECHO_REQUEST_LEN,
+    ICMP6_ECHO_STRUCT,
+    ICMP6_HEADER_STRUCT,
     ICMP6_MLD2_REPORT,
     ICMP6_MLD2_REPORT_LEN,
+    ICMP6_MLD2_REPORT_STRUCT,
     ICMP6_ND_NEIGHBOR_ADVERTISEMENT,
     ICMP6_ND_NEIGHBOR_ADVERTISEMENT_LEN,
     ICMP6_ND_NEIGHBOR_SOLICITATION,
     ICMP6_ND_NEIGHBOR_SOLICITATION_LEN,
+    ICMP6_ND_NEIGHBOR_STRUCT,
     ICMP6_ND_OPT_PI,
     ICMP6_ND_OPT_PI_LEN,
     ICMP6_ND_OPT_SLLA,
@@ -56,11 +60,14 @@ from protocols.icmp6.ps import (
     ICMP6_ND_OPT_TLLA_LEN,
     ICMP6_ND_ROUTER_ADVERTISEMENT,
     ICMP6_ND_ROUTER_ADVERTISEMENT_LEN,
+    ICMP6_ND_ROUTER_ADVERTISEMENT_STRUCT,
     ICMP6_ND_ROUTER_SOLICITATION,
     ICMP6_ND_ROUTER_SOLICITATION_LEN,
+    ICMP6_ND_ROUTER_SOLICITATION_STRUCT,
     ICMP6_UNREACHABLE,
     ICMP6_UNREACHABLE__PORT,
     ICMP6_UNREACHABLE_LEN,
+    ICMP6_UNREACHABLE_STRUCT,
 )
 from protocols.ip6.ps import IP6_NEXT_ICMP6
 
@@ -133,6 +140,7 @@ class Icmp6Assembler:
         if self._type == ICMP6_ND_ROUTER_SOLICITATION and self._code == 0:
             self._rs_reserved = 0
             self._nd_options = [] if nd_options is None else nd_options
+            self._raw_nd_options = b"".join(bytes(option) for option in self._nd_options)
 
             return
 
@@ -144,6 +152,7 @@ class Icmp6Assembler:
             self._ra_reachable_time = 0 if ra_reachable_time is None else ra_reachable_time
             self._ra_retrans_timer = 0 if ra_retrans_timer is None else ra_retrans_timer
             self._nd_options = [] if nd_options is None else nd_options
+            self._raw_nd_options = b"".join(bytes(option) for option in self._nd_options)
 
             assert 0 <= self._ra_hop <= 0xFF
             assert 0 <= self._ra_router_lifetime <= 0xFFFF
@@ -156,6 +165,7 @@ class Icmp6Assembler:
             self._ns_reserved = 0
             self._ns_target_address = Ip6Address(0) if ns_target_address is None else ns_target_address
             self._nd_options = [] if nd_options is None else nd_options
+            self._raw_nd_options = b"".join(bytes(option) for option in self._nd_options)
 
             return
 
@@ -166,6 +176,7 @@ class Icmp6Assembler:
             self._na_reserved = 0
             self._na_target_address = Ip6Address(0) if na_target_address is None else na_target_address
             self._nd_options = [] if nd_options is None else nd_options
+            self._raw_nd_options = b"".join(bytes(option) for option in self._nd_options)
 
             return
 
@@ -264,97 +275,72 @@ class Icmp6Assembler:
     def assemble(self, frame: memoryview, pshdr_sum: int) -> None:
         """Assemble packet into the raw form"""
 
+        ICMP6_HEADER_STRUCT.pack_into(frame, 0, self._type, self._code, 0)
+
         if self._type == ICMP6_UNREACHABLE and self._code == ICMP6_UNREACHABLE__PORT:
-            struct.pack_into(f"! BBH L {len(self._un_data)}s", frame, 0, self._type, self._code, 0, self._un_reserved, self._un_data)
+            ICMP6_UNREACHABLE_STRUCT.pack_into(frame, 4, self._un_reserved)
+            frame[ICMP6_UNREACHABLE_LEN : ICMP6_UNREACHABLE_LEN + len(self._un_data)] = self._un_data
             struct.pack_into("! H", frame, 2, inet_cksum(frame, pshdr_sum))
             return
 
         if self._type == ICMP6_ECHO_REQUEST and self._code == 0:
-            struct.pack_into(f"! BBH HH {len(self._ec_data)}s", frame, 0, self._type, self._code, 0, self._ec_id, self._ec_seq, self._ec_data)
+            ICMP6_ECHO_STRUCT.pack_into(frame, 4, self._ec_id, self._ec_seq)
+            frame[ICMP6_ECHO_REQUEST_LEN : ICMP6_ECHO_REQUEST_LEN + len(self._ec_data)] = self._ec_data
             struct.pack_into("! H", frame, 2, inet_cksum(frame, pshdr_sum))
             return
 
         if self._type == ICMP6_ECHO_REPLY and self._code == 0:
-            struct.pack_into(f"! BBH HH {len(self._ec_data)}s", frame, 0, self._type, self._code, 0, self._ec_id, self._ec_seq, bytes(self._ec_data))
+            ICMP6_ECHO_STRUCT.pack_into(frame, 4, self._ec_id, self._ec_seq)
+            frame[ICMP6_ECHO_REPLY_LEN : ICMP6_ECHO_REPLY_LEN + len(self._ec_data)] = self._ec_data
             struct.pack_into("! H", frame, 2, inet_cksum(frame, pshdr_sum))
             return
 
         if self._type == ICMP6_ND_ROUTER_SOLICITATION and self._code == 0:
-            struct.pack_into(f"! BBH L {len(self._raw_nd_options)}s", frame, 0, self._type, self._code, 0, self._rs_reserved, self._raw_nd_options)
+            ICMP6_ND_ROUTER_SOLICITATION_STRUCT.pack_into(frame, 4, self._rs_reserved)
+            frame[ICMP6_ND_ROUTER_SOLICITATION_LEN : ICMP6_ND_ROUTER_SOLICITATION_LEN + len(self._raw_nd_options)] = self._raw_nd_options
             struct.pack_into("! H", frame, 2, inet_cksum(frame, pshdr_sum))
             return
 
         if self._type == ICMP6_ND_ROUTER_ADVERTISEMENT and self._code == 0:
-            struct.pack_into(
-                f"! BBH BBH L L {len(self._raw_nd_options)}s",
+            ICMP6_ND_ROUTER_ADVERTISEMENT_STRUCT.pack_into(
                 frame,
-                0,
-                self._type,
-                self._code,
-                0,
+                4,
                 self._ra_hop,
                 (self._ra_flag_m << 7) | (self._ra_flag_o << 6),
                 self._ra_router_lifetime,
                 self._ra_reachable_time,
                 self._ra_retrans_timer,
-                self._raw_nd_options,
             )
+            frame[ICMP6_ND_ROUTER_ADVERTISEMENT_LEN : ICMP6_ND_ROUTER_ADVERTISEMENT_LEN + len(self._raw_nd_options)] = self._raw_nd_options
             struct.pack_into("! H", frame, 2, inet_cksum(frame, pshdr_sum))
             return
 
         if self._type == ICMP6_ND_NEIGHBOR_SOLICITATION and self._code == 0:
-            struct.pack_into(
-                f"! BBH L 16s {len(self._raw_nd_options)}s",
-                frame,
-                0,
-                self._type,
-                self._code,
-                0,
-                self._ns_reserved,
-                bytes(self._ns_target_address),
-                self._raw_nd_options,
-            )
+            ICMP6_ND_NEIGHBOR_STRUCT.pack_into(frame, 4, self._ns_reserved, bytes(self._ns_target_address))
+            frame[ICMP6_ND_NEIGHBOR_SOLICITATION_LEN : ICMP6_ND_NEIGHBOR_SOLICITATION_LEN + len(self._raw_nd_options)] = self._raw_nd_options
             struct.pack_into("! H", frame, 2, inet_cksum(frame, pshdr_sum))
             return
 
         if self._type == ICMP6_ND_NEIGHBOR_ADVERTISEMENT and self._code == 0:
-            struct.pack_into(
-                f"! BBH L 16s {len(self._raw_nd_options)}s",
+            ICMP6_ND_NEIGHBOR_STRUCT.pack_into(
                 frame,
-                0,
-                self._type,
-                self._code,
-                0,
+                4,
                 (self._na_flag_r << 31) | (self._na_flag_s << 30) | (self._na_flag_o << 29) | self._na_reserved,
                 bytes(self._na_target_address),
-                self._raw_nd_options,
             )
+            frame[ICMP6_ND_NEIGHBOR_ADVERTISEMENT_LEN : ICMP6_ND_NEIGHBOR_ADVERTISEMENT_LEN + len(self._raw_nd_options)] = self._raw_nd_options
             struct.pack_into("! H", frame, 2, inet_cksum(frame, pshdr_sum))
             return
 
         if self._type == ICMP6_MLD2_REPORT and self._code == 0:
-            struct.pack_into(
-                f"! BBH HH {sum([len(_) for _ in self._mlr2_multicast_address_record])}s",
-                frame,
-                0,
-                self._type,
-                self._code,
-                0,
-                self._mlr2_reserved,
-                self._mlr2_number_of_multicast_address_records,
-                b"".join([_.raw_record for _ in self._mlr2_multicast_address_record]),
-            )
+            raw_records = b"".join([_.raw_record for _ in self._mlr2_multicast_address_record])
+            ICMP6_MLD2_REPORT_STRUCT.pack_into(frame, 4, self._mlr2_reserved, self._mlr2_number_of_multicast_address_records)
+            frame[ICMP6_MLD2_REPORT_LEN : ICMP6_MLD2_REPORT_LEN + len(raw_records)] = raw_records
             struct.pack_into("! H", frame, 2, inet_cksum(frame, pshdr_sum))
             return
 
         assert False, "Unknown ICMPv4 Type/Code"
 
-    @property
-    def _raw_nd_options(self) -> bytes:
-        """ICMPv6 ND packet options in raw format"""
-
-        return b"".join(bytes(option) for option in self._nd_options)
-
 
 #
 #   ICMPv6 Neighbor Discovery options
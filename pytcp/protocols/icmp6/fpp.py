@@ -41,15 +41,19 @@ from misc.ip_helper import inet_cksum
 from protocols.icmp6.ps import (
     ICMP6_ECHO_REPLY,
     ICMP6_ECHO_REQUEST,
+    ICMP6_ECHO_STRUCT,
     ICMP6_HEADER_LEN,
+    ICMP6_HEADER_STRUCT,
     ICMP6_MLD2_QUERY,
     ICMP6_MLD2_REPORT,
+    ICMP6_MLD2_REPORT_STRUCT,
     ICMP6_ND_NEIGHBOR_ADVERTISEMENT,
     ICMP6_ND_NEIGHBOR_SOLICITATION,
     ICMP6_ND_OPT_PI,
     ICMP6_ND_OPT_SLLA,
     ICMP6_ND_OPT_TLLA,
     ICMP6_ND_ROUTER_ADVERTISEMENT,
+    ICMP6_ND_ROUTER_ADVERTISEMENT_STRUCT,
     ICMP6_ND_ROUTER_SOLICITATION,
     ICMP6_PACKET_TOO_BIG,
     ICMP6_PARAMETER_PROBLEM,
@@ -63,7 +67,63 @@ if TYPE_CHECKING:
 
 
 class Icmp6Parser:
-    """ICMPv6 packet parser class"""
+    """ICMPv6 packet parser class, header fields are decoded once when packet passes integrity check, options only when needed"""
+
+    __slots__ = (
+        "_frame",
+        "_plen",
+        "type",
+        "code",
+        "cksum",
+        "un_data",
+        "ec_id",
+        "ec_seq",
+        "ec_data",
+        "ra_hop",
+        "ra_flag_m",
+        "ra_flag_o",
+        "ra_router_lifetime",
+        "ra_reachable_time",
+        "ra_retrans_timer",
+        "ns_target_address",
+        "na_flag_r",
+        "na_flag_s",
+        "na_flag_o",
+        "na_target_address",
+        "mld2_rep_nor",
+        "_cache__mld2_rep_records",
+        "_cache__nd_options",
+        "_cache__nd_opt_slla",
+        "_cache__nd_opt_tlla",
+        "_cache__nd_opt_pi",
+        "_cache__packet_copy",
+    )
+
+    type: int  # 'Type' field
+    code: int  # 'Code' field
+    cksum: int  # 'Checksum' field
+    un_data: memoryview  # Data carried by Unreachable message
+    ec_id: int  # Echo 'Id' field
+    ec_seq: int  # Echo 'Seq' field
+    ec_data: memoryview  # Data carried by Echo message
+    ra_hop: int  # ND RA 'Hop limit' field
+    ra_flag_m: bool  # ND RA 'M flag' field
+    ra_flag_o: bool  # ND RA 'O flag' field
+    ra_router_lifetime: int  # ND RA 'Router lifetime' field
+    ra_reachable_time: int  # ND RA 'Reachable time' field
+    ra_retrans_timer: int  # ND RA 'Retransmision timer' field
+    ns_target_address: Ip6Address  # ND NS 'Target address' field
+    na_flag_r: bool  # ND NA 'R flag' field
+    na_flag_s: bool  # ND NA 'S flag' field
+    na_flag_o: bool  # ND NA 'O flag' field
+    na_target_address: Ip6Address  # ND NA 'Target address' field
+    mld2_rep_nor: int  # MLD2 Report 'Number of multicast address records' field
+    _cache__mld2_rep_records: list[MulticastAddressRecord]
+    _cache__nd_options: list[Icmp6NdOptSLLA | Icmp6NdOptTLLA | Icmp6NdOptPI | Icmp6NdOptUnk]
+    _cache__nd_opt_slla: MacAddress | None
+    _cache__nd_opt_tlla: MacAddress | None
+    _cache__nd_opt_pi: list[Ip6Network]
+    _cache__packet_copy: bytes
 
     def __init__(self, packet_rx: PacketRx) -> None:
         """Class constructor"""
@@ -75,9 +135,43 @@ class Icmp6Parser:
         self._frame = packet_rx.frame
         self._plen = packet_rx.ip6.dlen
 
-        packet_rx.parse_failed = self._packet_integrity_check(packet_rx.ip6.pshdr_sum) or self._packet_sanity_check(
-            packet_rx.ip6.src, packet_rx.ip6.dst, packet_rx.ip6.hop
-        )
+        packet_rx.parse_failed = self._packet_integrity_check(packet_rx.ip6.pshdr_sum)
+
+        if not packet_rx.parse_failed:
+            self._decode_header()
+            packet_rx.parse_failed = self._packet_sanity_check(packet_rx.ip6.src, packet_rx.ip6.dst, packet_rx.ip6.hop)
+
+    def _decode_header(self) -> None:
+        """Decode common header and fixed fields of the known message types"""
+
+        frame = self._frame
+        self.type, self.code, self.cksum = ICMP6_HEADER_STRUCT.unpack_from(frame)
+
+        if self.type in {ICMP6_ECHO_REQUEST, ICMP6_ECHO_REPLY}:
+            self.ec_id, self.ec_seq = ICMP6_ECHO_STRUCT.unpack_from(frame, 4)
+            self.ec_data = frame[8 : self._plen]
+
+        elif self.type == ICMP6_UNREACHABLE:
+            self.un_data = frame[8 : self._plen]
+
+        elif self.type == ICMP6_ND_ROUTER_ADVERTISEMENT:
+            self.ra_hop, flags, self.ra_router_lifetime, self.ra_reachable_time, self.ra_retrans_timer = ICMP6_ND_ROUTER_ADVERTISEMENT_STRUCT.unpack_from(
+                frame, 4
+            )
+            self.ra_flag_m = bool(flags & 0b10000000)
+            self.ra_flag_o = bool(flags & 0b01000000)
+
+        elif self.type == ICMP6_ND_NEIGHBOR_SOLICITATION:
+            self.ns_target_address = Ip6Address(frame[8:24])
+
+        elif self.type == ICMP6_ND_NEIGHBOR_ADVERTISEMENT:
+            self.na_flag_r = bool(frame[4] & 0b10000000)
+            self.na_flag_s = bool(frame[4] & 0b01000000)
+            self.na_flag_o = bool(frame[4] & 0b00100000)
+            self.na_target_address = Ip6Address(frame[8:24])
+
+        elif self.type == ICMP6_MLD2_REPORT:
+            self.mld2_rep_nor = ICMP6_MLD2_REPORT_STRUCT.unpack_from(frame, 4)[1]
 
     def __len__(self) -> int:
         """Number of bytes remaining in the frame"""
@@ -127,181 +221,21 @@ class Icmp6Parser:
 
         return f"{header} (unknown)"
 
-    @property
-    def type(self) -> int:
-        """Read 'Type' field"""
-
-        return self._frame[0]
-
-    @property
-    def code(self) -> int:
-        """Read 'Code' field"""
-
-        return self._frame[1]
-
-    @property
-    def cksum(self) -> int:
-        """Read 'Checksum' field"""
-
-        if "_cache__cksum" not in self.__dict__:
-            self._cache__cksum: int = struct.unpack("!H", self._frame[2:4])[0]
-        return self._cache__cksum
-
-    @property
-    def un_data(self) -> bytes:
-        """Read data carried by Unreachable message"""
-
-        if "_cache__un_data" not in self.__dict__:
-            assert self.type == ICMP6_UNREACHABLE
-            self._cache__un_data = self._frame[8 : self.plen]
-        return self._cache__un_data
-
-    @property
-    def ec_id(self) -> int:
-        """Read Echo 'Id' field"""
-
-        if "_cache__ec_id" not in self.__dict__:
-            assert self.type in {ICMP6_ECHO_REQUEST, ICMP6_ECHO_REPLY}
-            self._cache__ec_id: int = struct.unpack("!H", self._frame[4:6])[0]
-        return self._cache__ec_id
-
-    @property
-    def ec_seq(self) -> int:
-        """Read Echo 'Seq' field"""
-
-        if "_cache__ec_seq" not in self.__dict__:
-            assert self.type in {ICMP6_ECHO_REQUEST, ICMP6_ECHO_REPLY}
-            self._cache__ec_seq: int = struct.unpack("!H", self._frame[6:8])[0]
-        return self._cache__ec_seq
-
-    @property
-    def ec_data(self) -> bytes:
-        """Read data carried by Echo message"""
-
-        if "_cache__ec_data" not in self.__dict__:
-            assert self.type in {ICMP6_ECHO_REQUEST, ICMP6_ECHO_REPLY}
-            self._cache__ec_data = self._frame[8 : self.plen]
-        return self._cache__ec_data
-
-    @property
-    def ra_hop(self) -> int:
-        """Read ND RA 'Hop limit' field"""
-
-        assert self.type == ICMP6_ND_ROUTER_ADVERTISEMENT
-        return self._frame[4]
-
-    @property
-    def ra_flag_m(self) -> bool:
-        """Read ND RA 'M flag' field"""
-
-        if "_cache__ra_flag_m" not in self.__dict__:
-            assert self.type == ICMP6_ND_ROUTER_ADVERTISEMENT
-            self._cache__ra_flag_m = bool(self._frame[5] & 0b10000000)
-        return self._cache__ra_flag_m
-
-    @property
-    def ra_flag_o(self) -> bool:
-        """Read ND RA 'O flag' field"""
-
-        if "_cache__ra_flag_o" not in self.__dict__:
-            assert self.type == ICMP6_ND_ROUTER_ADVERTISEMENT
-            self._cache__ra_flag_o = bool(self._frame[5] & 0b01000000)
-        return self._cache__ra_flag_o
-
-    @property
-    def ra_router_lifetime(self) -> int:
-        """Read ND RA 'Router lifetime' field"""
-
-        if "_cache__ra_router_lifetime" not in self.__dict__:
-            assert self.type == ICMP6_ND_ROUTER_ADVERTISEMENT
-            self._cache__ra_router_lifetime: int = struct.unpack("!H", self._frame[6:8])[0]
-        return self._cache__ra_router_lifetime
-
-    @property
-    def ra_reachable_time(self) -> int:
-        """Read ND RA 'Reachable time' field"""
-
-        if "_cache__ra_reachable_time" not in self.__dict__:
-            assert self.type == ICMP6_ND_ROUTER_ADVERTISEMENT
-            self._cache__ra_reachable_time: int = struct.unpack("!L", self._frame[8:12])[0]
-        return self._cache__ra_reachable_time
-
-    @property
-    def ra_retrans_timer(self) -> int:
-        """Read ND RA 'Retransmision timer' field"""
-
-        if "_cache__ra_retrans_timer" not in self.__dict__:
-            assert self.type == ICMP6_ND_ROUTER_ADVERTISEMENT
-            self._cache__ra_retrans_timer: int = struct.unpack("!L", self._frame[12:16])[0]
-        return self._cache__ra_retrans_timer
-
-    @property
-    def ns_target_address(self) -> Ip6Address:
-        """Read ND NS 'Target adress' field"""
-
-        if "_cache__ns_target_address" not in self.__dict__:
-            assert self.type == ICMP6_ND_NEIGHBOR_SOLICITATION
-            self._cache__ns_target_address = Ip6Address(self._frame[8:24])
-        return self._cache__ns_target_address
-
-    @property
-    def na_flag_r(self) -> bool:
-        """Read ND NA 'R flag' field"""
-
-        if "_cache__na_flag_r" not in self.__dict__:
-            assert self.type == ICMP6_ND_NEIGHBOR_ADVERTISEMENT
-            self._cache__na_flag_r = bool(self._frame[4] & 0b10000000)
-        return self._cache__na_flag_r
-
-    @property
-    def na_flag_s(self) -> bool:
-        """Read ND NA 'S flag' field"""
-
-        if "_cache__na_flag_s" not in self.__dict__:
-            assert self.type == ICMP6_ND_NEIGHBOR_ADVERTISEMENT
-            self._cache__na_flag_s = bool(self._frame[4] & 0b01000000)
-        return self._cache__na_flag_s
-
-    @property
-    def na_flag_o(self) -> bool:
-        """Read ND NA 'O flag' field"""
-
-        if "_cache__na_flag_o" not in self.__dict__:
-            assert self.type == ICMP6_ND_NEIGHBOR_ADVERTISEMENT
-            self._cache__na_flag_o = bool(self._frame[4] & 0b00100000)
-        return self._cache__na_flag_o
-
-    @property
-    def na_target_address(self) -> Ip6Address:
-        """Read ND NA 'Taret address' field"""
-
-        if "_cache__na_target_address" not in self.__dict__:
-            assert self.type == ICMP6_ND_NEIGHBOR_ADVERTISEMENT
-            self._cache__na_target_address = Ip6Address(self._frame[8:24])
-        return self._cache__na_target_address
-
-    @property
-    def mld2_rep_nor(self) -> int:
-        """Read ICMP6_MLD2 Report 'Number of multicast address records' field"""
-
-        if "_cache__mld2_rep_nor" not in self.__dict__:
-            assert self.type == ICMP6_MLD2_REPORT
-            self._cache__mld2_rep_nor: int = struct.unpack("!H", self._frame[6:8])[0]
-        return self._cache__mld2_rep_nor
-
     @property
     def mld2_rep_records(self) -> list[MulticastAddressRecord]:
         """Read ICMP6_MLD2 Report record list"""
 
-        if "_cache__mld2_rep_records" not in self.__dict__:
+        try:
+            return self._cache__mld2_rep_records
+        except AttributeError:
             assert self.type == ICMP6_MLD2_REPORT
             self._cache__mld2_rep_records = []
-            raw_records = self._frame[8:]
+            raw_records = bytes(self._frame[8:])
             for _ in range(self.mld2_rep_nor):
                 record = MulticastAddressRecord(raw_records)
                 raw_records = raw_records[len(record) :]
                 self._cache__mld2_rep_records.append(record)
-        return self._cache__mld2_rep_records
+            return self._cache__mld2_rep_records
 
     def _read_nd_options(self, optr: int) -> list[Icmp6NdOptSLLA | Icmp6NdOptTLLA | Icmp6NdOptPI | Icmp6NdOptUnk]:
         """Read ND options"""
@@ -321,7 +255,9 @@ class Icmp6Parser:
     def nd_options(self) -> list[Icmp6NdOptSLLA | Icmp6NdOptTLLA | Icmp6NdOptPI | Icmp6NdOptUnk]:
         """Read ND options"""
 
-        if "_cache__nd_options" not in self.__dict__:
+        try:
+            return self._cache__nd_options
+        except AttributeError:
             assert self.type in {
                 ICMP6_ND_ROUTER_SOLICITATION,
                 ICMP6_ND_ROUTER_ADVERTISEMENT,
@@ -335,59 +271,37 @@ class Icmp6Parser:
                 ICMP6_ND_NEIGHBOR_ADVERTISEMENT: 24,
             }[self.type]
             self._cache__nd_options = self._read_nd_options(optr)
-        return self._cache__nd_options
+            return self._cache__nd_options
 
     @property
     def nd_opt_slla(self) -> MacAddress | None:
         """ICMPv6 ND option - Source Link Layer Address (1)"""
 
-        if "_cache__nd_opt_slla" not in self.__dict__:
-            assert self.type in {
-                ICMP6_ND_ROUTER_SOLICITATION,
-                ICMP6_ND_ROUTER_ADVERTISEMENT,
-                ICMP6_ND_NEIGHBOR_SOLICITATION,
-                ICMP6_ND_NEIGHBOR_ADVERTISEMENT,
-            }
-            for option in self.nd_options:
-                if isinstance(option, Icmp6NdOptSLLA):
-                    self._cache__nd_opt_slla: MacAddress | None = option.slla
-                    break
-            else:
-                self._cache__nd_opt_slla = None
-        return self._cache__nd_opt_slla
+        try:
+            return self._cache__nd_opt_slla
+        except AttributeError:
+            self._cache__nd_opt_slla = next((_.slla for _ in self.nd_options if isinstance(_, Icmp6NdOptSLLA)), None)
+            return self._cache__nd_opt_slla
 
     @property
     def nd_opt_tlla(self) -> MacAddress | None:
         """ICMPv6 ND option - Target Link Layer Address (2)"""
 
-        if "_cache__nd_opt_tlla" not in self.__dict__:
-            assert self.type in {
-                ICMP6_ND_ROUTER_SOLICITATION,
-                ICMP6_ND_ROUTER_ADVERTISEMENT,
-                ICMP6_ND_NEIGHBOR_SOLICITATION,
-                ICMP6_ND_NEIGHBOR_ADVERTISEMENT,
-            }
-            for option in self.nd_options:
-                if isinstance(option, Icmp6NdOptTLLA):
-                    self._cache__nd_opt_tlla: MacAddress | None = option.tlla
-                    break
-            else:
-                self._cache__nd_opt_tlla = None
-        return self._cache__nd_opt_tlla
+        try:
+            return self._cache__nd_opt_tlla
+        except AttributeError:
+            self._cache__nd_opt_tlla = next((_.tlla for _ in self.nd_options if isinstance(_, Icmp6NdOptTLLA)), None)
+            return self._cache__nd_opt_tlla
 
     @property
     def nd_opt_pi(self) -> list[Ip6Network]:
         """ICMPv6 ND option - Prefix Info (3) - Returns list of prefixes that can be used for address autoconfiguration"""
 
-        if "_cache__nd_opt_pi" not in self.__dict__:
-            assert self.type in {
-                ICMP6_ND_ROUTER_SOLICITATION,
-                ICMP6_ND_ROUTER_ADVERTISEMENT,
-                ICMP6_ND_NEIGHBOR_SOLICITATION,
-                ICMP6_ND_NEIGHBOR_ADVERTISEMENT,
-            }
+        try:
+            return self._cache__nd_opt_pi
+        except AttributeError:
             self._cache__nd_opt_pi = [_.prefix for _ in self.nd_options if isinstance(_, Icmp6NdOptPI) and _.flag_a and len(_.prefix.mask) == 64]
-        return self._cache__nd_opt_pi
+            return self._cache__nd_opt_pi
 
     @property
     def plen(self) -> int:
@@ -399,9 +313,11 @@ class Icmp6Parser:
     def packet_copy(self) -> bytes:
         """Read the whole packet"""
 
-        if "_cache__packet_copy" not in self.__dict__:
-            self._cache__packet_copy = self._frame[: self.plen]
-        return self._cache__packet_copy
+        try:
+            return self._cache__packet_copy
+        except AttributeError:
+            self._cache__packet_copy = bytes(self._frame[: self.plen])
+            return self._cache__packet_copy
 
     def _nd_option_integrity_check(self, optr: int) -> str:
         """Check integrity of ICMPv6 ND options"""
@@ -577,7 +493,7 @@ class Icmp6Parser:
 class Icmp6NdOptSLLA:
     """ICMPv6 ND option - Source Link Layer Address (1)"""
 
-    def __init__(self, frame: bytes) -> None:
+    def __init__(self, frame: bytes | memoryview) -> None:
         self.code = frame[0]
         self.len = frame[1] << 3
         self.slla = MacAddress(frame[2:8])
@@ -596,7 +512,7 @@ class Icmp6NdOptSLLA:
 class Icmp6NdOptTLLA:
     """ICMPv6 ND option - Target Link Layer Address (2)"""
 
-    def __init__(self, frame: bytes) -> None:
+    def __init__(self, frame: bytes | memoryview) -> None:
         self.code = frame[0]
         self.len = frame[1] << 3
         self.tlla = MacAddress(frame[2:8])
@@ -615,7 +531,7 @@ class Icmp6NdOptTLLA:
 class Icmp6NdOptPI:
     """ICMPv6 ND option - Prefix Information (3)"""
 
-    def __init__(self, frame: bytes) -> None:
+    def __init__(self, frame: bytes | memoryview) -> None:
         self.code = frame[0]
         self.len = frame[1] << 3
         self.flag_l = bool(frame[3] & 0b10000000)
@@ -639,7 +555,7 @@ class Icmp6NdOptPI:
 class Icmp6NdOptUnk:
     """ICMPv6 ND  option not supported by this stack"""
 
-    def __init__(self, frame: bytes) -> None:
+    def __init__(self, frame: bytes | memoryview) -> None:
         self.code = frame[0]
         self.len = frame[1] << 3
         self.data = frame[2 : self.len]
@@ -31,6 +31,8 @@
 
 from __future__ import annotations
 
+import struct
+
 # Destination Unreachable message (1/[0-6])
 
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
@@ -279,6 +281,16 @@ from __future__ import annotations
 
 ICMP6_HEADER_LEN = 4
 
+ICMP6_HEADER_STRUCT = struct.Struct("! BBH")
+
+# Message specific fixed fields, those follow the common header
+ICMP6_UNREACHABLE_STRUCT = struct.Struct("! L")
+ICMP6_ECHO_STRUCT = struct.Struct("! HH")
+ICMP6_ND_ROUTER_SOLICITATION_STRUCT = struct.Struct("! L")
+ICMP6_ND_ROUTER_ADVERTISEMENT_STRUCT = struct.Struct("! BBH L L")
+ICMP6_ND_NEIGHBOR_STRUCT = struct.Struct("! L 16s")  # Neighbor Solicitation and Neighbor Advertisement
+ICMP6_MLD2_REPORT_STRUCT = struct.Struct("! HH")
+
 ICMP6_UNREACHABLE = 1
 ICMP6_UNREACHABLE_LEN = 8
 ICMP6_UNREACHABLE__NO_ROUTE = 0
@@ -40,6 +40,7 @@ from lib.tracker import Tracker
 from misc.ip_helper import inet_cksum
 from protocols.ether.ps import ETHER_TYPE_IP4
 from protocols.ip4.ps import (
+    IP4_HEADER,
     IP4_HEADER_LEN,
     IP4_OPT_EOL,
     IP4_OPT_EOL_LEN,
@@ -99,13 +100,14 @@ class Ip4Assembler:
         self._dst: Ip4Address = dst
         self._options: list[Ip4OptNop | Ip4OptEol] = [] if options is None else options
         self._proto: int = self._carried_packet.ip4_proto
+        self._raw_options: bytes = b"".join(bytes(option) for option in self._options)
         self._hlen: int = IP4_HEADER_LEN + len(self._raw_options)
         self._plen: int = len(self)
 
     def __len__(self) -> int:
         """Length of the packet"""
 
-        return IP4_HEADER_LEN + sum(len(_) for _ in self._options) + len(self._carried_packet)
+        return self._hlen + len(self._carried_packet)
 
     def __str__(self) -> str:
         """Packet log string"""
@@ -161,34 +163,30 @@ class Ip4Assembler:
     def pshdr_sum(self) -> int:
         """Create IPv4 pseudo header used by TCP and UDP to compute their checksums"""
 
-        pseudo_header = struct.pack("! 4s 4s BBH", bytes(self._src), bytes(self._dst), 0, self._proto, self._plen - self._hlen)
-        return sum(struct.unpack("! 3L", pseudo_header))
-
-    @property
-    def _raw_options(self) -> bytes:
-        """Packet options in raw format"""
-
-        return b"".join(bytes(option) for option in self._options)
+        return int(self._src) + int(self._dst) + (self._proto << 16) + self._plen - self._hlen
 
     def assemble(self, frame: memoryview) -> None:
         """Assemble packet into the raw form"""
 
-        struct.pack_into(
-            f"! BBH HH BBH 4s 4s {len(self._raw_options)}s",
+        IP4_HEADER.pack_into(
             frame,
             0,
-            self._ver << 4 | self._hlen >> 2,
-            self._dscp << 2 | self._ecn,
+            self._ver,
+            self._hlen,
+            self._dscp,
+            self._ecn,
             self._plen,
             self._id,
-            self._flag_df << 14 | self._flag_mf << 13 | self._offset >> 3,
+            self._flag_df,
+            self._flag_mf,
+            self._offset,
             self._ttl,
             self._proto,
             0,
-            bytes(self._src),
-            bytes(self._dst),
-            self._raw_options,
+            self._src,
+            self._dst,
         )
+        frame[IP4_HEADER_LEN : self._hlen] = self._raw_options
 
         struct.pack_into("! H", frame, 10, inet_cksum(frame[: self._hlen]))
 
@@ -213,7 +211,7 @@ class Ip4FragAssembler:
         offset: int = 0,
         options: list[Ip4OptNop | Ip4OptEol] | None = None,
         proto: int = IP4_PROTO_RAW,
-        data: bytes = b"",
+        data: bytes | memoryview = b"",
     ):
         """Class constructor"""
 
@@ -235,15 +233,16 @@ class Ip4FragAssembler:
         self._src: Ip4Address = src
         self._dst: Ip4Address = dst
         self._options: list[Ip4OptNop | Ip4OptEol] = [] if options is None else options
-        self._data: bytes = data
+        self._data: bytes | memoryview = data
         self._proto: int = proto
+        self._raw_options: bytes = b"".join(bytes(option) for option in self._options)
         self._hlen: int = IP4_HEADER_LEN + len(self._raw_options)
         self._plen: int = len(self)
 
     def __len__(self) -> int:
         """Length of the packet"""
 
-        return IP4_HEADER_LEN + sum(len(_) for _ in self._options) + len(self._data)
+        return self._hlen + len(self._data)
 
     def __str__(self) -> str:
         """Packet log string"""
@@ -277,37 +276,29 @@ class Ip4FragAssembler:
 
         return self._src
 
-    @property
-    def _raw_options(self) -> bytes:
-        """Packet options in raw format"""
-
-        raw_options = b""
-
-        for option in self._options:
-            raw_options += bytes(option)
-
-        return raw_options
-
     def assemble(self, frame: memoryview) -> None:
         """Assemble packet into the raw form"""
 
-        struct.pack_into(
-            f"! BBH HH BBH 4s 4s {len(self._raw_options)}s {len(self._data)}s",
+        IP4_HEADER.pack_into(
             frame,
             0,
-            self._ver << 4 | self._hlen >> 2,
-            self._dscp << 2 | self._ecn,
+            self._ver,
+            self._hlen,
+            self._dscp,
+            self._ecn,
             self._plen,
             self._id,
-            self._flag_df << 14 | self._flag_mf << 13 | self._offset >> 3,
+            self._flag_df,
+            self._flag_mf,
+            self._offset,
             self._ttl,
             self._proto,
             0,
-            bytes(self._src),
-            bytes(self._dst),
-            bytes(self._raw_options),  # memoryview: conversion to bytes requir
-            bytes(self._data),  # memoryview: conversion to bytes requir
+            self._src,
+            self._dst,
         )
+        frame[IP4_HEADER_LEN : self._hlen] = self._raw_options
+        frame[self._hlen : self._plen] = self._data
 
         struct.pack_into("! H", frame, 10, inet_cksum(frame[: self._hlen]))
 
@@ -35,23 +35,74 @@ import struct
 from typing import TYPE_CHECKING
 
 import config
-from lib.ip4_address import Ip4Address
 from misc.ip_helper import inet_cksum
 from protocols.ip4.ps import (
+    IP4_HEADER,
     IP4_HEADER_LEN,
     IP4_OPT_EOL,
     IP4_OPT_EOL_LEN,
     IP4_OPT_NOP,
     IP4_OPT_NOP_LEN,
+    IP4_OPTIONS,
     IP4_PROTO_TABLE,
 )
 
 if TYPE_CHECKING:
+    from lib.ip4_address import Ip4Address
     from misc.packet import PacketRx
 
 
 class Ip4Parser:
-    """IPv4 packet parser class"""
+    """IPv4 packet parser class, header fields are decoded once when packet passes integrity check, options only when needed"""
+
+    __slots__ = (
+        "_frame",
+        "ver",
+        "hlen",
+        "dscp",
+        "ecn",
+        "plen",
+        "id",
+        "flag_df",
+        "flag_mf",
+        "offset",
+        "ttl",
+        "proto",
+        "cksum",
+        "src",
+        "dst",
+        "olen",
+        "dlen",
+        "_cache__options",
+        "_cache__header_copy",
+        "_cache__options_copy",
+        "_cache__data_copy",
+        "_cache__packet_copy",
+        "_cache__pshdr_sum",
+    )
+
+    ver: int  # 'Version' field
+    hlen: int  # 'Header length' field
+    dscp: int  # 'DSCP' field
+    ecn: int  # 'ECN' field
+    plen: int  # 'Packet length' field
+    id: int  # 'Identification' field
+    flag_df: bool  # 'DF flag' field
+    flag_mf: bool  # 'MF flag' field
+    offset: int  # 'Fragment offset' field
+    ttl: int  # 'TTL' field
+    proto: int  # 'Protocol' field
+    cksum: int  # 'Checksum' field
+    src: Ip4Address  # 'Source address' field
+    dst: Ip4Address  # 'Destination address' field
+    olen: int  # Options length
+    dlen: int  # Data length
+    _cache__options: list
+    _cache__header_copy: bytes
+    _cache__options_copy: bytes
+    _cache__data_copy: bytes
+    _cache__packet_copy: bytes
+    _cache__pshdr_sum: int
 
     def __init__(self, packet_rx: PacketRx) -> None:
         """Class constructor"""
@@ -61,7 +112,13 @@ class Ip4Parser:
 
         self._frame = packet_rx.frame
 
-        packet_rx.parse_failed = self._packet_integrity_check() or self._packet_sanity_check()
+        packet_rx.parse_failed = self._packet_integrity_check()
+
+        if not packet_rx.parse_failed:
+            IP4_HEADER.unpack_into(self, self._frame)
+            self.olen = self.hlen - IP4_HEADER_LEN
+            self.dlen = self.plen - self.hlen
+            packet_rx.parse_failed = self._packet_sanity_check()
 
         if not packet_rx.parse_failed:
             packet_rx.frame = packet_rx.frame[self.hlen :]
@@ -80,188 +137,82 @@ class Ip4Parser:
             + f", ttl {self.ttl}"
         )
 
-    @property
-    def ver(self) -> int:
-        """Read 'Version' field"""
-
-        if "_cache__ver" not in self.__dict__:
-            self._cache__ver = self._frame[0] >> 4
-        return self._cache__ver
-
-    @property
-    def hlen(self) -> int:
-        """Read 'Header length' field"""
-
-        if "_cache__hlen" not in self.__dict__:
-            self._cache__hlen = (self._frame[0] & 0b00001111) << 2
-        return self._cache__hlen
-
-    @property
-    def dscp(self) -> int:
-        """Read 'DSCP' field"""
-
-        if "_cache__dscp" not in self.__dict__:
-            self._cache__dscp = (self._frame[1] & 0b11111100) >> 2
-        return self._cache__dscp
-
-    @property
-    def ecn(self) -> int:
-        """Read 'ECN' field"""
-
-        if "_cache__ecn" not in self.__dict__:
-            self._cache__ecn = self._frame[1] & 0b00000011
-        return self._cache__ecn
-
-    @property
-    def plen(self) -> int:
-        """Read 'Packet length' field"""
-
-        if "_cache__plen" not in self.__dict__:
-            self._cache__plen: int = struct.unpack("!H", self._frame[2:4])[0]
-        return self._cache__plen
-
-    @property
-    def id(self) -> int:
-        """Read 'Identification' field"""
-
-        if "_cache__id" not in self.__dict__:
-            self._cache__id: int = struct.unpack("!H", self._frame[4:6])[0]
-        return self._cache__id
-
-    @property
-    def flag_df(self) -> bool:
-        """Read 'DF flag' field"""
-
-        return bool(self._frame[6] & 0b01000000)
-
-    @property
-    def flag_mf(self) -> bool:
-        """Read 'MF flag' field"""
-
-        return bool(self._frame[6] & 0b00100000)
-
-    @property
-    def offset(self) -> int:
-        """Read 'Fragment offset' field"""
-
-        if "_cache__offset" not in self.__dict__:
-            self._cache__offset: int = (struct.unpack("!H", self._frame[6:8])[0] & 0b0001111111111111) << 3
-        return self._cache__offset
-
-    @property
-    def ttl(self) -> int:
-        """Read 'TTL' field"""
-
-        return self._frame[8]
-
-    @property
-    def proto(self) -> int:
-        """Read 'Protocol' field"""
-
-        return self._frame[9]
-
-    @property
-    def cksum(self) -> int:
-        """Read 'Checksum' field"""
-
-        if "_cache__cksum" not in self.__dict__:
-            self._cache__cksum: int = struct.unpack("!H", self._frame[10:12])[0]
-        return self._cache__cksum
-
-    @property
-    def src(self) -> Ip4Address:
-        """Read 'Source address' field"""
-
-        if "_cache__src" not in self.__dict__:
-            self._cache__src = Ip4Address(self._frame[12:16])
-        return self._cache__src
-
-    @property
-    def dst(self) -> Ip4Address:
-        """Read 'Destination address' field"""
-
-        if "_cache__dst" not in self.__dict__:
-            self._cache__dst = Ip4Address(self._frame[16:20])
-        return self._cache__dst
-
     @property
     def options(self) -> list[Ip4OptEol | Ip4OptNop | Ip4OptUnk]:
         """Read list of options"""
 
-        if "_cache__options" not in self.__dict__:
-            self._cache__options: list = []
-            optr = IP4_HEADER_LEN
-
-            while optr < self.hlen:
-                if self._frame[optr] == IP4_OPT_EOL:
-                    self._cache__options.append(Ip4OptEol())
-                    break
-                if self._frame[optr] == IP4_OPT_NOP:
-                    self._cache__options.append(Ip4OptNop())
-                    optr += IP4_OPT_NOP_LEN
-                    continue
-                # typing: Had to put single mapping (0: lambda _: None) into dict to suppress typng error
-                self._cache__options.append({0: lambda _: None}.get(self._frame[optr], Ip4OptUnk)(self._frame[optr:]))
-                optr += self._frame[optr + 1]
-
-        return self._cache__options
-
-    @property
-    def olen(self) -> int:
-        """Calculate options length"""
+        try:
+            return self._cache__options
+        except AttributeError:
+            pass
 
-        if "_cache__olen" not in self.__dict__:
-            self._cache__olen = self.hlen - IP4_HEADER_LEN
-        return self._cache__olen
+        self._cache__options = []
+        optr = IP4_HEADER_LEN
 
-    @property
-    def dlen(self) -> int:
-        """Calculate data length"""
+        while optr < self.hlen:
+            if self._frame[optr] == IP4_OPT_EOL:
+                self._cache__options.append(Ip4OptEol())
+                break
+            if self._frame[optr] == IP4_OPT_NOP:
+                self._cache__options.append(Ip4OptNop())
+                optr += IP4_OPT_NOP_LEN
+                continue
+            # typing: Had to put single mapping (0: lambda _: None) into dict to suppress typng error
+            self._cache__options.append({0: lambda _: None}.get(self._frame[optr], Ip4OptUnk)(self._frame[optr:]))
+            optr += self._frame[optr + 1]
 
-        if "_cache__dlen" not in self.__dict__:
-            self._cache__dlen = self.plen - self.hlen
-        return self._cache__dlen
+        return self._cache__options
 
     @property
     def header_copy(self) -> bytes:
         """Return copy of packet header"""
 
-        if "_cache__header_copy" not in self.__dict__:
+        try:
+            return self._cache__header_copy
+        except AttributeError:
             self._cache__header_copy = bytes(self._frame[:IP4_HEADER_LEN])
-        return self._cache__header_copy
+            return self._cache__header_copy
 
     @property
     def options_copy(self) -> bytes:
         """Return copy of packet header"""
 
-        if "_cache__options_copy" not in self.__dict__:
+        try:
+            return self._cache__options_copy
+        except AttributeError:
             self._cache__options_copy = bytes(self._frame[IP4_HEADER_LEN : self.hlen])
-        return self._cache__options_copy
+            return self._cache__options_copy
 
     @property
     def data_copy(self) -> bytes:
         """Return copy of packet data"""
 
-        if "_cache__data_copy" not in self.__dict__:
+        try:
+            return self._cache__data_copy
+        except AttributeError:
             self._cache__data_copy = bytes(self._frame[self.hlen : self.plen])
-        return self._cache__data_copy
+            return self._cache__data_copy
 
     @property
     def packet_copy(self) -> bytes:
         """Return copy of whole packet"""
 
-        if "_cache__packet_copy" not in self.__dict__:
+        try:
+            return self._cache__packet_copy
+        except AttributeError:
             self._cache__packet_copy = bytes(self._frame[: self.plen])
-        return self._cache__packet_copy
+            return self._cache__packet_copy
 
     @property
     def pshdr_sum(self) -> int:
         """Create IPv4 pseudo header used by TCP and UDP to compute their checksums"""
 
-        if "_cache.__pshdr_sum" not in self.__dict__:
-            pseudo_header = struct.pack("! 4s 4s BBH", bytes(self.src), bytes(self.dst), 0, self.proto, self.plen - self.hlen)
-            self._cache__pshdr_sum = sum(struct.unpack("! 3L", pseudo_header))
-        return self._cache__pshdr_sum
+        # Sum of the pseudo header 32 bit words - source address, destination address and zero / protocol / data length
+        try:
+            return self._cache__pshdr_sum
+        except AttributeError:
+            self._cache__pshdr_sum = int(self.src) + int(self.dst) + (self.proto << 16) + self.dlen
+            return self._cache__pshdr_sum
 
     def _packet_integrity_check(self) -> str:
         """Packet integrity check to be run on raw packet prior to parsing to make sure parsing is safe"""
@@ -272,29 +223,17 @@ class Ip4Parser:
         if len(self) < IP4_HEADER_LEN:
             return "IPv4 integrity - wrong packet length (I)"
 
-        if not IP4_HEADER_LEN <= self.hlen <= self.plen <= len(self):
+        hlen = (self._frame[0] & 0b00001111) << 2
+        plen = struct.unpack_from("!H", self._frame, 2)[0]
+        if not IP4_HEADER_LEN <= hlen <= plen <= len(self):
             return "IPv4 integrity - wrong packet length (II)"
 
         # Cannot compute checksum earlier because it depends on sanity of hlen field
-        if inet_cksum(self._frame[: self.hlen]):
+        if inet_cksum(self._frame[:hlen]):
             return "IPv4 integriy - wrong packet checksum"
 
-        optr = IP4_HEADER_LEN
-        while optr < self.hlen:
-            if self._frame[optr] == IP4_OPT_EOL:
-                break
-            if self._frame[optr] == IP4_OPT_NOP:
-                optr += 1
-                if optr > self.hlen:
-                    return "IPv4 integrity - wrong option length (I)"
-                continue
-            if optr + 1 > self.hlen:
-                return "IPv4 integrity - wrong option length (II)"
-            if self._frame[optr + 1] == 0:
-                return "IPv4 integrity - wrong option length (III)"
-            optr += self._frame[optr + 1]
-            if optr > self.hlen:
-                return "IPv4 integrity - wrong option length (IV)"
+        if failed_check := IP4_OPTIONS.integrity_check(self._frame, IP4_HEADER_LEN, hlen):
+            return f"IPv4 integrity - wrong option length ({failed_check})"
 
         return ""
 
@@ -373,7 +312,7 @@ class Ip4OptNop:
 class Ip4OptUnk:
     """IPv4 option not supported by this stack"""
 
-    def __init__(self, frame: bytes) -> None:
+    def __init__(self, frame: bytes | memoryview) -> None:
         self.kind = frame[0]
         self.len = frame[1]
         self.data = frame[2 : self.len]
@@ -36,6 +36,7 @@ from typing import TYPE_CHECKING
 import config
 from lib.ip4_address import Ip4Address
 from lib.logger import log
+from lib.mac_address import MacAddress
 from misc.tx_status import TxStatus
 from protocols.icmp4.fpa import Icmp4Assembler
 from protocols.ip4.fpa import Ip4Assembler, Ip4FragAssembler
@@ -43,6 +44,7 @@ from protocols.raw.fpa import RawAssembler
 from protocols.udp.fpa import UdpAssembler
 
 if TYPE_CHECKING:
+    from misc.tx_template import TxTemplateKey
     from protocols.tcp.fpa import TcpAssembler
 
 
@@ -147,6 +149,27 @@ def _validate_dst_ip4_address(self, ip4_dst: Ip4Address, tracker) -> Ip4Address
     return ip4_dst
 
 
+def _route_ip4(
+    self, ip4_src: Ip4Address, ip4_dst: Ip4Address, carried_packet: Icmp4Assembler | TcpAssembler | UdpAssembler | RawAssembler
+) -> tuple[Ip4Address, MacAddress] | TxStatus:
+    """Validate packet addresses and resolve destination MAC, the result can be reused for following packets sent to the same destination"""
+
+    result = self._validate_src_ip4_address(ip4_src, ip4_dst, carried_packet)
+    if isinstance(result, TxStatus):
+        return result
+    ip4_src = result
+
+    result = self._validate_dst_ip4_address(ip4_dst, carried_packet.tracker)
+    if isinstance(result, TxStatus):
+        return result
+
+    mac_address = self._resolve_ether_dst_ip4(ip4_src, ip4_dst, carried_packet.tracker)
+    if isinstance(mac_address, TxStatus):
+        return mac_address
+
+    return ip4_src, mac_address
+
+
 def _phtx_ip4(
     self,
     *,
@@ -154,8 +177,10 @@ def _phtx_ip4(
     ip4_src: Ip4Address,
     ip4_ttl: int = config.IP4_DEFAULT_TTL,
     carried_packet: Icmp4Assembler | TcpAssembler | UdpAssembler | RawAssembler | None = None,
+    ether_dst: MacAddress = MacAddress(0),
+    tx_template_key: TxTemplateKey | None = None,
 ) -> TxStatus:
-    """Handle outbound IP packets"""
+    """Handle outbound IP packets, packet with pre-resolved destination MAC is expected to have its addresses validated already"""
 
     if carried_packet is None:
         carried_packet = RawAssembler()
@@ -169,17 +194,18 @@ def _phtx_ip4(
         self.packet_stats_tx.ip4__no_proto_support__drop += 1
         return TxStatus.DROPED__IP4__NO_PROTOCOL_SUPPORT
 
-    # Validate source address
-    result = self._validate_src_ip4_address(ip4_src, ip4_dst, carried_packet)
-    if isinstance(result, TxStatus):
-        return result
-    ip4_src = result
+    if ether_dst.is_unspecified:
+        # Validate source address
+        result = self._validate_src_ip4_address(ip4_src, ip4_dst, carried_packet)
+        if isinstance(result, TxStatus):
+            return result
+        ip4_src = result
 
-    # Validate destination address
-    result = self._validate_dst_ip4_address(ip4_dst, carried_packet.tracker)
-    if isinstance(result, TxStatus):
-        return result
-    ip4_dst = result
+        # Validate destination address
+        result = self._validate_dst_ip4_address(ip4_dst, carried_packet.tracker)
+        if isinstance(result, TxStatus):
+            return result
+        ip4_dst = result
 
     # Assemble IPv4 packet
     ip4_packet_tx = Ip4Assembler(src=ip4_src, dst=ip4_dst, ttl=ip4_ttl, carried_packet=carried_packet)
@@ -189,7 +215,7 @@ def _phtx_ip4(
         self.packet_stats_tx.ip4__mtu_ok__send += 1
         if __debug__:
             log("ip4", f"{ip4_packet_tx.tracker} - {ip4_packet_tx}")
-        return self._phtx_ether(carried_packet=ip4_packet_tx)
+        return self._phtx_ether(ether_dst=ether_dst, carried_packet=ip4_packet_tx, tx_template_key=tx_template_key)
 
     # Fragment packet and send out
     self.packet_stats_tx.ip4__mtu_exceed__frag += 1
@@ -217,7 +243,7 @@ def _phtx_ip4(
             log("ip4", f"{ip4_frag_tx.tracker} - {ip4_frag_tx}")
         offset += len(data_frag)
         self.packet_stats_tx.ip4__mtu_exceed__frag__send += 1
-        ether_tx_status.add(self._phtx_ether(carried_packet=ip4_frag_tx))
+        ether_tx_status.add(self._phtx_ether(ether_dst=ether_dst, carried_packet=ip4_frag_tx))
 
     # Return the most severe code
     for tx_status in [
@@ -31,6 +31,9 @@
 
 from __future__ import annotations
 
+from lib.ip4_address import Ip4Address
+from misc.header_schema import HeaderField, HeaderSchema, OptionsSchema
+
 # IPv4 protocol header
 
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
@@ -48,7 +51,25 @@ from __future__ import annotations
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
 
 
-IP4_HEADER_LEN = 20
+IP4_HEADER = HeaderSchema(
+    HeaderField("ver", 4),
+    HeaderField("hlen", 4, scale=2),
+    HeaderField("dscp", 6),
+    HeaderField("ecn", 2),
+    HeaderField("plen", 16),
+    HeaderField("id", 16),
+    HeaderField("", 1),
+    HeaderField("flag_df", 1, type=bool),
+    HeaderField("flag_mf", 1, type=bool),
+    HeaderField("offset", 13, scale=3),
+    HeaderField("ttl", 8),
+    HeaderField("proto", 8),
+    HeaderField("cksum", 16),
+    HeaderField("src", 32, type=Ip4Address),
+    HeaderField("dst", 32, type=Ip4Address),
+)
+
+IP4_HEADER_LEN = IP4_HEADER.len
 
 IP4_PROTO_ICMP4 = 1
 IP4_PROTO_TCP = 6
@@ -73,3 +94,5 @@ IP4_OPT_EOL_LEN = 1
 
 IP4_OPT_NOP = 1
 IP4_OPT_NOP_LEN = 1
+
+IP4_OPTIONS = OptionsSchema(eol=IP4_OPT_EOL, nop=IP4_OPT_NOP)
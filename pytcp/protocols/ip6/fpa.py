@@ -31,13 +31,13 @@
 
 from __future__ import annotations
 
-import struct
 from typing import TYPE_CHECKING
 
 import config
 from lib.ip6_address import Ip6Address
 from protocols.ether.ps import ETHER_TYPE_IP6
 from protocols.ip6.ps import (
+    IP6_HEADER,
     IP6_HEADER_LEN,
     IP6_NEXT_EXT_FRAG,
     IP6_NEXT_ICMP6,
@@ -145,25 +145,26 @@ class Ip6Assembler:
     def pshdr_sum(self) -> int:
         """Returns IPv6 pseudo header that is used by TCP, UDP and ICMPv6 to compute their checksums"""
 
-        pseudo_header = struct.pack("! 16s 16s L BBBB", bytes(self._src), bytes(self._dst), self._dlen, 0, 0, 0, self._next)
-        return sum(struct.unpack("! 5Q", pseudo_header))
+        src = int(self._src)
+        dst = int(self._dst)
+        return (src >> 64) + (src & 0xFFFFFFFFFFFFFFFF) + (dst >> 64) + (dst & 0xFFFFFFFFFFFFFFFF) + (self._dlen << 32) + self._next
 
     def assemble(self, frame: memoryview) -> None:
         """Assemble packet into the raw form"""
 
-        struct.pack_into(
-            "! BBBB HBB 16s 16s",
+        IP6_HEADER.pack_into(
             frame,
             0,
-            self._ver << 4 | self._dscp >> 4,
-            self._dscp & 0b00000011 << 6 | self._ecn << 4 | ((self._flow & 0b000011110000000000000000) >> 16),
-            (self._flow & 0b000000001111111100000000) >> 8,
-            self._flow & 0b000000000000000011111111,
+            self._ver,
+            # Keeps the existing wire layout, two upper bits of dscp are carried in the middle bits of the field
+            (self._dscp >> 4) << 2,
+            self._ecn,
+            self._flow & 0xFFFFF,
             self._dlen,
             self._next,
             self._hop,
-            bytes(self._src),
-            bytes(self._dst),
+            self._src,
+            self._dst,
         )
 
         self._carried_packet.assemble(frame[IP6_HEADER_LEN:], self.pshdr_sum)
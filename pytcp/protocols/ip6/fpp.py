@@ -35,15 +35,46 @@ import struct
 from typing import TYPE_CHECKING
 
 import config
-from lib.ip6_address import Ip6Address
-from protocols.ip6.ps import IP6_HEADER_LEN, IP6_NEXT_TABLE
+from protocols.ip6.ps import IP6_HEADER, IP6_HEADER_LEN, IP6_NEXT_TABLE
 
 if TYPE_CHECKING:
+    from lib.ip6_address import Ip6Address
     from misc.packet import PacketRx
 
 
 class Ip6Parser:
-    """IPv6 packet parser class"""
+    """IPv6 packet parser class, header fields are decoded once when packet passes integrity check"""
+
+    __slots__ = (
+        "_frame",
+        "ver",
+        "dscp",
+        "ecn",
+        "flow",
+        "dlen",
+        "next",
+        "hop",
+        "src",
+        "dst",
+        "_cache__header_copy",
+        "_cache__data_copy",
+        "_cache__packet_copy",
+        "_pshdr_sum",
+    )
+
+    ver: int  # 'Version' field
+    dscp: int  # 'DSCP' field
+    ecn: int  # 'ECN' field
+    flow: int  # 'Flow' field
+    dlen: int  # 'Data length' field
+    next: int  # 'Next' field
+    hop: int  # 'Hop' field
+    src: Ip6Address  # 'Source address' field
+    dst: Ip6Address  # 'Destination address' field
+    _cache__header_copy: bytes
+    _cache__data_copy: bytes
+    _cache__packet_copy: bytes
+    _pshdr_sum: int
 
     def __init__(self, packet_rx: PacketRx) -> None:
         """Class constructor"""
@@ -53,7 +84,15 @@ class Ip6Parser:
 
         self._frame = packet_rx.frame
 
-        packet_rx.parse_failed = self._packet_integrity_check() or self._packet_sanity_check()
+        packet_rx.parse_failed = self._packet_integrity_check()
+
+        if not packet_rx.parse_failed:
+            IP6_HEADER.unpack_into(self, self._frame)
+            # Sum of the pseudo header 64 bit words - source address, destination address and data length / zero / next header
+            src = int(self.src)
+            dst = int(self.dst)
+            self._pshdr_sum = (src >> 64) + (src & 0xFFFFFFFFFFFFFFFF) + (dst >> 64) + (dst & 0xFFFFFFFFFFFFFFFF) + (self.dlen << 32) + self.next
+            packet_rx.parse_failed = self._packet_sanity_check()
 
         if not packet_rx.parse_failed:
             packet_rx.frame = packet_rx.frame[IP6_HEADER_LEN:]
@@ -70,74 +109,6 @@ class Ip6Parser:
             f"IPv6 {self.src} > {self.dst}, next {self.next} ({IP6_NEXT_TABLE.get(self.next, '???')}), flow {self.flow}" + f", dlen {self.dlen}, hop {self.hop}"
         )
 
-    @property
-    def ver(self) -> int:
-        """Read 'Version' field"""
-
-        if "_cache__ver" not in self.__dict__:
-            self._cache__ver = self._frame[0] >> 4
-        return self._cache__ver
-
-    @property
-    def dscp(self) -> int:
-        """Read 'DSCP' field"""
-
-        if "_cache__dscp" not in self.__dict__:
-            self._cache__dscp = ((self._frame[0] & 0b00001111) << 2) | ((self._frame[1] & 0b11000000) >> 6)
-        return self._cache__dscp
-
-    @property
-    def ecn(self) -> int:
-        """Read 'ECN' field"""
-
-        if "_cache__ecn" not in self.__dict__:
-            self._cache__ecn = (self._frame[1] & 0b00110000) >> 4
-        return self._cache__ecn
-
-    @property
-    def flow(self) -> int:
-        """Read 'Flow' field"""
-
-        if "_cache__flow" not in self.__dict__:
-            self._cache__flow = ((self._frame[1] & 0b00001111) << 16) | (self._frame[2] << 8) | self._frame[3]
-        return self._cache__flow
-
-    @property
-    def dlen(self) -> int:
-        """Read 'Data length' field"""
-
-        if "_cache__dlen" not in self.__dict__:
-            self._cache__dlen: int = struct.unpack("!H", self._frame[4:6])[0]
-        return self._cache__dlen
-
-    @property
-    def next(self) -> int:
-        """Read 'Next' field"""
-
-        return self._frame[6]
-
-    @property
-    def hop(self) -> int:
-        """Read 'Hop' field"""
-
-        return self._frame[7]
-
-    @property
-    def src(self) -> Ip6Address:
-        """Read 'Source address' field"""
-
-        if "_cache__src" not in self.__dict__:
-            self._cache__src = Ip6Address(self._frame[8:24])
-        return self._cache__src
-
-    @property
-    def dst(self) -> Ip6Address:
-        """Read 'Destination address' field"""
-
-        if "_cache__dst" not in self.__dict__:
-            self._cache__dst = Ip6Address(self._frame[24:40])
-        return self._cache__dst
-
     @property
     def hlen(self) -> int:
         """Calculate header length"""
@@ -154,34 +125,37 @@ class Ip6Parser:
     def header_copy(self) -> bytes:
         """Return copy of packet header"""
 
-        if "_cache__header_copy" not in self.__dict__:
+        try:
+            return self._cache__header_copy
+        except AttributeError:
             self._cache__header_copy = bytes(self._frame[:IP6_HEADER_LEN])
-        return self._cache__header_copy
+            return self._cache__header_copy
 
     @property
     def data_copy(self) -> bytes:
         """Return copy of packet data"""
 
-        if "_cache__data_copy" not in self.__dict__:
+        try:
+            return self._cache__data_copy
+        except AttributeError:
             self._cache__data_copy = bytes(self._frame[IP6_HEADER_LEN : self.plen])
-        return self._cache__data_copy
+            return self._cache__data_copy
 
     @property
     def packet_copy(self) -> bytes:
         """Return copy of whole packet"""
 
-        if "_cache__packet_copy" not in self.__dict__:
+        try:
+            return self._cache__packet_copy
+        except AttributeError:
             self._cache__packet_copy = bytes(self._frame[: self.plen])
-        return self._cache__packet_copy
+            return self._cache__packet_copy
 
     @property
     def pshdr_sum(self) -> int:
         """Returns IPv6 pseudo header that is used by TCP, UDP and ICMPv6 to compute their checksums"""
 
-        if "_cache__pshdr_sum" not in self.__dict__:
-            pseudo_header = struct.pack("! 16s 16s L BBBB", bytes(self.src), bytes(self.dst), self.dlen, 0, 0, 0, self.next)
-            self._cache__pshdr_sum = sum(struct.unpack("! 5Q", pseudo_header))
-        return self._cache__pshdr_sum
+        return self._pshdr_sum
 
     def _packet_integrity_check(self) -> str:
         """Packet integrity check to be run on raw packet prior to parsing to make sure parsing is safe"""
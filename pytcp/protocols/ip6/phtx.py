@@ -36,6 +36,7 @@ from typing import TYPE_CHECKING
 import config
 from lib.ip6_address import Ip6Address
 from lib.logger import log
+from lib.mac_address import MacAddress
 from misc.tx_status import TxStatus
 from protocols.icmp6.fpa import (
     ICMP6_MLD2_REPORT,
@@ -46,6 +47,7 @@ from protocols.ip6.fpa import Ip6Assembler
 from protocols.raw.fpa import RawAssembler
 
 if TYPE_CHECKING:
+    from misc.tx_template import TxTemplateKey
     from protocols.ip6_ext_frag.fpa import Ip6ExtFragAssembler
     from protocols.tcp.fpa import TcpAssembler
     from protocols.udp.fpa import UdpAssembler
@@ -141,6 +143,27 @@ def _validate_dst_ip6_address(self, ip6_dst: Ip6Address, tracker) -> Ip6Address
     return ip6_dst
 
 
+def _route_ip6(
+    self, ip6_src: Ip6Address, ip6_dst: Ip6Address, carried_packet: Ip6ExtFragAssembler | Icmp6Assembler | TcpAssembler | UdpAssembler | RawAssembler
+) -> tuple[Ip6Address, MacAddress] | TxStatus:
+    """Validate packet addresses and resolve destination MAC, the result can be reused for following packets sent to the same destination"""
+
+    result = self._validate_src_ip6_address(ip6_src, ip6_dst, carried_packet)
+    if isinstance(result, TxStatus):
+        return result
+    ip6_src = result
+
+    result = self._validate_dst_ip6_address(ip6_dst, carried_packet.tracker)
+    if isinstance(result, TxStatus):
+        return result
+
+    mac_address = self._resolve_ether_dst_ip6(ip6_src, ip6_dst, carried_packet.tracker)
+    if isinstance(mac_address, TxStatus):
+        return mac_address
+
+    return ip6_src, mac_address
+
+
 def _phtx_ip6(
     self,
     *,
@@ -148,8 +171,10 @@ def _phtx_ip6(
     ip6_src: Ip6Address,
     ip6_hop: int = config.IP6_DEFAULT_HOP,
     carried_packet: Ip6ExtFragAssembler | Icmp6Assembler | TcpAssembler | UdpAssembler | RawAssembler | None = None,
+    ether_dst: MacAddress = MacAddress(0),
+    tx_template_key: TxTemplateKey | None = None,
 ) -> TxStatus:
-    """Handle outbound IP packets"""
+    """Handle outbound IP packets, packet with pre-resolved destination MAC is expected to have its addresses validated already"""
 
     if carried_packet is None:
         carried_packet = RawAssembler()
@@ -163,17 +188,18 @@ def _phtx_ip6(
         self.packet_stats_tx.ip6__no_proto_support__drop += 1
         return TxStatus.DROPED__IP6__NO_PROTOCOL_SUPPORT
 
-    # Validate source address
-    result = self._validate_src_ip6_address(ip6_src, ip6_dst, carried_packet)
-    if isinstance(result, TxStatus):
-        return result
-    ip6_src = result
+    if ether_dst.is_unspecified:
+        # Validate source address
+        result = self._validate_src_ip6_address(ip6_src, ip6_dst, carried_packet)
+        if isinstance(result, TxStatus):
+            return result
+        ip6_src = result
 
-    # Validate destination address
-    result = self._validate_dst_ip6_address(ip6_dst, carried_packet.tracker)
-    if isinstance(result, TxStatus):
-        return result
-    ip6_dst = result
+        # Validate destination address
+        result = self._validate_dst_ip6_address(ip6_dst, carried_packet.tracker)
+        if isinstance(result, TxStatus):
+            return result
+        ip6_dst = result
 
     # assemble IPv6 apcket
     ip6_packet_tx = Ip6Assembler(src=ip6_src, dst=ip6_dst, hop=ip6_hop, carried_packet=carried_packet)
@@ -183,7 +209,7 @@ def _phtx_ip6(
         self.packet_stats_tx.ip6__mtu_ok__send += 1
         if __debug__:
             log("ip6", f"{ip6_packet_tx.tracker} - {ip6_packet_tx}")
-        return self._phtx_ether(carried_packet=ip6_packet_tx)
+        return self._phtx_ether(ether_dst=ether_dst, carried_packet=ip6_packet_tx, tx_template_key=tx_template_key)
 
     # Fragment packet and send out
     self.packet_stats_tx.ip6__mtu_exceed__frag += 1
@@ -31,6 +31,9 @@
 
 from __future__ import annotations
 
+from lib.ip6_address import Ip6Address
+from misc.header_schema import HeaderField, HeaderSchema
+
 # IPv6 protocol header
 
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
@@ -56,7 +59,19 @@ from __future__ import annotations
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
 
 
-IP6_HEADER_LEN = 40
+IP6_HEADER = HeaderSchema(
+    HeaderField("ver", 4),
+    HeaderField("dscp", 6),
+    HeaderField("ecn", 2),
+    HeaderField("flow", 20),
+    HeaderField("dlen", 16),
+    HeaderField("next", 8),
+    HeaderField("hop", 8),
+    HeaderField("src", 128, type=Ip6Address),
+    HeaderField("dst", 128, type=Ip6Address),
+)
+
+IP6_HEADER_LEN = IP6_HEADER.len
 
 IP6_NEXT_TCP = 6
 IP6_NEXT_UDP = 17
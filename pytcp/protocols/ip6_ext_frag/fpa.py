@@ -31,8 +31,6 @@
 
 from __future__ import annotations
 
-import struct
-
 from lib.tracker import Tracker
 from protocols.ip6.ps import (
     IP6_NEXT_EXT_FRAG,
@@ -42,6 +40,7 @@ from protocols.ip6.ps import (
     IP6_NEXT_UDP,
 )
 from protocols.ip6_ext_frag.ps import (
+    IP6_EXT_FRAG_HEADER,
     IP6_EXT_FRAG_HEADER_LEN,
     IP6_EXT_FRAG_NEXT_HEADER_TABLE,
 )
@@ -59,7 +58,7 @@ class Ip6ExtFragAssembler:
         offset: int,
         flag_mf: bool,
         id: int,
-        data: bytes,
+        data: bytes | memoryview,
     ):
         """Class constructor"""
 
@@ -70,7 +69,7 @@ class Ip6ExtFragAssembler:
         self._offset: int = offset
         self._flag_mf: bool = flag_mf
         self._id: int = id
-        self._dataa: bytes = data
+        self._dataa: bytes | memoryview = data
         self._dlen: int = len(data)
         self._plen: int = len(self)
 
@@ -96,13 +95,5 @@ class Ip6ExtFragAssembler:
     def assemble(self, frame: memoryview, _: int) -> None:
         """Assemble packet into the raw form"""
 
-        struct.pack_into(
-            f"! BBH L {self._dlen}s",
-            frame,
-            0,
-            self._next,
-            0,
-            self._offset | self._flag_mf,
-            self._id,
-            bytes(self._dataa),  # memoryview: translation to bytes necessary
-        )
+        IP6_EXT_FRAG_HEADER.pack_into(frame, 0, self._next, self._offset, self._flag_mf, self._id)
+        frame[IP6_EXT_FRAG_HEADER_LEN : self._plen] = self._dataa
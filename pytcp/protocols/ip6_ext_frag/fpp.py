@@ -31,11 +31,11 @@
 
 from __future__ import annotations
 
-import struct
 from typing import TYPE_CHECKING
 
 import config
 from protocols.ip6_ext_frag.ps import (
+    IP6_EXT_FRAG_HEADER,
     IP6_EXT_FRAG_HEADER_LEN,
     IP6_EXT_FRAG_NEXT_HEADER_TABLE,
 )
@@ -45,7 +45,17 @@ if TYPE_CHECKING:
 
 
 class Ip6ExtFragParser:
-    """IPv6 fragmentation extension header parser class"""
+    """IPv6 fragmentation extension header parser class, header fields are decoded once when packet passes integrity check"""
+
+    __slots__ = ("_frame", "_plen", "next", "offset", "flag_mf", "id", "_cache__header_copy", "_cache__data_copy", "_cache__packet_copy")
+
+    next: int  # 'Next' field
+    offset: int  # 'Fragment offset' field
+    flag_mf: bool  # 'MF flag' field
+    id: int  # 'Identification' field
+    _cache__header_copy: bytes
+    _cache__data_copy: bytes
+    _cache__packet_copy: bytes
 
     def __init__(self, packet_rx: PacketRx) -> None:
         """Class constructor"""
@@ -57,7 +67,11 @@ class Ip6ExtFragParser:
         self._frame = packet_rx.frame
         self._plen = packet_rx.ip6.dlen
 
-        packet_rx.parse_failed = self._packet_integrity_check() or self._packet_sanity_check()
+        packet_rx.parse_failed = self._packet_integrity_check()
+
+        if not packet_rx.parse_failed:
+            IP6_EXT_FRAG_HEADER.unpack_into(self, self._frame)
+            packet_rx.parse_failed = self._packet_sanity_check()
 
         if not packet_rx.parse_failed:
             packet_rx.frame = packet_rx.frame[IP6_EXT_FRAG_HEADER_LEN:]
@@ -75,34 +89,6 @@ class Ip6ExtFragParser:
             + f", next {self.next} ({IP6_EXT_FRAG_NEXT_HEADER_TABLE.get(self.next, '???')})"
         )
 
-    @property
-    def next(self) -> int:
-        """Read 'Next' field"""
-
-        return self._frame[0]
-
-    @property
-    def offset(self) -> int:
-        """Read 'Fragment offset' field"""
-
-        if "_cache__offset" not in self.__dict__:
-            self._cache__offset: int = struct.unpack("!H", self._frame[2:4])[0] & 0b1111111111111000
-        return self._cache__offset
-
-    @property
-    def flag_mf(self) -> bool:
-        """Read 'MF flag' field"""
-
-        return bool(self._frame[3] & 0b00000001)
-
-    @property
-    def id(self) -> int:
-        """Read 'Identification' field"""
-
-        if "_cache__id" not in self.__dict__:
-            self._cache__id: int = struct.unpack("!L", self._frame[4:8])[0]
-        return self._cache__id
-
     @property
     def hlen(self) -> int:
         """Calculate header length"""
@@ -125,25 +111,31 @@ class Ip6ExtFragParser:
     def header_copy(self) -> bytes:
         """Return copy of packet header"""
 
-        if "_cache__header_copy" not in self.__dict__:
+        try:
+            return self._cache__header_copy
+        except AttributeError:
             self._cache__header_copy = bytes(self._frame[:IP6_EXT_FRAG_HEADER_LEN])
-        return self._cache__header_copy
+            return self._cache__header_copy
 
     @property
     def data_copy(self) -> bytes:
         """Return copy of packet data"""
 
-        if "_cache__data_copy" not in self.__dict__:
+        try:
+            return self._cache__data_copy
+        except AttributeError:
             self._cache__data_copy = bytes(self._frame[IP6_EXT_FRAG_HEADER_LEN : self.plen])
-        return self._cache__data_copy
+            return self._cache__data_copy
 
     @property
     def packet_copy(self) -> bytes:
         """Return copy of whole packet"""
 
-        if "_cache__packet_copy" not in self.__dict__:
+        try:
+            return self._cache__packet_copy
+        except AttributeError:
             self._cache__packet_copy = bytes(self._frame[: self.plen])
-        return self._cache__packet_copy
+            return self._cache__packet_copy
 
     def _packet_integrity_check(self) -> str:
         """Packet integrity check to be run on raw packet prior to parsing to make sure parsing is safe"""
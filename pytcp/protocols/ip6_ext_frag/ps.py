@@ -31,6 +31,8 @@
 
 from __future__ import annotations
 
+from misc.header_schema import HeaderField, HeaderSchema
+
 # IPv6 protocol fragmentation extension header
 
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
@@ -40,7 +42,16 @@ from __future__ import annotations
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
 
 
-IP6_EXT_FRAG_HEADER_LEN = 8
+IP6_EXT_FRAG_HEADER = HeaderSchema(
+    HeaderField("next", 8),
+    HeaderField("", 8),
+    HeaderField("offset", 13, scale=3),
+    HeaderField("", 2),
+    HeaderField("flag_mf", 1, type=bool),
+    HeaderField("id", 32),
+)
+
+IP6_EXT_FRAG_HEADER_LEN = IP6_EXT_FRAG_HEADER.len
 
 IP6_EXT_FRAG_NEXT_HEADER_TCP = 6
 IP6_EXT_FRAG_NEXT_HEADER_UDP = 17
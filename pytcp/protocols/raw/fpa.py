@@ -31,8 +31,6 @@
 
 from __future__ import annotations
 
-import struct
-
 from lib.tracker import Tracker
 from protocols.ether.ps import ETHER_TYPE_RAW
 from protocols.ip4.ps import IP4_PROTO_RAW
@@ -82,4 +80,4 @@ class RawAssembler:
     def assemble(self, frame: memoryview, _: int = 0) -> None:
         """Assemble packet into the raw form"""
 
-        struct.pack_into(f"! {len(self._data)}s", frame, 0, bytes(self._data))
+        frame[: self._plen] = self._data
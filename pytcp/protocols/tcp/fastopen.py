@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# protocols/tcp/fastopen.py - module contains TCP Fast Open cookie support (RFC 7413)
+#
+
+
+from __future__ import annotations
+
+import os
+from hashlib import blake2s
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from lib.ip_address import IpAddress
+
+
+FASTOPEN_COOKIE_LEN = 8  # Length of cookies generated by server
+FASTOPEN_CACHE_SIZE = 1024  # Number of servers client remembers cookies for
+
+_fastopen_secret = os.urandom(16)
+
+
+def fastopen_cookie(remote_ip_address: IpAddress) -> bytes:
+    """Generate Fast Open cookie for client, cookie is keyed hash of client's address so server doesn't need to keep any per client state"""
+
+    return blake2s(bytes(remote_ip_address), digest_size=FASTOPEN_COOKIE_LEN, key=_fastopen_secret).digest()
+
+
+class TcpFastOpenCache:
+    """Client side cache of Fast Open cookies received from servers, keyed by server's address"""
+
+    def __init__(self) -> None:
+        """Class constructor"""
+
+        self._cookies: dict[IpAddress, bytes] = {}
+
+    def __len__(self) -> int:
+        """Number of cached cookies"""
+
+        return len(self._cookies)
+
+    def add(self, remote_ip_address: IpAddress, cookie: bytes) -> None:
+        """Store cookie received from server, least recently stored cookie is evicted when cache is full"""
+
+        self._cookies.pop(remote_ip_address, None)
+        if len(self._cookies) >= FASTOPEN_CACHE_SIZE:
+            del self._cookies[next(iter(self._cookies))]
+        self._cookies[remote_ip_address] = cookie
+
+    def get(self, remote_ip_address: IpAddress) -> bytes | None:
+        """Find cookie for given server"""
+
+        return self._cookies.get(remote_ip_address, None)
+
+    def pop(self, remote_ip_address: IpAddress) -> bytes | None:
+        """Remove cookie server no longer accepts"""
+
+        return self._cookies.pop(remote_ip_address, None)
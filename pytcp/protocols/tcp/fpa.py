@@ -34,13 +34,16 @@ from __future__ import annotations
 import struct
 
 from lib.tracker import Tracker
-from misc.ip_helper import inet_cksum
+from misc.ip_helper import inet_cksum, inet_sum
 from protocols.ip4.ps import IP4_PROTO_TCP
 from protocols.ip6.ps import IP6_NEXT_TCP
 from protocols.tcp.ps import (
+    TCP_HEADER,
     TCP_HEADER_LEN,
     TCP_OPT_EOL,
     TCP_OPT_EOL_LEN,
+    TCP_OPT_FASTOPEN,
+    TCP_OPT_FASTOPEN_LEN,
     TCP_OPT_MSS,
     TCP_OPT_MSS_LEN,
     TCP_OPT_NOP,
@@ -78,11 +81,12 @@ class TcpAssembler:
         flag_fin: bool = False,
         win: int = 0,
         urp: int = 0,
-        options: list[TcpOptMss | TcpOptWscale | TcpOptSackPerm | TcpOptTimestamp | TcpOptEol | TcpOptNop] | None = None,
-        data: bytes | None = None,
+        options: list[TcpOptMss | TcpOptWscale | TcpOptSackPerm | TcpOptTimestamp | TcpOptFastOpen | TcpOptEol | TcpOptNop] | None = None,
+        data: bytes | memoryview | None = None,
+        data_sum: int | None = None,
         echo_tracker: Tracker | None = None,
     ) -> None:
-        """Class constructor"""
+        """Class constructor, data_sum is the precomputed inet_sum of data so it doesn't need to be summed again"""
 
         assert 0 <= sport <= 0xFFFF, f"{sport=}"
         assert 0 <= dport <= 0xFFFF, f"{dport=}"
@@ -107,9 +111,13 @@ class TcpAssembler:
         self._flag_fin: bool = flag_fin
         self._win: int = win
         self._urp: int = urp
-        self._options: list[TcpOptMss | TcpOptWscale | TcpOptSackPerm | TcpOptTimestamp | TcpOptEol | TcpOptNop] = [] if options is None else options
-        self._data: bytes = b"" if data is None else data
-        self._hlen: int = TCP_HEADER_LEN + sum(len(_) for _ in self._options)
+        self._options: list[TcpOptMss | TcpOptWscale | TcpOptSackPerm | TcpOptTimestamp | TcpOptFastOpen | TcpOptEol | TcpOptNop] = (
+            [] if options is None else options
+        )
+        self._data: bytes | memoryview = b"" if data is None else data
+        self._data_sum: int = inet_sum(self._data) if data_sum is None else data_sum
+        self._raw_options: bytes = b"".join(bytes(option) for option in self._options)
+        self._hlen: int = TCP_HEADER_LEN + len(self._raw_options)
 
         assert self._hlen % 4 == 0, f"TCP header len {self._hlen} is not multiplcation of 4 bytes, check options... {self._options}"
 
@@ -139,40 +147,37 @@ class TcpAssembler:
 
         return self._tracker
 
-    @property
-    def _raw_options(self) -> bytes:
-        """Packet options in raw format"""
-
-        return b"".join(bytes(option) for option in self._options)
-
     def assemble(self, frame: memoryview, pshdr_sum: int) -> None:
         """Assemble packet into the raw form"""
 
-        struct.pack_into(
-            f"! HH L L BBH HH {len(self._raw_options)}s {len(self._data)}s",
+        TCP_HEADER.pack_into(
             frame,
             0,
             self._sport,
             self._dport,
             self._seq,
             self._ack,
-            self._hlen << 2 | self._flag_ns,
-            self._flag_crw << 7
-            | self._flag_ece << 6
-            | self._flag_urg << 5
-            | self._flag_ack << 4
-            | self._flag_psh << 3
-            | self._flag_rst << 2
-            | self._flag_syn << 1
-            | self._flag_fin,
+            self._hlen,
+            self._flag_ns,
+            self._flag_crw,
+            self._flag_ece,
+            self._flag_urg,
+            self._flag_ack,
+            self._flag_psh,
+            self._flag_rst,
+            self._flag_syn,
+            self._flag_fin,
             self._win,
             0,
             self._urp,
-            self._raw_options,
-            self._data,
         )
+        frame[TCP_HEADER_LEN : self._hlen] = self._raw_options
 
-        struct.pack_into("! H", frame, 16, inet_cksum(frame, pshdr_sum))
+        # Data may be memoryview into TCP session's send queue, copy it directly into the frame
+        frame[self._hlen : self._hlen + len(self._data)] = self._data
+
+        # Header length is multiple of 4 bytes so data sum doesn't need to be adjusted for its offset
+        struct.pack_into("! H", frame, 16, inet_cksum(frame[: self._hlen], pshdr_sum + self._data_sum))
 
 
 #
@@ -366,3 +371,36 @@ class TcpOptTimestamp:
         """Equal operator"""
 
         return repr(self) == repr(other)
+
+
+class TcpOptFastOpen:
+    """TCP option - Fast Open Cookie (34)"""
+
+    def __init__(self, cookie: bytes = b"") -> None:
+        assert len(cookie) in {0, *range(4, 17, 2)}, f"{cookie=}"
+        self._cookie = cookie
+
+    def __str__(self) -> str:
+        """Option log string"""
+
+        return f"fastopen {self._cookie.hex() or 'request'}"
+
+    def __len__(self) -> int:
+        """Option length"""
+
+        return TCP_OPT_FASTOPEN_LEN + len(self._cookie)
+
+    def __repr__(self) -> str:
+        """Option representation"""
+
+        return f"TcpOptFastOpen({self._cookie!r})"
+
+    def __bytes__(self) -> bytes:
+        """Option in raw form"""
+
+        return struct.pack("! BB", TCP_OPT_FASTOPEN, TCP_OPT_FASTOPEN_LEN + len(self._cookie)) + self._cookie
+
+    def __eq__(self, other) -> bool:
+        """Equal operator"""
+
+        return repr(self) == repr(other)
@@ -37,15 +37,18 @@ from typing import TYPE_CHECKING
 import config
 from misc.ip_helper import inet_cksum
 from protocols.tcp.ps import (
+    TCP_HEADER,
     TCP_HEADER_LEN,
     TCP_OPT_EOL,
     TCP_OPT_EOL_LEN,
+    TCP_OPT_FASTOPEN,
     TCP_OPT_MSS,
     TCP_OPT_NOP,
     TCP_OPT_NOP_LEN,
     TCP_OPT_SACKPERM,
     TCP_OPT_TIMESTAMP,
     TCP_OPT_WSCALE,
+    TCP_OPTIONS,
 )
 
 if TYPE_CHECKING:
@@ -53,7 +56,69 @@ if TYPE_CHECKING:
 
 
 class TcpParser:
-    """TCP packet parser class"""
+    """TCP packet parser class, header fields are decoded once when packet passes integrity check, options only when needed"""
+
+    __slots__ = (
+        "_frame",
+        "_plen",
+        "sport",
+        "dport",
+        "seq",
+        "ack",
+        "hlen",
+        "flag_ns",
+        "flag_crw",
+        "flag_ece",
+        "flag_urg",
+        "flag_ack",
+        "flag_psh",
+        "flag_rst",
+        "flag_syn",
+        "flag_fin",
+        "win",
+        "cksum",
+        "urg",
+        "data",
+        "_cache__header_copy",
+        "_cache__options_copy",
+        "_cache__data_copy",
+        "_cache__packet_copy",
+        "_cache__options",
+        "_cache__mss",
+        "_cache__wscale",
+        "_cache__sackperm",
+        "_cache__timestamp",
+        "_cache__fastopen",
+    )
+
+    sport: int  # 'Source port' field
+    dport: int  # 'Destination port' field
+    seq: int  # 'Sequence number' field
+    ack: int  # 'Acknowledge number' field
+    hlen: int  # 'Header length' field
+    flag_ns: bool  # 'NS flag' field
+    flag_crw: bool  # 'CRW flag' field
+    flag_ece: bool  # 'ECE flag' field
+    flag_urg: bool  # 'URG flag' field
+    flag_ack: bool  # 'ACK flag' field
+    flag_psh: bool  # 'PSH flag' field
+    flag_rst: bool  # 'RST flag' field
+    flag_syn: bool  # 'SYN flag' field
+    flag_fin: bool  # 'FIN flag' field
+    win: int  # 'Window' field
+    cksum: int  # 'Checksum' field
+    urg: int  # 'Urgent pointer' field
+    data: memoryview  # Data packet carries
+    _cache__header_copy: bytes
+    _cache__options_copy: bytes
+    _cache__data_copy: bytes
+    _cache__packet_copy: bytes
+    _cache__options: list
+    _cache__mss: int
+    _cache__wscale: int | None
+    _cache__sackperm: bool | None
+    _cache__timestamp: tuple[int, int] | None
+    _cache__fastopen: bytes | None
 
     def __init__(self, packet_rx: PacketRx) -> None:
         """Class constructor"""
@@ -65,9 +130,14 @@ class TcpParser:
         self._frame = packet_rx.frame
         self._plen = packet_rx.ip.dlen
 
-        packet_rx.parse_failed = self._packet_integrity_check(packet_rx.ip.pshdr_sum) or self._packet_sanity_check()
+        packet_rx.parse_failed = self._packet_integrity_check(packet_rx.ip.pshdr_sum)
 
-        if packet_rx.parse_failed:
+        if not packet_rx.parse_failed:
+            TCP_HEADER.unpack_into(self, self._frame)
+            self.data = self._frame[self.hlen : self._plen]
+            packet_rx.parse_failed = self._packet_sanity_check()
+
+        if not packet_rx.parse_failed:
             packet_rx.frame = packet_rx.frame[self.hlen :]
 
     def __len__(self) -> int:
@@ -90,157 +160,11 @@ class TcpParser:
 
         return log
 
-    @property
-    def sport(self) -> int:
-        """Read 'Source port' field"""
-
-        if "_cache__sport" not in self.__dict__:
-            self._cache__sport: int = struct.unpack("!H", self._frame[0:2])[0]
-        return self._cache__sport
-
-    @property
-    def dport(self) -> int:
-        """Read 'Destianation port' field"""
-
-        if "_cache__dport" not in self.__dict__:
-            self._cache__dport: int = struct.unpack("!H", self._frame[2:4])[0]
-        return self._cache__dport
-
-    @property
-    def seq(self) -> int:
-        """Read 'Sequence number' field"""
-
-        if "_cache__seq" not in self.__dict__:
-            self._cache__seq: int = struct.unpack("!L", self._frame[4:8])[0]
-        return self._cache__seq
-
-    @property
-    def ack(self) -> int:
-        """Read 'Acknowledge number' field"""
-
-        if "_cache__ack" not in self.__dict__:
-            self._cache__ack: int = struct.unpack("!L", self._frame[8:12])[0]
-        return self._cache__ack
-
-    @property
-    def hlen(self) -> int:
-        """Read 'Header length' field"""
-
-        if "_cache__hlen" not in self.__dict__:
-            self._cache__hlen = (self._frame[12] & 0b11110000) >> 2
-        return self._cache__hlen
-
-    @property
-    def flag_ns(self) -> bool:
-        """Read 'NS flag' field"""
-
-        if "_cache__flag_ns" not in self.__dict__:
-            self._cache__flag_ns = bool(self._frame[12] & 0b00000001)
-        return self._cache__flag_ns
-
-    @property
-    def flag_crw(self) -> bool:
-        """Read 'CRW flag' field"""
-
-        if "_cache__flag_crw" not in self.__dict__:
-            self._cache__flag_crw = bool(self._frame[13] & 0b10000000)
-        return self._cache__flag_crw
-
-    @property
-    def flag_ece(self) -> bool:
-        """Read 'ECE flag' field"""
-
-        if "_cache__flag_ece" not in self.__dict__:
-            self._cache__flag_ece = bool(self._frame[13] & 0b01000000)
-        return self._cache__flag_ece
-
-    @property
-    def flag_urg(self) -> bool:
-        """Read 'URG flag' field"""
-
-        if "_cache__flag_urg" not in self.__dict__:
-            self._cache__flag_urg = bool(self._frame[13] & 0b00100000)
-        return self._cache__flag_urg
-
-    @property
-    def flag_ack(self) -> bool:
-        """Read 'ACK flag' field"""
-
-        if "_cache__flag_ack" not in self.__dict__:
-            self._cache__flag_ack = bool(self._frame[13] & 0b00010000)
-        return self._cache__flag_ack
-
-    @property
-    def flag_psh(self) -> bool:
-        """Read 'PSH flag' field"""
-
-        if "_cache__flag_psh" not in self.__dict__:
-            self._cache__flag_psh = bool(self._frame[13] & 0b00001000)
-        return self._cache__flag_psh
-
-    @property
-    def flag_rst(self) -> bool:
-        """Read 'RST flag' field"""
-
-        if "_cache__flag_rst" not in self.__dict__:
-            self._cache__flag_rst = bool(self._frame[13] & 0b00000100)
-        return self._cache__flag_rst
-
-    @property
-    def flag_syn(self) -> bool:
-        """Read 'SYN flag' field"""
-
-        if "_cache__flag_syn" not in self.__dict__:
-            self._cache__flag_syn = bool(self._frame[13] & 0b00000010)
-        return self._cache__flag_syn
-
-    @property
-    def flag_fin(self) -> bool:
-        """Read 'FIN flag' field"""
-
-        if "_cache__flag_fin" not in self.__dict__:
-            self._cache__flag_fin = bool(self._frame[13] & 0b00000001)
-        return self._cache__flag_fin
-
-    @property
-    def win(self) -> int:
-        """Read 'Window' field"""
-
-        if "_cache__win" not in self.__dict__:
-            self._cache__win: int = struct.unpack("!H", self._frame[14:16])[0]
-        return self._cache__win
-
-    @property
-    def cksum(self) -> int:
-        """Read 'Checksum' field"""
-
-        if "_cache__cksum" not in self.__dict__:
-            self._cache__cksum: int = struct.unpack("!H", self._frame[16:18])[0]
-        return self._cache__cksum
-
-    @property
-    def urg(self) -> int:
-        """Read 'Urgent pointer' field"""
-
-        if "_cache__urg" not in self.__dict__:
-            self._cache__urg: int = struct.unpack("!H", self._frame[18:20])[0]
-        return self._cache__urg
-
-    @property
-    def data(self) -> memoryview:
-        """Read the data packet carries"""
-
-        if "_cache__data" not in self.__dict__:
-            self._cache__data = self._frame[self.hlen : self.plen]
-        return self._cache__data
-
     @property
     def olen(self) -> int:
         """Calculate options length"""
 
-        if "_cache__olen" not in self.__dict__:
-            self._cache__olen = self.hlen - TCP_HEADER_LEN
-        return self._cache__olen
+        return self.hlen - TCP_HEADER_LEN
 
     @property
     def dlen(self) -> int:
@@ -258,55 +182,71 @@ class TcpParser:
     def header_copy(self) -> bytes:
         """Return copy of packet header"""
 
-        if "_cache__header_copy" not in self.__dict__:
+        try:
+            return self._cache__header_copy
+        except AttributeError:
             self._cache__header_copy = bytes(self._frame[:TCP_HEADER_LEN])
-        return self._cache__header_copy
+            return self._cache__header_copy
 
     @property
     def options_copy(self) -> bytes:
         """Return copy of packet header"""
 
-        if "_cache__options_copy" not in self.__dict__:
+        try:
+            return self._cache__options_copy
+        except AttributeError:
             self._cache__options_copy = bytes(self._frame[TCP_HEADER_LEN : self.hlen])
-        return self._cache__options_copy
+            return self._cache__options_copy
 
     @property
     def data_copy(self) -> bytes:
         """Return copy of packet data"""
 
-        if "_cache__data_copy" not in self.__dict__:
+        try:
+            return self._cache__data_copy
+        except AttributeError:
             self._cache__data_copy = bytes(self._frame[self.hlen : self.plen])
-        return self._cache__data_copy
+            return self._cache__data_copy
 
     @property
     def packet_copy(self) -> bytes:
         """Return copy of whole packet"""
 
-        if "_cache__packet_copy" not in self.__dict__:
+        try:
+            return self._cache__packet_copy
+        except AttributeError:
             self._cache__packet_copy = bytes(self._frame[: self.plen])
-        return self._cache__packet_copy
+            return self._cache__packet_copy
 
     @property
-    def options(self) -> list[TcpOptMss | TcpOptWscale | TcpOptSackPerm | TcpOptTimestamp | TcpOptUnk | TcpOptEol | TcpOptNop]:
+    def options(self) -> list[TcpOptMss | TcpOptWscale | TcpOptSackPerm | TcpOptTimestamp | TcpOptFastOpen | TcpOptUnk | TcpOptEol | TcpOptNop]:
         """Read list of options"""
 
-        if "_cache__options" not in self.__dict__:
-            self._cache__options: list = []
-            optr = TCP_HEADER_LEN
-            while optr < self.hlen:
-                if self._frame[optr] == TCP_OPT_EOL:
-                    self._cache__options.append(TcpOptEol())
-                    break
-                if self._frame[optr] == TCP_OPT_NOP:
-                    self._cache__options.append(TcpOptNop())
-                    optr += TCP_OPT_NOP_LEN
-                    continue
-                self._cache__options.append(
-                    {TCP_OPT_MSS: TcpOptMss, TCP_OPT_WSCALE: TcpOptWscale, TCP_OPT_SACKPERM: TcpOptSackPerm, TCP_OPT_TIMESTAMP: TcpOptTimestamp}.get(
-                        self._frame[optr], TcpOptUnk
-                    )(self._frame[optr:])
-                )
-                optr += self._frame[optr + 1]
+        try:
+            return self._cache__options
+        except AttributeError:
+            pass
+
+        self._cache__options = []
+        optr = TCP_HEADER_LEN
+        while optr < self.hlen:
+            if self._frame[optr] == TCP_OPT_EOL:
+                self._cache__options.append(TcpOptEol())
+                break
+            if self._frame[optr] == TCP_OPT_NOP:
+                self._cache__options.append(TcpOptNop())
+                optr += TCP_OPT_NOP_LEN
+                continue
+            self._cache__options.append(
+                {
+                    TCP_OPT_MSS: TcpOptMss,
+                    TCP_OPT_WSCALE: TcpOptWscale,
+                    TCP_OPT_SACKPERM: TcpOptSackPerm,
+                    TCP_OPT_TIMESTAMP: TcpOptTimestamp,
+                    TCP_OPT_FASTOPEN: TcpOptFastOpen,
+                }.get(self._frame[optr], TcpOptUnk)(self._frame[optr:])
+            )
+            optr += self._frame[optr + 1]
 
         return self._cache__options
 
@@ -314,54 +254,87 @@ class TcpParser:
     def mss(self) -> int:
         """TCP option - Maximum Segment Size (2)"""
 
-        if "_cache__mss" not in self.__dict__:
-            for option in self.options:
-                if isinstance(option, TcpOptMss):
-                    self._cache__mss = option.mss
-                    break
-            else:
-                self._cache__mss = 536
+        try:
+            return self._cache__mss
+        except AttributeError:
+            pass
+
+        for option in self.options:
+            if isinstance(option, TcpOptMss):
+                self._cache__mss = option.mss
+                break
+        else:
+            self._cache__mss = 536
         return self._cache__mss
 
     @property
     def wscale(self) -> int | None:
         """TCP option - Window Scale (3)"""
 
-        if "_cache__wscale" not in self.__dict__:
-            for option in self.options:
-                if isinstance(option, TcpOptWscale):
-                    self._cache__wscale: int | None = 1 << option.wscale
-                    break
-            else:
-                self._cache__wscale = None
+        try:
+            return self._cache__wscale
+        except AttributeError:
+            pass
+
+        for option in self.options:
+            if isinstance(option, TcpOptWscale):
+                self._cache__wscale = 1 << option.wscale
+                break
+        else:
+            self._cache__wscale = None
         return self._cache__wscale
 
     @property
     def sackperm(self) -> bool | None:
         """TCP option - Sack Permit (4)"""
 
-        if "_cache__sackperm" not in self.__dict__:
-            for option in self.options:
-                if isinstance(option, TcpOptSackPerm):
-                    self._cache__sackperm: bool | None = True
-                    break
-            else:
-                self._cache__sackperm = None
+        try:
+            return self._cache__sackperm
+        except AttributeError:
+            pass
+
+        for option in self.options:
+            if isinstance(option, TcpOptSackPerm):
+                self._cache__sackperm = True
+                break
+        else:
+            self._cache__sackperm = None
         return self._cache__sackperm
 
     @property
     def timestamp(self) -> tuple[int, int] | None:
         """TCP option - Timestamp (8)"""
 
-        if "_cache__timestamp" not in self.__dict__:
-            for option in self.options:
-                if isinstance(option, TcpOptTimestamp):
-                    self._cache__timestamp: tuple[int, int] | None = (option.tsval, option.tsecr)
-                    break
-            else:
-                self._cache__timestamp = None
+        try:
+            return self._cache__timestamp
+        except AttributeError:
+            pass
+
+        for option in self.options:
+            if isinstance(option, TcpOptTimestamp):
+                self._cache__timestamp = (option.tsval, option.tsecr)
+                break
+        else:
+            self._cache__timestamp = None
         return self._cache__timestamp
 
+    @property
+    def fastopen(self) -> bytes | None:
+        """TCP option - Fast Open Cookie (34)"""
+
+        try:
+            return self._cache__fastopen
+        except AttributeError:
+            pass
+
+        for option in self.options:
+            if isinstance(option, TcpOptFastOpen):
+                self._cache__fastopen = option.cookie
+                break
+        else:
+            self._cache__fastopen = None
+        return self._cache__fastopen
+
     def _packet_integrity_check(self, pshdr_sum: int) -> str:
         """Packet integrity check to be run on raw frame prior to parsing to make sure parsing is safe"""
 
@@ -378,22 +351,8 @@ class TcpParser:
         if not TCP_HEADER_LEN <= hlen <= self._plen <= len(self):
             return "TCP integrity - wrong packet length (II)"
 
-        optr = TCP_HEADER_LEN
-        while optr < hlen:
-            if self._frame[optr] == TCP_OPT_EOL:
-                break
-            if self._frame[optr] == TCP_OPT_NOP:
-                optr += 1
-                if optr > hlen:
-                    return "TCP integrity - wrong option length (I)"
-                continue
-            if optr + 1 > hlen:
-                return "TCP integrity - wrong option length (II)"
-            if self._frame[optr + 1] == 0:
-                return "TCP integrity - wrong option length (III)"
-            optr += self._frame[optr + 1]
-            if optr > hlen:
-                return "TCP integrity - wrong option length (IV)"
+        if failed_check := TCP_OPTIONS.integrity_check(self._frame, TCP_HEADER_LEN, hlen):
+            return f"TCP integrity - wrong option length ({failed_check})"
 
         return ""
 
@@ -472,7 +431,7 @@ class TcpOptNop:
 class TcpOptMss:
     """TCP option - Maximum Segment Size (2)"""
 
-    def __init__(self, frame: bytes) -> None:
+    def __init__(self, frame: bytes | memoryview) -> None:
         self.kind = frame[0]
         self.len = frame[1]
         self.mss: int = struct.unpack_from("!H", frame, 2)[0]
@@ -491,7 +450,7 @@ class TcpOptMss:
 class TcpOptWscale:
     """TCP option - Window Scale (3)"""
 
-    def __init__(self, frame: bytes) -> None:
+    def __init__(self, frame: bytes | memoryview) -> None:
         self.kind = frame[0]
         self.len = frame[1]
         self.wscale = frame[2]
@@ -510,7 +469,7 @@ class TcpOptWscale:
 class TcpOptSackPerm:
     """TCP option - Sack Permit (4)"""
 
-    def __init__(self, frame: bytes) -> None:
+    def __init__(self, frame: bytes | memoryview) -> None:
         self.kind = frame[0]
         self.len = frame[1]
 
@@ -528,7 +487,7 @@ class TcpOptSackPerm:
 class TcpOptTimestamp:
     """TCP option - Timestamp (8)"""
 
-    def __init__(self, frame: bytes) -> None:
+    def __init__(self, frame: bytes | memoryview) -> None:
         self.kind = frame[0]
         self.len = frame[1]
         self.tsval: int = struct.unpack_from("!L", frame, 2)[0]
@@ -545,10 +504,29 @@ class TcpOptTimestamp:
         return self.len
 
 
+class TcpOptFastOpen:
+    """TCP option - Fast Open Cookie (34)"""
+
+    def __init__(self, frame: bytes | memoryview) -> None:
+        self.kind = frame[0]
+        self.len = frame[1]
+        self.cookie = bytes(frame[2 : self.len])
+
+    def __str__(self) -> str:
+        """Option log string"""
+
+        return f"fastopen {self.cookie.hex() or 'request'}"
+
+    def __len__(self) -> int:
+        """Option length"""
+
+        return self.len
+
+
 class TcpOptUnk:
     """TCP option not supported by this stack"""
 
-    def __init__(self, frame: bytes) -> None:
+    def __init__(self, frame: bytes | memoryview) -> None:
         self.kind = frame[0]
         self.len = frame[1]
         self.data = frame[2 : self.len]
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# protocols/tcp/info.py - module contains snapshot of TCP session statistics, the TCP_INFO socket option
+#
+
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class TcpInfo:
+    """Snapshot of TCP session parameters and counters"""
+
+    state: str
+    rtt: float | None  # Smoothed round trip time in milliseconds, None until first measurement
+    snd_mss: int
+    rcv_mss: int
+    snd_wnd: int
+    snd_cwnd: int
+    rcv_wnd: int
+    segments_in_flight: int
+    bytes_in_flight: int
+    bytes_unsent: int
+    bytes_unread: int
+    bytes_out_of_order: int
+    segments_sent: int
+    segments_received: int
+    bytes_sent: int
+    bytes_acked: int
+    bytes_received: int
+    retransmits: int
+    bytes_retransmitted: int
+    timeouts: int
+    state_times: dict[str, float] = field(default_factory=dict)  # Seconds spent in each state, including the current one
+
+    def __str__(self) -> str:
+        """Info log string"""
+
+        return (
+            f"{self.state}, rtt {'-' if self.rtt is None else f'{self.rtt:.1f}ms'}, mss {self.snd_mss}/{self.rcv_mss}, "
+            + f"wnd {self.snd_wnd}/{self.rcv_wnd}, cwnd {self.snd_cwnd}, in flight {self.segments_in_flight}/{self.bytes_in_flight}, "
+            + f"unsent {self.bytes_unsent}, unread {self.bytes_unread}, ooo {self.bytes_out_of_order}, "
+            + f"segments {self.segments_sent}/{self.segments_received}, bytes {self.bytes_sent}/{self.bytes_acked}/{self.bytes_received}, "
+            + f"retransmits {self.retransmits}/{self.bytes_retransmitted}, timeouts {self.timeouts}, "
+            + "states "
+            + " ".join(f"{state}:{seconds:.1f}s" for state, seconds in self.state_times.items())
+        )
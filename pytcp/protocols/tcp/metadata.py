@@ -33,14 +33,45 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from protocols.ip4.ps import IP4_PROTO_TCP
+
 if TYPE_CHECKING:
     from lib.ip_address import IpAddress
+    from lib.socket_table import SocketId
     from lib.tracker import Tracker
+    from protocols.tcp.time_wait import TcpTimeWaitEntry
+
+
+def tcp_socket_id(local_ip_address: IpAddress, local_port: int, remote_ip_address: IpAddress, remote_port: int) -> SocketId:
+    """Key of the TCP socket in stack socket table, IPv4 protocol and IPv6 next header numbers of TCP are the same so key is built the same way for both"""
+
+    return (local_ip_address.version, IP4_PROTO_TCP, int(local_ip_address), local_port, int(remote_ip_address), remote_port)
 
 
 class TcpMetadata:
     """Store TCP metadata for the RX packet"""
 
+    __slots__ = (
+        "local_ip_address",
+        "local_port",
+        "remote_ip_address",
+        "remote_port",
+        "flag_syn",
+        "flag_ack",
+        "flag_fin",
+        "flag_rst",
+        "seq",
+        "ack",
+        "win",
+        "wscale",
+        "mss",
+        "fastopen",
+        "data",
+        "tracker",
+        "socket_id",
+        "time_wait",
+    )
+
     def __init__(
         self,
         local_ip_address: IpAddress,
@@ -56,6 +87,7 @@ class TcpMetadata:
         win: int,
         wscale: int | None,
         mss: int,
+        fastopen: bytes | None,
         data: memoryview,
         tracker: Tracker | None,
     ):
@@ -72,19 +104,13 @@ class TcpMetadata:
         self.win = win
         self.wscale = wscale
         self.mss = mss
+        self.fastopen = fastopen
         self.data = data
         self.tracker = tracker
+        self.socket_id: SocketId = tcp_socket_id(local_ip_address, local_port, remote_ip_address, remote_port)
+        self.time_wait: TcpTimeWaitEntry | None = None  # Connection in TIME_WAIT state whose 4-tuple is being reused by SYN packet
 
     def __str__(self) -> str:
         """String representation"""
 
         return f"AF_INET{self.local_ip_address.version}/SOCK_STREAM/{self.local_ip_address}/{self.local_port}/{self.remote_ip_address}/{self.remote_port}"
-
-    @property
-    def tcp_listening_socket_patterns(self) -> list[str]:
-        """Session ID patterns that match listening socket"""
-
-        return [
-            f"AF_INET{self.local_ip_address.version}/SOCK_STREAM/{self.local_ip_address}/{self.local_port}/{self.local_ip_address.unspecified}/0",
-            f"AF_INET{self.local_ip_address.version}/SOCK_STREAM/{self.local_ip_address.unspecified}/{self.local_port}/{self.local_ip_address.unspecified}/0",
-        ]
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# protocols/tcp/ooo_queue.py - module contains TCP out of order reassembly queue
+#
+
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+
+import config
+import misc.stack as stack
+
+OOO_QUEUE_INTERVAL_OVERHEAD = 128  # Memory cost accounted for every stored interval on top of its data, prevents tiny segment floods
+
+
+class TcpOooBudget:
+    """Memory accounted by all the out of order queues in the stack, sessions run on different threads so it is guarded by lock"""
+
+    def __init__(self) -> None:
+        """Class constructor"""
+
+        self._size: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Getter for _size"""
+
+        return self._size
+
+    def reserve(self, size: int) -> bool:
+        """Account memory if global limit allows it"""
+
+        with self._lock:
+            if self._size + size > config.TCP_OOO_QUEUE_GLOBAL_LIMIT:
+                return False
+            self._size += size
+            return True
+
+    def release(self, size: int) -> None:
+        """Return memory to global budget"""
+
+        with self._lock:
+            self._size -= size
+
+
+class TcpOooQueue:
+    """Sorted list of non overlapping intervals of data received ahead of 'rcv_nxt', intervals whose edges touch are merged into one"""
+
+    def __init__(self) -> None:
+        """Class constructor"""
+
+        self._seqs: list[int] = []
+        self._ends: list[int] = []
+        self._chunks: list[list[memoryview]] = []  # Data of each interval, kept as received pieces so merging doesn't need to copy it
+        self._size: int = 0  # Memory accounted by this queue
+
+    def __len__(self) -> int:
+        """Number of stored intervals"""
+
+        return len(self._seqs)
+
+    @property
+    def size(self) -> int:
+        """Getter for _size"""
+
+        return self._size
+
+    def _store(self, index: int, seq: int, data: memoryview) -> bool:
+        """Store piece of data in front of interval at given index, merge it with neighbours it touches, if memory budget allows it"""
+
+        end = seq + len(data)
+        merge_left = index > 0 and self._ends[index - 1] == seq
+        merge_right = index < len(self._seqs) and self._seqs[index] == end
+
+        # Merged piece adds no interval, piece joining two intervals takes one away
+        size = len(data) + OOO_QUEUE_INTERVAL_OVERHEAD * (1 - merge_left - merge_right)
+        if size > 0 and (self._size + size > config.TCP_OOO_QUEUE_SESSION_LIMIT or not stack.tcp_ooo_budget.reserve(size)):
+            return False
+        if size < 0:
+            stack.tcp_ooo_budget.release(-size)
+        self._size += size
+
+        # Copy small pieces of data so they don't pin whole received frames in memory
+        if isinstance(data.obj, (bytes, bytearray)) and len(data) < len(data.obj) >> 1:
+            data = memoryview(bytes(data))
+
+        if merge_left and merge_right:
+            self._chunks[index - 1] += [data, *self._chunks[index]]
+            self._ends[index - 1] = self._ends[index]
+            del self._seqs[index], self._ends[index], self._chunks[index]
+        elif merge_left:
+            self._chunks[index - 1].append(data)
+            self._ends[index - 1] = end
+        elif merge_right:
+            self._chunks[index].insert(0, data)
+            self._seqs[index] = seq
+        else:
+            self._seqs.insert(index, seq)
+            self._ends.insert(index, end)
+            self._chunks.insert(index, [data])
+        return True
+
+    def insert(self, seq: int, data: memoryview) -> int:
+        """Store parts of segment not covered by already queued intervals, return number of stored bytes"""
+
+        end = seq + len(data)
+        cursor = seq
+        stored = 0
+
+        while cursor < end:
+            index = max(bisect_right(self._seqs, cursor) - 1, 0)
+            # Skip part covered by interval that starts at or before cursor
+            if index < len(self._seqs) and self._seqs[index] <= cursor < self._ends[index]:
+                cursor = self._ends[index]
+                continue
+            if index < len(self._seqs) and self._seqs[index] <= cursor:
+                index += 1
+            # Store part that fits in the hole before next interval
+            hole_end = min(end, self._seqs[index]) if index < len(self._seqs) else end
+            if not self._store(index, cursor, data[cursor - seq : hole_end - seq]):
+                break
+            stored += hole_end - cursor
+            cursor = hole_end
+
+        return stored
+
+    def pop_contiguous(self, rcv_nxt: int) -> list[memoryview]:
+        """Dequeue data that became contiguous with 'rcv_nxt', trim the part already received"""
+
+        chunks: list[memoryview] = []
+        count = 0
+        while count < len(self._seqs) and self._seqs[count] <= rcv_nxt:
+            if self._ends[count] > rcv_nxt:
+                skip = rcv_nxt - self._seqs[count]
+                for data in self._chunks[count]:
+                    if skip < len(data):
+                        chunks.append(data[skip:])
+                    skip = max(skip - len(data), 0)
+                rcv_nxt = self._ends[count]
+            count += 1
+
+        self._release(count)
+        return chunks
+
+    def clear(self) -> None:
+        """Drop all stored intervals and return their memory to global budget"""
+
+        self._release(len(self._seqs))
+
+    def _release(self, count: int) -> None:
+        """Remove given number of intervals from the head of queue"""
+
+        if count:
+            size = sum(end - seq for seq, end in zip(self._seqs[:count], self._ends[:count])) + count * OOO_QUEUE_INTERVAL_OVERHEAD
+            del self._seqs[:count]
+            del self._ends[:count]
+            del self._chunks[:count]
+            self._size -= size
+            stack.tcp_ooo_budget.release(size)
@@ -31,11 +31,12 @@
 
 from __future__ import annotations
 
+import config
 import misc.stack as stack
 from lib.logger import log
 from misc.packet import PacketRx
 from protocols.tcp.fpp import TcpParser
-from protocols.tcp.metadata import TcpMetadata
+from protocols.tcp.metadata import TcpMetadata, tcp_socket_id
 
 
 def _phrx_tcp(self, packet_rx: PacketRx) -> None:
@@ -56,6 +57,13 @@ def _phrx_tcp(self, packet_rx: PacketRx) -> None:
 
     assert isinstance(packet_rx.tcp.data, memoryview)  # memoryview: data type check point
 
+    # Header prediction, in-order packet of ESTABLISHED session gets handled directly from parsed header without running full TCP FSM
+    if (
+        tcp_session := stack.tcp_fast_path.get(tcp_socket_id(packet_rx.ip.dst, packet_rx.tcp.dport, packet_rx.ip.src, packet_rx.tcp.sport))
+    ) and tcp_session.tcp_fast_path(packet_rx.tcp):
+        self.packet_stats_rx.tcp__socket_match_active__fast_path += 1
+        return
+
     # Create TcpMetadata object for further processing by TCP FSM
     packet_rx_md = TcpMetadata(
         local_ip_address=packet_rx.ip.dst,
@@ -71,27 +79,65 @@ def _phrx_tcp(self, packet_rx: PacketRx) -> None:
         win=packet_rx.tcp.win,
         wscale=packet_rx.tcp.wscale,
         mss=packet_rx.tcp.mss,
+        fastopen=packet_rx.tcp.fastopen,
         data=packet_rx.tcp.data,  # memoryview: passing as memoryview for tcp session to consume, no need to convert to bytes here
         tracker=packet_rx.tracker,
     )
 
     # Check if incoming packet matches active TCP socket
-    if tcp_socket := stack.sockets.get(str(packet_rx_md), None):
+    if tcp_socket := stack.sockets.get(packet_rx_md.socket_id, None):
         self.packet_stats_rx.tcp__socket_match_active__forward_to_socket += 1
         if __debug__:
             log("tcp", f"{packet_rx_md.tracker} - <INFO>TCP packet is part of active socket [{tcp_socket}]</>")
         tcp_socket.process_tcp_packet(packet_rx_md)
         return
 
-    # Check if incoming packet is an initial SYN packet and if it matches any listening TCP socket
-    if all({packet_rx_md.flag_syn}) and not any({packet_rx_md.flag_ack, packet_rx_md.flag_fin, packet_rx_md.flag_rst}):
-        for tcp_listening_socket_pattern in packet_rx_md.tcp_listening_socket_patterns:
-            if tcp_socket := stack.sockets.get(tcp_listening_socket_pattern, None):
-                self.packet_stats_rx.tcp__socket_match_listening__forward_to_socket += 1
-                if __debug__:
-                    log("tcp", f"{packet_rx_md.tracker} - <INFO>TCP packet matches listening socket [{tcp_socket}]</>")
-                tcp_socket.process_tcp_packet(packet_rx_md)
-                return
+    # Check if incoming packet belongs to connection in TIME_WAIT state
+    if time_wait := stack.tcp_time_wait.get(packet_rx_md.socket_id):
+        # New SYN packet with SEQ past the old connection may reuse its 4-tuple (RFC 1122 4.2.2.13), listener picks initial SEQ past the old one too
+        if (
+            all({packet_rx_md.flag_syn})
+            and not any({packet_rx_md.flag_ack, packet_rx_md.flag_fin, packet_rx_md.flag_rst})
+            and time_wait.accepts_syn(packet_rx_md.seq)
+        ):
+            self.packet_stats_rx.tcp__socket_match_time_wait__reuse += 1
+            packet_rx_md.time_wait = stack.tcp_time_wait.pop(packet_rx_md.socket_id)
+        # RST packet closes the connection only if it carries exactly expected SEQ, blind ones are ignored (RFC 1337, RFC 5961)
+        elif packet_rx_md.flag_rst:
+            if packet_rx_md.seq == time_wait.rcv_nxt:
+                stack.tcp_time_wait.pop(packet_rx_md.socket_id)
+            self.packet_stats_rx.tcp__socket_match_time_wait__drop += 1
+            return
+        # Any other packet (most likely retransmitted FIN) gets ACK packet in response and restarts the TIME_WAIT delay
+        else:
+            self.packet_stats_rx.tcp__socket_match_time_wait__respond_ack += 1
+            if __debug__:
+                log("tcp", f"{packet_rx_md.tracker} - <INFO>TCP packet is part of connection in TIME_WAIT state, responding with TCP ACK packet</>")
+            if packet_rx_md.flag_fin:
+                stack.tcp_time_wait.add(packet_rx_md.socket_id, snd_nxt=time_wait.snd_nxt, rcv_nxt=time_wait.rcv_nxt)
+            self._phtx_tcp(
+                ip_src=packet_rx.ip.dst,
+                ip_dst=packet_rx.ip.src,
+                tcp_sport=packet_rx.tcp.dport,
+                tcp_dport=packet_rx.tcp.sport,
+                tcp_seq=time_wait.snd_nxt,
+                tcp_ack=time_wait.rcv_nxt,
+                tcp_flag_ack=True,
+                tcp_win=config.LOCAL_TCP_WIN,
+                echo_tracker=packet_rx.tracker,
+            )
+            return
+
+    # Check if incoming packet is an initial SYN packet (or ACK / RST packet related to half-open connection) and if it matches any listening TCP socket
+    if (all({packet_rx_md.flag_syn}) and not any({packet_rx_md.flag_ack, packet_rx_md.flag_fin, packet_rx_md.flag_rst})) or (
+        any({packet_rx_md.flag_ack, packet_rx_md.flag_rst}) and not packet_rx_md.flag_syn
+    ):
+        if tcp_socket := stack.sockets.get_bound(packet_rx_md.socket_id):
+            self.packet_stats_rx.tcp__socket_match_listening__forward_to_socket += 1
+            if __debug__:
+                log("tcp", f"{packet_rx_md.tracker} - <INFO>TCP packet matches listening socket [{tcp_socket}]</>")
+            tcp_socket.process_tcp_packet(packet_rx_md)
+            return
 
     # In case packet doesn't match any session send RST packet in response to it
     self.packet_stats_rx.tcp__no_socket_match__respond_rst += 1
@@ -39,6 +39,7 @@ from misc.tx_status import TxStatus
 from protocols.tcp.fpa import (
     TcpAssembler,
     TcpOptEol,
+    TcpOptFastOpen,
     TcpOptMss,
     TcpOptNop,
     TcpOptSackPerm,
@@ -70,16 +71,19 @@ def _phtx_tcp(
     tcp_flag_fin: bool = False,
     tcp_mss: int | None = None,
     tcp_wscale: int | None = None,
+    tcp_fastopen: bytes | None = None,
     tcp_win: int = 0,
     tcp_urp: int = 0,
-    tcp_data: bytes | None = None,
+    tcp_data: bytes | memoryview | None = None,
+    tcp_data_sum: int | None = None,
     echo_tracker: Tracker | None = None,
+    tx_template: bool = False,
 ) -> TxStatus:
-    """Handle outbound TCP packets"""
+    """Handle outbound TCP packets, packet without options may be sent using its flow TX template if requested"""
 
     self.packet_stats_tx.tcp__pre_assemble += 1
 
-    tcp_options: list[TcpOptMss | TcpOptWscale | TcpOptSackPerm | TcpOptTimestamp | TcpOptEol | TcpOptNop] = []
+    tcp_options: list[TcpOptMss | TcpOptWscale | TcpOptSackPerm | TcpOptTimestamp | TcpOptFastOpen | TcpOptEol | TcpOptNop] = []
 
     if tcp_mss:
         self.packet_stats_tx.tcp__opt_mss += 1
@@ -91,6 +95,14 @@ def _phtx_tcp(
         tcp_options.append(TcpOptNop())
         tcp_options.append(TcpOptWscale(tcp_wscale))
 
+    # Empty Fast Open cookie is a cookie request, NOP options keep the header aligned to 4 bytes
+    if tcp_fastopen is not None:
+        self.packet_stats_tx.tcp__opt_fastopen += 1
+        for _ in range(-len(TcpOptFastOpen(tcp_fastopen)) % 4):
+            self.packet_stats_tx.tcp__opt_nop += 1
+            tcp_options.append(TcpOptNop())
+        tcp_options.append(TcpOptFastOpen(tcp_fastopen))
+
     tcp_packet_tx = TcpAssembler(
         sport=tcp_sport,
         dport=tcp_dport,
@@ -109,6 +121,7 @@ def _phtx_tcp(
         urp=tcp_urp,
         options=tcp_options,
         data=tcp_data,
+        data_sum=tcp_data_sum,
         echo_tracker=echo_tracker,
     )
 
@@ -142,13 +155,19 @@ def _phtx_tcp(
     if __debug__:
         log("tcp", f"{tcp_packet_tx.tracker} - {tcp_packet_tx}")
 
+    tx_template_key = ("tcp", ip_src, ip_dst, tcp_sport, tcp_dport) if tx_template and not tcp_options else None
+
+    if tx_template_key is not None and (tx_status := self._phtx_ether_template(tx_template_key=tx_template_key, carried_packet=tcp_packet_tx)) is not None:
+        self.packet_stats_tx.tcp__send += 1
+        return tx_status
+
     if ip_src.is_ip6 and ip_dst.is_ip6:
         self.packet_stats_tx.tcp__send += 1
-        return self._phtx_ip6(ip6_src=ip_src, ip6_dst=ip_dst, carried_packet=tcp_packet_tx)
+        return self._phtx_ip6(ip6_src=ip_src, ip6_dst=ip_dst, carried_packet=tcp_packet_tx, tx_template_key=tx_template_key)
 
     if ip_src.is_ip4 and ip_dst.is_ip4:
         self.packet_stats_tx.tcp__send += 1
-        return self._phtx_ip4(ip4_src=ip_src, ip4_dst=ip_dst, carried_packet=tcp_packet_tx)
+        return self._phtx_ip4(ip4_src=ip_src, ip4_dst=ip_dst, carried_packet=tcp_packet_tx, tx_template_key=tx_template_key)
 
     self.packet_stats_tx.tcp__unknown__drop += 1
     return TxStatus.DROPED__TCP__UNKNOWN
@@ -31,6 +31,8 @@
 
 from __future__ import annotations
 
+from misc.header_schema import HeaderField, HeaderSchema, OptionsSchema
+
 # TCP packet header (RFC 793)
 
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
@@ -48,7 +50,28 @@ from __future__ import annotations
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
 
 
-TCP_HEADER_LEN = 20
+TCP_HEADER = HeaderSchema(
+    HeaderField("sport", 16),
+    HeaderField("dport", 16),
+    HeaderField("seq", 32),
+    HeaderField("ack", 32),
+    HeaderField("hlen", 4, scale=2),
+    HeaderField("", 3),
+    HeaderField("flag_ns", 1, type=bool),
+    HeaderField("flag_crw", 1, type=bool),
+    HeaderField("flag_ece", 1, type=bool),
+    HeaderField("flag_urg", 1, type=bool),
+    HeaderField("flag_ack", 1, type=bool),
+    HeaderField("flag_psh", 1, type=bool),
+    HeaderField("flag_rst", 1, type=bool),
+    HeaderField("flag_syn", 1, type=bool),
+    HeaderField("flag_fin", 1, type=bool),
+    HeaderField("win", 16),
+    HeaderField("cksum", 16),
+    HeaderField("urg", 16),
+)
+
+TCP_HEADER_LEN = TCP_HEADER.len
 
 
 #
@@ -67,6 +90,8 @@ TCP_OPT_EOL_LEN = 1
 TCP_OPT_NOP = 1
 TCP_OPT_NOP_LEN = 1
 
+TCP_OPTIONS = OptionsSchema(eol=TCP_OPT_EOL, nop=TCP_OPT_NOP)
+
 
 # TCP option - Maximum Segment Size (2)
 
@@ -90,3 +115,9 @@ TCP_OPT_SACKPERM_LEN = 2
 
 TCP_OPT_TIMESTAMP = 8
 TCP_OPT_TIMESTAMP_LEN = 10
+
+
+# TCP option - Fast Open Cookie (34), cookie is 4 to 16 bytes long, empty cookie is a cookie request (RFC 7413)
+
+TCP_OPT_FASTOPEN = 34
+TCP_OPT_FASTOPEN_LEN = 2
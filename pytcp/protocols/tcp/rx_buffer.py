@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# protocols/tcp/rx_buffer.py - module contains TCP receive buffer
+#
+
+
+from __future__ import annotations
+
+from collections import deque
+
+
+class TcpRxBuffer:
+    """Queue of memoryview chunks referencing received frames, data is copied only once when application reads it"""
+
+    def __init__(self) -> None:
+        """Class constructor"""
+
+        self._chunks: deque[memoryview] = deque()
+        self._len: int = 0
+
+    def __len__(self) -> int:
+        """Number of bytes waiting to be read by application"""
+
+        return self._len
+
+    def append(self, data: memoryview) -> None:
+        """Enqueue received data without copying it"""
+
+        if data:
+            self._chunks.append(data)
+            self._len += len(data)
+
+    def _consume(self, count: int) -> list[memoryview]:
+        """Dequeue chunks covering up to 'count' bytes"""
+
+        parts: list[memoryview] = []
+        remaining = min(count, self._len)
+        while remaining:
+            chunk = self._chunks[0]
+            if len(chunk) > remaining:
+                self._chunks[0] = chunk[remaining:]
+                chunk = chunk[:remaining]
+            else:
+                self._chunks.popleft()
+            parts.append(chunk)
+            remaining -= len(chunk)
+        self._len -= sum(len(_) for _ in parts)
+        return parts
+
+    def read(self, count: int | None = None) -> bytes:
+        """Dequeue up to 'count' bytes into new bytes object"""
+
+        parts = self._consume(self._len if count is None else count)
+        if len(parts) == 1:
+            return bytes(parts[0])
+        return b"".join(parts)
+
+    def read_into(self, buffer: memoryview | bytearray, count: int | None = None) -> int:
+        """Dequeue up to 'count' bytes directly into provided buffer, return number of bytes copied"""
+
+        buffer = memoryview(buffer).cast("B")
+        optr = 0
+        for part in self._consume(len(buffer) if count is None else min(count, len(buffer))):
+            buffer[optr : optr + len(part)] = part
+            optr += len(part)
+        return optr
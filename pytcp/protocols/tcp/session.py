@@ -33,25 +33,46 @@ from __future__ import annotations
 
 import random
 import threading
+import time
 from enum import Enum, auto
 from typing import TYPE_CHECKING, Any, Callable
 
 import config
 import misc.stack as stack
 from lib.logger import log
+from misc.ip_helper import inet_sum
+from protocols.tcp.fastopen import fastopen_cookie
+from protocols.tcp.info import TcpInfo
+from protocols.tcp.ooo_queue import TcpOooQueue
+from protocols.tcp.rx_buffer import TcpRxBuffer
+from protocols.tcp.syn_cache import (
+    TcpSynCacheEntry,
+    syn_cookie_decode,
+    syn_cookie_encode,
+)
+from protocols.tcp.time_wait import TIME_WAIT_ISN_GAP
+from protocols.tcp.tx_buffer import TcpRetransmitQueue, TcpSegment, TcpTxBuffer
 
 if TYPE_CHECKING:
     from threading import Lock, RLock, Semaphore
 
     from lib.ip_address import IpAddress
     from lib.socket import Socket
+    from lib.socket_table import SocketId
+    from protocols.tcp.fpp import TcpParser
     from protocols.tcp.metadata import TcpMetadata
 
 
 PACKET_RETRANSMIT_TIMEOUT = 1000  # Retransmit data if ACK not received
 PACKET_RETRANSMIT_MAX_COUNT = 3  # If data is not acked, retransit it 5 times
-DELAYED_ACK_DELAY = 100  # Delay between consecutive delayed ACK outbound packets
-TIME_WAIT_DELAY = 30000  # 30s delay for the TIME_WAIT state, default is 30-120s
+SYN_CACHE_SWEEP_INTERVAL = 100  # Interval between checks for SYN + ACK retransmissions of half-open connections
+DELAYED_ACK_DELAY = 100  # Delay of ACK for received data, used until RTT has been measured
+DELAYED_ACK_DELAY_MIN = 20  # Lower bound of RTT based ACK delay
+DELAYED_ACK_DELAY_MAX = 200  # Upper bound of RTT based ACK delay, RFC 1122 requires it to be less than 500ms
+QUICK_ACK_COUNT = 16  # Number of data segments acknowledged immediately at the start of connection or after idle period to speed up peer's window growth
+PERSIST_TIMEOUT = 1000  # Initial interval between zero window probes
+PERSIST_TIMEOUT_MAX = 60000  # Upper bound of the exponentially backed off interval between zero window probes
+RCV_WSCALE = min(max((config.TCP_RCV_BUFFER_MAX - 1).bit_length() - 16, 0), 14)  # Window scale shift letting receive buffer grow up to its limit
 
 
 class TcpSessionError(Exception):
@@ -120,17 +141,17 @@ def trace_fsm(function: Callable) -> Callable:
 def trace_win(self) -> None:
     """Method used to trace sliding window operation, invoke as 'trace_win(self)' from within the TcpSession object"""
 
-    remaining_data_len = len(self._tx_buffer) - self._tx_buffer_nxt
-    usable_window = self._tx_buffer_una + self._snd_ewn - self._tx_buffer_nxt
+    remaining_data_len = len(self._tx_buffer)
+    usable_window = self._snd_una + self._snd_ewn - self._snd_nxt
     transmit_data_len = min(self._snd_mss, usable_window, remaining_data_len)
     print("unsent_data:", remaining_data_len)
     print("usable_window:", usable_window)
     print("transmit_data_len:", transmit_data_len)
     print("self._snd_nxt:", self._snd_nxt)
     print("self._snd_una:", self._snd_una)
-    print("self._tx_buffer_seq_mod:", self._tx_buffer_seq_mod)
-    print("self._tx_buffer_nxt:", self._tx_buffer_nxt)
-    print("self._tx_buffer_una:", self._tx_buffer_una)
+    print("self._snd_max:", self._snd_max)
+    print("segments_in_flight:", len(self._tx_retransmit_queue))
+    print("bytes_in_flight:", self._tx_retransmit_queue.bytes_in_flight)
 
 
 class TcpSession:
@@ -152,16 +173,27 @@ class TcpSession:
         self._remote_port: int = remote_port
         self._socket: Socket = socket  # Keeps track of the socket that owns this session for the session -> socket communication purposes
 
-        self._rx_buffer: bytearray = bytearray()  # Keeps data received from peer and not received by application yet
-        self._tx_buffer: bytearray = bytearray()  # Keeps data sent by application but not acknowledged by peer yet
+        self._rx_buffer: TcpRxBuffer = TcpRxBuffer()  # Keeps data received from peer and not received by application yet
+        self._tx_buffer: TcpTxBuffer = TcpTxBuffer()  # Keeps data sent by application but not transmitted yet
+        self._tx_retransmit_queue: TcpRetransmitQueue = TcpRetransmitQueue()  # Keeps segments transmitted but not acknowledged by peer yet
 
         # Receiving window parameters
         self._rcv_ini: int = 0  # Initial seq number
         self._rcv_nxt: int = 0  # Next seq to be received
         self._rcv_una: int = 0  # Seq we acked
         self._rcv_mss: int = config.TAP_MTU - 40  # Maximum segment size
-        self._rcv_wnd: int = 65535  # Window size
+        self._rcv_buf: int = config.LOCAL_TCP_WIN  # Receive buffer size, grows with application's consumption rate (Dynamic Right-Sizing)
+        self._rcv_wnd: int = min(self._rcv_buf, 0xFFFF)  # Window size
+        self._rcv_adv: int = 0  # Right edge of the advertised window
         self._rcv_wsc: int = 1  # Window scale
+        self._rcv_rtt: float | None = None  # Receiver's estimate of RTT, time it takes to receive one window of data
+        self._rcv_rtt_mark: int = 0  # Amount of received data that ends current RTT measurement
+        self._rcv_rtt_time: float = 0.0  # Start time of current RTT measurement
+        self._rcv_space_copied: int = 0  # Data read by application since last receive buffer auto-tuning
+        self._rcv_space_time: float = time.monotonic()  # Time of last receive buffer auto-tuning
+        self._rcv_mss_est: int = 536  # Estimate of peer's segment size, the largest data segment received so far
+        self._rcv_quick_ack: int = QUICK_ACK_COUNT  # Number of data segments still to be acknowledged without delay
+        self._rcv_data_time: float = time.monotonic()  # Time the last data segment was received, used to detect idle connection
 
         # Sending window parameters
         self._snd_ini: int = random.randint(0, 0xFFFFFFFF)  # Initial seq number
@@ -173,17 +205,11 @@ class TcpSession:
         self._snd_wnd: int = self._snd_mss  # Window size
         self._snd_ewn: int = self._snd_mss  # Effective window size, used as simple congestion management mechanism
         self._snd_wsc: int = 1  # Window scale, initialized to 1 because initial SYN / SYN + ACK packets don't use wscale for backward compatibility
+        self._srtt: float | None = None  # Smoothed round trip time (RFC 6298), in seconds
+        self._snd_persist: int = 0  # Current zero window probe interval, zero when persist timer is not running
 
-        # Keeps track of number of DUP packets sent by peer to determine if any is a retransmit request
-        self._tx_retransmit_request_counter: dict[int, int] = {}
-
-        # Keeps track of the timestamps for the sent out packets, used to determine when to retransmit packet
-        self._tx_retransmit_timeout_counter: dict[int, int] = {}
-
-        # Keeps track of us sending 'fast retransmit request' packets so we can limit their count to 2
-        self._rx_retransmit_request_counter: dict[int, int] = {}
-
-        self._tx_buffer_seq_mod: int = self._snd_ini  # Used to help translate local_seq_send and snd_una numbers to TX buffer pointers
+        # Keeps track of number of DUP packets sent by peer for current snd_una to determine if any is a retransmit request
+        self._tx_retransmit_request_counter: int = 0
 
         self._state: FsmState = FsmState.CLOSED  # TCP FSM (Finite FsmState Machine) state
 
@@ -196,12 +222,32 @@ class TcpSession:
 
         self._closing: bool = False  # Indicates that CLOSE syscall is in progress, this lets to finish sending data before FIN packet is transmitted
 
-        self._ooo_packet_queue: dict[int, TcpMetadata] = {}  # Out of order packet buffer
+        self._ooo_queue: TcpOooQueue = TcpOooQueue()  # Out of order data reassembly queue
+
+        self._syn_cache: dict[SocketId, TcpSynCacheEntry] = {}  # Half-open inbound connections, used by listening session only
+        self._defer_accept: bool = False  # Indicates that accept call is to be informed about this session once first data arrives
+
+        self._fastopen: bool = False  # Indicates that session uses TCP Fast Open and can carry data before three way handshake completes
+        self._fastopen_sessions: list[TcpSession] = []  # Sessions opened with Fast Open cookie, used by listening session only
 
         self._connection_error: ConnError = ConnError.NONE  # Used to report cause of connection failure
 
+        self._finished: bool = False  # Indicates that session reached CLOSED state after being used, stops its FSM timer
+
+        # Statistics reported by TCP_INFO socket option
+        self._stat_segments_sent: int = 0
+        self._stat_segments_received: int = 0
+        self._stat_bytes_sent: int = 0
+        self._stat_bytes_acked: int = 0
+        self._stat_bytes_received: int = 0
+        self._stat_retransmits: int = 0
+        self._stat_bytes_retransmitted: int = 0
+        self._stat_timeouts: int = 0
+        self._stat_state_times: dict[FsmState, float] = {}  # Time spent in each of the past states
+        self._stat_state_change_time: float = time.monotonic()
+
         # Setup timer to execute FSM time event every millisecond
-        stack.timer.register_method(method=self.tcp_fsm, kwargs={"timer": True})
+        stack.timer.register_method(method=self.tcp_fsm, kwargs={"timer": True}, stop_condition=lambda: self._finished)
 
     def __str__(self) -> str:
         """String representation"""
@@ -245,16 +291,35 @@ class TcpSession:
         return self._state
 
     @property
-    def _tx_buffer_nxt(self) -> int:
-        """'snd_nxt' number relative to TX buffer"""
-
-        return max(self._snd_nxt - self._tx_buffer_seq_mod, 0)
+    def info(self) -> TcpInfo:
+        """Snapshot of session parameters and statistics"""
 
-    @property
-    def _tx_buffer_una(self) -> int:
-        """'snd_una' number relative to TX buffer"""
-
-        return max(self._snd_una - self._tx_buffer_seq_mod, 0)
+        with self._lock_fsm:
+            state_times = {str(state): seconds for state, seconds in self._stat_state_times.items()}
+            state_times[str(self._state)] = state_times.get(str(self._state), 0.0) + time.monotonic() - self._stat_state_change_time
+            return TcpInfo(
+                state=str(self._state),
+                rtt=None if self._srtt is None else self._srtt * 1000,
+                snd_mss=self._snd_mss,
+                rcv_mss=self._rcv_mss,
+                snd_wnd=self._snd_wnd,
+                snd_cwnd=self._snd_ewn,
+                rcv_wnd=self._rcv_wnd,
+                segments_in_flight=len(self._tx_retransmit_queue),
+                bytes_in_flight=self._tx_retransmit_queue.bytes_in_flight,
+                bytes_unsent=len(self._tx_buffer),
+                bytes_unread=len(self._rx_buffer),
+                bytes_out_of_order=self._ooo_queue.size,
+                segments_sent=self._stat_segments_sent,
+                segments_received=self._stat_segments_received,
+                bytes_sent=self._stat_bytes_sent,
+                bytes_acked=self._stat_bytes_acked,
+                bytes_received=self._stat_bytes_received,
+                retransmits=self._stat_retransmits,
+                bytes_retransmitted=self._stat_bytes_retransmitted,
+                timeouts=self._stat_timeouts,
+                state_times=state_times,
+            )
 
     def listen(self) -> None:
         """LISTEN syscall"""
@@ -263,8 +328,18 @@ class TcpSession:
             log("tcp-ss", f"[{self}] - <ly>[{self._state}]</> - got <r>LISTEN</> syscall")
         self.tcp_fsm(syscall=SysCall.LISTEN)
 
-    def connect(self) -> None:
-        """CONNECT syscall"""
+    def connect(self, fastopen_data: bytes | None = None) -> None:
+        """CONNECT syscall, optional Fast Open data is sent in SYN packet if cookie for the server is known already"""
+
+        if fastopen_data is not None:
+            self._fastopen = True
+            self._tx_buffer.append(fastopen_data)
+
+        # Connection reusing 4-tuple of one in TIME_WAIT state starts past its sequence space so old duplicates can't be taken for new data
+        if time_wait := stack.tcp_time_wait.pop(self._socket.socket_id):
+            self._snd_ini = self._snd_nxt = self._snd_max = self._snd_una = (time_wait.snd_nxt + TIME_WAIT_ISN_GAP) & 0xFFFFFFFF
+            if __debug__:
+                log("tcp-ss", f"[{self}] - Reusing 4-tuple of connection in TIME_WAIT state, initial SEQ {self._snd_ini}")
 
         if __debug__:
             log("tcp-ss", f"[{self}] - <ly>[{self._state}]</> - got <r>CONNECT</> syscall")
@@ -278,38 +353,81 @@ class TcpSession:
     def send(self, data: bytes) -> int:
         """SEND syscall"""
 
-        if self._state in {FsmState.ESTABLISHED, FsmState.CLOSE_WAIT}:
+        if self._state in {FsmState.SYN_RCVD, FsmState.ESTABLISHED, FsmState.CLOSE_WAIT}:
+            with self._lock_tx_buffer:
+                return self._tx_buffer.append(data)
+
+        # This error should be risen when session is localy or fully closed
+        raise TcpSessionError("TCP session not in ESTABLISED or CLOSE_WAIT state")
+
+    def send_mapped(self, data: memoryview) -> int:
+        """SEND syscall for content of memory mapped file, TX buffer references the data instead of copying it"""
+
+        if self._state in {FsmState.SYN_RCVD, FsmState.ESTABLISHED, FsmState.CLOSE_WAIT}:
             with self._lock_tx_buffer:
-                self._tx_buffer.extend(data)
-                return len(data)
+                return self._tx_buffer.append_mapped(data)
 
         # This error should be risen when session is localy or fully closed
         raise TcpSessionError("TCP session not in ESTABLISED or CLOSE_WAIT state")
 
-    def receive(self, byte_count=None) -> bytes:
+    def receive(self, byte_count: int | None = None, timeout: float | None = None) -> bytes:
         """RECEIVE syscall"""
 
         # Wait till there is any data in the buffer (this will get bypassed when FSM goes into CLOSE_WAIT or CLOSED)
-        self._event_rx_buffer.acquire()
+        if not self._event_rx_buffer.acquire(timeout=timeout):
+            raise TcpSessionError("Receive timeout")
 
         # If there is no data in RX buffer and remote end closed connection then notify application by returning empty byte string
         if not self._rx_buffer and self._state in {FsmState.CLOSE_WAIT, FsmState.CLOSED}:
             return b""
 
         with self._lock_rx_buffer:
-            if byte_count is None:
-                byte_count = len(self._rx_buffer)
-            else:
-                byte_count = min(byte_count, len(self._rx_buffer))
+            data_rx = self._rx_buffer.read(byte_count)
+            self._release_rx_buffer_event()
 
-            rx_buffer = self._rx_buffer[:byte_count]
-            del self._rx_buffer[:byte_count]
+        self._autotune_rcv_buf(len(data_rx))
 
-            # If there is any data left in buffer or the remote end closed connection then release the rx_buffer event
-            if self._rx_buffer or self._state in {FsmState.CLOSE_WAIT, FsmState.CLOSED}:
-                self._event_rx_buffer.release()
+        return data_rx
+
+    def receive_into(self, buffer: memoryview | bytearray, byte_count: int | None = None, timeout: float | None = None) -> int:
+        """RECEIVE syscall, data is copied directly into provided buffer"""
+
+        # Wait till there is any data in the buffer (this will get bypassed when FSM goes into CLOSE_WAIT or CLOSED)
+        if not self._event_rx_buffer.acquire(timeout=timeout):
+            raise TcpSessionError("Receive timeout")
+
+        # If there is no data in RX buffer and remote end closed connection then notify application by returning zero
+        if not self._rx_buffer and self._state in {FsmState.CLOSE_WAIT, FsmState.CLOSED}:
+            return 0
+
+        with self._lock_rx_buffer:
+            data_rx_len = self._rx_buffer.read_into(buffer, byte_count)
+            self._release_rx_buffer_event()
+
+        self._autotune_rcv_buf(data_rx_len)
+
+        return data_rx_len
 
-        return bytes(rx_buffer)
+    def _autotune_rcv_buf(self, data_len: int) -> None:
+        """Grow receive buffer to twice the data application consumes within one RTT (Dynamic Right-Sizing), up to the largest window we can advertise"""
+
+        self._rcv_space_copied += data_len
+        if (rtt := self._rcv_rtt if self._rcv_rtt is not None else self._srtt) is None:
+            return
+        if (now := time.monotonic()) - self._rcv_space_time < rtt:
+            return
+        if (rcv_buf := min(self._rcv_space_copied * 2, config.TCP_RCV_BUFFER_MAX, 0xFFFF * self._rcv_wsc)) > self._rcv_buf:
+            if __debug__:
+                log("tcp-ss", f"[{self}] - Receive buffer auto-tuned {self._rcv_buf} -> {rcv_buf}")
+            self._rcv_buf = rcv_buf
+        self._rcv_space_copied = 0
+        self._rcv_space_time = now
+
+    def _release_rx_buffer_event(self) -> None:
+        """If there is any data left in buffer or the remote end closed connection then release the rx_buffer event"""
+
+        if self._rx_buffer or self._state in {FsmState.CLOSE_WAIT, FsmState.CLOSED}:
+            self._event_rx_buffer.release()
 
     def close(self) -> None:
         """CLOSE syscall"""
@@ -323,13 +441,26 @@ class TcpSession:
 
         old_state = self._state
         self._state = state
+
+        now = time.monotonic()
+        self._stat_state_times[old_state] = self._stat_state_times.get(old_state, 0.0) + now - self._stat_state_change_time
+        self._stat_state_change_time = now
         if old_state:
             if __debug__:
                 log("tcp-ss", f"[{self}] - <ly>[{old_state} -> {self._state}]</>")
 
+        # Only ESTABLISHED session is subject to header prediction
+        if self._state is FsmState.ESTABLISHED:
+            stack.tcp_fast_path[self._socket.socket_id] = self
+        elif old_state is FsmState.ESTABLISHED:
+            stack.tcp_fast_path.pop(self._socket.socket_id, None)
+
         # Unregister session
         if self._state in {FsmState.CLOSED}:
-            stack.sockets.pop(str(self._socket))
+            self._finished = True
+            self._ooo_queue.clear()
+            self._syn_cache.clear()
+            stack.sockets.discard(self._socket.socket_id, self._socket)
             if __debug__:
                 log("tcp-ss", f"[{self}] - Unregister associated socket")
 
@@ -340,12 +471,17 @@ class TcpSession:
         flag_ack: bool = False,
         flag_fin: bool = False,
         flag_rst: bool = False,
-        data: bytes | None = None,
+        data: memoryview | None = None,
+        data_sum: int | None = None,
+        fastopen: bytes | None = None,
     ) -> None:
-        """Send out TCP packet"""
+        """Send out TCP packet, data sum gets computed once and kept with the segment in retransmit queue"""
 
         seq = seq if seq is not None else self._snd_nxt
+        if data is not None and data_sum is None:
+            data_sum = inet_sum(data)
         ack = self._rcv_nxt if flag_ack else 0
+        win = self._rcv_wnd_field(flag_syn)
 
         stack.packet_handler.send_tcp_packet(
             local_ip_address=self._local_ip_address,
@@ -358,28 +494,29 @@ class TcpSession:
             flag_rst=flag_rst,
             seq=seq,
             ack=ack,
-            win=self._rcv_wnd,
+            win=win,
             mss=self._rcv_mss if flag_syn else None,
-            wscale=0 if flag_syn else None,
+            wscale=RCV_WSCALE if flag_syn and (self._state is FsmState.SYN_SENT or self._rcv_wsc > 1) else None,
+            fastopen=fastopen,
             data=data,
+            data_sum=data_sum,
+            tx_template=not (flag_syn or flag_rst),
         )
         self._rcv_una = self._rcv_nxt
         self._snd_nxt = seq + (0 if data is None else len(data)) + flag_syn + flag_fin
-        self._snd_max = max(self._snd_max, self._snd_nxt)
-        self._tx_buffer_seq_mod += flag_syn + flag_fin
+        self._stat_segments_sent += 1
 
         # In case packet caries FIN flag make note of its SEQ number
         if flag_fin:
             self._snd_fin = self._snd_nxt
 
-        # If in ESTABLISHED state then reset ACK delay timer
-        if self._state is FsmState.ESTABLISHED:
-            stack.timer.register_timer(f"{self}-delayed_ack", DELAYED_ACK_DELAY)
-
-        # If packet contains data then Initialize / adjust packet's retransmit counter and timer
-        if data or flag_syn or flag_fin:
-            self._tx_retransmit_timeout_counter[seq] = self._tx_retransmit_timeout_counter.get(seq, -1) + 1
-            stack.timer.register_timer(f"{self}-retransmit_seq-{seq}", PACKET_RETRANSMIT_TIMEOUT * (1 << self._tx_retransmit_timeout_counter[seq]))
+        # If packet carries new data (or SYN / FIN) then put it into retransmit queue, start retransmit timer if it's not running already
+        if self._snd_nxt > self._snd_max:
+            if not self._tx_retransmit_queue:
+                stack.timer.register_timer(f"{self}-retransmit", PACKET_RETRANSMIT_TIMEOUT)
+            self._tx_retransmit_queue.enqueue(TcpSegment(seq=seq, data=data, data_sum=data_sum, flag_syn=flag_syn, flag_fin=flag_fin, fastopen=fastopen))
+            self._snd_max = self._snd_nxt
+            self._stat_bytes_sent += 0 if data is None else len(data)
 
         if __debug__:
             log(
@@ -388,40 +525,123 @@ class TcpSession:
                 + f"{'A' if flag_ack else ''}, seq {seq}, ack {ack}, dlen {(0 if data is None else len(data))}",
             )
 
+    def _rcv_wnd_field(self, flag_syn: bool) -> int:
+        """Compute receive window out of free receive buffer space and return value for the window field, window in SYN packet is never scaled"""
+
+        rcv_wsc = 1 if flag_syn else self._rcv_wsc
+        free = max(self._rcv_buf - len(self._rx_buffer), 0)
+        current = 0 if flag_syn else max(self._rcv_adv - self._rcv_nxt, 0)
+
+        # Right window edge never moves back and window doesn't open by less than a segment or half of the buffer (receiver SWS avoidance, RFC 1122)
+        if free < current or free - current < min(self._rcv_buf // 2, self._rcv_mss):
+            win = -(-current // rcv_wsc)
+        else:
+            win = free // rcv_wsc
+        win = min(win, 0xFFFF)
+
+        self._rcv_wnd = win * rcv_wsc
+        self._rcv_adv = self._rcv_nxt + self._rcv_wnd
+        return win
+
+    def _window_update(self) -> None:
+        """Send window update once application frees enough of receive buffer to at least double the window peer knows about"""
+
+        # Free space is limited by the largest window that can be advertised, otherwise update would be sent on every tick without opening the window
+        free = max(min(self._rcv_buf, 0xFFFF * self._rcv_wsc) - len(self._rx_buffer), 0)
+        current = max(self._rcv_adv - self._rcv_nxt, 0)
+        if free >= 2 * current and free - current >= min(self._rcv_buf // 2, self._rcv_mss):
+            self._transmit_packet(flag_ack=True)
+            if __debug__:
+                log("tcp-ss", f"[{self}] - Sent window update ({self._rcv_wnd})")
+
     def _enqueue_rx_buffer(self, data: memoryview) -> None:
         """Process the incoming segment and enqueue the data to be used by socket"""
 
         assert isinstance(data, memoryview)  # memoryview: check to ensure data gets here as memoryview not bytes
 
+        self._stat_bytes_received += len(data)
+
+        # Measure time it takes to receive one window of data, it serves as receiver's RTT estimate for receive buffer auto-tuning
+        if self._stat_bytes_received >= self._rcv_rtt_mark:
+            now = time.monotonic()
+            if self._rcv_rtt_mark:
+                rtt = now - self._rcv_rtt_time
+                self._rcv_rtt = rtt if self._rcv_rtt is None else self._rcv_rtt * 0.875 + rtt * 0.125
+            self._rcv_rtt_mark = self._stat_bytes_received + max(self._rcv_wnd, self._rcv_mss)
+            self._rcv_rtt_time = now
+
         with self._lock_rx_buffer:
-            self._rx_buffer.extend(data)
+            self._rx_buffer.append(data)
             # If rx_buffer event has not been released yet (it could be released if some data were siting in buffer already) then release it
             if not self._event_rx_buffer._value:  # type: ignore
                 self._event_rx_buffer.release()
 
+    def _retransmit_segment(self, segment: TcpSegment) -> None:
+        """Send out again the segment from retransmit queue, data is not copied"""
+
+        if __debug__:
+            log("tcp-ss", f"[{self}] - Retransmitting segment: {segment}")
+        self._transmit_packet(
+            seq=segment.seq,
+            flag_syn=segment.flag_syn,
+            flag_ack=self._state is not FsmState.SYN_SENT,
+            flag_fin=segment.flag_fin,
+            data=segment.data,
+            data_sum=segment.data_sum,
+            fastopen=segment.fastopen,
+        )
+        segment.send_time = time.monotonic()
+        segment.retransmit_count += 1
+        self._stat_retransmits += 1
+        self._stat_bytes_retransmitted += len(segment.data)
+        if segment is self._tx_retransmit_queue.head:
+            stack.timer.register_timer(f"{self}-retransmit", PACKET_RETRANSMIT_TIMEOUT * (1 << segment.retransmit_count))
+
     def _transmit_data(self) -> None:
         """Send out data segment from TX buffer using TCP sliding window mechanism"""
 
-        assert self._snd_una <= self._snd_nxt <= self._snd_una + self._snd_ewn, "*** SEQ outside of TCP sliding window"
+        assert self._snd_una <= self._snd_nxt, "*** SEQ outside of TCP sliding window"
+
+        # Check if we need to retransmit segment(s) that have been sent out already
+        if self._snd_nxt < self._snd_max:
+            if segment := self._tx_retransmit_queue.find(self._snd_nxt):
+                if segment.flag_syn or segment.flag_fin or segment.end <= self._snd_una + self._snd_ewn:
+                    self._retransmit_segment(segment)
+            return
 
-        # Check if we need to (re)transmit initial SYN packet
+        # Check if we need to transmit initial SYN packet
         if self._state is FsmState.SYN_SENT and self._snd_nxt == self._snd_ini:
+            # Fast Open session carries data in SYN packet if server gave us cookie already, otherwise it requests cookie for the next connection
+            if self._fastopen and (cookie := stack.tcp_fastopen_cache.get(self._remote_ip_address)):
+                # SYN takes one SEQ number out of the initial window, application may have given no data to send
+                transmit_data = None
+                if self._tx_buffer:
+                    with self._lock_tx_buffer:
+                        transmit_data = self._tx_buffer.take(min(self._snd_ewn - 1, len(self._tx_buffer)))
+                if __debug__:
+                    log(
+                        "tcp-ss",
+                        f"[{self}] - Transmitting initial SYN packet_rx_md with Fast Open data: seq {self._snd_nxt}, "
+                        + f"len {0 if transmit_data is None else len(transmit_data)}",
+                    )
+                self._transmit_packet(flag_syn=True, data=transmit_data, fastopen=cookie)
+                return
             if __debug__:
                 log("tcp-ss", f"[{self}] - Transmitting initial SYN packet_rx_md: seq {self._snd_nxt}")
-            self._transmit_packet(flag_syn=True)
+            self._transmit_packet(flag_syn=True, fastopen=b"" if self._fastopen else None)
             return
 
-        # Check if we need to (re)transmit initial SYN + ACK packet
+        # Check if we need to transmit initial SYN + ACK packet
         if self._state is FsmState.SYN_RCVD and self._snd_nxt == self._snd_ini:
             if __debug__:
                 log("tcp-ss", f"[{self}] - Transmitting initial SYN + ACK packet_rx_md: seq {self._snd_nxt}")
             self._transmit_packet(flag_syn=True, flag_ack=True)
             return
 
-        # Make sure we in the state that allows sending data out
-        if self._state in {FsmState.ESTABLISHED, FsmState.CLOSE_WAIT}:
-            remaining_data_len = len(self._tx_buffer) - self._tx_buffer_nxt
-            usable_window = self._snd_ewn - self._tx_buffer_nxt
+        # Make sure we in the state that allows sending data out, Fast Open session can respond to client before handshake completes
+        if self._state in {FsmState.ESTABLISHED, FsmState.CLOSE_WAIT} or (self._state is FsmState.SYN_RCVD and self._fastopen):
+            remaining_data_len = len(self._tx_buffer)
+            usable_window = max(self._snd_una + self._snd_ewn - self._snd_nxt, 0)
             transmit_data_len = min(self._snd_mss, usable_window, remaining_data_len)
             if remaining_data_len:
                 if __debug__:
@@ -429,10 +649,10 @@ class TcpSession:
                     log("tcp-ss", f"[{self}] - {usable_window} left in window, {remaining_data_len} left in buffer, {transmit_data_len} to be sent")
                 if transmit_data_len:
                     with self._lock_tx_buffer:
-                        transmit_data = self._tx_buffer[self._tx_buffer_nxt : self._tx_buffer_nxt + transmit_data_len]
+                        transmit_data = self._tx_buffer.take(transmit_data_len)
                     if __debug__:
                         log("tcp-ss", f"[{self}] - Transmitting data segment: seq {self._snd_nxt} len {len(transmit_data)}")
-                    self._transmit_packet(flag_ack=True, data=bytes(transmit_data))
+                    self._transmit_packet(flag_ack=True, data=transmit_data)
                 return
 
         # Check if we need to (re)transmit final FIN packet
@@ -442,21 +662,84 @@ class TcpSession:
             self._transmit_packet(flag_fin=True, flag_ack=True)
             return
 
+    def _persist(self) -> None:
+        """Run persist timer, zero window probes make sure connection doesn't stall when peer's window update gets lost (RFC 1122)"""
+
+        # Persist timer runs only when there is data waiting for peer's window to open and nothing in flight that would elicit window update
+        if not self._tx_buffer or self._tx_retransmit_queue or self._snd_wnd:
+            self._snd_persist = 0
+            return
+
+        if not self._snd_persist:
+            self._snd_persist = PERSIST_TIMEOUT
+            stack.timer.register_timer(f"{self}-persist", self._snd_persist)
+            return
+
+        if stack.timer.is_expired(f"{self}-persist"):
+            self._transmit_window_probe()
+            self._snd_persist = min(self._snd_persist * 2, PERSIST_TIMEOUT_MAX)
+            stack.timer.register_timer(f"{self}-persist", self._snd_persist)
+
+    def _transmit_window_probe(self) -> None:
+        """Send zero window probe, the already acknowledged SEQ it carries makes peer respond with ACK announcing its current window"""
+
+        stack.packet_handler.send_tcp_packet(
+            local_ip_address=self._local_ip_address,
+            remote_ip_address=self._remote_ip_address,
+            local_port=self._local_port,
+            remote_port=self._remote_port,
+            flag_ack=True,
+            seq=(self._snd_una - 1) & 0xFFFFFFFF,
+            ack=self._rcv_nxt,
+            win=self._rcv_wnd_field(flag_syn=False),
+        )
+        if __debug__:
+            log("tcp-ss", f"[{self}] - Sent zero window probe, next probe in {self._snd_persist * 2}ms")
+
     def _delayed_ack(self) -> None:
         """Run Delayed ACK mechanism"""
 
+        if self._rcv_nxt > self._rcv_una and stack.timer.is_expired(f"{self}-delayed_ack"):
+            self._transmit_packet(flag_ack=True)
+            if __debug__:
+                log("tcp-ss", f"[{self}] - Sent out delayed ACK ({self._rcv_nxt})")
+
+    def _acknowledge_data(self, data_len: int, gap_filled: bool) -> None:
+        """Acknowledge received data immediately or let Delayed ACK mechanism do it (RFC 1122, RFC 5681)"""
+
+        self._rcv_mss_est = max(self._rcv_mss_est, data_len)
+
+        # Data arriving after connection was idle for longer than retransmit timeout starts quick ACK mode over, peer's sending window most likely shrunk
+        if (now := time.monotonic()) - self._rcv_data_time > PACKET_RETRANSMIT_TIMEOUT / 1000:
+            self._rcv_quick_ack = QUICK_ACK_COUNT
+        self._rcv_data_time = now
+
+        # Acknowledge immediately in quick ACK mode, when segment filled gap in received data or when more than one full segment is not acknowledged
+        if self._rcv_quick_ack or gap_filled or self._rcv_nxt - self._rcv_una > self._rcv_mss_est:
+            self._rcv_quick_ack = max(self._rcv_quick_ack - 1, 0)
+            self._transmit_packet(flag_ack=True)
+            return
+
+        # Otherwise delay ACK by half of RTT, giving the application a chance to piggyback it on response
         if stack.timer.is_expired(f"{self}-delayed_ack"):
-            if self._rcv_nxt > self._rcv_una:
-                self._transmit_packet(flag_ack=True)
-                if __debug__:
-                    log("tcp-ss", f"[{self}] - Sent out delayed ACK ({self._rcv_nxt})")
-            stack.timer.register_timer(f"{self}-delayed_ack", DELAYED_ACK_DELAY)
+            if self._srtt is None:
+                delay = DELAYED_ACK_DELAY
+            else:
+                delay = min(max(int(self._srtt * 500), DELAYED_ACK_DELAY_MIN), DELAYED_ACK_DELAY_MAX)
+            stack.timer.register_timer(f"{self}-delayed_ack", delay)
+
+    def _update_rtt(self, acked: list[TcpSegment]) -> None:
+        """Update smoothed RTT using the newest acknowledged segment, retransmitted segments are not sampled (Karn's algorithm)"""
+
+        if acked and not (segment := acked[-1]).retransmit_count:
+            rtt = time.monotonic() - segment.send_time
+            self._srtt = rtt if self._srtt is None else self._srtt * 0.875 + rtt * 0.125
 
     def _retransmit_packet_timeout(self) -> None:
         """Retransmit packet after expired timeout"""
 
-        if self._snd_una in self._tx_retransmit_timeout_counter and stack.timer.is_expired(f"{self}-retransmit_seq-{self._snd_una}"):
-            if self._tx_retransmit_timeout_counter[self._snd_una] == PACKET_RETRANSMIT_MAX_COUNT:
+        if (segment := self._tx_retransmit_queue.head) and stack.timer.is_expired(f"{self}-retransmit"):
+            if segment.retransmit_count == PACKET_RETRANSMIT_MAX_COUNT:
                 # Send RST packet if we received any packet from peer already
                 if self._rcv_nxt is not None:
                     self._transmit_packet(flag_rst=True, flag_ack=True, seq=self._snd_una)
@@ -476,11 +759,9 @@ class TcpSession:
                 # Change state to CLOSED
                 self._change_state(FsmState.CLOSED)
                 return
+            self._stat_timeouts += 1
             self._snd_ewn = self._snd_mss
             self._snd_nxt = self._snd_una
-            # In case we need to retransmit packt containing SYN flag adjust tx_buffer_seq_mod so it doesn't reflect SYN flag yet
-            if self._snd_nxt == self._snd_ini or self._snd_nxt == self._snd_fin:
-                self._tx_buffer_seq_mod -= 1
             if __debug__:
                 log("tcp-ss", f"[{self}] - Got retansmit timeout, sending segment {self._snd_nxt}, resetting snd_ewn to {self._snd_ewn}")
             return
@@ -488,8 +769,13 @@ class TcpSession:
     def _retransmit_packet_request(self, packet_rx_md: TcpMetadata) -> None:
         """Retransmit packet after rceiving request from peer"""
 
-        self._tx_retransmit_request_counter[packet_rx_md.ack] = self._tx_retransmit_request_counter.get(packet_rx_md.ack, 0) + 1
-        if self._tx_retransmit_request_counter[packet_rx_md.ack] > 1:
+        # Duplicate ACK may still carry window update
+        if self._snd_wnd != packet_rx_md.win * self._snd_wsc:
+            self._snd_wnd = packet_rx_md.win * self._snd_wsc
+            self._snd_ewn = min(max(self._snd_ewn, self._snd_mss), self._snd_wnd)
+
+        self._tx_retransmit_request_counter += 1
+        if self._tx_retransmit_request_counter > 1:
             self._snd_nxt = self._snd_una
             if __debug__:
                 log("tcp-ss", f"[{self}] - Got retransmit request, sending segment {self._snd_nxt}, keeping snd_ewn at {self._snd_ewn}")
@@ -497,8 +783,16 @@ class TcpSession:
     def _process_ack_packet(self, packet_rx_md: TcpMetadata) -> None:
         """Process regular data/ACK packet"""
 
-        # Make note of the local SEQ that has been acked by peer
-        self._snd_una = max(self._snd_una, packet_rx_md.ack)
+        # Make note of the local SEQ that has been acked by peer, purge acked segments from retransmit queue and restart retransmit timer
+        if packet_rx_md.ack > self._snd_una:
+            self._stat_bytes_acked += packet_rx_md.ack - self._snd_una
+            self._snd_una = packet_rx_md.ack
+            self._update_rtt(self._tx_retransmit_queue.acknowledge(self._snd_una))
+            self._tx_retransmit_request_counter = 0
+            if segment := self._tx_retransmit_queue.head:
+                stack.timer.register_timer(f"{self}-retransmit", PACKET_RETRANSMIT_TIMEOUT * (1 << segment.retransmit_count))
+            if __debug__:
+                log("tcp-ss", f"[{self}] - Purged retransmit queue up to SEQ {self._snd_una}")
         # Adjust local SEQ accordingly to what peer acked (needed after the retransmit happens and peer is jumping to previously received SEQ)
         if self._snd_nxt < self._snd_una <= self._snd_max:
             self._snd_nxt = self._snd_una
@@ -509,44 +803,164 @@ class TcpSession:
             self._enqueue_rx_buffer(packet_rx_md.data)
             if __debug__:
                 log("tcp-ss", f"[{self}] - Enqueued {len(packet_rx_md.data)} bytes starting at {packet_rx_md.seq}")
-        # Purge acked data from TX buffer
-        with self._lock_tx_buffer:
-            del self._tx_buffer[: self._tx_buffer_una]
-        self._tx_buffer_seq_mod += self._tx_buffer_una
-        if __debug__:
-            log("tcp-ss", f"[{self}] - Purged TX buffer up to SEQ {self._snd_una}")
-        # Update remote window size
-        if self._snd_wnd != packet_rx_md.win * self._snd_wsc:
+        # Update remote window size, window in SYN + ACK packet is never scaled
+        if self._snd_wnd != (snd_wnd := packet_rx_md.win * (1 if packet_rx_md.flag_syn else self._snd_wsc)):
             if __debug__:
-                log("tcp-ss", f"[{self}] - Updated sending window size {self._snd_wnd} -> {packet_rx_md.win * self._snd_wsc}")
-            self._snd_wnd = packet_rx_md.win * self._snd_wsc
-        # Enlarge effective sending window
-        self._snd_ewn = min(self._snd_ewn << 1, self._snd_wnd)
+                log("tcp-ss", f"[{self}] - Updated sending window size {self._snd_wnd} -> {snd_wnd}")
+            self._snd_wnd = snd_wnd
+        # Enlarge effective sending window, it starts from at least one segment when peer's window opens after being closed
+        self._snd_ewn = min(max(self._snd_ewn, self._snd_mss) << 1, self._snd_wnd)
         if __debug__:
             log("tcp-ss", f"[{self}] - Updated effective sending window to {self._snd_ewn}")
-        # Purge expired tx packet retransmit requests
-        for seq in list(self._tx_retransmit_request_counter):
-            if seq < packet_rx_md.ack:
-                self._tx_retransmit_request_counter.pop(seq)
+        # Bring data that became contiguous from Out of Order queue
+        if self._ooo_queue and not packet_rx_md.flag_fin:
+            for data in self._ooo_queue.pop_contiguous(self._rcv_nxt):
+                self._enqueue_rx_buffer(data)
                 if __debug__:
-                    log("tcp-ss", f"[{self}] - Purged expired TX packet retransmit request counter for {seq}")
-        # Purge expired tx packet retransmit timeouts
-        for seq in list(self._tx_retransmit_timeout_counter):
-            if seq < packet_rx_md.ack:
-                self._tx_retransmit_timeout_counter.pop(seq)
-                if __debug__:
-                    log("tcp-ss", f"[{self}] - Purged expired TX packet retransmit timeout for {seq}")
-        # Purge expired rx retransmit requests
-        for seq in list(self._rx_retransmit_request_counter):
-            if seq < self._rcv_nxt:
-                self._rx_retransmit_request_counter.pop(seq)
+                    log("tcp-ss", f"[{self}] - <lg>Retrieved {len(data)} bytes starting at {self._rcv_nxt} from Out of Order queue</>")
+                self._rcv_nxt += len(data)
+        # Inform accept call about deferred session once peer sent first data
+        if self._defer_accept and (packet_rx_md.data or packet_rx_md.flag_fin):
+            self._notify_accept()
+
+    def _transmit_syn_ack(self, syn: TcpSynCacheEntry) -> None:
+        """Send SYN + ACK packet on behalf of half-open connection"""
+
+        stack.packet_handler.send_tcp_packet(
+            local_ip_address=syn.local_ip_address,
+            remote_ip_address=syn.remote_ip_address,
+            local_port=syn.local_port,
+            remote_port=syn.remote_port,
+            flag_syn=True,
+            flag_ack=True,
+            seq=syn.snd_ini,
+            ack=syn.rcv_ini + 1,
+            win=min(self._rcv_buf, 0xFFFF),
+            mss=self._rcv_mss,
+            wscale=RCV_WSCALE if syn.wscale else None,
+            fastopen=syn.fastopen,
+        )
+
+    def _transmit_reset(self, packet_rx_md: TcpMetadata) -> None:
+        """Send RST packet in response to unacceptable ACK packet (RFC 793)"""
+
+        stack.packet_handler.send_tcp_packet(
+            local_ip_address=packet_rx_md.local_ip_address,
+            remote_ip_address=packet_rx_md.remote_ip_address,
+            local_port=packet_rx_md.local_port,
+            remote_port=packet_rx_md.remote_port,
+            flag_rst=True,
+            seq=packet_rx_md.ack,
+        )
+
+    def _fastopen_enabled(self) -> bool:
+        """Check if listening socket has Fast Open enabled and number of Fast Open connections pending handshake is within the socket's limit"""
+
+        from lib.socket import IPPROTO_TCP, TCP_FASTOPEN
+
+        if not (fastopen_qlen := self._socket.getsockopt(IPPROTO_TCP, TCP_FASTOPEN)):
+            return False
+        self._fastopen_sessions = [_ for _ in self._fastopen_sessions if _.state is FsmState.SYN_RCVD]
+        return len(self._fastopen_sessions) < fastopen_qlen
+
+    def _sweep_syn_cache(self) -> None:
+        """Retransmit SYN + ACK packets that haven't been answered in time, drop half-open connections that exceeded retransmit limit"""
+
+        now = time.monotonic()
+        for key, syn in list(self._syn_cache.items()):
+            if syn.retransmit_time > now:
+                continue
+            if syn.retransmit_count == PACKET_RETRANSMIT_MAX_COUNT:
+                del self._syn_cache[key]
                 if __debug__:
-                    log("tcp-ss", f"[{self}] - Purged expired RX packet retransmit request counter for {seq}")
-        # Bring next packet from ooo_packet_queue if available
-        if ooo_packet := self._ooo_packet_queue.pop(self._rcv_nxt, None):
-            if __debug__:
-                log("tcp-ss", f"[{self}] - <lg>Retrieving packet {self._rcv_nxt} from Out of Order queue</>")
-            self.tcp_fsm(ooo_packet)
+                    log("tcp-ss", f"[{self}] - Half-open connection {key} timed out, removed from SYN cache")
+                continue
+            syn.retransmit_count += 1
+            syn.retransmit_time = now + PACKET_RETRANSMIT_TIMEOUT * (1 << syn.retransmit_count) / 1000
+            self._transmit_syn_ack(syn)
+
+    def _spawn_session(self, packet_rx_md: TcpMetadata) -> TcpSession:
+        """Create session and its socket for inbound connection"""
+
+        from lib.socket import AF_INET4, AF_INET6
+        from protocols.tcp.socket import TcpSocket
+
+        tcp_session = TcpSession(
+            local_ip_address=packet_rx_md.local_ip_address,
+            local_port=packet_rx_md.local_port,
+            remote_ip_address=packet_rx_md.remote_ip_address,
+            remote_port=packet_rx_md.remote_port,
+            socket=self._socket,
+        )
+        tcp_session._socket = TcpSocket(AF_INET6 if packet_rx_md.local_ip_address.version == 6 else AF_INET4, tcp_session=tcp_session)
+        return tcp_session
+
+    def _accept_connection(self, packet_rx_md: TcpMetadata, mss: int, wscale: int | None) -> None:
+        """Create established session for inbound connection that completed three way handshake"""
+
+        from lib.socket import IPPROTO_TCP, TCP_DEFER_ACCEPT
+
+        tcp_session = self._spawn_session(packet_rx_md)
+        # Initialize session parameters
+        tcp_session._snd_ini = packet_rx_md.ack - 1
+        tcp_session._snd_nxt = tcp_session._snd_una = tcp_session._snd_max = packet_rx_md.ack
+        tcp_session._rcv_ini = packet_rx_md.seq - 1
+        tcp_session._rcv_nxt = tcp_session._rcv_una = packet_rx_md.seq
+        tcp_session._snd_mss = min(mss, config.TAP_MTU - 40)
+        tcp_session._snd_wsc = wscale if wscale and RCV_WSCALE else 1  # Peer's wscale set to None means that peer doesn't support window scaling
+        tcp_session._rcv_wsc = 1 << RCV_WSCALE if wscale else 1
+        tcp_session._rcv_adv = tcp_session._rcv_nxt + min(tcp_session._rcv_buf, 0xFFFF)  # Window advertised in SYN + ACK packet
+        tcp_session._snd_wnd = packet_rx_md.win * tcp_session._snd_wsc
+        tcp_session._snd_ewn = tcp_session._snd_mss
+        tcp_session._change_state(FsmState.ESTABLISHED)
+        # Inform accept call about the new session unless it is to be deferred until first data arrives
+        if self._socket.getsockopt(IPPROTO_TCP, TCP_DEFER_ACCEPT) and not packet_rx_md.data and not packet_rx_md.flag_fin:
+            tcp_session._defer_accept = True
+        else:
+            tcp_session._notify_accept()
+        # Process any data that came with the handshake completing ACK packet
+        if packet_rx_md.data or packet_rx_md.flag_fin:
+            tcp_session.tcp_fsm(packet_rx_md)
+
+    def _accept_fastopen(self, packet_rx_md: TcpMetadata) -> None:
+        """Create session for inbound connection that presented valid Fast Open cookie, data carried by SYN packet is delivered right away"""
+
+        tcp_session = self._spawn_session(packet_rx_md)
+        self._fastopen_sessions.append(tcp_session)
+        # Initialize session parameters, window advertised in SYN packet is never scaled
+        tcp_session._fastopen = True
+        tcp_session._rcv_ini = packet_rx_md.seq
+        tcp_session._rcv_nxt = tcp_session._rcv_una = packet_rx_md.seq + 1
+        tcp_session._snd_mss = min(packet_rx_md.mss, config.TAP_MTU - 40)
+        tcp_session._snd_wnd = packet_rx_md.win
+        tcp_session._snd_wsc = packet_rx_md.wscale if packet_rx_md.wscale and RCV_WSCALE else 1
+        tcp_session._rcv_wsc = 1 << RCV_WSCALE if packet_rx_md.wscale else 1
+        tcp_session._snd_ewn = tcp_session._snd_mss
+        tcp_session._change_state(FsmState.SYN_RCVD)
+        if packet_rx_md.data:
+            tcp_session._enqueue_rx_buffer(packet_rx_md.data)
+            tcp_session._rcv_nxt += len(packet_rx_md.data)
+        if __debug__:
+            log("tcp-ss", f"[{tcp_session}] - Accepted Fast Open connection with {len(packet_rx_md.data)} bytes of data")
+        tcp_session._notify_accept()
+        # Send SYN + ACK packet acknowledging the data
+        tcp_session._transmit_data()
+
+    def _enter_time_wait(self) -> None:
+        """Change state to TIME_WAIT, the connection is kept in TIME_WAIT table so full session can be released right away"""
+
+        self._change_state(FsmState.TIME_WAIT)
+        stack.tcp_time_wait.add(self._socket.socket_id, snd_nxt=self._snd_nxt, rcv_nxt=self._rcv_nxt)
+        if __debug__:
+            log("tcp-ss", f"[{self}] - Moved connection to TIME_WAIT table")
+        self._change_state(FsmState.CLOSED)
+
+    def _notify_accept(self) -> None:
+        """Inform the listening socket that session has been established so accept call can pick it up"""
+
+        self._defer_accept = False
+        self._socket._parent_socket._tcp_accept.append(self._socket)
+        self._socket._parent_socket._event_tcp_session_established.release()
 
     def _tcp_fsm_closed(self, packet_rx_md: TcpMetadata | None, syscall: SysCall | None, timer: bool | None) -> None:
         """TCP FSM CLOSED state handler"""
@@ -562,43 +976,73 @@ class TcpSession:
     def _tcp_fsm_listen(self, packet_rx_md: TcpMetadata | None, syscall: SysCall | None, timer: bool | None) -> None:
         """TCP FSM LISTEN state handler"""
 
-        from lib.socket import AF_INET4, AF_INET6
-        from protocols.tcp.socket import TcpSocket
+        # Got timer event -> Retransmit SYN + ACK packets for half-open connections and purge the ones that timed out
+        if timer:
+            if self._syn_cache and stack.timer.is_expired(f"{self}-syn_cache"):
+                stack.timer.register_timer(f"{self}-syn_cache", SYN_CACHE_SWEEP_INTERVAL)
+                self._sweep_syn_cache()
+            return
 
-        # Got SYN packet -> Send SYN + ACK packet / change state to SYN_RCVD
+        # Got SYN packet -> Store half-open connection in SYN cache (or in SYN cookie if cache is full) / send SYN + ACK packet
         if packet_rx_md and all({packet_rx_md.flag_syn}) and not any({packet_rx_md.flag_ack, packet_rx_md.flag_fin, packet_rx_md.flag_rst}):
             # Packet sanity check
-            if packet_rx_md.ack == 0 and not packet_rx_md.data:
-                # Create new session in LISTEN state and assign it to listening socket
-                tcp_session = TcpSession(
-                    local_ip_address=self._local_ip_address,
-                    local_port=self._local_port,
-                    remote_ip_address=self._remote_ip_address,
-                    remote_port=self._remote_port,
-                    socket=self._socket,
-                )
-                tcp_session.listen()
-                self._socket._tcp_session = tcp_session
-                # Adjust this session to match incoming connection and assign it to new socket
-                self._local_ip_address = packet_rx_md.local_ip_address
-                self._local_port = packet_rx_md.local_port
-                self._remote_ip_address = packet_rx_md.remote_ip_address
-                self._remote_port = packet_rx_md.remote_port
-                self._socket = TcpSocket(AF_INET6 if self._local_ip_address.version == 6 else AF_INET4, tcp_session=self)
-                # Initialize session parameters
-                self._snd_mss = min(packet_rx_md.mss, config.TAP_MTU - 40)
-                self._snd_wnd = packet_rx_md.win * self._snd_wsc  # For SYN / SYN + ACK packets this is initialized with wscale=1
-                self._snd_wsc = packet_rx_md.wscale if packet_rx_md.wscale else 1  # Peer's wscale set to None means that peer doesn't support window scaling
+            if packet_rx_md.ack == 0:
+                # Peer retransmitted SYN packet -> Send SYN + ACK packet again
+                if (syn := self._syn_cache.get(packet_rx_md.socket_id)) and syn.rcv_ini == packet_rx_md.seq:
+                    self._transmit_syn_ack(syn)
+                    return
+                # Got Fast Open option -> Accept the data right away if cookie is valid, otherwise send new cookie with SYN + ACK and ignore the data
+                cookie = None
+                if packet_rx_md.fastopen is not None and self._fastopen_enabled():
+                    cookie = fastopen_cookie(packet_rx_md.remote_ip_address)
+                    if packet_rx_md.fastopen == cookie and len(self._socket._tcp_accept) < self._socket._backlog:
+                        self._accept_fastopen(packet_rx_md)
+                        return
+                if len(self._syn_cache) < self._socket._backlog:
+                    retransmit_time = time.monotonic() + PACKET_RETRANSMIT_TIMEOUT / 1000
+                    # Connection reusing 4-tuple of one in TIME_WAIT state starts past its sequence space so old duplicates can't be taken for new data
+                    if packet_rx_md.time_wait:
+                        snd_ini = (packet_rx_md.time_wait.snd_nxt + TIME_WAIT_ISN_GAP) & 0xFFFFFFFF
+                    else:
+                        snd_ini = random.randint(0, 0xFFFFFFFF)
+                    syn = self._syn_cache[packet_rx_md.socket_id] = TcpSynCacheEntry(packet_rx_md, snd_ini, retransmit_time)
+                    syn.fastopen = cookie
+                    self._transmit_syn_ack(syn)
+                    return
                 if __debug__:
-                    log("tcp-ss", f"[{self}] - Initialized remote window scale at {self._snd_wsc}")
-                self._rcv_ini = packet_rx_md.seq
-                self._snd_ewn = self._snd_mss
-                # Make note of the remote SEQ number
-                self._rcv_nxt = packet_rx_md.seq + packet_rx_md.flag_syn
-                # Send SYN + ACK packet (this actually will be done in SYN_SENT state) / change state to SYN_RCVD
-                self._change_state(FsmState.SYN_RCVD)
+                    log("tcp-ss", f"[{self}] - SYN cache full, responding to {packet_rx_md.remote_ip_address}/{packet_rx_md.remote_port} with SYN cookie")
+                syn = TcpSynCacheEntry(packet_rx_md, snd_ini=syn_cookie_encode(packet_rx_md), retransmit_time=0)
+                syn.wscale = None  # Window scale can't be encoded in SYN cookie, so it is not negotiated
+                syn.fastopen = cookie
+                self._transmit_syn_ack(syn)
                 return
 
+        # Got ACK packet -> Create established session out of SYN cache entry or valid SYN cookie / inform accept call about it
+        if packet_rx_md and all({packet_rx_md.flag_ack}) and not any({packet_rx_md.flag_syn, packet_rx_md.flag_rst}):
+            mss: int | None
+            if (syn := self._syn_cache.get(packet_rx_md.socket_id)) and packet_rx_md.seq == syn.rcv_ini + 1 and packet_rx_md.ack == syn.snd_ini + 1:
+                mss, wscale = syn.mss, syn.wscale
+            elif (mss := syn_cookie_decode(packet_rx_md)) is not None:
+                wscale = None
+            else:
+                # ACK packet doesn't belong to any half-open connection -> Send RST packet
+                self._transmit_reset(packet_rx_md)
+                return
+            # Accept queue is full -> Drop packet, peer will retransmit it
+            if len(self._socket._tcp_accept) >= self._socket._backlog:
+                if __debug__:
+                    log("tcp-ss", f"[{self}] - Accept queue full, dropping ACK from {packet_rx_md.remote_ip_address}/{packet_rx_md.remote_port}")
+                return
+            self._syn_cache.pop(packet_rx_md.socket_id, None)
+            self._accept_connection(packet_rx_md, mss, wscale)
+            return
+
+        # Got RST packet -> Remove matching half-open connection
+        if packet_rx_md and all({packet_rx_md.flag_rst}) and not any({packet_rx_md.flag_syn, packet_rx_md.flag_fin}):
+            if (syn := self._syn_cache.get(packet_rx_md.socket_id)) and packet_rx_md.seq == syn.rcv_ini + 1:
+                del self._syn_cache[packet_rx_md.socket_id]
+            return
+
         # Got CLOSE syscall -> Change state to CLOSED
         if syscall is SysCall.CLOSE:
             self._change_state(FsmState.CLOSED)
@@ -615,18 +1059,29 @@ class TcpSession:
 
         # Got SYN + ACK packet -> Send ACK / change state to ESTABLISHED
         if packet_rx_md and all({packet_rx_md.flag_syn, packet_rx_md.flag_ack}) and not any({packet_rx_md.flag_fin, packet_rx_md.flag_rst}):
-            # Packet sanity check
-            if packet_rx_md.ack == self._snd_nxt and not packet_rx_md.data:
+            # Packet sanity check, peer may acknowledge our SYN without the Fast Open data it carried
+            if self._snd_ini < packet_rx_md.ack <= self._snd_nxt and not packet_rx_md.data:
+                # Remember Fast Open cookie for next connections to this server
+                if packet_rx_md.fastopen:
+                    stack.tcp_fastopen_cache.add(self._remote_ip_address, packet_rx_md.fastopen)
                 # Initialize session parameters
                 self._snd_mss = min(packet_rx_md.mss, config.TAP_MTU - 40)
                 self._snd_wnd = packet_rx_md.win * self._snd_wsc  # For SYN / SYN + ACK packets this is initialized with wscale=1
-                self._snd_wsc = packet_rx_md.wscale if packet_rx_md.wscale else 1  # Peer's wscale set to None means that peer doesn't support window scaling
+                # Peer's wscale set to None means that peer doesn't support window scaling, scaling is in effect only if both sides support it
+                self._snd_wsc = packet_rx_md.wscale if packet_rx_md.wscale and RCV_WSCALE else 1
+                self._rcv_wsc = 1 << RCV_WSCALE if packet_rx_md.wscale else 1
                 if __debug__:
-                    log("tcp-ss", f"[{self}] - Initialized remote window scale at {self._snd_wsc}")
+                    log("tcp-ss", f"[{self}] - Initialized remote window scale at {self._snd_wsc}, local window scale at {self._rcv_wsc}")
                 self._rcv_ini = packet_rx_md.seq
                 self._snd_ewn = self._snd_mss
-                # Process ACK packet
+                # Process ACK packet, window advertised in our SYN packet starts at peer's initial SEQ
                 self._process_ack_packet(packet_rx_md)
+                self._rcv_adv = self._rcv_nxt + self._rcv_wnd
+                # Peer didn't accept Fast Open data -> Send it again once connection is established
+                if self._snd_nxt > self._snd_una:
+                    if __debug__:
+                        log("tcp-ss", f"[{self}] - Fast Open data not acknowledged, retransmitting it")
+                    self._snd_nxt = self._snd_una
                 # Send initial ACK packet
                 self._transmit_packet(flag_ack=True)
                 if __debug__:
@@ -637,6 +1092,12 @@ class TcpSession:
                 self._event_connect.release()
                 return
 
+        # Got ACK packet that doesn't ack our SYN (most likely peer still keeps old connection in TIME_WAIT state) -> Send RST packet
+        if packet_rx_md and all({packet_rx_md.flag_ack}) and not any({packet_rx_md.flag_syn, packet_rx_md.flag_fin, packet_rx_md.flag_rst}):
+            if packet_rx_md.ack != self._snd_nxt:
+                self._transmit_reset(packet_rx_md)
+            return
+
         # Got SYN packet -> Send SYN + ACK packet / change state to SYN_RCVD
         if packet_rx_md and all({packet_rx_md.flag_syn}) and not any({packet_rx_md.flag_ack, packet_rx_md.flag_fin, packet_rx_md.flag_syn}):
             # Packet sanity check
@@ -672,18 +1133,15 @@ class TcpSession:
             self._transmit_data()
             return
 
-        # Got ACK packet -> Change state to ESTABLISHED
-        if packet_rx_md and all({packet_rx_md.flag_ack}) and not any({packet_rx_md.flag_syn, packet_rx_md.flag_fin, packet_rx_md.flag_rst}):
-            # Packet sanity check
-            if packet_rx_md.seq == self._rcv_nxt and packet_rx_md.ack == self._snd_nxt and not packet_rx_md.data:
-                self._process_ack_packet(packet_rx_md)
+        # Got ACK packet (possibly carrying data or FIN) -> Change state to ESTABLISHED / let ESTABLISHED state handler process the packet
+        if packet_rx_md and all({packet_rx_md.flag_ack}) and not any({packet_rx_md.flag_syn, packet_rx_md.flag_rst}):
+            # Packet sanity check, the ACK needs to acknowledge our SYN, Fast Open session may have sent data past it already
+            if packet_rx_md.seq == self._rcv_nxt and self._snd_ini < packet_rx_md.ack <= self._snd_max:
                 # Change state to ESTABLISHED
                 self._change_state(FsmState.ESTABLISHED)
-                # Inform the listening socket that session has been established so accept call can pick it up
-                self._socket._parent_socket._tcp_accept.append(self._socket)
-                self._socket._parent_socket._event_tcp_session_established.release()
                 # Inform connect syscall that connection related event happened, this is needed only in case of tcp simultaneous open
                 self._event_connect.release()
+                self._tcp_fsm_established(packet_rx_md, syscall=None, timer=None)
                 return
 
         # Got RST + ACK packet -> Change state to CLOSED
@@ -704,43 +1162,60 @@ class TcpSession:
 
         # Got CLOSE sycall -> Send FIN packet (this actually will be done in SYN_SENT state) / change state to FIN_WAIT_1
         if syscall is SysCall.CLOSE:
+            # Fast Open session may still have data to send, FIN will follow it once connection is established
+            if self._fastopen:
+                self._closing = True
+                return
             self._change_state(FsmState.FIN_WAIT_1)
             return
 
     def _tcp_fsm_established(self, packet_rx_md: TcpMetadata | None, syscall: SysCall | None, timer: bool | None) -> None:
         """TCP FSM ESTABLISHED state handler"""
 
-        # Got timer event -> Send out data and run Delayed ACK mechanism
+        # Got timer event -> Send out data, run persist timer, Delayed ACK and window update mechanisms
         if timer:
             self._retransmit_packet_timeout()
             self._transmit_data()
+            self._persist()
             self._delayed_ack()
-            if self._closing and not self._tx_buffer:
+            self._window_update()
+            if self._closing and not self._tx_buffer and not self._tx_retransmit_queue:
                 self._change_state(FsmState.FIN_WAIT_1)
             return
 
+        # Got packet that partially overlaps data already received -> Trim the overlapping part
+        if packet_rx_md and packet_rx_md.seq < self._rcv_nxt < packet_rx_md.seq + len(packet_rx_md.data):
+            packet_rx_md.data = packet_rx_md.data[self._rcv_nxt - packet_rx_md.seq :]
+            packet_rx_md.seq = self._rcv_nxt
+
         # Got packet that doesn't fit into receive window
-        if packet_rx_md and not self._rcv_nxt <= packet_rx_md.seq <= self._rcv_nxt + self._rcv_wnd - len(packet_rx_md.data):
+        if packet_rx_md and not self._rcv_nxt <= packet_rx_md.seq <= self._rcv_adv - len(packet_rx_md.data):
             if __debug__:
                 log("tcp-ss", f"[{self}] - Packet seq {packet_rx_md.seq} + {len(packet_rx_md.data)} doesn't fit into receive window, dropping")
+            # Segment outside of the window may mean our ACK got lost, let peer know what we expect (RFC 793)
+            if not packet_rx_md.flag_rst:
+                self._transmit_packet(flag_ack=True)
             return
 
         # Got ACK packet
         if packet_rx_md and all({packet_rx_md.flag_ack}) and not any({packet_rx_md.flag_syn, packet_rx_md.flag_rst, packet_rx_md.flag_fin}):
-            # Suspected retransmit request -> Reset TX window and local SEQ number
-            if packet_rx_md.seq == self._rcv_nxt and packet_rx_md.ack == self._snd_una and not packet_rx_md.data:
+            # Suspected retransmit request -> Reset TX window and local SEQ number, with nothing in flight the packet can only be window update
+            if packet_rx_md.seq == self._rcv_nxt and packet_rx_md.ack == self._snd_una and not packet_rx_md.data and self._snd_una < self._snd_max:
                 self._retransmit_packet_request(packet_rx_md)
                 return
-            # Packet with higher SEQ than what we are expecting -> Store it and send 'fast retransmit' request (don't send more than two)
+            # Packet with higher SEQ than what we are expecting -> Store its data and send duplicate ACK, peer needs three of them to fast retransmit
             if packet_rx_md.seq > self._rcv_nxt and self._snd_una <= packet_rx_md.ack <= self._snd_max:
-                self._ooo_packet_queue[packet_rx_md.seq] = packet_rx_md
-                self._rx_retransmit_request_counter[self._rcv_nxt] = self._rx_retransmit_request_counter.get(self._rcv_nxt, 0) + 1
-                if self._rx_retransmit_request_counter[self._rcv_nxt] <= 2:
-                    self._transmit_packet(flag_ack=True)
+                if packet_rx_md.data and not self._ooo_queue.insert(packet_rx_md.seq, packet_rx_md.data):
+                    if __debug__:
+                        log("tcp-ss", f"[{self}] - Out of Order queue stored no new data from packet seq {packet_rx_md.seq}")
+                self._transmit_packet(flag_ack=True)
                 return
-            # Regular data/ACK packet -> Process data
+            # Regular data/ACK packet -> Process data and acknowledge it, data filling gap in front of Out of Order queue is acknowledged immediately
             if packet_rx_md.seq == self._rcv_nxt and self._snd_una <= packet_rx_md.ack <= self._snd_max:
+                gap_filled = bool(self._ooo_queue)
                 self._process_ack_packet(packet_rx_md)
+                if packet_rx_md.data:
+                    self._acknowledge_data(len(packet_rx_md.data), gap_filled)
                 return
             return
 
@@ -808,9 +1283,7 @@ class TcpSession:
                 # Check if packet acks our FIN
                 if packet_rx_md.ack >= self._snd_fin:
                     # Change state to TIME_WAIT
-                    self._change_state(FsmState.TIME_WAIT)
-                    # Initialize TIME_WAIT delay
-                    stack.timer.register_timer(f"{self}-time_wait", TIME_WAIT_DELAY)
+                    self._enter_time_wait()
                 else:
                     # Change state to CLOSING
                     self._change_state(FsmState.CLOSING)
@@ -847,9 +1320,7 @@ class TcpSession:
                 if __debug__:
                     log("tcp-ss", f"[{self}] - Sent final ACK ({self._rcv_nxt}) packet")
                 # Change state to TIME_WAIT
-                self._change_state(FsmState.TIME_WAIT)
-                # Initialize TIME_WAIT delay
-                stack.timer.register_timer(f"{self}-time_wait", TIME_WAIT_DELAY)
+                self._enter_time_wait()
                 return
 
         # Got RST + ACK packet -> Change state to CLOSED
@@ -868,9 +1339,8 @@ class TcpSession:
             # Packet sanity check
             if packet_rx_md.ack == self._snd_nxt and self._snd_una <= packet_rx_md.ack <= self._snd_max:
                 self._snd_una = packet_rx_md.ack
-                self._change_state(FsmState.TIME_WAIT)
-                # Initialize TIME_WAIT delay
-                stack.timer.register_timer(f"{self}-time_wait", TIME_WAIT_DELAY)
+                # Change state to TIME_WAIT
+                self._enter_time_wait()
                 return
 
         # Got RST + ACK packet -> Change state to CLOSED
@@ -884,27 +1354,25 @@ class TcpSession:
     def _tcp_fsm_close_wait(self, packet_rx_md: TcpMetadata | None, syscall: SysCall | None, timer: bool | None) -> None:
         """TCP FSM CLOSE_WAIT state handler"""
 
-        # Got timer event -> Send out data and run Delayed ACK mechanism
+        # Got timer event -> Send out data, run persist timer and Delayed ACK mechanism
         if timer:
             self._retransmit_packet_timeout()
             self._transmit_data()
+            self._persist()
             self._delayed_ack()
-            if self._closing and not self._tx_buffer:
+            if self._closing and not self._tx_buffer and not self._tx_retransmit_queue:
                 self._change_state(FsmState.LAST_ACK)
             return
 
         # Got ACK packet
         if packet_rx_md and all({packet_rx_md.flag_ack}) and not any({packet_rx_md.flag_syn, packet_rx_md.flag_rst, packet_rx_md.flag_fin}):
-            # Suspected retransmit request -> Reset TX window and local SEQ number
-            if packet_rx_md.seq == self._rcv_nxt and packet_rx_md.ack == self._snd_una and not packet_rx_md.data:
+            # Suspected retransmit request -> Reset TX window and local SEQ number, with nothing in flight the packet can only be window update
+            if packet_rx_md.seq == self._rcv_nxt and packet_rx_md.ack == self._snd_una and not packet_rx_md.data and self._snd_una < self._snd_max:
                 self._retransmit_packet_request(packet_rx_md)
                 return
-            # Packet with higher SEQ than what we are expecting -> Store it and send 'fast retransmit' request
+            # Packet with higher SEQ than what we are expecting -> Send duplicate ACK, data past peer's FIN is never stored
             if packet_rx_md.seq > self._rcv_nxt and self._snd_una <= packet_rx_md.ack <= self._snd_max:
-                self._ooo_packet_queue[packet_rx_md.seq] = packet_rx_md
-                self._rx_retransmit_request_counter[self._rcv_nxt] = self._rx_retransmit_request_counter.get(self._rcv_nxt, 0) + 1
-                if self._rx_retransmit_request_counter[self._rcv_nxt] <= 2:
-                    self._transmit_packet(flag_ack=True)
+                self._transmit_packet(flag_ack=True)
                 return
             # Regular data/ACK packet -> Process data
             if packet_rx_md.seq == self._rcv_nxt and self._snd_una <= packet_rx_md.ack <= self._snd_max and not packet_rx_md.data:
@@ -949,19 +1417,65 @@ class TcpSession:
                 self._change_state(FsmState.CLOSED)
             return
 
-    def _tcp_fsm_time_wait(self, packet_rx_md: TcpMetadata | None, syscall: SysCall | None, timer: bool | None) -> None:
-        """TCP FSM TIME_WAIT state handler"""
+    def tcp_fast_path(self, packet_rx_tcp: TcpParser) -> bool:
+        """Handle in-order ACK or data packet of ESTABLISHED session without running FSM (header prediction), return False if packet needs the full path"""
 
-        # Got timer event -> Run TIME_WAIT delay
-        if timer and stack.timer.is_expired(f"{self}-time_wait"):
-            self._change_state(FsmState.CLOSED)
-            return
+        with self._lock_fsm:
+            # Predicted packet carries next expected SEQ, no flags other than ACK / PSH, unchanged window and session is not recovering from loss
+            # nor waiting for the first data to inform deferred accept call
+            if (
+                self._state is not FsmState.ESTABLISHED
+                or packet_rx_tcp.seq != self._rcv_nxt
+                or not packet_rx_tcp.flag_ack
+                or packet_rx_tcp.flag_syn
+                or packet_rx_tcp.flag_fin
+                or packet_rx_tcp.flag_rst
+                or packet_rx_tcp.flag_urg
+                or packet_rx_tcp.win * self._snd_wsc != self._snd_wnd
+                or self._snd_nxt != self._snd_max
+                or self._ooo_queue
+                or self._defer_accept
+            ):
+                return False
+
+            ack = packet_rx_tcp.ack
+            data = packet_rx_tcp.data
+
+            # Pure ACK for new data -> Purge acked segments from retransmit queue and enlarge effective sending window
+            if not data:
+                if not self._snd_una < ack <= self._snd_max:
+                    return False
+                self._stat_segments_received += 1
+                self._stat_bytes_acked += ack - self._snd_una
+                self._snd_una = ack
+                self._update_rtt(self._tx_retransmit_queue.acknowledge(ack))
+                self._tx_retransmit_request_counter = 0
+                if segment := self._tx_retransmit_queue.head:
+                    stack.timer.register_timer(f"{self}-retransmit", PACKET_RETRANSMIT_TIMEOUT * (1 << segment.retransmit_count))
+                self._snd_ewn = min(max(self._snd_ewn, self._snd_mss) << 1, self._snd_wnd)
+                if __debug__:
+                    log("tcp-ss", f"[{self}] - Fast path ACK, purged retransmit queue up to SEQ {self._snd_una}")
+                return True
+
+            # In-order data that fits into receive window and doesn't acknowledge anything new -> Enqueue data and acknowledge it
+            if ack != self._snd_una or len(data) > self._rcv_adv - self._rcv_nxt:
+                return False
+            self._stat_segments_received += 1
+            self._rcv_nxt += len(data)
+            self._enqueue_rx_buffer(data)
+            self._snd_ewn = min(max(self._snd_ewn, self._snd_mss) << 1, self._snd_wnd)
+            self._acknowledge_data(len(data), False)
+            if __debug__:
+                log("tcp-ss", f"[{self}] - Fast path data, enqueued {len(data)} bytes starting at {packet_rx_tcp.seq}")
+            return True
 
     def tcp_fsm(self, packet_rx_md: TcpMetadata | None = None, syscall: SysCall | None = None, timer: bool | None = None) -> None:
         """Run TCP finite state machine"""
 
         # Process event
         with self._lock_fsm:
+            if packet_rx_md:
+                self._stat_segments_received += 1
             return {
                 FsmState.CLOSED: self._tcp_fsm_closed,
                 FsmState.LISTEN: self._tcp_fsm_listen,
@@ -973,5 +1487,4 @@ class TcpSession:
                 FsmState.CLOSING: self._tcp_fsm_closing,
                 FsmState.CLOSE_WAIT: self._tcp_fsm_close_wait,
                 FsmState.LAST_ACK: self._tcp_fsm_last_ack,
-                FsmState.TIME_WAIT: self._tcp_fsm_time_wait,
             }[self._state](packet_rx_md, syscall, timer)
@@ -31,14 +31,32 @@
 
 from __future__ import annotations
 
+import mmap
+import os
 import threading
-from typing import TYPE_CHECKING
+from collections import deque
+from typing import TYPE_CHECKING, Any, BinaryIO
 
+import config
 import misc.stack as stack
 from lib.ip4_address import Ip4Address, Ip4AddressFormatError
 from lib.ip6_address import Ip6Address, Ip6AddressFormatError
 from lib.logger import log
-from lib.socket import AF_INET4, AF_INET6, SOCK_STREAM, Socket, gaierror
+from lib.socket import (
+    AF_INET4,
+    AF_INET6,
+    IPPROTO_TCP,
+    MSG_FASTOPEN,
+    SO_REUSEPORT,
+    SOCK_STREAM,
+    SOL_SOCKET,
+    TCP_DEFER_ACCEPT,
+    TCP_FASTOPEN,
+    TCP_INFO,
+    ReceiveTimeout,
+    Socket,
+    gaierror,
+)
 from protocols.tcp.session import FsmState, TcpSession, TcpSessionError
 
 if TYPE_CHECKING:
@@ -51,6 +69,8 @@ if TYPE_CHECKING:
 class TcpSocket(Socket):
     """Support for IPv6/IPv4 TCP socket operations"""
 
+    _supported_options = frozenset({(SOL_SOCKET, SO_REUSEPORT), (IPPROTO_TCP, TCP_DEFER_ACCEPT), (IPPROTO_TCP, TCP_FASTOPEN)})
+
     def __init__(self, family: AddressFamily, tcp_session: TcpSession | None = None) -> None:
         """Class constructor"""
 
@@ -59,7 +79,8 @@ class TcpSocket(Socket):
         self._family: AddressFamily = family
         self._type: SocketType = SOCK_STREAM
         self._event_tcp_session_established: Semaphore = threading.Semaphore(0)
-        self._tcp_accept: list[Socket] = []
+        self._tcp_accept: deque[Socket] = deque()  # Established inbound connections waiting to be picked up by accept call
+        self._backlog: int = config.TCP_LISTEN_BACKLOG
         self._tcp_session: TcpSession | None
         self._local_ip_address: IpAddress
         self._remote_ip_address: IpAddress
@@ -75,7 +96,9 @@ class TcpSocket(Socket):
             self._local_port = tcp_session.local_port
             self._remote_port = tcp_session.remote_port
             self._parent_socket = tcp_session.socket
-            stack.sockets[str(self)] = self
+            if (SOL_SOCKET, SO_REUSEPORT) in self._parent_socket._options:
+                self._options[(SOL_SOCKET, SO_REUSEPORT)] = self._parent_socket._options[(SOL_SOCKET, SO_REUSEPORT)]
+            stack.sockets[self.socket_id] = self
 
         # Fresh socket initialization
         else:
@@ -112,6 +135,16 @@ class TcpSocket(Socket):
 
         return self._parent_socket
 
+    def getsockopt(self, level: int, optname: int) -> Any:
+        """Return the value of given socket option, TCP_INFO option returns snapshot of the TCP session statistics"""
+
+        if (level, optname) == (IPPROTO_TCP, TCP_INFO):
+            if self._tcp_session is None:
+                raise OSError("[Errno 107] Transport endpoint is not connected - [Socket has no TCP session]")
+            return self._tcp_session.info
+
+        return super().getsockopt(level, optname)
+
     def bind(self, address: tuple[str, int]) -> None:
         """Bind the socket to local address"""
 
@@ -150,15 +183,15 @@ class TcpSocket(Socket):
             local_port = self._pick_local_port()
 
         # Assigning local port makes socket "bound"
-        stack.sockets.pop(str(self), None)
+        stack.sockets.discard(self.socket_id, self)
         self._local_ip_address = local_ip_address
         self._local_port = local_port
-        stack.sockets[str(self)] = self
+        stack.sockets[self.socket_id] = self
 
         if __debug__:
             log("socket", f"<g>[{self}]</> - Bound socket")
 
-    def connect(self, address: tuple[str, int]) -> None:
+    def connect(self, address: tuple[str, int], fastopen_data: bytes | None = None) -> None:
         """Connect the socket to remote host"""
 
         # 'connect' call will bind socket to specific local ip address (will rebind if necessary), specific local port,
@@ -168,20 +201,20 @@ class TcpSocket(Socket):
         if (remote_port := address[1]) not in range(0, 65536):
             raise OverflowError("connect(): port must be 0-65535. - [Port out of range]")
 
+        # Set local and remote ip addresses aproprietely
+        local_ip_address, remote_ip_address = self._set_ip_addresses(address, self._local_ip_address, self._local_port, remote_port)
+
         # Assigning local port makes socket "bound" if not "bound" already
         if (local_port := self._local_port) not in range(1, 65536):
-            local_port = self._pick_local_port()
-
-        # Set local and remote ip addresses aproprietely
-        local_ip_address, remote_ip_address = self._set_ip_addresses(address, self._local_ip_address, local_port, remote_port)
+            local_port = self._pick_local_port(local_ip_address, remote_ip_address, remote_port)
 
         # Re-register socket with new socket id
-        stack.sockets.pop(str(self), None)
+        stack.sockets.discard(self.socket_id, self)
         self._local_ip_address = local_ip_address
         self._local_port = local_port
         self._remote_ip_address = remote_ip_address
         self._remote_port = remote_port
-        stack.sockets[str(self)] = self
+        stack.sockets[self.socket_id] = self
 
         self._tcp_session = TcpSession(
             local_ip_address=self._local_ip_address,
@@ -195,7 +228,7 @@ class TcpSocket(Socket):
             log("socket", f"<g>[{self}]</> - Socket attempting connection")
 
         try:
-            self._tcp_session.connect()
+            self._tcp_session.connect(fastopen_data)
         except TcpSessionError as error:
             if str(error) == "Connection refused":
                 raise ConnectionRefusedError("[Errno 111] Connection refused - [Received RST packet from remote host]")
@@ -205,8 +238,10 @@ class TcpSocket(Socket):
         if __debug__:
             log("socket", f"<g>[{self}]</> - Bound")
 
-    def listen(self) -> None:
-        """Starts to listen for incoming connections"""
+    def listen(self, backlog: int = config.TCP_LISTEN_BACKLOG) -> None:
+        """Starts to listen for incoming connections, backlog limits both half-open and not yet accepted connections"""
+
+        self._backlog = max(backlog, 1)
 
         self._tcp_session = TcpSession(
             local_ip_address=self._local_ip_address,
@@ -219,7 +254,7 @@ class TcpSocket(Socket):
         if __debug__:
             log("socket", f"<g>[{self}]</> - Socket starting to listen for inbound connections")
 
-        stack.sockets[str(self)] = self
+        stack.sockets[self.socket_id] = self
         self._tcp_session.listen()
 
     def accept(self) -> tuple[Socket, tuple[str, int]]:
@@ -229,7 +264,7 @@ class TcpSocket(Socket):
             log("socket", f"<g>[{self}]</> - Waiting for inbound connection")
 
         self._event_tcp_session_established.acquire()
-        socket = self._tcp_accept.pop(0)
+        socket = self._tcp_accept.popleft()
 
         if __debug__:
             log("socket", f"<g>[{self}]</> - Socket accepted connection from {(str(socket.remote_ip_address), socket.remote_port)}")
@@ -255,14 +290,89 @@ class TcpSocket(Socket):
             log("socket", f"<g>[{self}]</> - Sent data segment, len {bytes_sent}")
         return bytes_sent
 
+    def sendto(self, data: bytes, address: tuple[str, int], flags: int = 0) -> int:
+        """Connect the socket to remote host and send the data, with MSG_FASTOPEN flag the data is carried by SYN packet (RFC 7413)"""
+
+        # Connected socket ignores the address the same way BSD socket implementation does
+        if self._tcp_session is not None:
+            return self.send(data)
+
+        if flags & MSG_FASTOPEN:
+            self.connect(address, fastopen_data=data)
+            if __debug__:
+                log("socket", f"<g>[{self}]</> - Sent Fast Open data, len {len(data)}")
+            return len(data)
+
+        self.connect(address)
+        return self.send(data)
+
+    def sendfile(self, file: BinaryIO, offset: int = 0, count: int | None = None) -> int:
+        """Send the file content, data is streamed into segments straight from memory mapped file without intermediate copies"""
+
+        if self._remote_ip_address.is_unspecified or self._remote_port == 0:
+            raise OSError("sendfile(): Destination address requir")
+
+        assert self._tcp_session is not None
+
+        size = os.fstat(file.fileno()).st_size
+        if (count := size - offset if count is None else min(count, size - offset)) <= 0:
+            return 0
+
+        # Mapping gets released once the last segment referencing it is acknowledged by peer
+        data = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))[offset : offset + count]
+
+        try:
+            bytes_sent = self._tcp_session.send_mapped(data)
+        except TcpSessionError as error:
+            raise BrokenPipeError(f"[Errno 32] Broken pipe - [{error}]")
+
+        file.seek(offset + bytes_sent)
+
+        if __debug__:
+            log("socket", f"<g>[{self}]</> - Sent file data, offset {offset}, len {bytes_sent}")
+        return bytes_sent
+
+    def recvfile(self, file: BinaryIO, count: int, offset: int = 0) -> int:
+        """Receive up to 'count' bytes into the file, data is copied from received frames straight into memory mapped file"""
+
+        assert self._tcp_session is not None
+
+        if count <= 0:
+            return 0
+
+        # File gets extended to fit the received data if needed, its existing content past the received range is left untouched
+        file.flush()
+        size = os.fstat(file.fileno()).st_size
+        if size < offset + count:
+            file.truncate(offset + count)
+        bytes_received = 0
+        with mmap.mmap(file.fileno(), offset + count, access=mmap.ACCESS_WRITE) as mapping:
+            with memoryview(mapping) as buffer:
+                while bytes_received < count:
+                    if not (data_rx_len := self._tcp_session.receive_into(buffer[offset + bytes_received :])):
+                        break
+                    bytes_received += data_rx_len
+
+        # Remote end closed connection before sending all of the data, don't leave unused space at the end of file we extended
+        if size < offset + count:
+            file.truncate(max(size, offset + bytes_received))
+        file.seek(offset + bytes_received)
+
+        if __debug__:
+            log("socket", f"<g>[{self}]</> - Received {bytes_received} bytes of data into file, offset {offset}")
+        return bytes_received
+
     def recv(self, bufsize: int | None = None, timeout: float | None = None) -> bytes:
         """Receive data from socket"""
 
-        # TODO - Consider implementing timeout
-
         assert self._tcp_session is not None
 
-        if data_rx := self._tcp_session.receive(bufsize):
+        try:
+            data_rx = self._tcp_session.receive(bufsize, timeout)
+        except TcpSessionError:
+            raise ReceiveTimeout
+
+        if data_rx:
             if __debug__:
                 log("socket", f"<g>[{self}]</> - Received {len(data_rx)} bytes of data")
         else:
@@ -271,6 +381,28 @@ class TcpSocket(Socket):
 
         return data_rx
 
+    def recv_into(self, buffer: memoryview | bytearray, nbytes: int = 0, flags: int = 0, *, timeout: float | None = None) -> int:
+        """Receive data from socket directly into provided buffer, 'flags' argument is there for compatibility with stdlib socket, none is supported yet"""
+
+        if flags:
+            raise ValueError(f"recv_into(): unsupported flags {flags:#x}")
+
+        assert self._tcp_session is not None
+
+        try:
+            data_rx_len = self._tcp_session.receive_into(buffer, nbytes or None, timeout)
+        except TcpSessionError:
+            raise ReceiveTimeout
+
+        if data_rx_len:
+            if __debug__:
+                log("socket", f"<g>[{self}]</> - Received {data_rx_len} bytes of data")
+        else:
+            if __debug__:
+                log("socket", f"<g>[{self}]</> - Received no data, remote end closed connection")
+
+        return data_rx_len
+
     def close(self) -> None:
         """Close socket and the TCP session(s) it owns"""
 
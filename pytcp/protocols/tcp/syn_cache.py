@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# protocols/tcp/syn_cache.py - module contains TCP half-open connection cache entry and SYN cookie support
+#
+
+
+from __future__ import annotations
+
+import os
+import struct
+import time
+from hashlib import blake2s
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from protocols.tcp.metadata import TcpMetadata
+
+
+SYN_COOKIE_MSS_TABLE = (536, 1200, 1220, 1360, 1400, 1440, 1452, 1460)  # MSS values that can be encoded in 3 bit cookie field
+SYN_COOKIE_PERIOD_SHIFT = 6  # Cookie time counter increments every 64 seconds, cookie stays valid for up to two periods
+
+_syn_cookie_secret = os.urandom(16)
+
+# Hash input: IP version, local address, local port, remote address, remote port, peer's initial SEQ, time counter, MSS index
+SYN_COOKIE_HASH_INPUT = struct.Struct("! B 16s H 16s H L L B")
+
+
+class TcpSynCacheEntry:
+    """Compact record of half-open inbound connection kept by listening session instead of full TCP session"""
+
+    def __init__(self, packet_rx_md: TcpMetadata, snd_ini: int, retransmit_time: float) -> None:
+        """Class constructor"""
+
+        self.local_ip_address = packet_rx_md.local_ip_address
+        self.local_port = packet_rx_md.local_port
+        self.remote_ip_address = packet_rx_md.remote_ip_address
+        self.remote_port = packet_rx_md.remote_port
+        self.rcv_ini = packet_rx_md.seq
+        self.snd_ini = snd_ini
+        self.mss = packet_rx_md.mss
+        self.wscale = packet_rx_md.wscale
+        self.retransmit_time = retransmit_time
+        self.retransmit_count = 0
+        self.fastopen: bytes | None = None  # Fast Open cookie to be sent to peer in SYN + ACK packet
+
+
+def _syn_cookie_hash(packet_rx_md: TcpMetadata, rcv_ini: int, counter: int, mss_index: int) -> int:
+    """Compute 24 bit keyed hash binding cookie to connection"""
+
+    data = SYN_COOKIE_HASH_INPUT.pack(
+        packet_rx_md.local_ip_address.version,
+        bytes(packet_rx_md.local_ip_address),
+        packet_rx_md.local_port,
+        bytes(packet_rx_md.remote_ip_address),
+        packet_rx_md.remote_port,
+        rcv_ini,
+        counter & 0xFFFFFFFF,
+        mss_index,
+    )
+    return int.from_bytes(blake2s(data, digest_size=3, key=_syn_cookie_secret).digest(), "big")
+
+
+def syn_cookie_encode(packet_rx_md: TcpMetadata) -> int:
+    """Create initial SEQ number for SYN + ACK packet that encodes connection parameters instead of storing them"""
+
+    counter = int(time.monotonic()) >> SYN_COOKIE_PERIOD_SHIFT
+    mss_index = max((_ for _, mss in enumerate(SYN_COOKIE_MSS_TABLE) if mss <= packet_rx_md.mss), default=0)
+
+    return (counter & 0x1F) << 27 | mss_index << 24 | _syn_cookie_hash(packet_rx_md, packet_rx_md.seq, counter, mss_index)
+
+
+def syn_cookie_decode(packet_rx_md: TcpMetadata) -> int | None:
+    """Validate cookie echoed back in ACK packet, return encoded MSS if cookie is valid"""
+
+    cookie = (packet_rx_md.ack - 1) & 0xFFFFFFFF
+    rcv_ini = (packet_rx_md.seq - 1) & 0xFFFFFFFF
+    mss_index = cookie >> 24 & 0x07
+
+    counter = int(time.monotonic()) >> SYN_COOKIE_PERIOD_SHIFT
+    for counter in (counter, counter - 1):
+        if cookie >> 27 == counter & 0x1F and cookie & 0xFFFFFF == _syn_cookie_hash(packet_rx_md, rcv_ini, counter, mss_index):
+            return SYN_COOKIE_MSS_TABLE[mss_index]
+
+    return None
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# protocols/tcp/time_wait.py - module contains table of TCP connections in TIME_WAIT state
+#
+
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from lib.socket_table import SocketId
+
+TIME_WAIT_DELAY = 30000  # 30s delay for the TIME_WAIT state, default is 30-120s
+TIME_WAIT_ISN_GAP = 64000  # Distance between last SEQ of old connection and initial SEQ of new connection reusing its 4-tuple
+
+
+class TcpTimeWaitEntry(NamedTuple):
+    """Everything the stack needs to remember about connection in TIME_WAIT state"""
+
+    expiry: float
+    snd_nxt: int
+    rcv_nxt: int
+
+    def accepts_syn(self, seq: int) -> bool:
+        """Check if SYN packet of new connection starts past the old connection's sequence space, comparison is done modulo 2**32"""
+
+        return 0 < (seq - self.rcv_nxt) & 0xFFFFFFFF < 0x80000000
+
+
+class TcpTimeWaitTable:
+    """Compact replacement of full TCP sessions in TIME_WAIT state, keyed by the same socket id as stack sockets"""
+
+    def __init__(self) -> None:
+        """Class constructor"""
+
+        self._entries: dict[SocketId, TcpTimeWaitEntry] = {}
+
+    def __len__(self) -> int:
+        """Number of connections in TIME_WAIT state"""
+
+        self._sweep()
+        return len(self._entries)
+
+    def _sweep(self) -> None:
+        """Remove expired entries, all entries share the same delay so dict insertion order is also their expiry order"""
+
+        now = time.monotonic()
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.expiry > now:
+                break
+            del self._entries[key]
+
+    def add(self, key: SocketId, snd_nxt: int, rcv_nxt: int) -> None:
+        """Add connection or restart TIME_WAIT delay of existing one"""
+
+        self._sweep()
+        self._entries.pop(key, None)
+        self._entries[key] = TcpTimeWaitEntry(time.monotonic() + TIME_WAIT_DELAY / 1000, snd_nxt, rcv_nxt)
+
+    def get(self, key: SocketId) -> TcpTimeWaitEntry | None:
+        """Find connection in TIME_WAIT state"""
+
+        self._sweep()
+        return self._entries.get(key, None)
+
+    def pop(self, key: SocketId) -> TcpTimeWaitEntry | None:
+        """Remove connection from TIME_WAIT state so its 4-tuple can be reused"""
+
+        self._sweep()
+        return self._entries.pop(key, None)
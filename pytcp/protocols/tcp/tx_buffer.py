@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# protocols/tcp/tx_buffer.py - module contains TCP send queue and retransmission queue
+#
+
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_right
+from collections import deque
+
+from misc.ip_helper import inet_sum, inet_sum_move, inet_sum_sub
+
+
+class TcpTxBuffer:
+    """Ring of immutable data chunks sent by application but not yet transmitted"""
+
+    def __init__(self) -> None:
+        """Class constructor"""
+
+        self._chunks: deque[memoryview] = deque()
+        self._len: int = 0
+
+    def __len__(self) -> int:
+        """Number of bytes waiting to be transmitted"""
+
+        return self._len
+
+    def append(self, data: bytes) -> int:
+        """Enqueue application data, copy it only if it is mutable"""
+
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        if data:
+            self._chunks.append(memoryview(data))
+            self._len += len(data)
+        return len(data)
+
+    def append_mapped(self, data: memoryview) -> int:
+        """Enqueue read-only view of memory mapped file, the data is referenced until peer acknowledges it and never copied"""
+
+        assert data.readonly, "Mapped data needs to be read-only so it can't change while waiting for transmission"
+
+        data = data.cast("B")
+        if data:
+            self._chunks.append(data)
+            self._len += len(data)
+        return len(data)
+
+    def take(self, count: int) -> memoryview:
+        """Dequeue up to 'count' bytes, data is not copied unless segment spans multiple chunks"""
+
+        chunk = self._chunks[0]
+
+        if len(chunk) > count:
+            self._chunks[0] = chunk[count:]
+            segment = chunk[:count]
+
+        elif len(chunk) == count or len(self._chunks) == 1:
+            segment = self._chunks.popleft()
+
+        else:
+            parts: list[memoryview] = []
+            remaining = count
+            while remaining and self._chunks:
+                chunk = self._chunks[0]
+                if len(chunk) > remaining:
+                    self._chunks[0] = chunk[remaining:]
+                    chunk = chunk[:remaining]
+                else:
+                    self._chunks.popleft()
+                parts.append(chunk)
+                remaining -= len(chunk)
+            segment = memoryview(b"".join(parts))
+
+        self._len -= len(segment)
+        return segment
+
+
+class TcpSegment:
+    """Segment sent out and not yet acknowledged by peer"""
+
+    def __init__(
+        self,
+        seq: int,
+        data: memoryview | None = None,
+        data_sum: int | None = None,
+        flag_syn: bool = False,
+        flag_fin: bool = False,
+        fastopen: bytes | None = None,
+    ) -> None:
+        """Class constructor, data sum is kept so retransmissions don't need to sum the data again"""
+
+        self.seq: int = seq
+        self.data: memoryview = memoryview(b"") if data is None else data
+        self.data_sum: int = inet_sum(self.data) if data_sum is None else data_sum
+        self.flag_syn: bool = flag_syn
+        self.flag_fin: bool = flag_fin
+        self.fastopen: bytes | None = fastopen  # Fast Open cookie (or cookie request) carried by SYN packet
+        self.len: int = len(self.data) + flag_syn + flag_fin  # Amount of sequence space used by segment
+        self.send_time: float = time.monotonic()
+        self.retransmit_count: int = 0
+
+    def __str__(self) -> str:
+        """Segment log string"""
+
+        return f"{'S' if self.flag_syn else ''}{'F' if self.flag_fin else ''} seq {self.seq}, len {self.len}, retransmits {self.retransmit_count}"
+
+    @property
+    def end(self) -> int:
+        """Sequence number following the segment"""
+
+        return self.seq + self.len
+
+    def trim(self, ack: int) -> None:
+        """Drop the part of segment acknowledged by peer"""
+
+        if self.flag_syn:
+            self.flag_syn = False
+            self.fastopen = None
+            self.seq += 1
+            self.len -= 1
+        acked = ack - self.seq
+
+        # Sum of remaining data is derived from sum of whole data if acknowledged part is the shorter one
+        if acked <= len(self.data) >> 1:
+            self.data_sum = inet_sum_move(inet_sum_sub(self.data_sum, inet_sum(self.data[:acked])), acked)
+        else:
+            self.data_sum = inet_sum(self.data[acked:])
+        self.data = self.data[acked:]
+        self.len -= acked
+        self.seq = ack
+
+
+class TcpRetransmitQueue:
+    """Queue of segments sent out and not yet acknowledged by peer, ordered by sequence number"""
+
+    def __init__(self) -> None:
+        """Class constructor"""
+
+        self._segments: list[TcpSegment] = []
+        self._seqs: list[int] = []
+        self._head: int = 0  # Index of the oldest unacknowledged segment, acknowledged ones are purged in batches
+
+    def __len__(self) -> int:
+        """Number of unacknowledged segments"""
+
+        return len(self._segments) - self._head
+
+    def __iter__(self):
+        """Iterate over unacknowledged segments"""
+
+        return iter(self._segments[self._head :])
+
+    @property
+    def head(self) -> TcpSegment | None:
+        """Oldest unacknowledged segment"""
+
+        return self._segments[self._head] if self._head < len(self._segments) else None
+
+    @property
+    def bytes_in_flight(self) -> int:
+        """Amount of sequence space sent out and not acknowledged yet"""
+
+        if self._head < len(self._segments):
+            return self._segments[-1].end - self._segments[self._head].seq
+        return 0
+
+    def enqueue(self, segment: TcpSegment) -> None:
+        """Add newly sent segment at the end of queue"""
+
+        assert not len(self) or segment.seq == self._segments[-1].end, f"Segment {segment} doesn't follow {self._segments[-1]}"
+
+        self._segments.append(segment)
+        self._seqs.append(segment.seq)
+
+    def acknowledge(self, ack: int) -> list[TcpSegment]:
+        """Remove segments fully acknowledged by peer, trim the partially acknowledged one, return removed segments"""
+
+        start = self._head
+        while self._head < len(self._segments) and self._segments[self._head].end <= ack:
+            self._head += 1
+        acked = self._segments[start : self._head]
+
+        if self._head < len(self._segments) and (segment := self._segments[self._head]).seq < ack:
+            segment.trim(ack)
+            self._seqs[self._head] = segment.seq
+
+        # Compact lists only once the purged part dominates to keep the cost amortized
+        if self._head > len(self._segments) >> 1:
+            del self._segments[: self._head]
+            del self._seqs[: self._head]
+            self._head = 0
+
+        return acked
+
+    def find(self, seq: int) -> TcpSegment | None:
+        """Find unacknowledged segment that contains given sequence number"""
+
+        if (index := bisect_right(self._seqs, seq, self._head) - 1) >= self._head and seq < self._segments[index].end:
+            return self._segments[index]
+        return None
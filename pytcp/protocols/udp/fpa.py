@@ -37,7 +37,7 @@ from lib.tracker import Tracker
 from misc.ip_helper import inet_cksum
 from protocols.ip4.ps import IP4_PROTO_UDP
 from protocols.ip6.ps import IP6_NEXT_UDP
-from protocols.udp.ps import UDP_HEADER_LEN
+from protocols.udp.ps import UDP_HEADER, UDP_HEADER_LEN
 
 
 class UdpAssembler:
@@ -46,7 +46,7 @@ class UdpAssembler:
     ip4_proto = IP4_PROTO_UDP
     ip6_next = IP6_NEXT_UDP
 
-    def __init__(self, *, sport: int = 0, dport: int = 0, data: bytes | None = None, echo_tracker: Tracker | None = None) -> None:
+    def __init__(self, *, sport: int = 0, dport: int = 0, data: bytes | memoryview | None = None, echo_tracker: Tracker | None = None) -> None:
         """Class constructor"""
 
         assert 0 <= sport <= 0xFFFF, f"{sport=}"
@@ -55,7 +55,7 @@ class UdpAssembler:
         self._tracker: Tracker = Tracker(prefix="TX", echo_tracker=echo_tracker)
         self._sport: int = sport
         self._dport: int = dport
-        self._data: bytes = b"" if data is None else data
+        self._data: bytes | memoryview = b"" if data is None else data
         self._plen: int = UDP_HEADER_LEN + len(self._data)
 
     def __len__(self) -> int:
@@ -77,6 +77,6 @@ class UdpAssembler:
     def assemble(self, frame: memoryview, pshdr_sum: int) -> None:
         """Assemble packet into the raw form"""
 
-        # memoryview: bytes conversion requir
-        struct.pack_into(f"! HH HH {len(self._data)}s", frame, 0, self._sport, self._dport, self._plen, 0, bytes(self._data))
+        UDP_HEADER.pack_into(frame, 0, self._sport, self._dport, self._plen, 0)
+        frame[UDP_HEADER_LEN : self._plen] = self._data
         struct.pack_into("! H", frame, 6, inet_cksum(frame, pshdr_sum))
@@ -36,14 +36,25 @@ from typing import TYPE_CHECKING
 
 import config
 from misc.ip_helper import inet_cksum
-from protocols.udp.ps import UDP_HEADER_LEN
+from protocols.udp.ps import UDP_HEADER, UDP_HEADER_LEN
 
 if TYPE_CHECKING:
     from misc.packet import PacketRx
 
 
 class UdpParser:
-    """UDP packet parser class"""
+    """UDP packet parser class, header fields are decoded once when packet passes integrity check"""
+
+    __slots__ = ("_frame", "_plen", "sport", "dport", "plen", "cksum", "data", "_cache__header_copy", "_cache__data_copy", "_cache__packet_copy")
+
+    sport: int  # 'Source port' field
+    dport: int  # 'Destination port' field
+    plen: int  # 'Packet length' field
+    cksum: int  # 'Checksum' field
+    data: memoryview  # Data packet carries
+    _cache__header_copy: bytes
+    _cache__data_copy: bytes
+    _cache__packet_copy: bytes
 
     def __init__(self, packet_rx: PacketRx) -> None:
         """Class constructor"""
@@ -55,7 +66,12 @@ class UdpParser:
         self._frame = packet_rx.frame
         self._plen = packet_rx.ip.dlen
 
-        packet_rx.parse_failed = self._packet_integrity_check(packet_rx.ip.pshdr_sum) or self._packet_sanity_check()
+        packet_rx.parse_failed = self._packet_integrity_check(packet_rx.ip.pshdr_sum)
+
+        if not packet_rx.parse_failed:
+            UDP_HEADER.unpack_into(self, self._frame)
+            self.data = self._frame[UDP_HEADER_LEN : self.plen]
+            packet_rx.parse_failed = self._packet_sanity_check()
 
         if not packet_rx.parse_failed:
             packet_rx.frame = packet_rx.frame[UDP_HEADER_LEN:]
@@ -70,46 +86,6 @@ class UdpParser:
 
         return f"UDP {self.sport} > {self.dport}, len {self.plen}"
 
-    @property
-    def sport(self) -> int:
-        """Read 'Source port' field"""
-
-        if "_cache__sport" not in self.__dict__:
-            self._cache__sport: int = struct.unpack("!H", self._frame[0:2])[0]
-        return self._cache__sport
-
-    @property
-    def dport(self) -> int:
-        """Read 'Destianation port' field"""
-
-        if "_cache__dport" not in self.__dict__:
-            self._cache__dport: int = struct.unpack("!H", self._frame[2:4])[0]
-        return self._cache__dport
-
-    @property
-    def plen(self) -> int:
-        """Read 'Packet length' field"""
-
-        if "_cache__plen" not in self.__dict__:
-            self._cache__plen: int = struct.unpack("!H", self._frame[4:6])[0]
-        return self._cache__plen
-
-    @property
-    def cksum(self) -> int:
-        """Read 'Checksum' field"""
-
-        if "_cache__cksum" not in self.__dict__:
-            self._cache__cksum: int = struct.unpack("!H", self._frame[6:8])[0]
-        return self._cache__cksum
-
-    @property
-    def data(self) -> memoryview:
-        """Read the data packet carries"""
-
-        if "_cache__data" not in self.__dict__:
-            self._cache__data = self._frame[UDP_HEADER_LEN : self.plen]
-        return self._cache__data
-
     @property
     def dlen(self) -> int:
         """Calculate data length"""
@@ -120,25 +96,31 @@ class UdpParser:
     def header_copy(self) -> bytes:
         """Return copy of packet header"""
 
-        if "_cache__header_copy" not in self.__dict__:
+        try:
+            return self._cache__header_copy
+        except AttributeError:
             self._cache__header_copy = bytes(self._frame[:UDP_HEADER_LEN])
-        return self._cache__header_copy
+            return self._cache__header_copy
 
     @property
     def data_copy(self) -> bytes:
         """Return copy of packet data"""
 
-        if "_cache__data_copy" not in self.__dict__:
+        try:
+            return self._cache__data_copy
+        except AttributeError:
             self._cache__data_copy = bytes(self._frame[UDP_HEADER_LEN : self.plen - UDP_HEADER_LEN])
-        return self._cache__data_copy
+            return self._cache__data_copy
 
     @property
     def packet_copy(self) -> bytes:
         """Return copy of whole packet"""
 
-        if "_cache__packet_copy" not in self.__dict__:
+        try:
+            return self._cache__packet_copy
+        except AttributeError:
             self._cache__packet_copy = bytes(self._frame[: self.plen])
-        return self._cache__packet_copy
+            return self._cache__packet_copy
 
     def _packet_integrity_check(self, pshdr_sum: int) -> str:
         """Packet integrity check to be run on raw frame prior to parsing to make sure parsing is safe"""
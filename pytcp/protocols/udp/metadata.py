@@ -33,23 +33,26 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from lib.ip4_address import Ip4Address
+from protocols.ip4.ps import IP4_PROTO_UDP
 
 if TYPE_CHECKING:
     from lib.ip_address import IpAddress
+    from lib.socket_table import SocketId
     from lib.tracker import Tracker
 
 
 class UdpMetadata:
     """Store AF_INET6/SOCK_DGRAM metadata"""
 
+    __slots__ = ("local_ip_address", "local_port", "remote_ip_address", "remote_port", "data", "tracker", "socket_id")
+
     def __init__(
         self,
         local_ip_address: IpAddress,
         local_port: int,
         remote_ip_address: IpAddress,
         remote_port: int,
-        data: bytes = b"",
+        data: bytes | memoryview = b"",
         tracker: Tracker | None = None,
     ) -> None:
         self.local_ip_address = local_ip_address
@@ -58,23 +61,9 @@ class UdpMetadata:
         self.remote_port = remote_port
         self.data = data
         self.tracker = tracker
+        self.socket_id: SocketId = (local_ip_address.version, IP4_PROTO_UDP, int(local_ip_address), local_port, int(remote_ip_address), remote_port)
 
     def __str__(self) -> str:
         """String representation"""
 
         return f"AF_INET{self.local_ip_address.version}/SOCK_DGRAM/{self.local_ip_address}/{self.local_port}/{self.remote_ip_address}/{self.remote_port}"
-
-    @property
-    def socket_patterns(self) -> list[str]:
-        """Socket ID patterns that match this packet"""
-
-        patterns = [
-            f"AF_INET{self.local_ip_address.version}/SOCK_DGRAM/{self.local_ip_address}/{self.local_port}/{self.remote_ip_address}/{self.remote_port}",
-            f"AF_INET{self.local_ip_address.version}/SOCK_DGRAM/{self.local_ip_address}/{self.local_port}/{self.local_ip_address.unspecified}/0",
-            f"AF_INET{self.local_ip_address.version}/SOCK_DGRAM/{self.local_ip_address.unspecified}/{self.local_port}/{self.local_ip_address.unspecified}/0",
-        ]
-
-        if isinstance(self.local_ip_address, Ip4Address):
-            patterns.append(f"AF_INET4/SOCK_DGRAM/0.0.0.0/{self.local_port}/255.255.255.255/{self.remote_port}")  # For DHCPv4 client
-
-        return patterns
@@ -65,18 +65,16 @@ def _phrx_udp(self, packet_rx: PacketRx) -> None:
         local_port=packet_rx.udp.dport,
         remote_ip_address=packet_rx.ip.src,
         remote_port=packet_rx.udp.sport,
-        data=bytes(packet_rx.udp.data),  # memoryview: conversion for end-user interface
+        data=packet_rx.udp.data,  # memoryview: converted to bytes by socket unless it has zero-copy delivery enabled
         tracker=packet_rx.tracker,
     )
 
-    for socket_pattern in packet_rx_md.socket_patterns:
-        socket = stack.sockets.get(socket_pattern, None)
-        if socket:
-            self.packet_stats_rx.udp__socket_match += 1
-            if __debug__:
-                log("udp", f"{packet_rx_md.tracker} - <INFO>Found matching listening socket [{socket}]</>")
-            socket.process_udp_packet(packet_rx_md)
-            return
+    if socket := stack.sockets.match(packet_rx_md.socket_id):
+        self.packet_stats_rx.udp__socket_match += 1
+        if __debug__:
+            log("udp", f"{packet_rx_md.tracker} - <INFO>Found matching listening socket [{socket}]</>")
+        socket.process_udp_packet(packet_rx_md)
+        return
 
     # Silently drop packet if it's source address is unspecified
     if packet_rx.ip.src.is_unspecified:
@@ -40,6 +40,7 @@ from protocols.udp.fpa import UdpAssembler
 
 if TYPE_CHECKING:
     from lib.ip_address import IpAddress
+    from lib.mac_address import MacAddress
 
 
 def _phtx_udp(
@@ -51,8 +52,9 @@ def _phtx_udp(
     udp_dport: int,
     udp_data: bytes | None = None,
     echo_tracker: Tracker | None = None,
+    tx_template: bool = False,
 ) -> TxStatus:
-    """Handle outbound UDP packets"""
+    """Handle outbound UDP packets, packet may be sent using its flow TX template if requested"""
 
     self.packet_stats_tx.udp__pre_assemble += 1
 
@@ -61,13 +63,67 @@ def _phtx_udp(
     if __debug__:
         log("udp", f"{udp_packet_tx.tracker} - {udp_packet_tx}")
 
+    tx_template_key = ("udp", ip_src, ip_dst, udp_sport, udp_dport) if tx_template else None
+
+    if tx_template_key is not None and (tx_status := self._phtx_ether_template(tx_template_key=tx_template_key, carried_packet=udp_packet_tx)) is not None:
+        self.packet_stats_tx.udp__send += 1
+        return tx_status
+
     if ip_src.is_ip6 and ip_dst.is_ip6:
         self.packet_stats_tx.udp__send += 1
-        return self._phtx_ip6(ip6_src=ip_src, ip6_dst=ip_dst, carried_packet=udp_packet_tx)
+        return self._phtx_ip6(ip6_src=ip_src, ip6_dst=ip_dst, carried_packet=udp_packet_tx, tx_template_key=tx_template_key)
 
     if ip_src.is_ip4 and ip_dst.is_ip4:
         self.packet_stats_tx.udp__send += 1
-        return self._phtx_ip4(ip4_src=ip_src, ip4_dst=ip_dst, carried_packet=udp_packet_tx)
+        return self._phtx_ip4(ip4_src=ip_src, ip4_dst=ip_dst, carried_packet=udp_packet_tx, tx_template_key=tx_template_key)
 
     self.packet_stats_tx.udp__unknown__drop += 1
     return TxStatus.DROPED__UDP__UNKNOWN
+
+
+def _phtx_udp_batch(self, *, udp_sport: int, packets: list[tuple[IpAddress, IpAddress, int, bytes | memoryview]]) -> list[TxStatus]:
+    """Handle batch of outbound UDP packets, headers are built only once per flow and the following packets are sent using its TX template"""
+
+    routes: dict[tuple[IpAddress, IpAddress], tuple[IpAddress, MacAddress] | TxStatus] = {}
+    tx_status: list[TxStatus] = []
+
+    for ip_src, ip_dst, udp_dport, udp_data in packets:
+        self.packet_stats_tx.udp__pre_assemble += 1
+
+        udp_packet_tx = UdpAssembler(sport=udp_sport, dport=udp_dport, data=udp_data)
+
+        if __debug__:
+            log("udp", f"{udp_packet_tx.tracker} - {udp_packet_tx}")
+
+        if ip_src.version != ip_dst.version:
+            self.packet_stats_tx.udp__unknown__drop += 1
+            tx_status.append(TxStatus.DROPED__UDP__UNKNOWN)
+            continue
+
+        # Packets following the first one of the flow are sent using its TX template, only the length and checksum fields get patched
+        tx_template_key = ("udp", ip_src, ip_dst, udp_sport, udp_dport)
+
+        if (template_tx_status := self._phtx_ether_template(tx_template_key=tx_template_key, carried_packet=udp_packet_tx)) is not None:
+            self.packet_stats_tx.udp__send += 1
+            tx_status.append(template_tx_status)
+            continue
+
+        if (route := routes.get((ip_src, ip_dst))) is None:
+            route = routes[(ip_src, ip_dst)] = (
+                self._route_ip6(ip_src, ip_dst, udp_packet_tx) if ip_dst.is_ip6 else self._route_ip4(ip_src, ip_dst, udp_packet_tx)
+            )
+        if isinstance(route, TxStatus):
+            tx_status.append(route)
+            continue
+
+        self.packet_stats_tx.udp__send += 1
+        if ip_dst.is_ip6:
+            tx_status.append(
+                self._phtx_ip6(ip6_src=route[0], ip6_dst=ip_dst, carried_packet=udp_packet_tx, ether_dst=route[1], tx_template_key=tx_template_key)
+            )
+        else:
+            tx_status.append(
+                self._phtx_ip4(ip4_src=route[0], ip4_dst=ip_dst, carried_packet=udp_packet_tx, ether_dst=route[1], tx_template_key=tx_template_key)
+            )
+
+    return tx_status
@@ -31,6 +31,8 @@
 
 from __future__ import annotations
 
+from misc.header_schema import HeaderField, HeaderSchema
+
 # UDP packet header (RFC 768)
 
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
@@ -40,4 +42,11 @@ from __future__ import annotations
 # +-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+-+
 
 
-UDP_HEADER_LEN = 8
+UDP_HEADER = HeaderSchema(
+    HeaderField("sport", 16),
+    HeaderField("dport", 16),
+    HeaderField("plen", 16),
+    HeaderField("cksum", 16),
+)
+
+UDP_HEADER_LEN = UDP_HEADER.len
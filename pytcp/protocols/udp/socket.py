@@ -32,17 +32,33 @@
 from __future__ import annotations
 
 import threading
+from collections import deque
 from typing import TYPE_CHECKING
 
+import config
 import misc.stack as stack
 from lib.ip4_address import Ip4Address, Ip4AddressFormatError
 from lib.ip6_address import Ip6Address, Ip6AddressFormatError
 from lib.logger import log
-from lib.socket import AF_INET4, AF_INET6, SOCK_DGRAM, ReceiveTimeout, Socket, gaierror
+from lib.socket import (
+    AF_INET4,
+    AF_INET6,
+    IPPROTO_UDP,
+    MSG_TRUNC,
+    SO_RCVBUF,
+    SO_REUSEPORT,
+    SO_ZEROCOPY,
+    SOCK_DGRAM,
+    SOL_SOCKET,
+    UDP_SEGMENT,
+    ReceiveTimeout,
+    Socket,
+    gaierror,
+)
 from misc.tx_status import TxStatus
 
 if TYPE_CHECKING:
-    from threading import Semaphore
+    from threading import Condition
 
     from lib.ip_address import IpAddress
     from lib.socket import AddressFamily, SocketType
@@ -52,6 +68,8 @@ if TYPE_CHECKING:
 class UdpSocket(Socket):
     """Support for IPv6/IPv4 UDP socket operations"""
 
+    _supported_options = frozenset({(SOL_SOCKET, SO_RCVBUF), (SOL_SOCKET, SO_REUSEPORT), (SOL_SOCKET, SO_ZEROCOPY), (IPPROTO_UDP, UDP_SEGMENT)})
+
     def __init__(self, family: AddressFamily) -> None:
         """Class constructor"""
 
@@ -61,8 +79,10 @@ class UdpSocket(Socket):
         self._type: SocketType = SOCK_DGRAM
         self._local_port: int = 0
         self._remote_port: int = 0
-        self._packet_rx_md: list[UdpMetadata] = []
-        self._packet_rx_md_ready: Semaphore = threading.Semaphore(0)
+        self._packet_rx_md: deque[UdpMetadata] = deque()
+        self._packet_rx_md_len: int = 0  # Amount of data queued, limited by SO_RCVBUF option
+        self._packet_rx_md_ready: Condition = threading.Condition(threading.Lock())
+        self._stat_drops: int = 0  # Number of datagrams dropped because receive queue was full
         self._unreachable: bool = False
         self._local_ip_address: IpAddress
         self._remote_ip_address: IpAddress
@@ -115,10 +135,10 @@ class UdpSocket(Socket):
             local_port = self._pick_local_port()
 
         # Assigning local port makes socket "bound"
-        stack.sockets.pop(str(self), None)
+        stack.sockets.discard(self.socket_id, self)
         self._local_ip_address = local_ip_address
         self._local_port = local_port
-        stack.sockets[str(self)] = self
+        stack.sockets[self.socket_id] = self
 
         if __debug__:
             log("socket", f"<g>[{self}]</> - Bound")
@@ -133,24 +153,47 @@ class UdpSocket(Socket):
         if (remote_port := address[1]) not in range(0, 65536):
             raise OverflowError("connect(): port must be 0-65535. - [Port out of range]")
 
+        # Set local and remote ip addresses aproprietely
+        local_ip_address, remote_ip_address = self._set_ip_addresses(address, self._local_ip_address, self._local_port, remote_port)
+
         # Assigning local port makes socket "bound" if not "bound" already
         if (local_port := self._local_port) not in range(1, 65536):
-            local_port = self._pick_local_port()
-
-        # Set local and remote ip addresses aproprietely
-        local_ip_address, remote_ip_address = self._set_ip_addresses(address, self._local_ip_address, local_port, remote_port)
+            local_port = self._pick_local_port(local_ip_address, remote_ip_address, remote_port)
 
         # Re-register socket with new socket id
-        stack.sockets.pop(str(self), None)
+        stack.sockets.discard(self.socket_id, self)
         self._local_ip_address = local_ip_address
         self._local_port = local_port
         self._remote_ip_address = remote_ip_address
         self._remote_port = remote_port
-        stack.sockets[str(self)] = self
+        stack.sockets[self.socket_id] = self
 
         if __debug__:
             log("socket", f"<g>[{self}]</> - Connected socket")
 
+    def _send_data(self, local_ip_address: IpAddress, remote_ip_address: IpAddress, remote_port: int, data: bytes, tx_template: bool = False) -> int:
+        """Send data as single datagram, or split it into datagrams of UDP_SEGMENT option size, return amount of data sent"""
+
+        if not (segment_size := self.getsockopt(IPPROTO_UDP, UDP_SEGMENT)) or len(data) <= segment_size:
+            tx_status = stack.packet_handler.send_udp_packet(
+                local_ip_address=local_ip_address,
+                remote_ip_address=remote_ip_address,
+                local_port=self._local_port,
+                remote_port=remote_port,
+                data=data,
+                tx_template=tx_template,
+            )
+            return len(data) if tx_status is TxStatus.PASSED__ETHER__TO_TX_RING else 0
+
+        # Segments are views into the original data, headers get built only once and the following segments are sent using flow TX template
+        data_view = memoryview(data)
+        segments = [data_view[_ : _ + segment_size] for _ in range(0, len(data), segment_size)]
+        tx_status_list = stack.packet_handler.send_udp_packets(
+            local_port=self._local_port,
+            packets=[(local_ip_address, remote_ip_address, remote_port, _) for _ in segments],
+        )
+        return sum(len(segment) for segment, tx_status in zip(segments, tx_status_list) if tx_status is TxStatus.PASSED__ETHER__TO_TX_RING)
+
     def send(self, data: bytes) -> int:
         """Send the data to connected remote host"""
 
@@ -163,15 +206,8 @@ class UdpSocket(Socket):
             self._unreachable = False
             raise ConnectionRefusedError("[Errno 111] Connection refused - [Remote host sent ICMP Unreachable]")
 
-        tx_status = stack.packet_handler.send_udp_packet(
-            local_ip_address=self._local_ip_address,
-            remote_ip_address=self._remote_ip_address,
-            local_port=self._local_port,
-            remote_port=self._remote_port,
-            data=data,
-        )
-
-        sent_data_len = len(data) if tx_status is TxStatus.PASSED__ETHER__TO_TX_RING else 0
+        # Connected socket sends all its datagrams to the same peer so it can use TX template
+        sent_data_len = self._send_data(self._local_ip_address, self._remote_ip_address, self._remote_port, data, tx_template=True)
 
         if __debug__:
             log("socket", f"<g>[{self}]</> - <lr>Sent</> {sent_data_len} bytes of data")
@@ -189,60 +225,146 @@ class UdpSocket(Socket):
 
         # Assigning local port makes socket "bound" if not "bound" already
         if self._local_port not in range(1, 65536):
-            stack.sockets.pop(str(self), None)
+            stack.sockets.discard(self.socket_id, self)
             self._local_port = self._pick_local_port()
-            stack.sockets[str(self)] = self
+            stack.sockets[self.socket_id] = self
 
         # Set local and remote ip addresses aproprietely
         local_ip_address, remote_ip_address = self._set_ip_addresses(address, self._local_ip_address, self._local_port, remote_port)
 
-        tx_status = stack.packet_handler.send_udp_packet(
-            local_ip_address=local_ip_address,
-            remote_ip_address=remote_ip_address,
+        sent_data_len = self._send_data(local_ip_address, remote_ip_address, remote_port, data)
+
+        if __debug__:
+            log("socket", f"<g>[{self}]</> - <lr>Sent</> {sent_data_len} bytes of data")
+
+        return sent_data_len
+
+    def send_many(self, datagrams: list[tuple[bytes, tuple[str, int]]]) -> int:
+        """Send batch of datagrams to remote hosts, return number of datagrams sent"""
+
+        # Batch equivalent of 'sendto' call, addresses are resolved and validated only once per distinct remote address
+
+        # Sanity check on remote port numbers (0 is a valid remote port in BSD socket implementation)
+        if any(address[1] not in range(0, 65536) for _, address in datagrams):
+            raise OverflowError("send_many(): port must be 0-65535. - [Port out of range]")
+
+        # Assigning local port makes socket "bound" if not "bound" already
+        if self._local_port not in range(1, 65536):
+            stack.sockets.discard(self.socket_id, self)
+            self._local_port = self._pick_local_port()
+            stack.sockets[self.socket_id] = self
+
+        # Set local and remote ip addresses aproprietely
+        ip_addresses: dict[tuple[str, int], tuple[IpAddress, IpAddress]] = {}
+        for _, address in datagrams:
+            if address not in ip_addresses:
+                ip_addresses[address] = self._set_ip_addresses(address, self._local_ip_address, self._local_port, address[1])
+
+        tx_status = stack.packet_handler.send_udp_packets(
             local_port=self._local_port,
-            remote_port=remote_port,
-            data=data,
+            packets=[(*ip_addresses[address], address[1], data) for data, address in datagrams],
         )
 
-        sent_data_len = len(data) if tx_status is TxStatus.PASSED__ETHER__TO_TX_RING else 0
+        sent_datagrams = sum(_ is TxStatus.PASSED__ETHER__TO_TX_RING for _ in tx_status)
 
         if __debug__:
-            log("socket", f"<g>[{self}]</> - <lr>Sent</> {sent_data_len} bytes of data")
+            log("socket", f"<g>[{self}]</> - <lr>Sent</> {sent_datagrams} datagrams")
 
-        return sent_data_len
+        return sent_datagrams
 
-    def recv(self, bufsize: int | None = None, timeout: float | None = None) -> bytes:
-        """Read data from socket"""
+    @property
+    def drops(self) -> int:
+        """Number of datagrams dropped because receive queue was full"""
+
+        return self._stat_drops
+
+    def getsockopt(self, level: int, optname: int) -> int:
+        """Return the value of given socket option, SO_RCVBUF option defaults to stack wide receive buffer size"""
+
+        if (level, optname) == (SOL_SOCKET, SO_RCVBUF):
+            return self._options.get((level, optname), config.UDP_RCV_BUFFER)
 
-        # TODO - Implement support for buffsize
+        return super().getsockopt(level, optname)
+
+    def _dequeue(self, timeout: float | None) -> UdpMetadata:
+        """Wait for datagram and take it off the receive queue"""
+
+        with self._packet_rx_md_ready:
+            if not self._packet_rx_md_ready.wait_for(lambda: self._packet_rx_md, timeout):
+                raise ReceiveTimeout
+            packet_rx_md = self._packet_rx_md.popleft()
+            self._packet_rx_md_len -= len(packet_rx_md.data)
+        return packet_rx_md
+
+    def recv(self, bufsize: int | None = None, timeout: float | None = None) -> bytes:
+        """Read data from socket, part of datagram that doesn't fit into 'bufsize' bytes gets discarded"""
 
         if self._unreachable:
             self._unreachable = False
             raise ConnectionRefusedError("[Errno 111] Connection refused - [Remote host sent ICMP Unreachable]")
 
-        if self._packet_rx_md_ready.acquire(timeout=timeout):  # type: ignore
-            data_rx = self._packet_rx_md.pop(0).data
-            if __debug__:
-                log("socket", f"<g>[{self}]</> - <lg>Received</> {len(data_rx)} bytes of data")
-            return data_rx
-        raise ReceiveTimeout
+        data_rx = bytes(self._dequeue(timeout).data[:bufsize])
+        if __debug__:
+            log("socket", f"<g>[{self}]</> - <lg>Received</> {len(data_rx)} bytes of data")
+        return data_rx
 
     def recvfrom(self, bufsize: int | None = None, timeout: float | None = None) -> tuple[bytes, tuple[str, int]]:
-        """Read data from socket"""
+        """Read data from socket, part of datagram that doesn't fit into 'bufsize' bytes gets discarded"""
+
+        packet_rx_md = self._dequeue(timeout)
+        data_rx = bytes(packet_rx_md.data[:bufsize])
+        if __debug__:
+            log("socket", f"<g>[{self}]</> - <lg>Received</> {len(data_rx)} bytes of data")
+        return (data_rx, (str(packet_rx_md.remote_ip_address), packet_rx_md.remote_port))
 
-        # TODO - Implement support for buffsize
+    def recv_many(self, count: int, timeout: float | None = None) -> list[tuple[bytes, tuple[str, int]]]:
+        """Read up to 'count' datagrams from socket, wait only for the first one to arrive"""
 
-        if self._packet_rx_md_ready.acquire(timeout=timeout):  # type: ignore
-            packet_rx_md = self._packet_rx_md.pop(0)
-            if __debug__:
-                log("socket", f"<g>[{self}]</> - <lg>Received</> {len(packet_rx_md.data)} bytes of data")
-            return (packet_rx_md.data, (str(packet_rx_md.remote_ip_address), packet_rx_md.remote_port))
-        raise ReceiveTimeout
+        with self._packet_rx_md_ready:
+            if not self._packet_rx_md_ready.wait_for(lambda: self._packet_rx_md, timeout):
+                raise ReceiveTimeout
+            packets_rx_md = [self._packet_rx_md.popleft() for _ in range(min(count, len(self._packet_rx_md)))]
+            self._packet_rx_md_len -= sum(len(_.data) for _ in packets_rx_md)
+
+        if __debug__:
+            log("socket", f"<g>[{self}]</> - <lg>Received</> {len(packets_rx_md)} datagrams")
+
+        return [(bytes(_.data), (str(_.remote_ip_address), _.remote_port)) for _ in packets_rx_md]
+
+    def recvfrom_view(self, timeout: float | None = None) -> tuple[memoryview, tuple[str, int]]:
+        """Read datagram from socket without copying it, with SO_ZEROCOPY option set the view points directly into the received frame"""
+
+        # Application is expected to call 'release()' on the view (or use it as context manager) once done with it,
+        # until then the view keeps the whole frame it came with in memory
+
+        packet_rx_md = self._dequeue(timeout)
+        data_rx = memoryview(packet_rx_md.data)
+        if __debug__:
+            log("socket", f"<g>[{self}]</> - <lg>Received</> {len(data_rx)} bytes of data")
+        return (data_rx, (str(packet_rx_md.remote_ip_address), packet_rx_md.remote_port))
+
+    def recv_into(self, buffer: memoryview | bytearray, nbytes: int = 0, flags: int = 0, *, timeout: float | None = None) -> int:
+        """Receive datagram directly into provided buffer, with MSG_TRUNC flag the real datagram length is returned even if it didn't fit"""
+
+        return self.recvfrom_into(buffer, nbytes, flags, timeout=timeout)[0]
+
+    def recvfrom_into(self, buffer: memoryview | bytearray, nbytes: int = 0, flags: int = 0, *, timeout: float | None = None) -> tuple[int, tuple[str, int]]:
+        """Receive datagram directly into provided buffer, with MSG_TRUNC flag the real datagram length is returned even if it didn't fit"""
+
+        packet_rx_md = self._dequeue(timeout)
+        data_rx_len = min(nbytes or len(buffer), len(buffer), len(packet_rx_md.data))
+        buffer[:data_rx_len] = packet_rx_md.data[:data_rx_len]
+        if __debug__:
+            log("socket", f"<g>[{self}]</> - <lg>Received</> {data_rx_len} bytes of data")
+        return (
+            len(packet_rx_md.data) if flags & MSG_TRUNC else data_rx_len,
+            (str(packet_rx_md.remote_ip_address), packet_rx_md.remote_port),
+        )
 
     def close(self) -> None:
         """Close socket"""
 
-        stack.sockets.pop(str(self), None)
+        stack.sockets.discard(self.socket_id, self)
 
         if __debug__:
             log("socket", f"<g>[{self}]</> - Closed socket")
@@ -250,8 +372,20 @@ class UdpSocket(Socket):
     def process_udp_packet(self, packet_rx_md: UdpMetadata) -> None:
         """Process incoming packet's metadata"""
 
-        self._packet_rx_md.append(packet_rx_md)
-        self._packet_rx_md_ready.release()
+        # Unless zero-copy delivery is enabled copy the data out of the frame so frame can be freed right away
+        if not self.getsockopt(SOL_SOCKET, SO_ZEROCOPY):
+            packet_rx_md.data = bytes(packet_rx_md.data)
+
+        with self._packet_rx_md_ready:
+            # Datagram that doesn't fit into receive buffer gets dropped, single datagram is always accepted into empty queue
+            if self._packet_rx_md and self._packet_rx_md_len + len(packet_rx_md.data) > self.getsockopt(SOL_SOCKET, SO_RCVBUF):
+                self._stat_drops += 1
+                if __debug__:
+                    log("socket", f"<g>[{self}]</> - Receive queue full, dropped {len(packet_rx_md.data)} bytes of data")
+                return
+            self._packet_rx_md.append(packet_rx_md)
+            self._packet_rx_md_len += len(packet_rx_md.data)
+            self._packet_rx_md_ready.notify()
 
     def notify_unreachable(self) -> None:
         """Set the unreachable notification"""
@@ -45,14 +45,16 @@ if TYPE_CHECKING:
 class ServiceTcp:
     """TCP service support class"""
 
-    def __init__(self, name: str, local_ip_address: str, local_port: int) -> None:
-        """Class constructor"""
+    def __init__(self, name: str, local_ip_address: str, local_port: int, workers: int = 1) -> None:
+        """Class constructor, multiple workers share the local port using SO_REUSEPORT option"""
 
         self.local_ip_address = local_ip_address
         self.local_port = local_port
         self.name = name
+        self.workers = workers
 
-        threading.Thread(target=self.__thread_service).start()
+        for _ in range(workers):
+            threading.Thread(target=self.__thread_service).start()
 
     def __thread_service(self) -> None:
         """Service initialization"""
@@ -67,6 +69,9 @@ class ServiceTcp:
                 log("service", f"Service TCP {self.name}: Invalid local IP address - {self.local_ip_address}")
             return
 
+        if self.workers > 1:
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
         try:
             s.bind((self.local_ip_address, self.local_port))
             if __debug__:
@@ -78,6 +78,7 @@ class ArpCache:
             # If entry age is over maximum age then discard the entry
             if time.time() - self.arp_cache[ip4_address].creation_time > config.ARP_CACHE_ENTRY_MAX_AGE:
                 mac_address = self.arp_cache.pop(ip4_address).mac_address
+                stack.packet_handler.invalidate_tx_templates(mac_address)
                 if __debug__:
                     log("arp-c", f"Discarded expir ARP cache entry - {ip4_address} -> {mac_address}")
 
@@ -90,11 +91,17 @@ class ArpCache:
                 if __debug__:
                     log("arp-c", f"Trying to refresh expiring ARP cache entry for {ip4_address} -> {self.arp_cache[ip4_address].mac_address}")
 
+            # Flows sent using TX templates don't do cache lookups, dropping their templates lets them register hits needed for the entry refresh
+            elif time.time() - self.arp_cache[ip4_address].creation_time > config.ARP_CACHE_ENTRY_MAX_AGE - config.ARP_CACHE_ENTRY_REFRESH_TIME:
+                stack.packet_handler.invalidate_tx_templates(self.arp_cache[ip4_address].mac_address)
+
     def add_entry(self, ip4_address: Ip4Address, mac_address: MacAddress) -> None:
         """Add / refresh entry in cache"""
 
         if __debug__:
             log("arp-c", f"<INFO>Adding/refreshing ARP cache entry - {ip4_address} -> {mac_address}</>")
+        if (arp_entry := self.arp_cache.get(ip4_address)) is not None and arp_entry.mac_address != mac_address:
+            stack.packet_handler.invalidate_tx_templates(arp_entry.mac_address)
         self.arp_cache[ip4_address] = self.CacheEntry(mac_address)
 
     def find_entry(self, ip4_address: Ip4Address) -> MacAddress | None:
@@ -76,6 +76,7 @@ class NdCache:
             # If entry age is over maximum age then discard the entry
             if time.time() - self.nd_cache[ip6_address].creation_time > config.ND_CACHE_ENTRY_MAX_AGE:
                 mac_address = self.nd_cache.pop(ip6_address).mac_address
+                stack.packet_handler.invalidate_tx_templates(mac_address)
                 if __debug__:
                     log("nd-c", f"Discarded expir ICMPv6 ND cache entry - {ip6_address} -> {mac_address}")
 
@@ -88,11 +89,17 @@ class NdCache:
                 if __debug__:
                     log("nd-c", f"Trying to refresh expiring ICMPv6 ND cache entry for {ip6_address} -> {self.nd_cache[ip6_address].mac_address}")
 
+            # Flows sent using TX templates don't do cache lookups, dropping their templates lets them register hits needed for the entry refresh
+            elif time.time() - self.nd_cache[ip6_address].creation_time > config.ND_CACHE_ENTRY_MAX_AGE - config.ND_CACHE_ENTRY_REFRESH_TIME:
+                stack.packet_handler.invalidate_tx_templates(self.nd_cache[ip6_address].mac_address)
+
     def add_entry(self, ip6_address: Ip6Address, mac_address: MacAddress) -> None:
         """Add / refresh entry in cache"""
 
         if __debug__:
             log("nd-c", f"<INFO>Adding/refreshing ARP cache entry from direct reply - {ip6_address} -> {mac_address}</>")
+        if (nd_entry := self.nd_cache.get(ip6_address)) is not None and nd_entry.mac_address != mac_address:
+            stack.packet_handler.invalidate_tx_templates(nd_entry.mac_address)
         self.nd_cache[ip6_address] = self.CacheEntry(mac_address)
 
     def find_entry(self, ip6_address: Ip6Address) -> MacAddress | None:
@@ -59,7 +59,13 @@ from protocols.arp.phrx import _phrx_arp
 from protocols.arp.phtx import _phtx_arp
 from protocols.arp.ps import ARP_OP_REPLY, ARP_OP_REQUEST
 from protocols.ether.phrx import _phrx_ether
-from protocols.ether.phtx import _phtx_ether
+from protocols.ether.phtx import (
+    _phtx_ether,
+    _phtx_ether_template,
+    _resolve_ether_dst_ip4,
+    _resolve_ether_dst_ip6,
+    _save_tx_template,
+)
 from protocols.icmp4.phrx import _phrx_icmp4
 from protocols.icmp4.phtx import _phtx_icmp4
 from protocols.icmp6.fpa import (
@@ -79,12 +85,14 @@ from protocols.icmp6.ps import (
 from protocols.ip4.phrx import _defragment_ip4_packet, _phrx_ip4
 from protocols.ip4.phtx import (
     _phtx_ip4,
+    _route_ip4,
     _validate_dst_ip4_address,
     _validate_src_ip4_address,
 )
 from protocols.ip6.phrx import _phrx_ip6
 from protocols.ip6.phtx import (
     _phtx_ip6,
+    _route_ip6,
     _validate_dst_ip6_address,
     _validate_src_ip6_address,
 )
@@ -93,7 +101,7 @@ from protocols.ip6_ext_frag.phtx import _phtx_ip6_ext_frag
 from protocols.tcp.phrx import _phrx_tcp
 from protocols.tcp.phtx import _phtx_tcp
 from protocols.udp.phrx import _phrx_udp
-from protocols.udp.phtx import _phtx_udp
+from protocols.udp.phtx import _phtx_udp, _phtx_udp_batch
 from subsystems.arp_cache import ArpCache
 from subsystems.nd_cache import NdCache
 from subsystems.rx_ring import RxRing
@@ -104,6 +112,7 @@ if TYPE_CHECKING:
 
     from lib.ip_address import IpAddress
     from misc.tx_status import TxStatus
+    from misc.tx_template import TxTemplate, TxTemplateKey
 
 
 class PacketHandler:
@@ -114,6 +123,10 @@ class PacketHandler:
     _phtx_arp = _phtx_arp
     _phrx_ether = _phrx_ether
     _phtx_ether = _phtx_ether
+    _phtx_ether_template = _phtx_ether_template
+    _save_tx_template = _save_tx_template
+    _resolve_ether_dst_ip4 = _resolve_ether_dst_ip4
+    _resolve_ether_dst_ip6 = _resolve_ether_dst_ip6
     _phrx_icmp6 = _phrx_icmp6
     _phtx_icmp6 = _phtx_icmp6
     _phrx_ip6_ext_frag = _phrx_ip6_ext_frag
@@ -124,16 +137,19 @@ class PacketHandler:
     _phrx_ip4 = _phrx_ip4
     _defragment_ip4_packet = _defragment_ip4_packet
     _phtx_ip4 = _phtx_ip4
+    _route_ip4 = _route_ip4
     _validate_dst_ip4_address = _validate_dst_ip4_address
     _validate_src_ip4_address = _validate_src_ip4_address
     _phrx_ip6 = _phrx_ip6
     _phtx_ip6 = _phtx_ip6
+    _route_ip6 = _route_ip6
     _validate_dst_ip6_address = _validate_dst_ip6_address
     _validate_src_ip6_address = _validate_src_ip6_address
     _phrx_tcp = _phrx_tcp
     _phtx_tcp = _phtx_tcp
     _phrx_udp = _phrx_udp
     _phtx_udp = _phtx_udp
+    _phtx_udp_batch = _phtx_udp_batch
 
     def __init__(self, tap: int | None) -> None:
         """Class constructor"""
@@ -175,6 +191,9 @@ class PacketHandler:
         self.ip4_frag_flows: dict[int, bytes] = {}
         self.ip6_frag_flows: dict[int, bytes] = {}
 
+        # Used to keep pre-built Ethernet / IP headers of the established TCP and UDP flows
+        self.tx_templates: dict[TxTemplateKey, TxTemplate] = {}
+
         # Skip rest of the initialisations for the unit test / mock run
         if tap is None:
             return
@@ -228,7 +247,9 @@ class PacketHandler:
         """Thread picks up incoming packets from RX ring and processes them"""
 
         while True:
-            self._phrx_ether(self.rx_ring.dequeue())
+            packet_rx = self.rx_ring.dequeue()
+            self._phrx_ether(packet_rx)
+            packet_rx.release()
 
     @property
     def ip6_unicast(self) -> list[Ip6Address]:
@@ -428,6 +449,7 @@ class PacketHandler:
             self.ip4_host_candidate.remove(ip4_host)
             if ip4_host.address not in self.arp_probe_unicast_conflict:
                 self.ip4_host.append(ip4_host)
+                self.invalidate_tx_templates()
                 self._send_arp_announcement(ip4_host.address)
                 if __debug__:
                     log("stack", f"Successfully claimed IPv4 address {ip4_unicast}")
@@ -535,6 +557,7 @@ class PacketHandler:
         """Assign IPv6 host unicast  address to the list stack listens on"""
 
         self.ip6_host.append(ip6_host)
+        self.invalidate_tx_templates()
         if __debug__:
             log("stack", f"Assigned IPv6 unicast address {ip6_host}")
         self._assign_ip6_multicast(ip6_host.address.solicited_node_multicast)
@@ -543,6 +566,7 @@ class PacketHandler:
         """Remove IPv6 ihost unicast address from the list stack listens on"""
 
         self.ip6_host.remove(ip6_host)
+        self.invalidate_tx_templates()
         if __debug__:
             log("stack", f"Removed IPv6 unicast address {ip6_host}")
         self._remove_ip6_multicast(ip6_host.address.solicited_node_multicast)
@@ -579,6 +603,18 @@ class PacketHandler:
         if __debug__:
             log("stack", f"Removed MAC multicast {mac_multicast}")
 
+    def invalidate_tx_templates(self, mac_address: MacAddress | None = None) -> None:
+        """Drop TX templates of flows sent to given MAC address or all of them when address is not specified"""
+
+        if mac_address is None:
+            self.tx_templates.clear()
+            return
+
+        # Timer thread runs this while packet handler thread keeps adding templates, so dict is iterated over its snapshot
+        for flow, tx_template in list(self.tx_templates.items()):
+            if tx_template.ether_dst == mac_address:
+                self.tx_templates.pop(flow, None)
+
     def send_udp_packet(
         self,
         local_ip_address: IpAddress,
@@ -586,6 +622,7 @@ class PacketHandler:
         local_port: int,
         remote_port: int,
         data: bytes | None = None,
+        tx_template: bool = False,
     ) -> TxStatus:
         """Interface method for UDP Socket -> FPA communication"""
 
@@ -595,8 +632,14 @@ class PacketHandler:
             udp_sport=local_port,
             udp_dport=remote_port,
             udp_data=data,
+            tx_template=tx_template,
         )
 
+    def send_udp_packets(self, local_port: int, packets: list[tuple[IpAddress, IpAddress, int, bytes | memoryview]]) -> list[TxStatus]:
+        """Interface method for UDP Socket -> FPA communication, sends batch of (local ip, remote ip, remote port, data) datagrams"""
+
+        return self._phtx_udp_batch(udp_sport=local_port, packets=packets)
+
     def send_tcp_packet(
         self,
         local_ip_address: IpAddress,
@@ -612,7 +655,10 @@ class PacketHandler:
         win: int = 0,
         wscale: int | None = None,
         mss: int | None = None,
-        data: bytes | None = None,
+        fastopen: bytes | None = None,
+        data: bytes | memoryview | None = None,
+        data_sum: int | None = None,
+        tx_template: bool = False,
     ) -> TxStatus:
         """Interface method for TCP Socket -> FPA communication"""
 
@@ -630,7 +676,10 @@ class PacketHandler:
             tcp_win=win,
             tcp_wscale=wscale,
             tcp_mss=mss,
+            tcp_fastopen=fastopen,
             tcp_data=data,
+            tcp_data_sum=data_sum,
+            tx_template=tx_template,
         )
 
     def send_icmp4_packet(
@@ -36,6 +36,7 @@ import threading
 
 import misc.stack as stack
 from lib.logger import log
+from lib.socket import SOCK_STREAM
 
 
 class StackCliServer:
@@ -82,16 +83,15 @@ class StackCliServer:
                 if message == b"":
                     continue
 
-                """
                 if message.lower().strip() == b"show tcp sessions":
                     message = b"\n"
-                    for session in stack.tcp_sessions:
-                        message += bytes(str(session), "utf-8") + b"\n"
+                    for tcp_socket in list(stack.sockets.values()):
+                        if tcp_socket.type is SOCK_STREAM and tcp_socket.tcp_session:
+                            message += bytes(f"{tcp_socket.tcp_session} - {tcp_socket.tcp_session.info}", "utf-8") + b"\n"
                     message += b"\n"
                     conn.sendall(message)
-                """
 
-                if message.lower().strip() == b"show ipv6 host":
+                elif message.lower().strip() == b"show ipv6 host":
                     message = b"\n"
                     for ip6_host in stack.packet_handler.ip6_host:
                         message += bytes(str(ip6_host), "utf-8") + b"\n"
@@ -41,6 +41,7 @@ from lib.logger import log
 if TYPE_CHECKING:
     from threading import Semaphore
 
+    from misc.tx_template import TxTemplatePacket
     from protocols.ether.fpa import EtherAssembler
 
 
@@ -51,7 +52,7 @@ class TxRing:
         """Initialize access to tap interface and the outbound queue"""
 
         self.tap: int = tap
-        self.tx_ring: list[EtherAssembler] = []
+        self.tx_ring: list[EtherAssembler | TxTemplatePacket] = []
         self.packet_enqueued: Semaphore = threading.Semaphore(0)
 
         threading.Thread(target=self.__thread_transmit).start()
@@ -84,7 +85,7 @@ class TxRing:
             if __debug__:
                 log("tx-ring", f"<B><lr>[TX]</> {packet_tx.tracker}<y>{packet_tx.tracker.latency}</> - sent frame, {len(packet_tx)} bytes")
 
-    def enqueue(self, packet_tx: EtherAssembler) -> None:
+    def enqueue(self, packet_tx: EtherAssembler | TxTemplatePacket) -> None:
         """Enqueue outbound packet into TX ring"""
 
         self.tx_ring.append(packet_tx)
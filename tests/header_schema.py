@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# tests/header_schema.py - unit tests for declarative header schema
+#
+
+
+from types import SimpleNamespace
+
+from testslide import TestCase
+
+from pytcp.lib.ip6_address import Ip6Address
+from pytcp.lib.mac_address import MacAddress
+from pytcp.misc.header_schema import HeaderField, HeaderSchema, OptionsSchema
+
+
+class TestHeaderSchema(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.schema = HeaderSchema(
+            HeaderField("mac", 48, type=MacAddress),
+            HeaderField("", 8),
+            HeaderField("hlen", 4, scale=2),
+            HeaderField("", 3),
+            HeaderField("flag", 1, type=bool),
+            HeaderField("offset", 13, scale=3),
+            HeaderField("", 2),
+            HeaderField("flag_mf", 1, type=bool),
+            HeaderField("addr", 128, type=Ip6Address),
+        )
+        self.frame = b"\x02\x00\x00\x00\x00\x07\x00\x51\x04\xd1" + b"\x20\x01\x0d\xb8\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01"
+
+    def test_header_schema__layout(self):
+        """Test grouping of fields into struct words"""
+
+        self.assertEqual(self.schema.struct.format, "! L H 1x B H Q Q")
+        self.assertEqual(len(self.schema), 26)
+        self.assertEqual(self.schema.names, ("mac", "hlen", "flag", "offset", "flag_mf", "addr"))
+
+    def test_header_schema__layout__unaligned(self):
+        """Test bitfields that don't add up to whole word"""
+
+        with self.assertRaises(AssertionError):
+            HeaderSchema(HeaderField("ver", 4), HeaderField("ttl", 8))
+
+    def test_header_schema__unpack_into(self):
+        """Test decoding header fields into object attributes"""
+
+        header = SimpleNamespace()
+        self.schema.unpack_into(header, memoryview(self.frame))
+        self.assertEqual(header.mac, MacAddress("02:00:00:00:00:07"))
+        self.assertEqual(header.hlen, 20)
+        self.assertIs(header.flag, True)
+        self.assertEqual(header.offset, 1232)
+        self.assertIs(header.flag_mf, True)
+        self.assertEqual(header.addr, Ip6Address("2001:db8::1"))
+
+    def test_header_schema__unpack_into__offset(self):
+        """Test decoding header placed at offset of the frame"""
+
+        header = SimpleNamespace()
+        self.schema.unpack_into(header, memoryview(b"\xff" * 3 + self.frame), 3)
+        self.assertEqual(header.hlen, 20)
+        self.assertEqual(header.addr, Ip6Address("2001:db8::1"))
+
+    def test_header_schema__pack_into(self):
+        """Test encoding header fields into frame"""
+
+        frame = memoryview(bytearray(b"\xff" * len(self.schema)))
+        self.schema.pack_into(frame, 0, MacAddress("02:00:00:00:00:07"), 20, True, 1232, True, Ip6Address("2001:db8::1"))
+        self.assertEqual(bytes(frame), self.frame)
+
+    def test_header_schema__pack_into__truncated(self):
+        """Test encoding scaled value that is truncated to its unit"""
+
+        schema = HeaderSchema(HeaderField("ver", 4), HeaderField("hlen", 4, scale=2))
+        frame = memoryview(bytearray(len(schema)))
+        schema.pack_into(frame, 0, 4, 22)
+        self.assertEqual(bytes(frame), b"\x45")
+
+    def test_header_schema__pack_into__assert(self):
+        """Test validation of field values"""
+
+        frame = memoryview(bytearray(len(self.schema)))
+        with self.assertRaises(AssertionError):
+            self.schema.pack_into(frame, 0, MacAddress(0), 64, False, 0, False, Ip6Address(0))
+        with self.assertRaises(AssertionError):
+            self.schema.pack_into(frame, 0, MacAddress(0), 22, False, 0, False, Ip6Address(0))
+        with self.assertRaises(AssertionError):
+            self.schema.pack_into(frame, 0, MacAddress(0), 20, False, 1235, False, Ip6Address(0))
+        with self.assertRaises(AssertionError):
+            self.schema.pack_into(frame, 0, MacAddress(0), 20, False, -8, False, Ip6Address(0))
+
+
+class TestOptionsSchema(TestCase):
+    def test_options_schema__integrity_check(self):
+        """Test options integrity check"""
+
+        options = OptionsSchema(eol=0, nop=1)
+
+        self.assertEqual(options.integrity_check(memoryview(b"\x01\x01\x02\x04\x05\xb4\x00\x00"), 0, 8), "")
+        self.assertEqual(options.integrity_check(memoryview(b"\x00\xff"), 0, 2), "")
+        self.assertEqual(options.integrity_check(memoryview(b"\x02\x00\x00\x00"), 0, 4), "III")
+        self.assertEqual(options.integrity_check(memoryview(b"\x02\x06\x00\x00"), 0, 4), "IV")
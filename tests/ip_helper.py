@@ -29,11 +29,23 @@
 #
 
 
+import random
 from dataclasses import dataclass
+from unittest import skipUnless
 
 from testslide import TestCase
 
-from pytcp.misc.ip_helper import inet_cksum, ip_version
+from pytcp.misc import ip_helper
+from pytcp.misc.ip_helper import (
+    inet_cksum,
+    inet_cksum_batch,
+    inet_cksum_update,
+    inet_sum,
+    inet_sum_add,
+    inet_sum_move,
+    inet_sum_sub,
+    ip_version,
+)
 
 
 class TestIpHelper(TestCase):
@@ -45,15 +57,15 @@ class TestIpHelper(TestCase):
             result: int
 
         samples = [
-            Sample(b"\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0A\x0B\x0C\x0D\x0E\x0F" * 80, 0, 0x2D2D),
-            Sample(b"\xFF" * 1500, 0, 0x0000),
+            Sample(b"\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f" * 80, 0, 0x2D2D),
+            Sample(b"\xff" * 1500, 0, 0x0000),
             Sample(b"\x00" * 1500, 0, 0xFFFF),
-            Sample(b"\xF7\x24\x09" * 100 + b"\x35\x67\x0F\x00" * 250, 0, 0xF1E5),
+            Sample(b"\xf7\x24\x09" * 100 + b"\x35\x67\x0f\x00" * 250, 0, 0xF1E5),
             Sample(b"\x07" * 9999, 0, 0xBEC5),
-            Sample(b"\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0A\x0B\x0C\x0D\x0E\x0F" * 80, 0x03DF, 0x294E),
-            Sample(b"\xFF" * 1500, 0x0015, 0xFFEA),
+            Sample(b"\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f" * 80, 0x03DF, 0x294E),
+            Sample(b"\xff" * 1500, 0x0015, 0xFFEA),
             Sample(b"\x00" * 1500, 0xF3FF, 0x0C00),
-            Sample(b"\xF7\x24\x09" * 100 + b"\x35\x67\x0F\x00" * 250, 0x7314, 0x7ED1),
+            Sample(b"\xf7\x24\x09" * 100 + b"\x35\x67\x0f\x00" * 250, 0x7314, 0x7ED1),
             Sample(b"\x07" * 9999, 0xA3DC, 0x1AE9),
         ]
 
@@ -61,6 +73,53 @@ class TestIpHelper(TestCase):
             result = inet_cksum(data=memoryview(sample.data), init=sample.init)
             self.assertEqual(result, sample.result)
 
+        self.assertEqual(inet_cksum_batch([memoryview(_.data) for _ in samples], [_.init for _ in samples]), [_.result for _ in samples])
+        self.assertEqual(inet_cksum_batch([b"", b"\x07", memoryview(samples[0].data)[1:]]), [0xFFFF, 0xF8FF, inet_cksum(memoryview(samples[0].data)[1:])])
+
+    def test_inet_cksum__no_numpy(self):
+        if ip_helper.numpy is not None:
+            self.patch_attribute(ip_helper, "numpy", None, type_validation=False)
+        self.test_inet_cksum()
+
+    @skipUnless(ip_helper.numpy is not None, "NumPy not installed")
+    def test_inet_cksum__numpy(self):
+        rng = random.Random(0)
+        data = [memoryview(rng.randbytes(_ + 3))[3:] for _ in (0, 1, 2, 3, 20, 255, 256, 257, 258, 259, 1460, 1461, 9001)]
+        data += [memoryview(b"\xff" * _) for _ in (256, 1500, 9003)]
+        init = [rng.randrange(0x100000000) for _ in data]
+
+        numpy_results = [inet_cksum(_, __) for _, __ in zip(data, init)]
+        numpy_sums = [inet_sum(_, 1) for _ in data]
+        numpy_batch = inet_cksum_batch(data, init)
+        numpy_batch__single = [inet_cksum_batch([_]) for _ in data]
+
+        self.patch_attribute(ip_helper, "numpy", None, type_validation=False)
+
+        self.assertEqual(numpy_results, [inet_cksum(_, __) for _, __ in zip(data, init)])
+        self.assertEqual(numpy_sums, [inet_sum(_, 1) for _ in data])
+        self.assertEqual(numpy_batch, numpy_results)
+        self.assertEqual(numpy_batch, inet_cksum_batch(data, init))
+        self.assertEqual(numpy_batch__single, [inet_cksum_batch([_]) for _ in data])
+
+    def test_inet_cksum_update(self):
+        data = bytearray(b"\x45\x00\x00\x28\x00\x00\x00\x00\x40\x06\x00\x00\x0a\x00\x01\x07\x0a\x00\x01\x5b")
+        cksum = inet_cksum(data=memoryview(data))
+
+        for old, new in ((0x0028, 0x05DC), (0x05DC, 0x0000), (0x0000, 0xFFFF), (0xFFFF, 0x0014)):
+            data[2:4] = new.to_bytes(2, "big")
+            cksum = inet_cksum_update(cksum, old, new)
+            self.assertEqual(cksum, inet_cksum(data=memoryview(data)))
+
+    def test_inet_sum(self):
+        data = memoryview(b"\xf7\x24\x09" * 100 + b"\x35\x67\x0f\x00" * 250 + b"\x07")
+        cksum = inet_cksum(data)
+
+        for split in (0, 1, 2, 7, 300, 999, len(data)):
+            head, tail = data[:split], data[split:]
+            self.assertEqual(~inet_sum_add(inet_sum(head), inet_sum(tail, split)) & 0xFFFF, cksum)
+            self.assertEqual(inet_sum_sub(inet_sum(data), inet_sum(head)) % 0xFFFF, inet_sum(tail, split) % 0xFFFF)
+            self.assertEqual(inet_sum_move(inet_sum(tail, split), split), inet_sum(tail))
+
     def test_ip_version(self):
         self.assertEqual(ip_version("1:2:3:4:5:6:7:8"), 6)
         self.assertEqual(ip_version("1.2.3.4"), 4)
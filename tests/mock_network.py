@@ -30,11 +30,20 @@
 #
 
 
+import misc.stack as stack
 from testslide import StrictMock
 
 from pytcp.lib.ip4_address import Ip4Address, Ip4Host
 from pytcp.lib.ip6_address import Ip6Address, Ip6Host
 from pytcp.lib.mac_address import MacAddress
+from pytcp.lib.socket_table import SocketTable
+from pytcp.protocols.tcp.fastopen import TcpFastOpenCache
+from pytcp.protocols.tcp.metadata import TcpMetadata
+from pytcp.protocols.tcp.ooo_queue import TcpOooBudget
+
+# Socket classes need to see the same enums and exceptions as the stack code does
+from pytcp.protocols.tcp.socket import AF_INET4, TcpSocket
+from pytcp.protocols.tcp.time_wait import TcpTimeWaitTable
 from pytcp.subsystems.arp_cache import ArpCache
 from pytcp.subsystems.nd_cache import NdCache
 from pytcp.subsystems.packet_handler import PacketHandler
@@ -176,3 +185,89 @@ def setup_mock_packet_handler(self):
 
     self.frame_tx = memoryview(bytearray(2048))
     self.frames_tx = []
+
+
+class MockTimer:
+    """Stack timer driven by the test, registered timers expire only when test advances the time and registered methods are never run"""
+
+    def __init__(self):
+        self.timers = {}
+
+    def register_method(self, method, args=None, kwargs=None, delay=1, delay_exp=False, repeat_count=-1, stop_condition=None):
+        pass
+
+    def register_timer(self, name, timeout):
+        self.timers[name] = timeout
+
+    def is_expired(self, name):
+        return not self.timers.get(name, None)
+
+    def tick(self, count=1):
+        self.timers = {name: timeout - count for name, timeout in self.timers.items() if timeout > count}
+
+
+def setup_mock_stack(self):
+    """Replace stack wide structures with fresh ones so TCP sessions can run without timer thread, packets they send are collected as arguments"""
+
+    self.timer = MockTimer()
+    self.packets_tx = []
+    self.packet_handler_mock = StrictMock(PacketHandler)
+    self.mock_callable(self.packet_handler_mock, "send_tcp_packet").with_implementation(lambda **kwargs: self.packets_tx.append(kwargs))
+
+    # Stack globals are swapped directly as some of them are not assigned until stack starts and patch_attribute can't restore empty containers
+    for name, value in {
+        "timer": self.timer,
+        "packet_handler": self.packet_handler_mock,
+        "sockets": SocketTable(),
+        "tcp_time_wait": TcpTimeWaitTable(),
+        "tcp_fastopen_cache": TcpFastOpenCache(),
+        "tcp_ooo_budget": TcpOooBudget(),
+        "tcp_fast_path": {},
+    }.items():
+        self.addCleanup(setattr, stack, name, getattr(stack, name, None))
+        setattr(stack, name, value)
+
+
+def mock_tcp_metadata(self, **kwargs):
+    """Create metadata of TCP packet sent from host A port 40000 to stack port 80, by default it is pure ACK packet"""
+
+    return TcpMetadata(
+        **{
+            "local_ip_address": self.mns.stack_ip4_host.address,
+            "local_port": 80,
+            "remote_ip_address": self.mns.host_a_ip4_address,
+            "remote_port": 40000,
+            "flag_syn": False,
+            "flag_ack": True,
+            "flag_fin": False,
+            "flag_rst": False,
+            "seq": 0,
+            "ack": 0,
+            "win": 65535,
+            "wscale": None,
+            "mss": 1460,
+            "fastopen": None,
+            "tracker": None,
+            **kwargs,
+            "data": memoryview(kwargs.get("data", b"")),
+        }
+    )
+
+
+def setup_mock_tcp_listener(self):
+    """Create TCP socket listening on stack port 80"""
+
+    self.listener = TcpSocket(AF_INET4)
+    self.listener._local_ip_address = self.mns.stack_ip4_host.address
+    self.listener._local_port = 80
+    self.listener.listen()
+
+
+def accept_mock_tcp_session(self, *, rcv_ini=5000, wscale=None):
+    """Complete three way handshake host A initiates towards listening socket and return the stack's end of established session"""
+
+    self.listener.process_tcp_packet(mock_tcp_metadata(self, flag_syn=True, flag_ack=False, seq=rcv_ini, wscale=wscale))
+    snd_ini = self.packets_tx.pop()["seq"]
+    self.listener.process_tcp_packet(mock_tcp_metadata(self, seq=rcv_ini + 1, ack=snd_ini + 1))
+    socket, _ = self.listener.accept()
+    return socket.tcp_session
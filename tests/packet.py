@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# tests/packet.py - unit tests for RX packet object pool
+#
+
+
+from testslide import TestCase
+
+from pytcp.lib.ip4_address import Ip4Address, Ip4Host
+from pytcp.lib.ip6_address import Ip6Address, Ip6Host
+from pytcp.lib.mac_address import MacAddress
+from pytcp.lib.tracker import Tracker
+from pytcp.misc.packet import PACKET_RX_POOL_SIZE, PacketRx
+from pytcp.protocols.ether.fpp import EtherParser
+from pytcp.protocols.tcp.metadata import TcpMetadata
+from pytcp.protocols.udp.metadata import UdpMetadata
+from tests.mock_network import (
+    MockNetworkSettings,
+    patch_config,
+    setup_mock_packet_handler,
+)
+
+# Addresses below match the test packets and should not be changed
+STACK_MAC_ADDRESS = MacAddress("02:00:00:77:77:77")
+STACK_IP4_HOST = Ip4Host("192.168.9.7/24")
+STACK_IP6_HOST = Ip6Host("2603:9000:e307:9f09:0:ff:fe77:7777/64")
+LOCNET_MAC_ADDRESS = MacAddress("52:54:00:df:85:37")
+LOCNET_IP4_ADDRESS = Ip4Address("192.168.9.102")
+LOCNET_IP6_ADDRESS = Ip6Address("2603:9000:e307:9f09::1fa1")
+
+TEST_FRAME_DIR = "tests/packets/rx_tx/"
+
+
+class TestPacketRx(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        PacketRx._pool.clear()
+
+    def tearDown(self):
+        PacketRx._pool.clear()
+
+        super().tearDown()
+
+    def test_packet_rx__slots(self):
+        for cls in (PacketRx, Tracker, TcpMetadata, UdpMetadata):
+            self.assertNotIn("__dict__", dir(cls))
+
+    def test_packet_rx__release(self):
+        packet_rx = PacketRx(b"\x00" * 64)
+        EtherParser(packet_rx)
+        packet_rx.release()
+        self.assertIsNone(packet_rx.frame)
+        self.assertIsNone(packet_rx.ether)
+        self.assertEqual(PacketRx._pool, [packet_rx])
+
+    def test_packet_rx__reuse(self):
+        allocated = set()
+        for _ in range(1000):
+            packet_rx = PacketRx(b"\x00" * 64)
+            allocated.add(id(packet_rx))
+            self.assertEqual(bytes(packet_rx.frame), b"\x00" * 64)
+            self.assertEqual(packet_rx.parse_failed, "")
+            packet_rx.release()
+        self.assertEqual(len(allocated), 1)
+
+    def test_packet_rx__pool_size(self):
+        packets_rx = [PacketRx(b"") for _ in range(PACKET_RX_POOL_SIZE + 10)]
+        for packet_rx in packets_rx:
+            packet_rx.release()
+        self.assertEqual(len(PacketRx._pool), PACKET_RX_POOL_SIZE)
+
+
+class TestPacketRxHandler(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.mns = MockNetworkSettings()
+        patch_config(self)
+        setup_mock_packet_handler(self)
+        self.mock_callable(self.arp_cache_mock, "find_entry").for_call(LOCNET_IP4_ADDRESS).to_return_value(LOCNET_MAC_ADDRESS)
+        self.mock_callable(self.arp_cache_mock, "add_entry").to_return_value(None)
+        self.mock_callable(self.nd_cache_mock, "find_entry").for_call(LOCNET_IP6_ADDRESS).to_return_value(LOCNET_MAC_ADDRESS)
+        self.mock_callable(self.nd_cache_mock, "add_entry").to_return_value(None)
+        self.packet_handler.mac_unicast = STACK_MAC_ADDRESS
+        self.packet_handler.mac_multicast = [STACK_IP6_HOST.address.solicited_node_multicast.multicast_mac]
+        self.packet_handler.ip4_host = [STACK_IP4_HOST]
+        self.packet_handler.ip6_host = [STACK_IP6_HOST]
+        self.packet_handler.ip6_multicast = [Ip6Address("ff02::1"), STACK_IP6_HOST.address.solicited_node_multicast]
+
+        self.frames_rx = []
+        for name in ("ip4_ping", "ip4_udp_to_closed_port", "arp_request", "ip6_ping", "ip6_udp_to_closed_port"):
+            with open(TEST_FRAME_DIR + name + ".rx", "rb") as _:
+                self.frames_rx.append(_.read())
+
+        PacketRx._pool.clear()
+
+    def tearDown(self):
+        PacketRx._pool.clear()
+
+        super().tearDown()
+
+    def _handle(self, frame_rx):
+        """Pass frame through packet handler the way its RX thread does"""
+
+        packet_rx = PacketRx(frame_rx)
+        self.packet_handler._phrx_ether(packet_rx)
+        packet_rx.release()
+        return packet_rx
+
+    def test_packet_rx__handler__allocations(self):
+        """Test that single packet object is allocated for any number of frames handled one after another"""
+
+        # Every packet object handed out is kept referenced so the address of the freed one can't be taken by the next allocation
+        packets_rx = []
+        packet_rx_new = PacketRx.__new__
+        self.addCleanup(setattr, PacketRx, "__new__", packet_rx_new)
+        PacketRx.__new__ = staticmethod(lambda cls, frame: packets_rx.append(packet_rx_new(cls, frame)) or packets_rx[-1])
+
+        for _ in range(100):
+            for frame_rx in self.frames_rx:
+                self._handle(frame_rx)
+
+        self.assertEqual(len(packets_rx), 100 * len(self.frames_rx))
+        self.assertEqual(len({id(_) for _ in packets_rx}), 1)
+        self.assertEqual(self.packet_handler.packet_stats_rx.ether__pre_parse, 100 * len(self.frames_rx))
+        self.assertEqual(len(self.frames_tx), 100 * len(self.frames_rx))
+
+    def test_packet_rx__handler__stale_parsers(self):
+        """Test that packet object reused for the next frame doesn't carry parsers of the previous one"""
+
+        packet_rx = self._handle(self.frames_rx[1])
+        self.assertEqual(PacketRx._pool, [packet_rx])
+
+        reused_packet_rx = PacketRx(self.frames_rx[2])
+        self.assertIs(reused_packet_rx, packet_rx)
+        for name in PacketRx.__slots__:
+            if name not in {"frame", "tracker", "parse_failed"}:
+                self.assertIsNone(getattr(reused_packet_rx, name), name)
+
+        self.packet_handler._phrx_ether(reused_packet_rx)
+        self.assertIsNotNone(reused_packet_rx.arp)
+        for name in ("ip", "ip4", "ip6", "ip6_ext_frag", "icmp4", "icmp6", "tcp", "udp"):
+            self.assertIsNone(getattr(reused_packet_rx, name), name)
+        self.assertEqual(self.packet_handler.packet_stats_rx.arp__pre_parse, 1)
+        self.assertEqual(self.packet_handler.packet_stats_rx.udp__pre_parse, 1)
+
+
+class TestTracker(TestCase):
+    def test_tracker__serial(self):
+        self.patch_attribute(Tracker, "serial_rx", 0xFFFF)
+        self.assertEqual(repr(Tracker(prefix="RX")), "Tracker(serial='<lg>RXFFFF</>')")
+        self.assertEqual(str(Tracker(prefix="RX")), "<lg>RX0000</>")
+        self.assertEqual(str(Tracker(prefix="TX", serial="<lr>TX0001</>")), "<lr>TX0001</>")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# tests/socket_table.py - unit tests for socket demultiplexing table and ephemeral port allocator
+#
+
+
+from types import SimpleNamespace
+
+from testslide import TestCase
+
+from pytcp.lib.ip4_address import Ip4Address
+from pytcp.lib.socket_table import SocketTable
+
+TCP = 6
+UDP = 17
+LOCAL_IP = Ip4Address("10.0.0.7")
+REMOTE_IP = Ip4Address("10.0.0.1")
+
+
+def _socket_id(proto, local_port, remote_ip_address=Ip4Address(0), remote_port=0, local_ip_address=LOCAL_IP):
+    return (4, proto, int(local_ip_address), local_port, int(remote_ip_address), remote_port)
+
+
+class TestSocketTable(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.patch_attribute("pytcp.lib.socket_table.config", "EPHEMERAL_PORT_RANGE", range(1000, 1004))
+        self.table = SocketTable()
+
+    def _add(self, *args, **kwargs):
+        socket_id = _socket_id(*args, **kwargs)
+        self.table[socket_id] = socket = SimpleNamespace(socket_id=socket_id)
+        return socket
+
+    def test_socket_table__register(self):
+        socket = self._add(TCP, 80)
+        self.assertIn(socket.socket_id, self.table)
+        self.assertIs(self.table[socket.socket_id], socket)
+        self.assertEqual(list(self.table), [socket.socket_id])
+        self.assertEqual(list(self.table.values()), [socket])
+        self.assertIs(self.table.pop(socket.socket_id), socket)
+        self.assertIsNone(self.table.pop(socket.socket_id, None))
+        self.assertRaises(KeyError, self.table.pop, socket.socket_id)
+        self.assertEqual(len(self.table), 0)
+
+    def test_socket_table__values__snapshot(self):
+        sockets = [self._add(TCP, 80), self._add(TCP, 80, REMOTE_IP, 1000), self._add(TCP, 80, REMOTE_IP, 1001)]
+        for socket in self.table.values():
+            self.table.pop(socket.socket_id)
+            self._add(TCP, 81, REMOTE_IP, socket.socket_id[5])
+        self.assertEqual(len(self.table), len(sockets))
+
+    def test_socket_table__match(self):
+        connected = self._add(UDP, 53, REMOTE_IP, 5353)
+        bound = self._add(UDP, 53)
+        bound_any = self._add(UDP, 53, local_ip_address=Ip4Address(0))
+        self.assertIs(self.table.match(_socket_id(UDP, 53, REMOTE_IP, 5353)), connected)
+        self.assertIs(self.table.match(_socket_id(UDP, 53, REMOTE_IP, 5354)), bound)
+        self.assertIs(self.table.match(_socket_id(UDP, 53, REMOTE_IP, 5354, Ip4Address("10.0.0.8"))), bound_any)
+        self.assertIsNone(self.table.match(_socket_id(TCP, 53, REMOTE_IP, 5354)))
+        self.assertIsNone(self.table.get(_socket_id(UDP, 53, REMOTE_IP, 5354)))
+        self.assertIs(self.table.get_bound(_socket_id(UDP, 53, REMOTE_IP, 5353)), bound)
+
+    def test_socket_table__reuse_port(self):
+        workers = [self._add(UDP, 53) for _ in range(4)]
+        self.assertEqual(len(self.table), 4)
+        self.assertEqual(list(self.table.values()), workers)
+        matches = [self.table.match(_socket_id(UDP, 53, REMOTE_IP, remote_port)) for remote_port in range(5000, 5100)]
+        self.assertEqual({id(_) for _ in matches}, {id(_) for _ in workers})
+        self.assertIs(self.table.match(_socket_id(UDP, 53, REMOTE_IP, 5000)), matches[0])
+        self.table.discard(workers[1].socket_id, workers[1])
+        self.assertEqual([id(_) for _ in self.table.values()], [id(workers[0]), id(workers[2]), id(workers[3])])
+        for worker in workers:
+            self.table.discard(worker.socket_id, worker)
+        self.assertNotIn(workers[0].socket_id, self.table)
+        self.assertEqual(len(self.table), 0)
+
+    def test_socket_table__match__dhcp4_client(self):
+        dhcp4_client = self._add(UDP, 68, Ip4Address("255.255.255.255"), 67, Ip4Address(0))
+        self.assertIs(self.table.match(_socket_id(UDP, 68, REMOTE_IP, 67)), dhcp4_client)
+
+    def test_socket_table__pick_local_port__unused(self):
+        self._add(TCP, 1000)
+        self._add(TCP, 1001, REMOTE_IP, 80)
+        self._add(TCP, 1002)
+        self.assertEqual(self.table.pick_local_port(TCP), 1003)
+        self.assertIn(self.table.pick_local_port(UDP), range(1000, 1004))
+
+    def test_socket_table__pick_local_port__exhausted(self):
+        for port in range(1000, 1004):
+            self._add(UDP, port)
+        self.assertIsNone(self.table.pick_local_port(UDP))
+        self.assertIsNone(self.table.pick_local_port(UDP, LOCAL_IP, REMOTE_IP, 53))
+        self.table.pop(_socket_id(UDP, 1002))
+        self.assertEqual(self.table.pick_local_port(UDP), 1002)
+
+    def test_socket_table__pick_local_port__shared_by_connections(self):
+        ports = {}
+        for remote_port in (80, 443):
+            for _ in range(4):
+                port = self.table.pick_local_port(TCP, LOCAL_IP, REMOTE_IP, remote_port)
+                self._add(TCP, port, REMOTE_IP, remote_port)
+                ports.setdefault(remote_port, set()).add(port)
+            self.assertIsNone(self.table.pick_local_port(TCP, LOCAL_IP, REMOTE_IP, remote_port))
+        self.assertEqual(ports, {80: {1000, 1001, 1002, 1003}, 443: {1000, 1001, 1002, 1003}})
+        self.assertIsNone(self.table.pick_local_port(TCP))
+
+    def test_socket_table__pick_local_port__bound_port_not_shared(self):
+        self._add(TCP, 1000)
+        self._add(TCP, 1001)
+        for _ in range(2):
+            self._add(TCP, self.table.pick_local_port(TCP, LOCAL_IP, REMOTE_IP, 80), REMOTE_IP, 80)
+        self.assertIsNone(self.table.pick_local_port(TCP, LOCAL_IP, REMOTE_IP, 80))
+        self.table.clear()
+        self.assertEqual(len(self.table), 0)
+        self.assertIsNotNone(self.table.pick_local_port(TCP))
+
+    def test_socket_table__port_users(self):
+        bound = self._add(UDP, 53)
+        connected = self._add(UDP, 53, REMOTE_IP, 5353)
+        self._add(UDP, 54)
+        self._add(TCP, 53)
+        self.assertEqual([id(_) for _ in self.table.port_users(UDP, 53)], [id(bound), id(connected)])
+        self.table.discard(bound.socket_id, connected)
+        self.table.discard(bound.socket_id, bound)
+        self.assertEqual([id(_) for _ in self.table.port_users(UDP, 53)], [id(connected)])
+        self.table.pop(connected.socket_id)
+        self.assertEqual(self.table.port_users(UDP, 53), [])
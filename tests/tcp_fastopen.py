@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# tests/tcp_fastopen.py - unit tests for TCP Fast Open cookie support
+#
+
+
+import misc.stack as stack
+from testslide import TestCase
+
+from pytcp.lib.ip4_address import Ip4Address
+from pytcp.protocols.tcp import fastopen
+from pytcp.protocols.tcp.fastopen import (
+    FASTOPEN_COOKIE_LEN,
+    TcpFastOpenCache,
+    fastopen_cookie,
+)
+from pytcp.protocols.tcp.session import PACKET_RETRANSMIT_TIMEOUT
+
+# Socket classes need to see the same enums and exceptions as the stack code does
+from pytcp.protocols.tcp.socket import (
+    AF_INET4,
+    IPPROTO_TCP,
+    TCP_FASTOPEN,
+    FsmState,
+    TcpSession,
+    TcpSocket,
+)
+from tests.mock_network import (
+    MockNetworkSettings,
+    mock_tcp_metadata,
+    setup_mock_stack,
+    setup_mock_tcp_listener,
+)
+
+
+class TestTcpFastOpenCookie(TestCase):
+    def test_tcp_fastopen_cookie(self):
+        cookie = fastopen_cookie(Ip4Address("10.0.1.8"))
+        self.assertEqual(len(cookie), FASTOPEN_COOKIE_LEN)
+        self.assertEqual(fastopen_cookie(Ip4Address("10.0.1.8")), cookie)
+        self.assertNotEqual(fastopen_cookie(Ip4Address("10.0.1.9")), cookie)
+
+
+class TestTcpFastOpenCache(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.patch_attribute(fastopen, "FASTOPEN_CACHE_SIZE", 2)
+        self.cache = TcpFastOpenCache()
+        self.cache.add(Ip4Address("10.0.1.7"), b"\x01" * 8)
+        self.cache.add(Ip4Address("10.0.1.8"), b"\x02" * 8)
+
+    def test_tcp_fastopen_cache__get(self):
+        self.assertEqual(self.cache.get(Ip4Address("10.0.1.7")), b"\x01" * 8)
+        self.assertIsNone(self.cache.get(Ip4Address("10.0.1.9")))
+
+    def test_tcp_fastopen_cache__eviction(self):
+        self.cache.add(Ip4Address("10.0.1.7"), b"\x03" * 8)
+        self.cache.add(Ip4Address("10.0.1.9"), b"\x04" * 8)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get(Ip4Address("10.0.1.8")))
+        self.assertEqual(self.cache.get(Ip4Address("10.0.1.7")), b"\x03" * 8)
+
+    def test_tcp_fastopen_cache__pop(self):
+        self.assertEqual(self.cache.pop(Ip4Address("10.0.1.8")), b"\x02" * 8)
+        self.assertIsNone(self.cache.pop(Ip4Address("10.0.1.8")))
+        self.assertEqual(len(self.cache), 1)
+
+
+class TestTcpFastOpenClient(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.mns = MockNetworkSettings()
+        setup_mock_stack(self)
+
+        self.socket = TcpSocket(AF_INET4)
+        self.socket._local_ip_address = self.mns.stack_ip4_host.address
+        self.socket._local_port = 80
+        self.socket._remote_ip_address = self.mns.host_a_ip4_address
+        self.socket._remote_port = 40000
+        self.session = self.socket._tcp_session = TcpSession(
+            local_ip_address=self.socket._local_ip_address,
+            local_port=self.socket._local_port,
+            remote_ip_address=self.socket._remote_ip_address,
+            remote_port=self.socket._remote_port,
+            socket=self.socket,
+        )
+        self.cookie = b"\x01" * FASTOPEN_COOKIE_LEN
+
+    def _connect(self, data):
+        """Run CONNECT syscall and let session send out its SYN packet, connect call returns right away instead of waiting for handshake"""
+
+        self.session._event_connect.release()
+        self.session.connect(fastopen_data=data)
+        self.session.tcp_fsm(timer=True)
+        return self.packets_tx.pop()
+
+    def _syn_ack(self, ack, fastopen=None):
+        """Deliver SYN + ACK packet from server"""
+
+        self.session.tcp_fsm(mock_tcp_metadata(self, flag_syn=True, seq=9000, ack=ack, fastopen=fastopen))
+
+    def test_tcp_fastopen__client__cookie_request(self):
+        """Test that client without cookie sends SYN with cookie request and stores the cookie server returns"""
+
+        syn = self._connect(b"hello")
+        self.assertEqual((syn["flag_syn"], syn["fastopen"], syn["data"]), (True, b"", None))
+        self._syn_ack(syn["seq"] + 1, fastopen=self.cookie)
+        self.assertIs(self.session.state, FsmState.ESTABLISHED)
+        self.assertEqual(stack.tcp_fastopen_cache.get(self.mns.host_a_ip4_address), self.cookie)
+
+    def test_tcp_fastopen__client__data(self):
+        """Test that client with cookie sends data in SYN packet"""
+
+        stack.tcp_fastopen_cache.add(self.mns.host_a_ip4_address, self.cookie)
+        syn = self._connect(b"hello")
+        self.assertEqual((syn["flag_syn"], syn["fastopen"], bytes(syn["data"])), (True, self.cookie, b"hello"))
+        self._syn_ack(syn["seq"] + 6)
+        self.assertIs(self.session.state, FsmState.ESTABLISHED)
+        self.assertEqual([(_["flag_ack"], _["ack"], _["data"]) for _ in self.packets_tx], [(True, 9001, None)])
+        self.assertEqual(len(self.session._tx_retransmit_queue), 0)
+
+    def test_tcp_fastopen__client__no_data(self):
+        """Test that client with cookie and no data to send sends SYN packet with the cookie only"""
+
+        stack.tcp_fastopen_cache.add(self.mns.host_a_ip4_address, self.cookie)
+        syn = self._connect(b"")
+        self.assertEqual((syn["flag_syn"], syn["fastopen"], syn["data"]), (True, self.cookie, None))
+
+    def test_tcp_fastopen__client__syn_retransmit(self):
+        """Test that retransmitted SYN packet carries the same data and cookie"""
+
+        stack.tcp_fastopen_cache.add(self.mns.host_a_ip4_address, self.cookie)
+        syn = self._connect(b"hello")
+        self.timer.tick(PACKET_RETRANSMIT_TIMEOUT)
+        self.session.tcp_fsm(timer=True)
+        self.session.tcp_fsm(timer=True)
+        retransmit = self.packets_tx.pop()
+        self.assertEqual(
+            (retransmit["flag_syn"], retransmit["seq"], retransmit["fastopen"], bytes(retransmit["data"])), (True, syn["seq"], self.cookie, b"hello")
+        )
+
+    def test_tcp_fastopen__client__data_ignored(self):
+        """Test that data server didn't acknowledge in SYN + ACK packet is sent again once connection is established"""
+
+        stack.tcp_fastopen_cache.add(self.mns.host_a_ip4_address, self.cookie)
+        syn = self._connect(b"hello")
+        self._syn_ack(syn["seq"] + 1)
+        self.assertIs(self.session.state, FsmState.ESTABLISHED)
+        self.assertEqual(self.packets_tx.pop()["ack"], 9001)
+        self.session.tcp_fsm(timer=True)
+        retransmit = self.packets_tx.pop()
+        self.assertEqual(
+            (retransmit["flag_syn"], retransmit["seq"], retransmit["fastopen"], bytes(retransmit["data"])), (False, syn["seq"] + 1, None, b"hello")
+        )
+
+
+class TestTcpFastOpenServer(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.mns = MockNetworkSettings()
+        setup_mock_stack(self)
+        setup_mock_tcp_listener(self)
+        self.listener.setsockopt(IPPROTO_TCP, TCP_FASTOPEN, 1)
+
+        # Server hands out cookie in response to cookie request
+        self.listener.process_tcp_packet(mock_tcp_metadata(self, flag_syn=True, flag_ack=False, seq=100, fastopen=b"", remote_port=40001))
+        self.cookie = self.packets_tx.pop()["fastopen"]
+
+    def _syn(self, fastopen, remote_port=40000):
+        """Deliver SYN packet carrying data and return server's SYN + ACK response"""
+
+        self.listener.process_tcp_packet(
+            mock_tcp_metadata(self, flag_syn=True, flag_ack=False, seq=5000, fastopen=fastopen, data=b"hello", remote_port=remote_port)
+        )
+        return self.packets_tx.pop()
+
+    def test_tcp_fastopen__server__accept(self):
+        """Test that SYN packet with valid cookie creates session that delivers data to application right away"""
+
+        self.assertEqual(len(self.cookie), FASTOPEN_COOKIE_LEN)
+        syn_ack = self._syn(self.cookie)
+        self.assertEqual((syn_ack["flag_syn"], syn_ack["flag_ack"], syn_ack["ack"]), (True, True, 5006))
+        socket, _ = self.listener.accept()
+        self.assertIs(socket.tcp_session.state, FsmState.SYN_RCVD)
+        self.assertEqual(socket.recv(), b"hello")
+        socket.tcp_session.tcp_fsm(mock_tcp_metadata(self, seq=5006, ack=syn_ack["seq"] + 1))
+        self.assertIs(socket.tcp_session.state, FsmState.ESTABLISHED)
+
+    def test_tcp_fastopen__server__invalid_cookie(self):
+        """Test that SYN packet with invalid cookie gets new cookie and its data is ignored"""
+
+        syn_ack = self._syn(b"\x00" * FASTOPEN_COOKIE_LEN)
+        self.assertEqual((syn_ack["ack"], syn_ack["fastopen"]), (5001, self.cookie))
+        self.assertEqual(len(self.listener._tcp_accept), 0)
+
+    def test_tcp_fastopen__server__qlen(self):
+        """Test that Fast Open connections pending handshake are limited by socket option value, over the limit they fall back to regular handshake"""
+
+        self.assertEqual(self._syn(self.cookie)["ack"], 5006)
+        syn_ack = self._syn(self.cookie, remote_port=40002)
+        self.assertEqual((syn_ack["ack"], syn_ack["fastopen"]), (5001, None))
+        self.assertEqual(len(self.listener._tcp_accept), 1)
+
+    def test_tcp_fastopen__server__disabled(self):
+        """Test that listener without Fast Open enabled ignores the option"""
+
+        self.listener.setsockopt(IPPROTO_TCP, TCP_FASTOPEN, 0)
+        syn_ack = self._syn(self.cookie)
+        self.assertEqual((syn_ack["ack"], syn_ack["fastopen"]), (5001, None))
@@ -37,6 +37,7 @@ from pytcp.protocols.ip6.ps import IP6_NEXT_TCP
 from pytcp.protocols.tcp.fpa import (
     TcpAssembler,
     TcpOptEol,
+    TcpOptFastOpen,
     TcpOptMss,
     TcpOptNop,
     TcpOptSackPerm,
@@ -605,3 +606,35 @@ class TestTcpOptTimestamp(TestCase):
         option = TcpOptTimestamp(12345678, 87654321)
 
         self.assertEqual(option, TcpOptTimestamp(12345678, 87654321))
+
+
+class TestTcpOptFastOpen(TestCase):
+    def test_tcp_fpa_opt_fastopen____init____assert_cookie_len(self):
+        """Test assertion for the cookie length"""
+
+        with self.assertRaises(AssertionError):
+            TcpOptFastOpen(b"\x01\x02")
+
+    def test_tcp_fpa_opt_fastopen____str__(self):
+        """Test the __str__ dunder"""
+
+        self.assertEqual(str(TcpOptFastOpen(b"\x01\x02\x03\x04")), "fastopen 01020304")
+        self.assertEqual(str(TcpOptFastOpen()), "fastopen request")
+
+    def test_tcp_fpa_opt_fastopen____len__(self):
+        """Test the __len__ dunder"""
+
+        self.assertEqual(len(TcpOptFastOpen(b"\x01\x02\x03\x04")), 6)
+        self.assertEqual(len(TcpOptFastOpen()), 2)
+
+    def test_tcp_fpa_opt_fastopen____bytes__(self):
+        """Test the __bytes__ dunder"""
+
+        self.assertEqual(bytes(TcpOptFastOpen(b"\x01\x02\x03\x04")), b'"\x06\x01\x02\x03\x04')
+        self.assertEqual(bytes(TcpOptFastOpen()), b'"\x02')
+
+    def test_tcp_fpa_opt_fastopen____eq__(self):
+        """Test the __eq__ dunder"""
+
+        self.assertEqual(TcpOptFastOpen(b"\x01\x02\x03\x04"), TcpOptFastOpen(b"\x01\x02\x03\x04"))
+        self.assertNotEqual(TcpOptFastOpen(b"\x01\x02\x03\x04"), TcpOptFastOpen())
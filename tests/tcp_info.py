@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# tests/tcp_info.py - unit tests for TCP session statistics snapshot
+#
+
+
+from testslide import TestCase
+
+from pytcp.protocols.tcp.info import TcpInfo
+from pytcp.protocols.tcp.session import PACKET_RETRANSMIT_TIMEOUT
+
+# Socket classes need to see the same enums and exceptions as the stack code does
+from pytcp.protocols.tcp.socket import AF_INET4, IPPROTO_TCP, TCP_INFO, TcpSocket
+from pytcp.subsystems.stack_cli_server import StackCliServer
+from tests.mock_network import (
+    MockNetworkSettings,
+    accept_mock_tcp_session,
+    mock_tcp_metadata,
+    setup_mock_stack,
+    setup_mock_tcp_listener,
+)
+
+
+def tcp_info(**kwargs):
+    fields = dict(
+        state="ESTABLISHED",
+        rtt=None,
+        snd_mss=1460,
+        rcv_mss=1460,
+        snd_wnd=65535,
+        snd_cwnd=2920,
+        rcv_wnd=65535,
+        segments_in_flight=2,
+        bytes_in_flight=2920,
+        bytes_unsent=100,
+        bytes_unread=200,
+        bytes_out_of_order=0,
+        segments_sent=10,
+        segments_received=8,
+        bytes_sent=14600,
+        bytes_acked=11681,
+        bytes_received=300,
+        retransmits=1,
+        bytes_retransmitted=1460,
+        timeouts=0,
+        state_times={"CLOSED": 0.0, "SYN_SENT": 0.05, "ESTABLISHED": 2.0},
+    )
+    fields.update(kwargs)
+    return TcpInfo(**fields)
+
+
+class TestTcpInfo(TestCase):
+    def test_tcp_info____str__(self):
+        self.assertEqual(
+            str(tcp_info()),
+            "ESTABLISHED, rtt -, mss 1460/1460, wnd 65535/65535, cwnd 2920, in flight 2/2920, unsent 100, unread 200, ooo 0, "
+            + "segments 10/8, bytes 14600/11681/300, retransmits 1/1460, timeouts 0, states CLOSED:0.0s SYN_SENT:0.1s ESTABLISHED:2.0s",
+        )
+
+    def test_tcp_info____str____rtt(self):
+        self.assertIn("rtt 12.3ms", str(tcp_info(rtt=12.345)))
+
+
+class TestTcpInfoSession(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.mns = MockNetworkSettings()
+        self.time = 1000.0
+        self.mock_callable("protocols.tcp.session.time", "monotonic").with_implementation(lambda: self.time)
+        setup_mock_stack(self)
+        setup_mock_tcp_listener(self)
+        self.session = accept_mock_tcp_session(self)
+
+    def _send(self, data_len):
+        """Let session send out data segment"""
+
+        self.session.send(b"x" * data_len)
+        self.session.tcp_fsm(timer=True)
+
+    def test_tcp_info__session__sent_acked(self):
+        """Test counters of sent and acknowledged data, handshake packets are counted by listening session"""
+
+        self._send(1000)
+        self._send(400)
+        info = self.session.info
+        self.assertEqual((info.segments_sent, info.bytes_sent, info.segments_in_flight, info.bytes_in_flight), (2, 1400, 2, 1400))
+        self.session.tcp_fsm(mock_tcp_metadata(self, seq=self.session._rcv_nxt, ack=self.session._snd_una + 1000))
+        info = self.session.info
+        self.assertEqual((info.segments_received, info.bytes_acked, info.segments_in_flight, info.bytes_in_flight), (1, 1000, 1, 400))
+
+    def test_tcp_info__session__received(self):
+        """Test counters of received data"""
+
+        self.session.tcp_fsm(mock_tcp_metadata(self, seq=self.session._rcv_nxt, ack=self.session._snd_nxt, data=b"x" * 300))
+        info = self.session.info
+        self.assertEqual((info.segments_received, info.bytes_received, info.bytes_unread), (1, 300, 300))
+
+    def test_tcp_info__session__retransmit_timeout(self):
+        """Test counters of retransmit timeouts and retransmitted data"""
+
+        self._send(1000)
+        self.timer.tick(PACKET_RETRANSMIT_TIMEOUT)
+        self.session.tcp_fsm(timer=True)
+        info = self.session.info
+        self.assertEqual((info.timeouts, info.retransmits, info.bytes_retransmitted, info.bytes_sent), (1, 1, 1000, 1000))
+
+    def test_tcp_info__session__state_times(self):
+        """Test time spent in each of the states"""
+
+        self.time += 2.5
+        self.assertEqual(self.session.info.state_times, {"CLOSED": 0.0, "ESTABLISHED": 2.5})
+        self.session.tcp_fsm(mock_tcp_metadata(self, flag_fin=True, seq=self.session._rcv_nxt, ack=self.session._snd_nxt))
+        self.time += 1.0
+        self.assertEqual(self.session.info.state_times, {"CLOSED": 0.0, "ESTABLISHED": 2.5, "CLOSE_WAIT": 1.0})
+
+    def test_tcp_info__getsockopt(self):
+        """Test TCP_INFO socket option"""
+
+        self._send(1000)
+        self.assertEqual(self.session.socket.getsockopt(IPPROTO_TCP, TCP_INFO), self.session.info)
+        self.assertEqual(self.session.socket.getsockopt(IPPROTO_TCP, TCP_INFO).bytes_sent, 1000)
+
+    def test_tcp_info__getsockopt__not_connected(self):
+        """Test TCP_INFO socket option of socket without TCP session"""
+
+        with self.assertRaises(OSError):
+            TcpSocket(AF_INET4).getsockopt(IPPROTO_TCP, TCP_INFO)
+
+
+class MockCliConnection:
+    """Connection to CLI server that sends given commands and collects the responses"""
+
+    def __init__(self, *commands):
+        self.commands = list(commands)
+        self.responses = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def recv(self, bufsize):
+        return self.commands.pop(0)
+
+    def sendall(self, data):
+        self.responses.append(data)
+
+
+class TestTcpInfoCli(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.mns = MockNetworkSettings()
+        setup_mock_stack(self)
+        setup_mock_tcp_listener(self)
+        self.session = accept_mock_tcp_session(self)
+
+    def test_tcp_info__cli__show_tcp_sessions(self):
+        """Test that CLI lists sessions of all TCP sockets along with their statistics"""
+
+        conn = MockCliConnection(b"show tcp sessions\r\n", b"exit")
+        StackCliServer._StackCliServer__thread_connection(conn)
+        lines = conn.responses[1].decode().strip().split("\n")
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith("10.0.1.7/80/0.0.0.0/0 - LISTEN, rtt -, "))
+        self.assertEqual(lines[1], f"10.0.1.7/80/10.0.1.91/40000 - {self.session.info}")
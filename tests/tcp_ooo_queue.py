@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# tests/tcp_ooo_queue.py - unit tests for TCP out of order reassembly queue
+#
+
+
+import misc.stack as stack
+from testslide import TestCase
+
+from pytcp.protocols.tcp.ooo_queue import (
+    OOO_QUEUE_INTERVAL_OVERHEAD,
+    TcpOooBudget,
+    TcpOooQueue,
+)
+
+
+class TestTcpOooQueue(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.addCleanup(setattr, stack, "tcp_ooo_budget", stack.tcp_ooo_budget)
+        stack.tcp_ooo_budget = TcpOooBudget()
+        self.ooo_queue = TcpOooQueue()
+        self.ooo_queue.insert(110, memoryview(b"ABCDEFGHIJ"))
+        self.ooo_queue.insert(130, memoryview(b"abcdefghij"))
+
+    def tearDown(self):
+        self.ooo_queue.clear()
+        self.assertEqual(self.ooo_queue.size, 0)
+        self.assertEqual(stack.tcp_ooo_budget.size, 0)
+
+        super().tearDown()
+
+    def test_tcp_ooo_queue__insert_overlapping(self):
+        self.assertEqual(self.ooo_queue.insert(105, memoryview(b"012345678901234567890123456789012345")), 16)
+        self.assertEqual(self.ooo_queue.insert(112, memoryview(b"xxxx")), 0)
+        self.assertEqual(len(self.ooo_queue), 1)
+        self.assertEqual(self.ooo_queue.size, 36 + OOO_QUEUE_INTERVAL_OVERHEAD)
+        self.assertEqual(self.ooo_queue.pop_contiguous(100), [])
+        self.assertEqual([bytes(_) for _ in self.ooo_queue.pop_contiguous(105)], [b"01234", b"ABCDEFGHIJ", b"5678901234", b"abcdefghij", b"5"])
+        self.assertEqual(self.ooo_queue.size, 0)
+
+    def test_tcp_ooo_queue__insert_adjacent(self):
+        self.assertEqual(self.ooo_queue.insert(140, memoryview(b"0123")), 4)
+        self.assertEqual(self.ooo_queue.insert(105, memoryview(b"01234")), 5)
+        self.assertEqual(self.ooo_queue.insert(150, memoryview(b"0123")), 4)
+        self.assertEqual(len(self.ooo_queue), 3)
+        self.assertEqual(self.ooo_queue.insert(120, memoryview(b"0123456789")), 10)
+        self.assertEqual(len(self.ooo_queue), 2)
+        self.assertEqual(self.ooo_queue.size, 43 + 2 * OOO_QUEUE_INTERVAL_OVERHEAD)
+        self.assertEqual(stack.tcp_ooo_budget.size, self.ooo_queue.size)
+        self.assertEqual(b"".join(self.ooo_queue.pop_contiguous(105)), b"01234ABCDEFGHIJ0123456789abcdefghij0123")
+        self.assertEqual(len(self.ooo_queue), 1)
+
+    def test_tcp_ooo_queue__insert_adjacent__small_segments(self):
+        self.patch_attribute("pytcp.protocols.tcp.ooo_queue.config", "TCP_OOO_QUEUE_SESSION_LIMIT", 420 + 2 * OOO_QUEUE_INTERVAL_OVERHEAD)
+        for seq in range(140, 540, 4):
+            self.assertEqual(self.ooo_queue.insert(seq, memoryview(b"0123")), 4)
+        self.assertEqual(len(self.ooo_queue), 2)
+        self.assertEqual(self.ooo_queue.size, 420 + 2 * OOO_QUEUE_INTERVAL_OVERHEAD)
+        self.assertEqual(b"".join(self.ooo_queue.pop_contiguous(130)), b"abcdefghij" + b"0123" * 100)
+
+    def test_tcp_ooo_queue__pop_contiguous_trimmed(self):
+        self.ooo_queue.insert(140, memoryview(b"0123"))
+        self.assertEqual([bytes(_) for _ in self.ooo_queue.pop_contiguous(115)], [b"FGHIJ"])
+        self.assertEqual(len(self.ooo_queue), 1)
+        self.assertEqual([bytes(_) for _ in self.ooo_queue.pop_contiguous(142)], [b"23"])
+        self.assertEqual(len(self.ooo_queue), 0)
+
+    def test_tcp_ooo_queue__memory_limit(self):
+        self.patch_attribute("pytcp.protocols.tcp.ooo_queue.config", "TCP_OOO_QUEUE_SESSION_LIMIT", 2 * OOO_QUEUE_INTERVAL_OVERHEAD + 25)
+        self.assertEqual(self.ooo_queue.insert(150, memoryview(b"0123456789")), 0)
+        self.assertEqual(self.ooo_queue.insert(140, memoryview(b"0123456789")), 0)
+        self.assertEqual(self.ooo_queue.insert(140, memoryview(b"01234")), 5)
+        self.ooo_queue.pop_contiguous(120)
+        self.assertEqual(self.ooo_queue.size, OOO_QUEUE_INTERVAL_OVERHEAD + 15)
+        self.assertEqual(stack.tcp_ooo_budget.size, OOO_QUEUE_INTERVAL_OVERHEAD + 15)
+        self.assertEqual(self.ooo_queue.insert(150, memoryview(b"0123456789")), 10)
+
+    def test_tcp_ooo_queue__memory_limit__global(self):
+        self.patch_attribute("pytcp.protocols.tcp.ooo_queue.config", "TCP_OOO_QUEUE_GLOBAL_LIMIT", 3 * OOO_QUEUE_INTERVAL_OVERHEAD + 20)
+        other_ooo_queue = TcpOooQueue()
+        self.assertEqual(other_ooo_queue.insert(110, memoryview(b"0123456789")), 0)
+        self.assertEqual(self.ooo_queue.insert(120, memoryview(b"0123456789")), 10)
+        self.assertEqual(other_ooo_queue.insert(110, memoryview(b"0123456789")), 10)
+        other_ooo_queue.clear()
+        self.assertEqual(stack.tcp_ooo_budget.size, self.ooo_queue.size)
@@ -448,6 +448,69 @@ class TestUdpPhtx(TestCase):
             frame_tx = _.read()
         self.assertEqual(self.frame_tx[: len(frame_tx)], frame_tx)
 
+    def test_tcp_phtx__ip4_tcp_packet__tx_template(self):
+        """Test sending IPv4/TCP packet using TX template created by the previous packet of the same flow"""
+
+        for tcp_data in (None, b"01234567890ABCDEF" * 50):
+            tx_status = self.packet_handler._phtx_tcp(
+                ip_src=self.mns.stack_ip4_host.address,
+                ip_dst=self.mns.host_a_ip4_address,
+                tcp_sport=1000,
+                tcp_dport=2000,
+                tcp_data=tcp_data,
+                tx_template=True,
+            )
+            self.assertEqual(tx_status, TxStatus.PASSED__ETHER__TO_TX_RING)
+        self.assertEqual(
+            self.packet_handler.packet_stats_tx,
+            PacketStatsTx(
+                tcp__pre_assemble=2,
+                tcp__send=2,
+                ip4__pre_assemble=1,
+                ip4__mtu_ok__send=1,
+                ether__pre_assemble=1,
+                ether__src_unspec__fill=1,
+                ether__dst_unspec__ip4_lookup=1,
+                ether__dst_unspec__ip4_lookup__locnet__arp_cache_hit__send=1,
+                ether__template__save=1,
+                ether__template__send=1,
+            ),
+        )
+        with open(TEST_FRAME_DIR + "ip4_tcp_packet__data.tx", "rb") as _:
+            frame_tx = _.read()
+        self.assertEqual(self.frame_tx[: len(frame_tx)], frame_tx)
+
+    def test_tcp_phtx__ip4_tcp_packet__tx_template__invalidated(self):
+        """Test sending IPv4/TCP packet after TX template of its flow got invalidated"""
+
+        for _ in range(2):
+            self.packet_handler.invalidate_tx_templates(self.mns.host_a_mac_address)
+            tx_status = self.packet_handler._phtx_tcp(
+                ip_src=self.mns.stack_ip4_host.address,
+                ip_dst=self.mns.host_a_ip4_address,
+                tcp_sport=1000,
+                tcp_dport=2000,
+                tx_template=True,
+            )
+            self.assertEqual(tx_status, TxStatus.PASSED__ETHER__TO_TX_RING)
+        self.assertEqual(
+            self.packet_handler.packet_stats_tx,
+            PacketStatsTx(
+                tcp__pre_assemble=2,
+                tcp__send=2,
+                ip4__pre_assemble=2,
+                ip4__mtu_ok__send=2,
+                ether__pre_assemble=2,
+                ether__src_unspec__fill=2,
+                ether__dst_unspec__ip4_lookup=2,
+                ether__dst_unspec__ip4_lookup__locnet__arp_cache_hit__send=2,
+                ether__template__save=2,
+            ),
+        )
+        with open(TEST_FRAME_DIR + "ip4_tcp_packet.tx", "rb") as _:
+            frame_tx = _.read()
+        self.assertEqual(self.frame_tx[: len(frame_tx)], frame_tx)
+
     def test_tcp_phtx__ip4_tcp_packet__ip6_src(self):
         """Test sending IPv4/TCP packet with src set to ip6 address"""
 
@@ -938,6 +1001,38 @@ class TestUdpPhtx(TestCase):
             frame_tx = _.read()
         self.assertEqual(self.frame_tx[: len(frame_tx)], frame_tx)
 
+    def test_tcp_phtx__ip6_tcp_packet__tx_template(self):
+        """Test sending IPv6/TCP packet using TX template created by the previous packet of the same flow"""
+
+        for tcp_data in (None, b"01234567890ABCDEF" * 50):
+            tx_status = self.packet_handler._phtx_tcp(
+                ip_src=self.mns.stack_ip6_host.address,
+                ip_dst=self.mns.host_a_ip6_address,
+                tcp_sport=1000,
+                tcp_dport=2000,
+                tcp_data=tcp_data,
+                tx_template=True,
+            )
+            self.assertEqual(tx_status, TxStatus.PASSED__ETHER__TO_TX_RING)
+        self.assertEqual(
+            self.packet_handler.packet_stats_tx,
+            PacketStatsTx(
+                tcp__pre_assemble=2,
+                tcp__send=2,
+                ip6__pre_assemble=1,
+                ip6__mtu_ok__send=1,
+                ether__pre_assemble=1,
+                ether__src_unspec__fill=1,
+                ether__dst_unspec__ip6_lookup=1,
+                ether__dst_unspec__ip6_lookup__locnet__nd_cache_hit__send=1,
+                ether__template__save=1,
+                ether__template__send=1,
+            ),
+        )
+        with open(TEST_FRAME_DIR + "ip6_tcp_packet__data.tx", "rb") as _:
+            frame_tx = _.read()
+        self.assertEqual(self.frame_tx[: len(frame_tx)], frame_tx)
+
     def test_tcp_phtx__ip6_tcp_packet__ip4_src(self):
         """Test sending IPv6/TCP packet with src set to ip4 address"""
 
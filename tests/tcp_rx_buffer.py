@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# tests/tcp_rx_buffer.py - unit tests for TCP receive buffer
+#
+
+
+from testslide import TestCase
+
+from pytcp.protocols.tcp.rx_buffer import TcpRxBuffer
+
+
+class TestTcpRxBuffer(TestCase):
+    def setUp(self):
+        self.rx_buffer = TcpRxBuffer()
+        self.rx_buffer.append(memoryview(b"0123"))
+        self.rx_buffer.append(memoryview(b""))
+        self.rx_buffer.append(memoryview(b"4567"))
+        self.rx_buffer.append(memoryview(b"89"))
+
+    def test_tcp_rx_buffer__len(self):
+        self.assertEqual(len(self.rx_buffer), 10)
+
+    def test_tcp_rx_buffer__read(self):
+        self.assertEqual(self.rx_buffer.read(2), b"01")
+        self.assertEqual(self.rx_buffer.read(5), b"23456")
+        self.assertEqual(len(self.rx_buffer), 3)
+        self.assertEqual(self.rx_buffer.read(), b"789")
+        self.assertEqual(self.rx_buffer.read(), b"")
+
+    def test_tcp_rx_buffer__read_into(self):
+        buffer = bytearray(6)
+        self.assertEqual(self.rx_buffer.read_into(buffer), 6)
+        self.assertEqual(buffer, b"012345")
+        self.assertEqual(self.rx_buffer.read_into(memoryview(buffer)[2:], 1), 1)
+        self.assertEqual(buffer, b"016345")
+        self.assertEqual(self.rx_buffer.read_into(buffer), 3)
+        self.assertEqual(buffer[:3], b"789")
+        self.assertEqual(len(self.rx_buffer), 0)
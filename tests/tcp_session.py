@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# tests/tcp_session.py - unit tests for TCP session running in ESTABLISHED state
+#
+
+
+from types import SimpleNamespace
+
+import misc.stack as stack
+from testslide import StrictMock, TestCase
+
+from pytcp.misc.packet import PacketRx
+from pytcp.protocols.ether.fpa import EtherAssembler
+from pytcp.protocols.ip4.fpa import Ip4Assembler
+from pytcp.protocols.ip6.fpa import Ip6Assembler
+from pytcp.protocols.tcp.fpa import TcpAssembler
+from pytcp.protocols.tcp.metadata import tcp_socket_id
+from pytcp.protocols.tcp.session import (
+    DELAYED_ACK_DELAY,
+    DELAYED_ACK_DELAY_MAX,
+    DELAYED_ACK_DELAY_MIN,
+    PACKET_RETRANSMIT_TIMEOUT,
+    PERSIST_TIMEOUT,
+    QUICK_ACK_COUNT,
+)
+
+# Socket classes need to see the same enums and exceptions as the stack code does
+from pytcp.protocols.tcp.socket import TcpSession
+from tests.mock_network import (
+    MockNetworkSettings,
+    accept_mock_tcp_session,
+    mock_tcp_metadata,
+    patch_config,
+    setup_mock_packet_handler,
+    setup_mock_stack,
+    setup_mock_tcp_listener,
+)
+
+
+class TestTcpSessionDelayedAck(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.mns = MockNetworkSettings()
+        self.time = 1000.0
+        self.mock_callable("protocols.tcp.session.time", "monotonic").with_implementation(lambda: self.time)
+        setup_mock_stack(self)
+        setup_mock_tcp_listener(self)
+        self.session = accept_mock_tcp_session(self)
+        self.packets_tx.clear()
+
+    def _receive(self, data_len=1460):
+        """Deliver next in-order data segment to session, return ACK numbers session sent in response"""
+
+        self.session.tcp_fsm(mock_tcp_metadata(self, seq=self.session._rcv_nxt, ack=self.session._snd_nxt, data=b"x" * data_len))
+        acks = [_["ack"] for _ in self.packets_tx]
+        self.packets_tx.clear()
+        return acks
+
+    def _delay(self):
+        """Current delay of the delayed ACK timer"""
+
+        return self.timer.timers.get(f"{self.session}-delayed_ack")
+
+    def test_tcp_session__delayed_ack__quick_ack(self):
+        """Test that first segments of connection are acknowledged immediately"""
+
+        for _ in range(QUICK_ACK_COUNT):
+            self.assertEqual(self._receive(100), [self.session._rcv_nxt])
+        self.assertEqual(self._receive(100), [])
+        self.assertEqual(self._delay(), DELAYED_ACK_DELAY)
+
+    def test_tcp_session__delayed_ack__quick_ack_after_idle(self):
+        """Test that data arriving after idle period is acknowledged immediately again"""
+
+        self.session._rcv_quick_ack = 0
+        self.assertEqual(self._receive(100), [])
+        self.time += PACKET_RETRANSMIT_TIMEOUT / 1000
+        self.assertEqual(self._receive(100), [])
+        self.time += PACKET_RETRANSMIT_TIMEOUT / 1000 + 0.001
+        self.assertEqual(self._receive(100), [self.session._rcv_nxt])
+        self.assertEqual(self.session._rcv_quick_ack, QUICK_ACK_COUNT - 1)
+
+    def test_tcp_session__delayed_ack__gap_filled(self):
+        """Test that data filling gap in front of out of order queue is acknowledged immediately"""
+
+        self.session._rcv_quick_ack = 0
+        rcv_nxt = self.session._rcv_nxt
+        self.session.tcp_fsm(mock_tcp_metadata(self, seq=rcv_nxt + 1460, ack=self.session._snd_nxt, data=b"y" * 1460))
+        self.packets_tx.clear()
+        self.assertEqual(self._receive(), [rcv_nxt + 2920])
+
+    def test_tcp_session__delayed_ack__every_second_segment(self):
+        """Test that every second full segment is acknowledged immediately"""
+
+        self.session._rcv_quick_ack = 0
+        self.assertEqual(self._receive(), [])
+        self.assertEqual(self._receive(), [self.session._rcv_nxt])
+        self.assertEqual(self._receive(), [])
+        self.assertEqual(self._receive(), [self.session._rcv_nxt])
+
+    def test_tcp_session__delayed_ack__timer(self):
+        """Test that delayed ACK is sent once its timer expires"""
+
+        self.session._rcv_quick_ack = 0
+        self._receive()
+        self.session.tcp_fsm(timer=True)
+        self.assertEqual(self.packets_tx, [])
+        self.timer.tick(DELAYED_ACK_DELAY)
+        self.session.tcp_fsm(timer=True)
+        self.assertEqual([_["ack"] for _ in self.packets_tx], [self.session._rcv_nxt])
+
+    def test_tcp_session__delayed_ack__rtt_delay(self):
+        """Test that ACK delay is half of smoothed RTT within its bounds"""
+
+        self.session._rcv_quick_ack = 0
+        for srtt, delay in ((0.01, DELAYED_ACK_DELAY_MIN), (0.1, 50), (1.0, DELAYED_ACK_DELAY_MAX)):
+            self.session._srtt = srtt
+            self.timer.timers.clear()
+            self.session._rcv_una = self.session._rcv_nxt
+            self._receive()
+            self.assertEqual(self._delay(), delay)
+
+    def test_tcp_session__delayed_ack__out_of_order(self):
+        """Test that every out of order segment is acknowledged immediately so peer gets duplicate ACKs it needs to fast retransmit"""
+
+        self.session._rcv_quick_ack = 0
+        rcv_nxt = self.session._rcv_nxt
+        for seq in range(rcv_nxt + 1460, rcv_nxt + 6 * 1460, 1460):
+            self.session.tcp_fsm(mock_tcp_metadata(self, seq=seq, ack=self.session._snd_nxt, data=b"y" * 1460))
+        self.assertEqual([_["ack"] for _ in self.packets_tx], [rcv_nxt] * 5)
+        self.packets_tx.clear()
+
+        self.assertEqual(self._receive(), [rcv_nxt + 6 * 1460])
+        self.session.tcp_fsm(mock_tcp_metadata(self, seq=self.session._rcv_nxt + 1460, ack=self.session._snd_nxt, data=b"y" * 1460))
+        self.assertEqual([_["ack"] for _ in self.packets_tx], [rcv_nxt + 6 * 1460])
+
+
+class TestTcpSessionWindow(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.mns = MockNetworkSettings()
+        self.time = 1000.0
+        self.mock_callable("protocols.tcp.session.time", "monotonic").with_implementation(lambda: self.time)
+        setup_mock_stack(self)
+        setup_mock_tcp_listener(self)
+
+    def _receive(self, session, segment_count):
+        """Deliver in-order full sized data segments to session"""
+
+        for _ in range(segment_count):
+            session.tcp_fsm(mock_tcp_metadata(self, seq=session._rcv_nxt, ack=session._snd_nxt, data=b"x" * 1460))
+        self.packets_tx.clear()
+
+    def _window(self, session):
+        """Window advertised in ACK packet session sends right now"""
+
+        session._transmit_packet(flag_ack=True)
+        return self.packets_tx.pop()["win"]
+
+    def test_tcp_session__window__sws_avoidance(self):
+        """Test that window doesn't open by less than one segment"""
+
+        session = accept_mock_tcp_session(self)
+        self._receive(session, 40)
+        self.assertEqual(self._window(session), 65535 - 58400)
+        session.receive(1000)
+        self.assertEqual(self._window(session), 65535 - 58400)
+        session.receive(460)
+        self.assertEqual(self._window(session), 65535 - 58400 + 1460)
+
+    def test_tcp_session__window__update(self):
+        """Test that window update is sent once application frees enough of receive buffer, and only once"""
+
+        session = accept_mock_tcp_session(self)
+        self._receive(session, 40)
+        session.receive(5000)
+        session.tcp_fsm(timer=True)
+        self.assertEqual(self.packets_tx, [])
+        session.receive()
+        session.tcp_fsm(timer=True)
+        self.assertEqual([(_["ack"], _["win"]) for _ in self.packets_tx], [(session._rcv_nxt, 65535)])
+        session.tcp_fsm(timer=True)
+        self.assertEqual(len(self.packets_tx), 1)
+
+    def test_tcp_session__window__autotune(self):
+        """Test that receive buffer grows to twice the amount of data application consumes within one RTT"""
+
+        session = accept_mock_tcp_session(self, wscale=7)
+        session._rcv_rtt = 0.05
+        self._receive(session, 40)
+        self.time += 0.1
+        session.receive()
+        self.assertEqual(session._rcv_buf, 2 * 58400)
+        session.tcp_fsm(timer=True)
+        self.assertEqual([_["win"] for _ in self.packets_tx], [2 * 58400 // session._rcv_wsc])
+
+    def test_tcp_session__window__autotune__unscaled(self):
+        """Test that receive buffer of session without window scaling doesn't grow past the largest window it can advertise"""
+
+        session = accept_mock_tcp_session(self)
+        session._rcv_rtt = 0.05
+        self._receive(session, 40)
+        self.time += 0.1
+        session.receive()
+        self.assertEqual(session._rcv_buf, 0xFFFF)
+        for _ in range(3):
+            session.tcp_fsm(timer=True)
+        self.assertEqual([_["win"] for _ in self.packets_tx], [0xFFFF])
+
+    def test_tcp_session__window__persist(self):
+        """Test that zero window probes are sent in exponentially growing intervals until peer's window opens"""
+
+        session = accept_mock_tcp_session(self)
+        session.tcp_fsm(mock_tcp_metadata(self, seq=session._rcv_nxt, ack=session._snd_nxt, win=0))
+        session.send(b"x" * 100)
+        session.tcp_fsm(timer=True)
+        session.tcp_fsm(timer=True)
+        self.assertEqual(self.packets_tx, [])
+        for interval in (PERSIST_TIMEOUT, 2 * PERSIST_TIMEOUT):
+            self.timer.tick(interval)
+            session.tcp_fsm(timer=True)
+            probe = self.packets_tx.pop()
+            self.assertEqual((probe["seq"], probe.get("data")), ((session._snd_una - 1) & 0xFFFFFFFF, None))
+            self.assertEqual(self.timer.timers[f"{session}-persist"], 2 * interval)
+        session.tcp_fsm(mock_tcp_metadata(self, seq=session._rcv_nxt, ack=session._snd_nxt, win=65535))
+        session.tcp_fsm(timer=True)
+        self.assertEqual(bytes(self.packets_tx.pop()["data"]), b"x" * 100)
+        self.assertEqual(session._snd_persist, 0)
+
+
+class TestTcpSessionFastPath(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.mns = MockNetworkSettings()
+        self.time = 1000.0
+        self.mock_callable("protocols.tcp.session.time", "monotonic").with_implementation(lambda: self.time)
+        setup_mock_stack(self)
+        setup_mock_tcp_listener(self)
+        self.session = accept_mock_tcp_session(self)
+        self.packets_tx.clear()
+
+    def _tcp(self, **kwargs):
+        """Create parsed TCP header of in-order pure ACK packet sent by host A, fields can be overridden"""
+
+        return SimpleNamespace(
+            **{
+                "seq": self.session._rcv_nxt,
+                "ack": self.session._snd_una,
+                "win": self.session._snd_wnd // self.session._snd_wsc,
+                "flag_syn": False,
+                "flag_ack": True,
+                "flag_fin": False,
+                "flag_rst": False,
+                "flag_urg": False,
+                "data": memoryview(b""),
+            }
+            | kwargs
+        )
+
+    def _send(self, data):
+        """Send data out in full sized segments with congestion window open, clear packets session sent"""
+
+        self.session._snd_ewn = self.session._snd_wnd
+        self.session.send(data)
+        for _ in range(len(data) // self.session._snd_mss + 1):
+            self.session.tcp_fsm(timer=True)
+        self.packets_tx.clear()
+
+    def test_tcp_session__fast_path__registration(self):
+        """Test that only ESTABLISHED session is subject to header prediction"""
+
+        self.assertIs(stack.tcp_fast_path[self.session.socket.socket_id], self.session)
+        self.session.tcp_fsm(mock_tcp_metadata(self, flag_fin=True, seq=self.session._rcv_nxt, ack=self.session._snd_nxt))
+        self.assertEqual(stack.tcp_fast_path, {})
+
+    def test_tcp_session__fast_path__ack(self):
+        """Test that in-order pure ACK purges acknowledged segments from retransmit queue"""
+
+        self._send(b"x" * 2920)
+        snd_una = self.session._snd_una
+        self.assertEqual(len(self.session._tx_retransmit_queue), 2)
+        self.assertTrue(self.session.tcp_fast_path(self._tcp(ack=snd_una + 1460)))
+        self.assertEqual(self.session._snd_una, snd_una + 1460)
+        self.assertEqual(len(self.session._tx_retransmit_queue), 1)
+        self.assertIn(f"{self.session}-retransmit", self.timer.timers)
+        self.assertTrue(self.session.tcp_fast_path(self._tcp(ack=snd_una + 2920)))
+        self.assertEqual(len(self.session._tx_retransmit_queue), 0)
+        self.assertEqual((self.session._stat_segments_received, self.session._stat_bytes_acked), (2, 2920))
+        self.assertEqual(self.packets_tx, [])
+
+    def test_tcp_session__fast_path__ack__old(self):
+        """Test that pure ACK that doesn't acknowledge anything new falls back to the full path"""
+
+        self._send(b"x" * 1460)
+        self.assertFalse(self.session.tcp_fast_path(self._tcp()))
+        self.assertFalse(self.session.tcp_fast_path(self._tcp(ack=self.session._snd_max + 1)))
+        self.assertEqual(len(self.session._tx_retransmit_queue), 1)
+
+    def test_tcp_session__fast_path__data(self):
+        """Test that in-order data is enqueued into receive buffer and acknowledged"""
+
+        rcv_nxt = self.session._rcv_nxt
+        self.assertTrue(self.session.tcp_fast_path(self._tcp(data=memoryview(b"y" * 100))))
+        self.assertEqual(self.session._rcv_nxt, rcv_nxt + 100)
+        self.assertEqual([_["ack"] for _ in self.packets_tx], [rcv_nxt + 100])
+        self.packets_tx.clear()
+
+        self.session._rcv_quick_ack = 0
+        self.assertTrue(self.session.tcp_fast_path(self._tcp(data=memoryview(b"z" * 100))))
+        self.assertEqual(self.packets_tx, [])
+        self.assertEqual(self.timer.timers.get(f"{self.session}-delayed_ack"), DELAYED_ACK_DELAY)
+        self.assertEqual(self.session.receive(), b"y" * 100 + b"z" * 100)
+
+    def test_tcp_session__fast_path__fallback(self):
+        """Test that packets header prediction doesn't cover are left to the full path untouched"""
+
+        data = memoryview(b"y" * 100)
+        for tcp in (
+            self._tcp(data=data, win=1000),
+            self._tcp(data=data, seq=self.session._rcv_nxt + 1460),
+            self._tcp(data=data, flag_fin=True),
+            self._tcp(data=data, flag_rst=True),
+            self._tcp(data=data, flag_syn=True),
+            self._tcp(data=data, flag_ack=False),
+            self._tcp(data=data, flag_urg=True),
+            self._tcp(data=b"y" * (self.session._rcv_adv - self.session._rcv_nxt + 1)),
+        ):
+            self.assertFalse(self.session.tcp_fast_path(tcp))
+        self.assertEqual(self.session._stat_segments_received, 0)
+        self.assertEqual(len(self.session._rx_buffer), 0)
+        self.assertEqual(self.packets_tx, [])
+
+    def test_tcp_session__fast_path__fallback__out_of_order_queue(self):
+        """Test that data of session with out of order queue falls back to the full path so the queue gets merged"""
+
+        self.session.tcp_fsm(mock_tcp_metadata(self, seq=self.session._rcv_nxt + 100, ack=self.session._snd_nxt, data=b"z" * 100))
+        self.assertFalse(self.session.tcp_fast_path(self._tcp(data=memoryview(b"y" * 100))))
+
+    def test_tcp_session__fast_path__fallback__retransmit(self):
+        """Test that ACK of session retransmitting lost data falls back to the full path"""
+
+        self._send(b"x" * 2920)
+        self.session._snd_nxt = self.session._snd_una
+        self.assertFalse(self.session.tcp_fast_path(self._tcp(ack=self.session._snd_una + 1460)))
+        self.assertEqual(len(self.session._tx_retransmit_queue), 2)
+
+    def test_tcp_session__fast_path__fallback__defer_accept(self):
+        """Test that first data of session with deferred accept falls back to the full path so accept call gets informed"""
+
+        self.session._defer_accept = True
+        self.assertFalse(self.session.tcp_fast_path(self._tcp(data=memoryview(b"y" * 100))))
+
+
+class TestTcpSessionFastPathRx(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.mns = MockNetworkSettings()
+        patch_config(self)
+        setup_mock_packet_handler(self)
+        setup_mock_stack(self)
+
+    def _frame(self, ip_assembler, ip_src, ip_dst):
+        """Assemble frame carrying pure ACK packet from host A port 40000 to stack port 80"""
+
+        packet = EtherAssembler(
+            src=self.mns.host_a_mac_address,
+            dst=self.mns.stack_mac_address,
+            carried_packet=ip_assembler(src=ip_src, dst=ip_dst, carried_packet=TcpAssembler(sport=40000, dport=80, seq=1, ack=1, flag_ack=True, win=1000)),
+        )
+        frame = memoryview(bytearray(len(packet)))
+        packet.assemble(frame)
+        return bytes(frame)
+
+    def test_tcp_session__fast_path__phrx(self):
+        """Test that inbound packet of IPv4 and IPv6 session is matched to the session by the key session registers itself under"""
+
+        for ip_assembler, ip_src, ip_dst in (
+            (Ip4Assembler, self.mns.host_a_ip4_address, self.mns.stack_ip4_host.address),
+            (Ip6Assembler, self.mns.host_a_ip6_address, self.mns.stack_ip6_host.address),
+        ):
+            tcp_session = StrictMock(TcpSession)
+            self.mock_callable(tcp_session, "tcp_fast_path").to_return_value(True).and_assert_called_once()
+            stack.tcp_fast_path[tcp_socket_id(ip_dst, 80, ip_src, 40000)] = tcp_session
+            self.packet_handler._phrx_ether(PacketRx(self._frame(ip_assembler, ip_src, ip_dst)))
+        self.assertEqual(self.packet_handler.packet_stats_rx.tcp__socket_match_active__fast_path, 2)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# tests/tcp_socket.py - unit tests for TCP socket receive calls and file transfer
+#
+
+
+import gc
+import mmap
+import tempfile
+import weakref
+
+from testslide import TestCase
+
+from pytcp.lib.socket import MSG_TRUNC
+
+# Socket classes need to see the same enums and exceptions as the stack code does
+from pytcp.protocols.tcp.socket import ReceiveTimeout
+from tests.mock_network import (
+    MockNetworkSettings,
+    accept_mock_tcp_session,
+    mock_tcp_metadata,
+    setup_mock_stack,
+    setup_mock_tcp_listener,
+)
+
+DATA = bytes(range(256)) * 4
+
+
+class TestTcpSocketFile(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.mns = MockNetworkSettings()
+        setup_mock_stack(self)
+        setup_mock_tcp_listener(self)
+        self.session = accept_mock_tcp_session(self)
+        self.socket = self.session.socket
+
+        self.file = tempfile.TemporaryFile()
+        self.addCleanup(self.file.close)
+
+    def _transmit(self):
+        """Let session send out data segments, return their data"""
+
+        self.session.tcp_fsm(timer=True)
+        data = [bytes(_["data"]) for _ in self.packets_tx]
+        self.packets_tx.clear()
+        return data
+
+    def _receive(self, data, flag_fin=False):
+        """Deliver data segment to session"""
+
+        self.session.tcp_fsm(mock_tcp_metadata(self, flag_fin=flag_fin, seq=self.session._rcv_nxt, ack=self.session._snd_nxt, data=data))
+
+    def test_tcp_socket__sendfile(self):
+        """Test sending the whole file"""
+
+        self.file.write(DATA)
+        self.file.flush()
+        self.assertEqual(self.socket.sendfile(self.file), len(DATA))
+        self.assertEqual(self.file.tell(), len(DATA))
+        self.assertEqual(self._transmit(), [DATA])
+
+    def test_tcp_socket__sendfile__offset_count(self):
+        """Test sending part of the file"""
+
+        self.file.write(DATA)
+        self.file.flush()
+        self.assertEqual(self.socket.sendfile(self.file, offset=100, count=300), 300)
+        self.assertEqual(self.file.tell(), 400)
+        self.assertEqual(self.socket.sendfile(self.file, offset=1000, count=300), 24)
+        self.assertEqual(self.file.tell(), 1024)
+        self.assertEqual(self._transmit(), [DATA[100:400] + DATA[1000:]])
+
+    def test_tcp_socket__sendfile__eof(self):
+        """Test sending file from offset at or past its end"""
+
+        self.file.write(DATA)
+        self.file.flush()
+        self.assertEqual(self.socket.sendfile(self.file, offset=len(DATA)), 0)
+        self.assertEqual(self.socket.sendfile(self.file, offset=len(DATA) + 1, count=10), 0)
+        self.assertEqual(len(self.session._tx_buffer), 0)
+
+    def test_tcp_socket__sendfile__mapping_released_on_ack(self):
+        """Test that memory mapped file stays referenced by retransmit queue until peer acknowledges the data"""
+
+        self.file.write(DATA)
+        self.file.flush()
+        self.socket.sendfile(self.file)
+        self.file.close()
+        self._transmit()
+        mapping = weakref.ref(self.session._tx_retransmit_queue.head.data.obj)
+        self.assertIsInstance(mapping(), mmap.mmap)
+        gc.collect()
+        self.assertIsNotNone(mapping())
+        self.assertEqual(bytes(self.session._tx_retransmit_queue.head.data), DATA)
+        self.session.tcp_fsm(mock_tcp_metadata(self, seq=self.session._rcv_nxt, ack=self.session._snd_nxt))
+        self.assertEqual(len(self.session._tx_retransmit_queue), 0)
+        gc.collect()
+        self.assertIsNone(mapping())
+
+    def test_tcp_socket__recvfile(self):
+        """Test receiving data into file at given offset"""
+
+        self.file.write(b"x" * 10)
+        self._receive(DATA[:600])
+        self._receive(DATA[600:])
+        self.assertEqual(self.socket.recvfile(self.file, 1000, offset=10), 1000)
+        self.assertEqual(self.file.tell(), 1010)
+        self.file.seek(0)
+        self.assertEqual(self.file.read(), b"x" * 10 + DATA[:1000])
+        self.assertEqual(self.socket.recv(), DATA[1000:])
+
+    def test_tcp_socket__recvfile__eof(self):
+        """Test that file is not left longer than received data when peer closes connection early"""
+
+        self._receive(DATA[:500], flag_fin=True)
+        self.assertEqual(self.socket.recvfile(self.file, 1000), 500)
+        self.assertEqual(self.file.tell(), 500)
+        self.file.seek(0)
+        self.assertEqual(self.file.read(), DATA[:500])
+        self.assertEqual(self.socket.recvfile(self.file, 1000, offset=500), 0)
+        self.assertEqual(self.file.seek(0, 2), 500)
+
+    def test_tcp_socket__recvfile__existing_data(self):
+        """Test that file content past the received range survives short read"""
+
+        self.file.write(b"x" * 2000)
+        self._receive(DATA[:500], flag_fin=True)
+        self.assertEqual(self.socket.recvfile(self.file, 1000, offset=100), 500)
+        self.assertEqual(self.file.tell(), 600)
+        self.file.seek(0)
+        self.assertEqual(self.file.read(), b"x" * 100 + DATA[:500] + b"x" * 1400)
+
+    def test_tcp_socket__recvfile__extend(self):
+        """Test that file shorter than received range is extended only up to the end of received data"""
+
+        self.file.write(b"x" * 300)
+        self._receive(DATA[:500], flag_fin=True)
+        self.assertEqual(self.socket.recvfile(self.file, 1000, offset=100), 500)
+        self.file.seek(0)
+        self.assertEqual(self.file.read(), b"x" * 100 + DATA[:500])
+
+    def test_tcp_socket__recvfile__zero_count(self):
+        """Test that receiving zero bytes doesn't touch the file"""
+
+        self.assertEqual(self.socket.recvfile(self.file, 0), 0)
+        self.assertEqual(self.file.seek(0, 2), 0)
+
+
+class TestTcpSocketRecv(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.mns = MockNetworkSettings()
+        setup_mock_stack(self)
+        setup_mock_tcp_listener(self)
+        self.session = accept_mock_tcp_session(self)
+        self.socket = self.session.socket
+
+    def _receive(self, data):
+        """Deliver data segment to session"""
+
+        self.session.tcp_fsm(mock_tcp_metadata(self, seq=self.session._rcv_nxt, ack=self.session._snd_nxt, data=data))
+
+    def test_tcp_socket__recv__timeout(self):
+        """Test that receive call gives up waiting for data once timeout expires"""
+
+        self.assertRaises(ReceiveTimeout, self.socket.recv, timeout=0)
+        self.assertRaises(ReceiveTimeout, self.socket.recv, 10, 0.01)
+        self._receive(b"0123456789")
+        self.assertEqual(self.socket.recv(timeout=0), b"0123456789")
+
+    def test_tcp_socket__recv_into(self):
+        """Test receiving data into provided buffer"""
+
+        buffer = bytearray(8)
+        self._receive(b"0123456789")
+        self.assertEqual(self.socket.recv_into(buffer, 4), 4)
+        self.assertEqual(self.socket.recv_into(memoryview(buffer)[4:], timeout=0), 4)
+        self.assertEqual(buffer, b"01234567")
+        self.assertEqual(self.socket.recv_into(buffer, 0, 0, timeout=0), 2)
+        self.assertEqual(buffer, b"89234567")
+
+    def test_tcp_socket__recv_into__timeout(self):
+        """Test that receive call gives up waiting for data once timeout expires"""
+
+        self.assertRaises(ReceiveTimeout, self.socket.recv_into, bytearray(8), timeout=0)
+        self.assertRaises(ReceiveTimeout, self.socket.recv_into, bytearray(8), timeout=0.01)
+
+    def test_tcp_socket__recv_into__flags(self):
+        """Test that unsupported flags are refused rather than ignored"""
+
+        self._receive(b"0123456789")
+        self.assertRaises(ValueError, self.socket.recv_into, bytearray(8), 0, MSG_TRUNC)
+        self.assertEqual(self.socket.recv(), b"0123456789")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# tests/tcp_syn_cache.py - unit tests for TCP SYN cookies
+#
+
+
+from testslide import TestCase
+
+from pytcp.lib.ip4_address import Ip4Address
+from pytcp.protocols.tcp.metadata import TcpMetadata
+from pytcp.protocols.tcp.syn_cache import syn_cookie_decode, syn_cookie_encode
+
+
+def packet_md(flag_syn, seq, ack, mss=1460, remote_port=40000, remote_ip_address="10.0.1.8"):
+    return TcpMetadata(
+        local_ip_address=Ip4Address("10.0.1.7"),
+        local_port=80,
+        remote_ip_address=Ip4Address(remote_ip_address),
+        remote_port=remote_port,
+        flag_syn=flag_syn,
+        flag_ack=not flag_syn,
+        flag_fin=False,
+        flag_rst=False,
+        seq=seq,
+        ack=ack,
+        win=65535,
+        wscale=None,
+        mss=mss,
+        fastopen=None,
+        data=memoryview(b""),
+        tracker=None,
+    )
+
+
+class TestTcpSynCookie(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.time = 1000000.0
+        self.mock_callable("pytcp.protocols.tcp.syn_cache.time", "monotonic").with_implementation(lambda: self.time)
+
+    def test_tcp_syn_cookie__valid(self):
+        cookie = syn_cookie_encode(packet_md(True, 0xFFFFFFFF, 0, mss=1400))
+        self.time += 64
+        self.assertEqual(syn_cookie_decode(packet_md(False, 0, (cookie + 1) & 0xFFFFFFFF)), 1400)
+
+    def test_tcp_syn_cookie__mss_rounded_down(self):
+        cookie = syn_cookie_encode(packet_md(True, 1000, 0, mss=1300))
+        self.assertEqual(syn_cookie_decode(packet_md(False, 1001, cookie + 1)), 1220)
+
+    def test_tcp_syn_cookie__invalid(self):
+        cookie = syn_cookie_encode(packet_md(True, 1000, 0))
+        self.assertIsNone(syn_cookie_decode(packet_md(False, 1002, cookie + 1)))
+        self.assertIsNone(syn_cookie_decode(packet_md(False, 1001, cookie + 1, remote_port=40001)))
+        self.assertIsNone(syn_cookie_decode(packet_md(False, 1001, cookie + 1, remote_ip_address="10.0.1.9")))
+        self.assertIsNone(syn_cookie_decode(packet_md(False, 1001, cookie + 1 ^ 1 << 24)))
+
+    def test_tcp_syn_cookie__expired(self):
+        cookie = syn_cookie_encode(packet_md(True, 1000, 0))
+        self.time += 128
+        self.assertIsNone(syn_cookie_decode(packet_md(False, 1001, cookie + 1)))
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# tests/tcp_time_wait.py - unit tests for TCP TIME_WAIT table
+#
+
+
+from testslide import TestCase
+
+from pytcp.protocols.tcp.time_wait import (
+    TIME_WAIT_DELAY,
+    TIME_WAIT_ISN_GAP,
+    TcpTimeWaitEntry,
+    TcpTimeWaitTable,
+)
+from tests.mock_network import (
+    MockNetworkSettings,
+    accept_mock_tcp_session,
+    mock_tcp_metadata,
+    setup_mock_stack,
+    setup_mock_tcp_listener,
+)
+
+
+class TestTcpTimeWaitTable(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.time = 1000.0
+        self.mock_callable("pytcp.protocols.tcp.time_wait.time", "monotonic").with_implementation(lambda: self.time)
+        self.table = TcpTimeWaitTable()
+        self.table.add("a", snd_nxt=100, rcv_nxt=200)
+        self.time += 1
+        self.table.add("b", snd_nxt=300, rcv_nxt=400)
+
+    def test_tcp_time_wait__get(self):
+        self.assertEqual(self.table.get("a"), TcpTimeWaitEntry(1000.0 + TIME_WAIT_DELAY / 1000, 100, 200))
+        self.assertIsNone(self.table.get("c"))
+        self.assertEqual(len(self.table), 2)
+
+    def test_tcp_time_wait__expiry(self):
+        self.time = 1000.0 + TIME_WAIT_DELAY / 1000
+        self.assertIsNone(self.table.get("a"))
+        self.assertEqual(len(self.table), 1)
+        self.time += 1
+        self.assertEqual(len(self.table), 0)
+
+    def test_tcp_time_wait__add_restarts_delay(self):
+        self.time += 1
+        self.table.add("a", snd_nxt=100, rcv_nxt=200)
+        self.time = 1001.0 + TIME_WAIT_DELAY / 1000
+        self.assertIsNone(self.table.get("b"))
+        self.assertIsNotNone(self.table.get("a"))
+
+    def test_tcp_time_wait__pop(self):
+        self.assertEqual(self.table.pop("b"), TcpTimeWaitEntry(1001.0 + TIME_WAIT_DELAY / 1000, 300, 400))
+        self.assertIsNone(self.table.pop("b"))
+        self.assertEqual(len(self.table), 1)
+
+
+class TestTcpTimeWaitEntry(TestCase):
+    def test_tcp_time_wait__accepts_syn(self):
+        entry = TcpTimeWaitEntry(0.0, 100, 200)
+        self.assertTrue(entry.accepts_syn(201))
+        self.assertFalse(entry.accepts_syn(200))
+        self.assertFalse(entry.accepts_syn(199))
+
+    def test_tcp_time_wait__accepts_syn__wraparound(self):
+        entry = TcpTimeWaitEntry(0.0, 100, 0xFFFFFF00)
+        self.assertTrue(entry.accepts_syn(0x10))
+        self.assertFalse(entry.accepts_syn(0xFFFFFE00))
+        entry = TcpTimeWaitEntry(0.0, 100, 0x10)
+        self.assertFalse(entry.accepts_syn(0xFFFFFF00))
+
+
+class TestTcpTimeWaitReuse(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.mns = MockNetworkSettings()
+        setup_mock_stack(self)
+        setup_mock_tcp_listener(self)
+
+    def test_tcp_time_wait__reuse__listener_isn(self):
+        """Test that listener picks initial SEQ past the sequence space of connection in TIME_WAIT state"""
+
+        packet_rx_md = mock_tcp_metadata(self, flag_syn=True, flag_ack=False, seq=5000)
+        packet_rx_md.time_wait = TcpTimeWaitEntry(0.0, 0xFFFFFF00, 4000)
+        self.listener.process_tcp_packet(packet_rx_md)
+        snd_ini = (0xFFFFFF00 + TIME_WAIT_ISN_GAP) & 0xFFFFFFFF
+        self.assertEqual((self.packets_tx[-1]["seq"], self.packets_tx[-1]["ack"]), (snd_ini, 5001))
+        self.listener.process_tcp_packet(mock_tcp_metadata(self, seq=5001, ack=snd_ini + 1))
+        self.assertEqual(self.listener.accept()[0].tcp_session._snd_ini, snd_ini)
+
+    def test_tcp_time_wait__reuse__listener_isn__random(self):
+        """Test that listener picks random initial SEQ for connection that doesn't reuse 4-tuple"""
+
+        self.mock_callable("protocols.tcp.session.random", "randint").for_call(0, 0xFFFFFFFF).to_return_value(12345)
+        self.assertEqual(accept_mock_tcp_session(self)._snd_ini, 12345)
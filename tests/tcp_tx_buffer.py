@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# tests/tcp_tx_buffer.py - unit tests for TCP send queue and retransmit queue
+#
+
+import mmap
+import tempfile
+
+from testslide import TestCase
+
+from pytcp.misc.ip_helper import inet_sum
+from pytcp.protocols.tcp.tx_buffer import TcpRetransmitQueue, TcpSegment, TcpTxBuffer
+
+
+class TestTcpTxBuffer(TestCase):
+    def test_tcp_tx_buffer__append(self):
+        tx_buffer = TcpTxBuffer()
+        self.assertEqual(tx_buffer.append(b"0123456789"), 10)
+        self.assertEqual(tx_buffer.append(bytearray(b"abcde")), 5)
+        self.assertEqual(tx_buffer.append(b""), 0)
+        self.assertEqual(len(tx_buffer), 15)
+
+    def test_tcp_tx_buffer__take__zero_copy(self):
+        data = b"0123456789"
+        tx_buffer = TcpTxBuffer()
+        tx_buffer.append(data)
+        segment = tx_buffer.take(4)
+        self.assertIs(segment.obj, data)
+        self.assertEqual(bytes(segment), b"0123")
+        self.assertEqual(bytes(tx_buffer.take(100)), b"456789")
+        self.assertEqual(len(tx_buffer), 0)
+
+    def test_tcp_tx_buffer__take__multiple_chunks(self):
+        tx_buffer = TcpTxBuffer()
+        tx_buffer.append(b"0123")
+        tx_buffer.append(b"4567")
+        tx_buffer.append(b"89")
+        self.assertEqual(bytes(tx_buffer.take(6)), b"012345")
+        self.assertEqual(bytes(tx_buffer.take(6)), b"6789")
+        self.assertEqual(len(tx_buffer), 0)
+
+    def test_tcp_tx_buffer__append_mapped(self):
+        with tempfile.TemporaryFile() as file:
+            file.write(b"0123456789")
+            file.flush()
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            tx_buffer = TcpTxBuffer()
+            self.assertEqual(tx_buffer.append_mapped(memoryview(mapping)[2:]), 8)
+            segment = tx_buffer.take(4)
+            self.assertIs(segment.obj, mapping)
+            self.assertEqual(bytes(segment), b"2345")
+            self.assertRaises(BufferError, mapping.close)
+            segment.release()
+            tx_buffer.take(100).release()
+            tx_buffer._chunks.clear()
+
+    def test_tcp_tx_buffer__append_mapped__writable(self):
+        self.assertRaises(AssertionError, TcpTxBuffer().append_mapped, memoryview(bytearray(b"0123")))
+
+
+class TestTcpRetransmitQueue(TestCase):
+    def setUp(self):
+        self.queue = TcpRetransmitQueue()
+        self.queue.enqueue(TcpSegment(seq=1000, flag_syn=True))
+        self.queue.enqueue(TcpSegment(seq=1001, data=memoryview(b"A" * 100)))
+        self.queue.enqueue(TcpSegment(seq=1101, data=memoryview(b"B" * 100)))
+        self.queue.enqueue(TcpSegment(seq=1201, data=memoryview(b"C" * 100)))
+        self.queue.enqueue(TcpSegment(seq=1301, flag_fin=True))
+
+    def test_tcp_retransmit_queue__bytes_in_flight(self):
+        self.assertEqual(len(self.queue), 5)
+        self.assertEqual(self.queue.bytes_in_flight, 302)
+
+    def test_tcp_retransmit_queue__acknowledge(self):
+        acked = self.queue.acknowledge(1101)
+        self.assertEqual([_.seq for _ in acked], [1000, 1001])
+        self.assertEqual(self.queue.head.seq, 1101)
+        self.assertEqual(self.queue.acknowledge(1101), [])
+        self.assertEqual([_.seq for _ in self.queue.acknowledge(1302)], [1101, 1201, 1301])
+        self.assertIsNone(self.queue.head)
+        self.assertEqual(self.queue.bytes_in_flight, 0)
+
+    def test_tcp_retransmit_queue__acknowledge__partial(self):
+        self.queue.acknowledge(1151)
+        self.assertEqual(self.queue.head.seq, 1151)
+        self.assertEqual(self.queue.head.len, 50)
+        self.assertEqual(bytes(self.queue.head.data), b"B" * 50)
+        self.assertIs(self.queue.find(1160), self.queue.head)
+
+    def test_tcp_retransmit_queue__acknowledge__partial__data_sum(self):
+        data = memoryview(bytes(range(7, 250)))
+        for acked in (1, 2, 121, 122, 200, 242):
+            segment = TcpSegment(seq=5000, data=data)
+            segment.trim(5000 + acked)
+            self.assertEqual(segment.data_sum % 0xFFFF, inet_sum(data[acked:]) % 0xFFFF)
+
+    def test_tcp_retransmit_queue__find(self):
+        self.assertEqual(self.queue.find(1000).seq, 1000)
+        self.assertEqual(self.queue.find(1050).seq, 1001)
+        self.assertEqual(self.queue.find(1300).seq, 1201)
+        self.assertEqual(self.queue.find(1301).seq, 1301)
+        self.assertIsNone(self.queue.find(999))
+        self.assertIsNone(self.queue.find(1302))
+        self.queue.acknowledge(1201)
+        self.assertIsNone(self.queue.find(1050))
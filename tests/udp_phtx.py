@@ -104,6 +104,115 @@ class TestUdpPhtx(TestCase):
             frame_tx = _.read()
         self.assertEqual(self.frame_tx[: len(frame_tx)], frame_tx)
 
+    def test_udp_phtx__ip4_udp_packet__tx_template(self):
+        """Test sending IPv4/UDP packet using TX template created by the previous packet of the same flow"""
+
+        for udp_data in (None, b"01234567890ABCDEF" * 50):
+            tx_status = self.packet_handler._phtx_udp(
+                ip_src=self.mns.stack_ip4_host.address,
+                ip_dst=self.mns.host_a_ip4_address,
+                udp_sport=1000,
+                udp_dport=2000,
+                udp_data=udp_data,
+                tx_template=True,
+            )
+            self.assertEqual(tx_status, TxStatus.PASSED__ETHER__TO_TX_RING)
+        self.assertEqual(
+            self.packet_handler.packet_stats_tx,
+            PacketStatsTx(
+                udp__pre_assemble=2,
+                udp__send=2,
+                ip4__pre_assemble=1,
+                ip4__mtu_ok__send=1,
+                ether__pre_assemble=1,
+                ether__src_unspec__fill=1,
+                ether__dst_unspec__ip4_lookup=1,
+                ether__dst_unspec__ip4_lookup__locnet__arp_cache_hit__send=1,
+                ether__template__save=1,
+                ether__template__send=1,
+            ),
+        )
+        with open(TEST_FRAME_DIR + "ip4_udp_packet__data.tx", "rb") as _:
+            frame_tx = _.read()
+        self.assertEqual(self.frame_tx[: len(frame_tx)], frame_tx)
+
+    def test_udp_phtx__ip4_udp_packet__tx_template__invalidated(self):
+        """Test sending IPv4/UDP packet after TX template of its flow got invalidated"""
+
+        for _ in range(2):
+            self.packet_handler.invalidate_tx_templates(self.mns.host_a_mac_address)
+            tx_status = self.packet_handler._phtx_udp(
+                ip_src=self.mns.stack_ip4_host.address,
+                ip_dst=self.mns.host_a_ip4_address,
+                udp_sport=1000,
+                udp_dport=2000,
+                tx_template=True,
+            )
+            self.assertEqual(tx_status, TxStatus.PASSED__ETHER__TO_TX_RING)
+        self.assertEqual(
+            self.packet_handler.packet_stats_tx,
+            PacketStatsTx(
+                udp__pre_assemble=2,
+                udp__send=2,
+                ip4__pre_assemble=2,
+                ip4__mtu_ok__send=2,
+                ether__pre_assemble=2,
+                ether__src_unspec__fill=2,
+                ether__dst_unspec__ip4_lookup=2,
+                ether__dst_unspec__ip4_lookup__locnet__arp_cache_hit__send=2,
+                ether__template__save=2,
+            ),
+        )
+        with open(TEST_FRAME_DIR + "ip4_udp_packet.tx", "rb") as _:
+            frame_tx = _.read()
+        self.assertEqual(self.frame_tx[: len(frame_tx)], frame_tx)
+
+    def test_udp_phtx__ip4_udp_packet__tx_template__invalidated__other_mac(self):
+        """Test that invalidating TX templates of one MAC address keeps templates of flows sent to other addresses"""
+
+        for ip_dst in (self.mns.host_a_ip4_address, self.mns.host_c_ip4_address):
+            self.packet_handler._phtx_udp(ip_src=self.mns.stack_ip4_host.address, ip_dst=ip_dst, udp_sport=1000, udp_dport=2000, tx_template=True)
+        tx_templates = self.packet_handler.tx_templates
+        self.assertEqual(len(tx_templates), 2)
+        self.packet_handler.invalidate_tx_templates(self.mns.host_a_mac_address)
+        self.assertIs(self.packet_handler.tx_templates, tx_templates)
+        self.assertEqual([_.ether_dst for _ in tx_templates.values()], [self.mns.stack_ip4_gateway_mac_address])
+        self.packet_handler.invalidate_tx_templates()
+        self.assertEqual(tx_templates, {})
+
+    def test_udp_phtx__ip4_udp_packet__batch(self):
+        """Test sending batch of IPv4/UDP packets, headers get built only once and the following packets of the flow use its TX template"""
+
+        tx_status = self.packet_handler._phtx_udp_batch(
+            udp_sport=1000,
+            packets=[
+                (self.mns.stack_ip4_host.address, self.mns.host_a_ip4_address, 2000, b""),
+                (self.mns.stack_ip4_host.address, self.mns.host_a_ip6_address, 2000, b""),
+                (self.mns.stack_ip4_host.address, self.mns.host_a_ip4_address, 2000, memoryview(b"01234567890ABCDEF" * 51)[17:]),
+            ],
+        )
+        self.assertEqual(tx_status, [TxStatus.PASSED__ETHER__TO_TX_RING, TxStatus.DROPED__UDP__UNKNOWN, TxStatus.PASSED__ETHER__TO_TX_RING])
+        self.assertEqual(
+            self.packet_handler.packet_stats_tx,
+            PacketStatsTx(
+                udp__pre_assemble=3,
+                udp__send=2,
+                udp__unknown__drop=1,
+                ip4__pre_assemble=1,
+                ip4__mtu_ok__send=1,
+                ether__pre_assemble=1,
+                ether__src_unspec__fill=1,
+                ether__dst_spec__send=1,
+                ether__dst_unspec__ip4_lookup=1,
+                ether__dst_unspec__ip4_lookup__locnet__arp_cache_hit__send=1,
+                ether__template__save=1,
+                ether__template__send=1,
+            ),
+        )
+        with open(TEST_FRAME_DIR + "ip4_udp_packet__data.tx", "rb") as _:
+            frame_tx = _.read()
+        self.assertEqual(self.frame_tx[: len(frame_tx)], frame_tx)
+
     def test_udp_phtx__ip4_udp_packet__ip6_src(self):
         """Test sending IPv4/UDP packet with src set to ip6 address"""
 
@@ -191,6 +300,38 @@ class TestUdpPhtx(TestCase):
             frame_tx = _.read()
         self.assertEqual(self.frame_tx[: len(frame_tx)], frame_tx)
 
+    def test_udp_phtx__ip6_udp_packet__tx_template(self):
+        """Test sending IPv6/UDP packet using TX template created by the previous packet of the same flow"""
+
+        for udp_data in (None, b"01234567890ABCDEF" * 50):
+            tx_status = self.packet_handler._phtx_udp(
+                ip_src=self.mns.stack_ip6_host.address,
+                ip_dst=self.mns.host_a_ip6_address,
+                udp_sport=1000,
+                udp_dport=2000,
+                udp_data=udp_data,
+                tx_template=True,
+            )
+            self.assertEqual(tx_status, TxStatus.PASSED__ETHER__TO_TX_RING)
+        self.assertEqual(
+            self.packet_handler.packet_stats_tx,
+            PacketStatsTx(
+                udp__pre_assemble=2,
+                udp__send=2,
+                ip6__pre_assemble=1,
+                ip6__mtu_ok__send=1,
+                ether__pre_assemble=1,
+                ether__src_unspec__fill=1,
+                ether__dst_unspec__ip6_lookup=1,
+                ether__dst_unspec__ip6_lookup__locnet__nd_cache_hit__send=1,
+                ether__template__save=1,
+                ether__template__send=1,
+            ),
+        )
+        with open(TEST_FRAME_DIR + "ip6_udp_packet__data.tx", "rb") as _:
+            frame_tx = _.read()
+        self.assertEqual(self.frame_tx[: len(frame_tx)], frame_tx)
+
     def test_udp_phtx__ip6_udp_packet__ip4_src(self):
         """Test sending IPv6/UDP packet with src set to ip4 address"""
 
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+############################################################################
+#                                                                          #
+#  PyTCP - Python TCP/IP stack                                             #
+#  Copyright (C) 2020-2021  Sebastian Majewski                             #
+#                                                                          #
+#  This program is free software: you can redistribute it and/or modify    #
+#  it under the terms of the GNU General Public License as published by    #
+#  the Free Software Foundation, either version 3 of the License, or       #
+#  (at your option) any later version.                                     #
+#                                                                          #
+#  This program is distributed in the hope that it will be useful,         #
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of          #
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the           #
+#  GNU General Public License for more details.                            #
+#                                                                          #
+#  You should have received a copy of the GNU General Public License       #
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.  #
+#                                                                          #
+#  Author's email: ccie18643@gmail.com                                     #
+#  Github repository: https://github.com/ccie18643/PyTCP                   #
+#                                                                          #
+############################################################################
+
+
+#
+# tests/udp_socket.py - unit tests for UDP socket receive queue
+#
+
+
+from testslide import TestCase
+
+from pytcp.lib.ip4_address import Ip4Address
+from pytcp.lib.socket import (
+    IPPROTO_UDP,
+    MSG_TRUNC,
+    SO_RCVBUF,
+    SO_ZEROCOPY,
+    SOL_SOCKET,
+    UDP_SEGMENT,
+)
+from pytcp.protocols.udp.metadata import UdpMetadata
+
+# Socket classes need to see the same enums and exceptions as the stack code does
+from pytcp.protocols.udp.socket import AF_INET4, ReceiveTimeout, TxStatus, UdpSocket
+from tests.mock_network import MockNetworkSettings, setup_mock_stack
+
+
+def _udp_metadata(data):
+    return UdpMetadata(local_ip_address=Ip4Address("10.0.0.7"), local_port=53, remote_ip_address=Ip4Address("10.0.0.1"), remote_port=5353, data=data)
+
+
+class TestUdpSocket(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.socket = UdpSocket(AF_INET4)
+
+    def test_udp_socket__recv(self):
+        self.socket.process_udp_packet(_udp_metadata(b"0123456789"))
+        self.socket.process_udp_packet(_udp_metadata(b"abcdef"))
+        self.assertEqual(self.socket.recv(4), b"0123")
+        self.assertEqual(self.socket.recvfrom(), (b"abcdef", ("10.0.0.1", 5353)))
+        self.assertRaises(ReceiveTimeout, self.socket.recv, timeout=0)
+
+    def test_udp_socket__recv_many(self):
+        for data in (b"0123456789", b"abc", b"def"):
+            self.socket.process_udp_packet(_udp_metadata(data))
+        self.assertEqual(self.socket.recv_many(2), [(b"0123456789", ("10.0.0.1", 5353)), (b"abc", ("10.0.0.1", 5353))])
+        self.assertEqual(self.socket.recv_many(8), [(b"def", ("10.0.0.1", 5353))])
+        self.assertEqual(self.socket._packet_rx_md_len, 0)
+        self.assertRaises(ReceiveTimeout, self.socket.recv_many, 8, timeout=0)
+
+    def test_udp_socket__recv_into(self):
+        buffer = bytearray(8)
+        self.socket.process_udp_packet(_udp_metadata(b"0123456789"))
+        self.socket.process_udp_packet(_udp_metadata(b"0123456789"))
+        self.socket.process_udp_packet(_udp_metadata(b"abc"))
+        self.assertEqual(self.socket.recv_into(buffer), 8)
+        self.assertEqual(buffer, b"01234567")
+        self.assertEqual(self.socket.recv_into(buffer, 4, MSG_TRUNC), 10)
+        self.assertEqual(buffer, b"01234567")
+        self.assertEqual(self.socket.recvfrom_into(memoryview(buffer)[4:]), (3, ("10.0.0.1", 5353)))
+        self.assertEqual(buffer, b"0123abc7")
+        self.assertRaises(ReceiveTimeout, self.socket.recv_into, buffer, timeout=0)
+        self.assertRaises(ReceiveTimeout, self.socket.recvfrom_into, buffer, 0, MSG_TRUNC, timeout=0)
+        self.assertRaises(TypeError, self.socket.recv_into, buffer, 0, 0, 0)
+
+    def test_udp_socket__zerocopy(self):
+        frame = b"headers0123456789"
+        self.socket.process_udp_packet(_udp_metadata(memoryview(frame)[7:]))
+        data, address = self.socket.recvfrom_view()
+        self.assertEqual((data, address), (b"0123456789", ("10.0.0.1", 5353)))
+        self.assertIsNot(data.obj, frame)
+        self.socket.setsockopt(SOL_SOCKET, SO_ZEROCOPY, 1)
+        self.socket.process_udp_packet(_udp_metadata(memoryview(frame)[7:]))
+        self.socket.process_udp_packet(_udp_metadata(memoryview(frame)[7:]))
+        with self.socket.recvfrom_view()[0] as data:
+            self.assertEqual(data, b"0123456789")
+            self.assertIs(data.obj, frame)
+        self.assertEqual(self.socket.recv(4), b"0123")
+
+    def test_udp_socket__rcvbuf(self):
+        self.assertEqual(self.socket.getsockopt(SOL_SOCKET, SO_RCVBUF), 212992)
+        self.socket.setsockopt(SOL_SOCKET, SO_RCVBUF, 25)
+        for _ in range(4):
+            self.socket.process_udp_packet(_udp_metadata(b"0123456789"))
+        self.assertEqual(self.socket.drops, 2)
+        self.socket.recv()
+        self.socket.process_udp_packet(_udp_metadata(b"abcdefghij"))
+        self.assertEqual(self.socket.drops, 2)
+        self.assertEqual([self.socket.recv(), self.socket.recv()], [b"0123456789", b"abcdefghij"])
+
+    def test_udp_socket__rcvbuf__oversized_datagram(self):
+        self.socket.setsockopt(SOL_SOCKET, SO_RCVBUF, 4)
+        self.socket.process_udp_packet(_udp_metadata(b"0123456789"))
+        self.assertEqual(self.socket.recv(), b"0123456789")
+
+
+class TestUdpSocketSend(TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.mns = MockNetworkSettings()
+        setup_mock_stack(self)
+        self.tx_status = {}
+        self.mock_callable(self.packet_handler_mock, "send_udp_packet").with_implementation(self._send_udp_packet)
+        self.mock_callable(self.packet_handler_mock, "send_udp_packets").with_implementation(self._send_udp_packets)
+
+        self.socket = UdpSocket(AF_INET4)
+        # Local address is created with the address class stack code checks against
+        self.socket._local_ip_address = type(self.socket._local_ip_address)(str(self.mns.stack_ip4_host.address))
+        self.socket._local_port = 53
+
+    def _send_udp_packet(self, **kwargs):
+        self.packets_tx.append((kwargs["local_ip_address"], kwargs["remote_ip_address"], kwargs["remote_port"], bytes(kwargs["data"])))
+        return self.tx_status.get(len(self.packets_tx) - 1, TxStatus.PASSED__ETHER__TO_TX_RING)
+
+    def _send_udp_packets(self, local_port, packets):
+        self.assertEqual(local_port, 53)
+        tx_status = []
+        for local_ip_address, remote_ip_address, remote_port, data in packets:
+            tx_status.append(self._send_udp_packet(local_ip_address=local_ip_address, remote_ip_address=remote_ip_address, remote_port=remote_port, data=data))
+        return tx_status
+
+    def test_udp_socket__send_many(self):
+        self.mock_callable(self.socket, "_set_ip_addresses", allow_private=True).to_call_original().and_assert_called_exactly(3)
+        datagrams = [
+            (b"a", ("10.0.1.91", 5000)),
+            (b"b", ("10.0.1.92", 5000)),
+            (b"c", ("10.0.1.91", 5000)),
+            (b"d", ("10.0.1.91", 5001)),
+            (b"e", ("10.0.1.92", 5000)),
+        ]
+        self.assertEqual(self.socket.send_many(datagrams), 5)
+        self.assertEqual(
+            self.packets_tx,
+            [
+                (self.mns.stack_ip4_host.address, self.mns.host_a_ip4_address, 5000, b"a"),
+                (self.mns.stack_ip4_host.address, self.mns.host_b_ip4_address, 5000, b"b"),
+                (self.mns.stack_ip4_host.address, self.mns.host_a_ip4_address, 5000, b"c"),
+                (self.mns.stack_ip4_host.address, self.mns.host_a_ip4_address, 5001, b"d"),
+                (self.mns.stack_ip4_host.address, self.mns.host_b_ip4_address, 5000, b"e"),
+            ],
+        )
+
+    def test_udp_socket__send_many__partial_failure(self):
+        self.tx_status = {1: TxStatus.DROPED__ETHER__DST_ARP_CACHE_FAIL, 3: TxStatus.DROPED__ETHER__DST_ARP_CACHE_FAIL}
+        self.assertEqual(self.socket.send_many([(b"x", ("10.0.1.91", 5000)), (b"y", ("10.0.1.92", 5000))] * 2), 2)
+        self.assertEqual(len(self.packets_tx), 4)
+
+    def test_udp_socket__send_many__port_out_of_range(self):
+        self.assertRaises(OverflowError, self.socket.send_many, [(b"x", ("10.0.1.91", 5000)), (b"y", ("10.0.1.91", 65536))])
+        self.assertEqual(self.packets_tx, [])
+
+    def test_udp_socket__udp_segment(self):
+        self.socket.setsockopt(IPPROTO_UDP, UDP_SEGMENT, 1000)
+        data = bytes(range(250)) * 10
+        self.assertEqual(self.socket.sendto(data, ("10.0.1.91", 5000)), 2500)
+        self.assertEqual([_[3] for _ in self.packets_tx], [data[:1000], data[1000:2000], data[2000:]])
+        self.assertEqual({_[:3] for _ in self.packets_tx}, {(self.mns.stack_ip4_host.address, self.mns.host_a_ip4_address, 5000)})
+
+    def test_udp_socket__udp_segment__segment_size(self):
+        self.mock_callable(self.packet_handler_mock, "send_udp_packets").to_raise(AssertionError).and_assert_not_called()
+        self.socket.setsockopt(IPPROTO_UDP, UDP_SEGMENT, 1000)
+        self.assertEqual(self.socket.sendto(b"x" * 1000, ("10.0.1.91", 5000)), 1000)
+        self.assertEqual([len(_[3]) for _ in self.packets_tx], [1000])
+
+    def test_udp_socket__udp_segment__unset(self):
+        self.mock_callable(self.packet_handler_mock, "send_udp_packets").to_raise(AssertionError).and_assert_not_called()
+        self.assertEqual(self.socket.sendto(b"x" * 2500, ("10.0.1.91", 5000)), 2500)
+        self.assertEqual([len(_[3]) for _ in self.packets_tx], [2500])
+
+    def test_udp_socket__udp_segment__partial_failure(self):
+        self.tx_status = {1: TxStatus.DROPED__ETHER__DST_ARP_CACHE_FAIL}
+        self.socket.setsockopt(IPPROTO_UDP, UDP_SEGMENT, 1000)
+        self.assertEqual(self.socket.sendto(b"x" * 2500, ("10.0.1.91", 5000)), 1500)
+        self.assertEqual([len(_[3]) for _ in self.packets_tx], [1000, 1000, 500])